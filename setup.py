@@ -75,6 +75,14 @@ ext_modules = [
         optional=True,
         language="c++",
     ),
+    Extension(
+        "ezdxf.acc.tagger",
+        [
+            "src/ezdxf/acc/tagger.pyx",
+        ],
+        optional=True,
+        language="c++",
+    ),
     Extension(
         "ezdxf.acc.np_support",
         [
@@ -47,6 +47,8 @@ cdef class _LineTypeRenderer:
         cdef CppVec3 segment_vec, segment_dir
         cdef double segment_length, dash_length
         cdef vector[double] dashes
+        cdef vector[bint] is_dashes
+        cdef size_t index
 
         if self.is_solid or cpp_start.isclose(cpp_end, ABS_TOL):
             yield v3_from_cpp_vec3(cpp_start), v3_from_cpp_vec3(cpp_end)
@@ -57,26 +59,32 @@ cdef class _LineTypeRenderer:
         with cython.cdivision:
             segment_dir = segment_vec * (1.0 / segment_length)  # normalize
 
-        self._render_dashes(segment_length, dashes)
-        for dash_length in dashes:
-            cpp_end = cpp_start + (segment_dir * abs(dash_length))
-            if dash_length > 0:
+        self._render_dashes(segment_length, dashes, is_dashes)
+        for index in range(dashes.size()):
+            cpp_end = cpp_start + (segment_dir * dashes[index])
+            # a dash of length 0 is a point:
+            if is_dashes[index]:
                 yield v3_from_cpp_vec3(cpp_start), v3_from_cpp_vec3(cpp_end)
             cpp_start = cpp_end
 
-    cdef _render_dashes(self, double length, vector[double] &dashes):
+    cdef _render_dashes(
+        self, double length, vector[double] &dashes, vector[bint] &is_dashes
+    ):
         if length <= self._current_dash_length:
             self._current_dash_length -= length
-            dashes.push_back(length if self._is_dash else -length)
+            dashes.push_back(length)
+            is_dashes.push_back(self._is_dash)
             if self._current_dash_length < ABS_TOL:
                 self._cycle_dashes()
         else:
             # Avoid deep recursions!
             while length > self._current_dash_length:
                 length -= self._current_dash_length
-                self._render_dashes(self._current_dash_length, dashes)
+                self._render_dashes(
+                    self._current_dash_length, dashes, is_dashes
+                )
             if length > 0.0:
-                self._render_dashes(length, dashes)
+                self._render_dashes(length, dashes, is_dashes)
 
     cdef _cycle_dashes(self):
         with cython.cdivision:
@@ -0,0 +1,367 @@
+# cython: language_level=3
+# distutils: language = c++
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+from typing import Iterator, TextIO
+from libc.string cimport memcpy, memchr
+from libc.stdint cimport int16_t, int32_t, int64_t, uint64_t
+
+from ezdxf.lldxf.types import (
+    DXFTag,
+    DXFVertex,
+    DXFBinaryTag,
+    BYTES,
+    INT16,
+    INT32,
+    INT64,
+    DOUBLE,
+    POINT_CODES,
+    TYPE_TABLE,
+    BINARY_DATA,
+)
+from ezdxf.lldxf.const import DXFStructureError
+from array import array
+from ezdxf.lldxf.tagger import scan_binary_dxf_params
+
+DEF MAX_CODE = 1071
+
+# Value types of group codes:
+cdef enum:
+    STRING = 0
+    INTEGER = 1
+    FLOAT = 2
+    POINT = 3
+    BINARY = 4
+
+# Binary DXF value types of group codes:
+cdef enum:
+    B_STRING = 0
+    B_INT16 = 1
+    B_INT32 = 2
+    B_INT64 = 3
+    B_DOUBLE = 4
+    B_BYTE = 5
+    B_BINARY = 6
+
+cdef object _new = object.__new__
+
+
+# Creating DXFTag objects without calling the Python __init__() method is
+# nearly twice as fast:
+cdef inline object new_tag(int code, object value):
+    tag = _new(DXFTag)
+    tag._code = code
+    tag._value = value
+    return tag
+
+
+cdef inline object new_vertex(int code, tuple point):
+    tag = _new(DXFVertex)
+    tag._code = code
+    tag._value = array("d", point)
+    return tag
+
+
+cdef inline object new_binary_tag(int code, bytes value):
+    tag = _new(DXFBinaryTag)
+    tag._code = code
+    tag._value = value
+    return tag
+
+
+cdef unsigned char VALUE_TYPE[MAX_CODE + 1]
+cdef unsigned char BINARY_VALUE_TYPE[MAX_CODE + 1]
+
+
+cdef _setup_type_tables():
+    cdef int code
+    for code in range(MAX_CODE + 1):
+        if code in POINT_CODES:
+            VALUE_TYPE[code] = POINT
+        elif code in BINARY_DATA:
+            VALUE_TYPE[code] = BINARY
+        elif TYPE_TABLE.get(code, str) is int:
+            VALUE_TYPE[code] = INTEGER
+        elif TYPE_TABLE.get(code, str) is float:
+            VALUE_TYPE[code] = FLOAT
+        else:
+            VALUE_TYPE[code] = STRING
+
+        if code in BINARY_DATA:
+            BINARY_VALUE_TYPE[code] = B_BINARY
+        elif code in INT16:
+            BINARY_VALUE_TYPE[code] = B_INT16
+        elif code in DOUBLE:
+            BINARY_VALUE_TYPE[code] = B_DOUBLE
+        elif code in INT32:
+            BINARY_VALUE_TYPE[code] = B_INT32
+        elif code in INT64:
+            BINARY_VALUE_TYPE[code] = B_INT64
+        elif code in BYTES:
+            BINARY_VALUE_TYPE[code] = B_BYTE
+        else:
+            BINARY_VALUE_TYPE[code] = B_STRING
+
+
+_setup_type_tables()
+
+
+cdef inline int value_type(int code):
+    if 0 <= code <= MAX_CODE:
+        return VALUE_TYPE[code]
+    if code in POINT_CODES:
+        return POINT
+    if code in BINARY_DATA:
+        return BINARY
+    caster = TYPE_TABLE.get(code, str)
+    if caster is int:
+        return INTEGER
+    if caster is float:
+        return FLOAT
+    return STRING
+
+
+def ascii_tags_loader(
+    stream: TextIO, bint skip_comments = True
+) -> Iterator[DXFTag]:
+    """Yields :class:`DXFTag` objects from a text `stream`. Cython
+    implementation of :func:`ezdxf.lldxf.tagger.ascii_tags_loader`.
+
+    Raises:
+        DXFStructureError: Found invalid group code.
+
+    """
+    cdef int line = 1
+    cdef int group_code
+    cdef bint yield_comments = not skip_comments
+    cdef str code
+    cdef str value
+    readline = stream.readline
+    # readline() returns an empty string at EOF, not exception will be raised!
+    while True:
+        code = readline()
+        if not code:  # empty string indicates EOF
+            return
+        try:
+            group_code = int(code)
+        except (ValueError, OverflowError):
+            raise DXFStructureError(f'Invalid group code "{code}" at line {line}.')
+
+        value = readline()
+        if not value:  # empty string indicates EOF
+            return
+        value = value.rstrip("\n")
+        if group_code != 999 or yield_comments:
+            yield new_tag(group_code, value)
+        if group_code == 0 and value == "EOF":
+            # yield EOF tag but ignore any data beyond EOF
+            return
+        line += 2
+
+
+def tag_compiler(tags: Iterator[DXFTag]) -> Iterator[DXFTag]:
+    """Compiles DXF tag values imported by ascii_tags_loader() into Python
+    types. Cython implementation of :func:`ezdxf.lldxf.tagger.tag_compiler`.
+
+    Raises:
+        DXFStructureError: Found invalid DXF tag or unexpected coordinate order.
+
+    """
+    cdef int line = 0
+    cdef int code
+    cdef int vtype
+    undo_tag = None
+
+    while True:
+        try:
+            if undo_tag is not None:
+                x = undo_tag
+                undo_tag = None
+            else:
+                x = next(tags)
+                line += 2
+            code = x.code
+            vtype = value_type(code)
+            if vtype == POINT:
+                # y-axis is mandatory
+                y = next(tags)
+                line += 2
+                if y.code != code + 10:  # like 20 for base x-code 10
+                    raise DXFStructureError(
+                        f"Missing required y coordinate near line: {line}."
+                    )
+                # z-axis just for 3d points
+                z = next(tags)
+                line += 2
+                try:
+                    # z-axis like (30, 0.0) for base x-code 10
+                    if z.code == code + 20:
+                        point = (float(x.value), float(y.value), float(z.value))
+                    else:
+                        point = (float(x.value), float(y.value))
+                        undo_tag = z
+                except ValueError:
+                    raise DXFStructureError(
+                        f"Invalid floating point values near line: {line}."
+                    )
+                yield new_vertex(code, point)
+            elif vtype == BINARY:
+                # Maybe pre compiled in low level tagger (binary DXF):
+                if isinstance(x, DXFBinaryTag):
+                    tag = x
+                else:
+                    try:
+                        tag = DXFBinaryTag.from_string(code, x.value)
+                    except ValueError:
+                        raise DXFStructureError(
+                            f"Invalid binary data near line: {line}."
+                        )
+                yield tag
+            else:  # Just a single tag
+                value = x.value
+                try:
+                    if vtype == STRING:
+                        if code == 0:
+                            value = value.strip()
+                    elif vtype == INTEGER:
+                        value = int(value)
+                    else:
+                        value = float(value)
+                except ValueError:
+                    # ProE stores int values as floats :((
+                    if vtype == INTEGER:
+                        try:
+                            value = int(float(value))
+                        except ValueError:
+                            raise DXFStructureError(_error_msg(x, line))
+                    else:
+                        raise DXFStructureError(_error_msg(x, line))
+                yield new_tag(code, value)
+        except StopIteration:
+            return
+
+
+cdef str _error_msg(tag, int line):
+    return (
+        f'Invalid tag (code={tag.code}, value="{tag.value}") '
+        f"near line: {line}."
+    )
+
+
+cdef inline int16_t _int16(const unsigned char *p):
+    return <int16_t> (p[0] | (p[1] << 8))
+
+
+cdef inline uint64_t _uint64(const unsigned char *p):
+    cdef uint64_t value = 0
+    cdef int i
+    for i in range(7, -1, -1):
+        value = (value << 8) | p[i]
+    return value
+
+
+cdef inline int32_t _int32(const unsigned char *p):
+    return <int32_t> (<uint64_t> p[0] | (<uint64_t> p[1] << 8) |
+                      (<uint64_t> p[2] << 16) | (<uint64_t> p[3] << 24))
+
+
+cdef inline double _double(const unsigned char *p):
+    cdef uint64_t bits = _uint64(p)
+    cdef double value
+    memcpy(&value, &bits, 8)
+    return value
+
+
+# min. byte count of the value types, B_STRING is the terminating zero and
+# B_BINARY is the length byte:
+cdef Py_ssize_t VALUE_SIZE[7]
+VALUE_SIZE[:] = [1, 2, 4, 8, 8, 1, 1]
+
+
+cdef inline void _check_bounds(
+    Py_ssize_t index, Py_ssize_t size, Py_ssize_t data_length
+) except *:
+    if index + size > data_length:
+        raise DXFStructureError("Unexpected end of binary DXF data.")
+
+
+def binary_tags_loader(
+    data: bytes, errors: str = "surrogateescape"
+) -> Iterator[DXFTag]:
+    """Yields :class:`DXFTag` or :class:`DXFBinaryTag` objects from binary DXF
+    `data`. Cython implementation of
+    :func:`ezdxf.lldxf.tagger.binary_tags_loader`.
+
+    Raises:
+        DXFStructureError: Not a binary DXF file
+        UnicodeDecodeError: if `errors` is "strict" and a decoding error occurs
+
+    """
+    if data[:22] != b"AutoCAD Binary DXF\r\n\x1a\x00":
+        raise DXFStructureError("Not a binary DXF data structure.")
+
+    cdef bytes _data = bytes(data)
+    encoding, dxfversion = scan_binary_dxf_params(_data)
+    cdef bint r12 = dxfversion <= "AC1009"
+    cdef Py_ssize_t index = 22
+    cdef Py_ssize_t data_length = len(_data)
+    cdef const unsigned char *buffer = _data
+    cdef const unsigned char *end_ptr
+    cdef Py_ssize_t length
+    cdef int code
+    cdef int btype
+
+    while index < data_length:
+        # decode next group code
+        code = buffer[index]
+        if r12:
+            if code == 255:  # extended data
+                _check_bounds(index, 3, data_length)
+                code = (buffer[index + 2] << 8) | buffer[index + 1]
+                index += 3
+            else:
+                index += 1
+        else:  # 2-byte group code
+            _check_bounds(index, 2, data_length)
+            code = (buffer[index + 1] << 8) | code
+            index += 2
+
+        # decode next value
+        if code <= MAX_CODE:
+            btype = BINARY_VALUE_TYPE[code]
+        else:
+            btype = B_STRING
+        _check_bounds(index, VALUE_SIZE[btype], data_length)
+        if btype == B_BINARY:
+            length = buffer[index]
+            index += 1
+            _check_bounds(index, length, data_length)
+            value = _data[index: index + length]
+            index += length
+            yield new_binary_tag(code, value)
+            continue
+        if btype == B_INT16:
+            value = _int16(buffer + index)
+            index += 2
+        elif btype == B_DOUBLE:
+            value = _double(buffer + index)
+            index += 8
+        elif btype == B_INT32:
+            value = _int32(buffer + index)
+            index += 4
+        elif btype == B_INT64:
+            value = <int64_t> _uint64(buffer + index)
+            index += 8
+        elif btype == B_BYTE:
+            value = buffer[index]
+            index += 1
+        else:  # zero terminated string
+            end_ptr = <const unsigned char *> memchr(
+                buffer + index, 0, data_length - index
+            )
+            if end_ptr == NULL:
+                raise ValueError("subsection not found")
+            length = end_ptr - (buffer + index)
+            value = _data[index: index + length].decode(encoding, errors=errors)
+            index += length + 1
+        yield new_tag(code, value)
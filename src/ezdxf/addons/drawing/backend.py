@@ -10,7 +10,8 @@ from ezdxf.addons.drawing.properties import Properties, BackendProperties
 from ezdxf.addons.drawing.type_hints import Color
 from ezdxf.entities import DXFGraphic
 from ezdxf.math import Vec2
-from ezdxf.npshapes import NumpyPath2d, NumpyPoints2d, single_paths
+from ezdxf.npshapes import NumpyPath2d, NumpyPoints2d, single_paths, flatten_paths
+from ezdxf.tools import take2
 
 BkPath2d: TypeAlias = NumpyPath2d
 BkPoints2d: TypeAlias = NumpyPoints2d
@@ -50,6 +51,18 @@ class BackendInterface(ABC):
     ) -> None:
         raise NotImplementedError
 
+    def draw_solid_lines_array(
+        self, lines: BkPoints2d, properties: BackendProperties
+    ) -> None:
+        """Draws a bunch of solid lines with the same properties, each pair of
+        vertices (n, n+1) represents the start- and end point of a line.
+
+        This method receives the output of the vectorized linetype rendering.
+        Backends can override this method to process the vertices as ndarray
+        without creating a :class:`Vec2` instance for each vertex.
+        """
+        self.draw_solid_lines(take2(lines.vertices()), properties)
+
     @abstractmethod
     def draw_path(self, path: BkPath2d, properties: BackendProperties) -> None:
         raise NotImplementedError
@@ -162,13 +175,9 @@ class Backend(BackendInterface, metaclass=ABCMeta):
             properties: HATCH properties
 
         """
-        for path in paths:
-            self.draw_filled_polygon(
-                BkPoints2d(
-                    path.flattening(distance=self.config.max_flattening_distance)
-                ),
-                properties,
-            )
+        vertices, offsets = flatten_paths(paths, self.config.max_flattening_distance)
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            self.draw_filled_polygon(BkPoints2d(vertices[start:end]), properties)
 
     @abstractmethod
     def draw_filled_polygon(
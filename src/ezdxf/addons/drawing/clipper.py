@@ -3,6 +3,7 @@
 from __future__ import annotations
 from typing import Optional, Iterable, Iterator, Sequence
 
+import numpy as np
 from ezdxf.math import Matrix44, Vec2, BoundingBox2d
 from ezdxf.math.clipping import ClippingRect2d
 from ezdxf.npshapes import NumpyPath2d, NumpyPoints2d, single_paths
@@ -53,6 +54,21 @@ class ClippingRect:
             return self.view.clip_line(start, end)
         return start, end
 
+    def clip_lines(self, lines: NumpyPoints2d) -> NumpyPoints2d:
+        """Clips multiple lines at once, each pair of vertices (n, n+1) represents
+        the start- and end point of a line. Lines outside the view are removed.
+        """
+        if self.m is not None:
+            lines.transform_inplace(self.m)
+            # lines in paperspace units!
+        view = self.view
+        if view is None or len(lines) == 0:
+            return lines
+        box = view.bbox
+        return NumpyPoints2d(
+            clip_lines_rect(lines.np_vertices(), box.extmin, box.extmax)
+        )
+
     def clip_filled_paths(
         self, paths: Iterable[NumpyPath2d], max_sagitta: float
     ) -> Iterator[NumpyPath2d]:
@@ -114,3 +130,73 @@ class ClippingRect:
             if not view.is_inside(extmin) or not view.is_inside(extmax):
                 return NumpyPoints2d(view.clip_polygon(points.vertices()))
         return points
+
+
+def clip_lines_rect(lines: np.ndarray, extmin: Vec2, extmax: Vec2) -> np.ndarray:
+    """Returns the clipped `lines` by the Liang-Barsky algorithm, each pair of rows
+    (n, n+1) of the ndarray `lines` represents the start- and end point of a line.
+    Lines outside the clipping rectangle are removed.
+    """
+    starts = lines[0::2]
+    directions = lines[1::2] - starts
+    t0 = np.zeros(len(starts))
+    t1 = np.ones(len(starts))
+    inside = np.ones(len(starts), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for axis in (0, 1):
+            d = directions[:, axis]
+            for p, q in (
+                (-d, starts[:, axis] - extmin[axis]),
+                (d, extmax[axis] - starts[:, axis]),
+            ):
+                inside &= (p != 0.0) | (q >= 0.0)
+                r = q / p
+                t0 = np.where(p < 0.0, np.maximum(t0, r), t0)
+                t1 = np.where(p > 0.0, np.minimum(t1, r), t1)
+    inside &= t0 <= t1
+    starts = starts[inside]
+    directions = directions[inside]
+    result = np.empty((len(starts) * 2, 2), dtype=np.float64)
+    result[0::2] = starts + directions * t0[inside, np.newaxis]
+    result[1::2] = starts + directions * t1[inside, np.newaxis]
+    return result
+
+
+def boxes_intersecting_polygon(
+    extmin: np.ndarray, extmax: np.ndarray, polygon: np.ndarray
+) -> np.ndarray:
+    """Returns a boolean ndarray which is ``True`` for each box which intersects the
+    implicit closed `polygon`. The boxes are defined by the ndarrays `extmin` and
+    `extmax` of shape (n, 2) and the `polygon` by an ndarray of shape (m, 2).
+    """
+    count = len(extmin)
+    intersecting = np.zeros(count, dtype=bool)
+    # crossing number of the extmin corners to detect boxes inside the polygon:
+    inside = np.zeros(count, dtype=bool)
+    px = extmin[:, 0]
+    py = extmin[:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for (x0, y0), (x1, y1) in zip(polygon, np.roll(polygon, -1, axis=0)):
+            dx = x1 - x0
+            dy = y1 - y0
+            if dy != 0.0:
+                crossing = (y0 > py) != (y1 > py)
+                inside ^= crossing & (px < x0 + (py - y0) * dx / dy)
+            # Liang-Barsky test of the polygon edge against all boxes:
+            t0 = np.zeros(count)
+            t1 = np.ones(count)
+            hit = np.ones(count, dtype=bool)
+            for p, q in (
+                (-dx, x0 - extmin[:, 0]),
+                (dx, extmax[:, 0] - x0),
+                (-dy, y0 - extmin[:, 1]),
+                (dy, extmax[:, 1] - y0),
+            ):
+                if p == 0.0:
+                    hit &= q >= 0.0
+                elif p < 0.0:
+                    t0 = np.maximum(t0, q / p)
+                else:
+                    t1 = np.minimum(t1, q / p)
+            intersecting |= hit & (t0 <= t1)
+    return intersecting | inside
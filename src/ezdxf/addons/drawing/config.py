@@ -218,6 +218,19 @@ class Configuration:
             background color as "#RRGGBBAA" color string (RGB+alpha)
         lineweight_policy:
         text_policy:
+        block_cache: cache the rendered primitives of block definitions and
+            draw block references by transforming the cached primitives, the
+            cache is used for block references without extrusion and for each
+            combination of block definition, scaling and inherited properties;
+            the backend does not get the entities of the block definitions by
+            the :meth:`enter_entity` method, only the block reference itself
+        pixel_size: size of an output pixel in drawing units to activate the
+            level-of-detail rendering, which simplifies primitives too small to
+            be visible in the output medium: small text is drawn as filled
+            rectangles, dense hatch patterns are drawn as solid fillings, short
+            linetype patterns are drawn as continuous lines, paths smaller than
+            a pixel are drawn as points and curves are flattened with a tolerance
+            of half a pixel; 0 disables the level-of-detail rendering (default)
 
     """
 
@@ -243,6 +256,8 @@ class Configuration:
     custom_bg_color: Color = "#ffffff"
     lineweight_policy: LineweightPolicy = LineweightPolicy.ABSOLUTE
     text_policy: TextPolicy = TextPolicy.FILLING
+    block_cache: bool = False
+    pixel_size: float = 0.0
 
     @staticmethod
     def defaults() -> Configuration:
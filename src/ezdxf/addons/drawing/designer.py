@@ -9,26 +9,32 @@ from typing import (
     TYPE_CHECKING,
     Iterator,
     Callable,
+    Hashable,
+    Any,
 )
 from typing_extensions import TypeAlias
 import abc
-import itertools
+import copy
+import numpy as np
 
 from ezdxf.colors import RGB
 import ezdxf.bbox
 
 from ezdxf.fonts import fonts
 from ezdxf.math import Vec2, Matrix44, BoundingBox2d, AnyVec
+from ezdxf.npshapes import transform_paths
 from ezdxf.path import make_path, Path
 from ezdxf.tools.text import replace_non_printable_characters
 from ezdxf.render import linetypes
 from ezdxf.entities import DXFGraphic, Viewport
+from ezdxf.spatialindex import SpatialIndex
 
 from .backend import BackendInterface, BkPath2d, BkPoints2d
-from .clipper import ClippingRect
+from .clipper import ClippingRect, boxes_intersecting_polygon
 from .config import LinePolicy, TextPolicy, ColorPolicy, Configuration
 from .properties import BackendProperties, Filling
 from .properties import Properties, RenderContext
+from .recorder import Recorder, RecordType
 from .type_hints import Color
 from .unified_text_renderer import UnifiedTextRenderer
 
@@ -37,6 +43,13 @@ if TYPE_CHECKING:
 
 PatternKey: TypeAlias = Tuple[str, float]
 DrawEntitiesCallback: TypeAlias = Callable[[RenderContext, Iterable[DXFGraphic]], None]
+Recording: TypeAlias = "list[tuple[RecordType, BackendProperties, Any]]"
+
+# Level-of-detail rendering thresholds in output pixels:
+# text with a smaller cap height is drawn as filled rectangle
+LOD_MIN_CAP_HEIGHT = 3.0
+# linetypes with a shorter pattern length are drawn as continuous lines
+LOD_MIN_PATTERN_LENGTH = 4.0
 
 
 class Designer(abc.ABC):
@@ -134,6 +147,28 @@ class Designer(abc.ABC):
     def exit_entity(self, entity: DXFGraphic) -> None:
         ...
 
+    def draw_cached(
+        self, key: Hashable, m: Matrix44, draw: Callable[[], None]
+    ) -> bool:
+        """Draws the primitives created by the `draw` function transformed by
+        the matrix `m`. The primitives are recorded at the first call for a `key`
+        and replayed for all subsequent calls with the same `key`.
+
+        Returns ``False`` if caching of primitives is not supported by the
+        designer, the `draw` function is not called in this case.
+        """
+        return False
+
+    def clear_cache(self) -> None:
+        """Clears the cache of recorded primitives."""
+
+    @property
+    def lod_pixel_size(self) -> float:
+        """Returns the size of an output pixel in drawing units for the
+        level-of-detail rendering, 0 if not supported by the designer.
+        """
+        return 0.0
+
 
 class Designer2d(Designer):
     """Designer class for 2D backends."""
@@ -146,6 +181,7 @@ class Designer2d(Designer):
         self.current_vp_scale = 1.0
         self._current_entity_handle: str = ""
         self._color_mapping: dict[str, str] = dict()
+        self._recordings: dict[Hashable, Recording] = dict()
 
     @property
     def vp_ltype_scale(self) -> float:
@@ -154,6 +190,24 @@ class Designer2d(Designer):
         """
         return 1.0 / max(self.current_vp_scale, 0.0001)  # max out at 1:10000
 
+    @property
+    def lod_pixel_size(self) -> float:
+        """Returns the size of an output pixel in drawing units of the current
+        viewport for the level-of-detail rendering, 0 if the level-of-detail
+        rendering is disabled.
+        """
+        return self.config.pixel_size * self.vp_ltype_scale
+
+    def is_below_pixel_size(self, shape: BkPath2d) -> bool:
+        """Returns ``True`` if the extents of `shape` are smaller than an output
+        pixel for the level-of-detail rendering.
+        """
+        pixel_size = self.lod_pixel_size
+        if pixel_size <= 0.0 or len(shape) == 0:
+            return False
+        extmin, extmax = shape.extents()
+        return extmax.x - extmin.x < pixel_size and extmax.y - extmin.y < pixel_size
+
     def get_backend_properties(self, properties: Properties) -> BackendProperties:
         try:
             color = self._color_mapping[properties.color]
@@ -176,6 +230,7 @@ class Designer2d(Designer):
     def set_config(self, config: Configuration) -> None:
         self.config = config
         self.backend.configure(self.config)
+        self.clear_cache()
 
     def set_current_entity_handle(self, handle: str) -> None:
         assert handle is not None
@@ -194,12 +249,24 @@ class Designer2d(Designer):
             msp_limits = vp.get_modelspace_limits()
         except ValueError:  # modelspace limits not detectable
             return
-        if self.enter_viewport(vp):
-            self.draw_entities(
-                layout_ctx.from_viewport(vp),
-                filter_vp_entities(vp.doc.modelspace(), msp_limits, bbox_cache),
-            )
-            self.exit_viewport()
+        if not self.enter_viewport(vp):
+            return
+        msp_index = layout_ctx.modelspace_index
+        if msp_index is None:
+            # The modelspace index is shared by all viewports:
+            msp_index = ModelspaceIndex(vp.doc.modelspace(), bbox_cache)
+            layout_ctx.modelspace_index = msp_index
+        polygon: Optional[np.ndarray] = None
+        if vp.has_extended_clipping_path:
+            polygon = viewport_clipping_polygon(vp)
+            window = BoundingBox2d(polygon)
+        else:
+            min_x, min_y, max_x, max_y = msp_limits
+            window = BoundingBox2d([(min_x, min_y), (max_x, max_y)])
+        self.draw_entities(
+            layout_ctx.from_viewport(vp), msp_index.query(window, polygon)
+        )
+        self.exit_viewport()
 
     def enter_viewport(self, vp: Viewport) -> bool:
         """Set current viewport, returns ``True`` for valid viewports."""
@@ -228,7 +295,7 @@ class Designer2d(Designer):
         e = Vec2(end)
         if (
             self.config.line_policy == LinePolicy.SOLID
-            or len(properties.linetype_pattern) < 2  # CONTINUOUS
+            or len(self.pattern(properties)) < 2  # CONTINUOUS
         ):
             if self.clipper.is_active:
                 points = self.clipper.clip_line(s, e)
@@ -237,9 +304,10 @@ class Designer2d(Designer):
                 start, end = points
             self.backend.draw_line(start, end, self.get_backend_properties(properties))
         else:
-            renderer = linetypes.LineTypeRenderer(self.pattern(properties))
-            self.draw_solid_lines(  # includes transformation
-                ((s, e) for s, e in renderer.line_segment(s, e)),
+            self._draw_dashed_lines(
+                linetypes.dashed_lines(
+                    np.array(((s.x, s.y), (e.x, e.y))), self.pattern(properties)
+                ),
                 properties,
             )
 
@@ -260,9 +328,12 @@ class Designer2d(Designer):
         self._draw_path(BkPath2d(path), properties)
 
     def _draw_path(self, path: BkPath2d, properties: Properties):
+        if self.is_below_pixel_size(path):
+            self.draw_point(path.start, properties)
+            return
         if (
             self.config.line_policy == LinePolicy.SOLID
-            or len(properties.linetype_pattern) < 2  # CONTINUOUS
+            or len(self.pattern(properties)) < 2  # CONTINUOUS
         ):
             if self.clipper.is_active:
                 for clipped_path in self.clipper.clip_paths(
@@ -274,12 +345,22 @@ class Designer2d(Designer):
                 return
             self.backend.draw_path(path, self.get_backend_properties(properties))
         else:
-            renderer = linetypes.LineTypeRenderer(self.pattern(properties))
-            vertices = path.flattening(self.config.max_flattening_distance, segments=16)
+            vertices = BkPoints2d(
+                path.flattening(self.config.max_flattening_distance, segments=16)
+            )
+            lines = linetypes.dashed_lines(
+                vertices.np_vertices(), self.pattern(properties)
+            )
+            self._draw_dashed_lines(lines, properties)
 
-            self.draw_solid_lines(
-                ((Vec2(s), Vec2(e)) for s, e in renderer.line_segments(vertices)),
-                properties,
+    def _draw_dashed_lines(self, lines: np.ndarray, properties: Properties) -> None:
+        # each pair of rows (n, n+1) is the start- and end point of a dash
+        points = BkPoints2d(lines)
+        if self.clipper.is_active:
+            points = self.clipper.clip_lines(points)
+        if len(points):
+            self.backend.draw_solid_lines_array(
+                points, self.get_backend_properties(properties)
             )
 
     def draw_filled_paths(
@@ -337,6 +418,9 @@ class Designer2d(Designer):
             ]
             if len(pattern) % 2:
                 pattern.pop()
+            pixel_size = self.lod_pixel_size
+            if pixel_size > 0.0 and sum(pattern) < LOD_MIN_PATTERN_LENGTH * pixel_size:
+                return tuple()  # draw as continuous line
             return pattern
 
     def draw_text(
@@ -355,15 +439,18 @@ class Designer2d(Designer):
         if font_face is None:
             font_face = self.default_font_face
 
+        pixel_size = self.lod_pixel_size
+        if pixel_size > 0.0 and cap_height < LOD_MIN_CAP_HEIGHT * pixel_size:
+            self._draw_text_box(text, transform, properties, cap_height, font_face)
+            return
+
         try:
             glyph_paths = self.text_engine.get_text_glyph_paths(
                 text, font_face, cap_height
             )
         except (RuntimeError, ValueError):
             return
-        for p in glyph_paths:
-            p.transform_inplace(transform)
-        transformed_paths: list[BkPath2d] = glyph_paths
+        transformed_paths: list[BkPath2d] = transform_paths(glyph_paths, transform)
 
         points: list[Vec2]
         if text_policy == TextPolicy.REPLACE_RECT:
@@ -399,6 +486,26 @@ class Designer2d(Designer):
             properties.filling = Filling()
         self._draw_filled_paths(transformed_paths, properties)
 
+    def _draw_text_box(
+        self,
+        text: str,
+        transform: Matrix44,
+        properties: Properties,
+        cap_height: float,
+        font_face: fonts.FontFace,
+    ) -> None:
+        # level-of-detail rendering: text as filled rectangle without
+        # rendering the glyph paths
+        try:
+            width = self.text_engine.get_text_line_width(text, font_face, cap_height)
+        except (RuntimeError, ValueError):
+            return
+        corners = [(0, 0), (width, 0), (width, cap_height), (0, cap_height)]
+        polygon = BkPoints2d(transform.fast_2d_transform(corners))
+        if properties.filling is None:
+            properties.filling = Filling()
+        self._draw_filled_polygon(polygon, properties)
+
     def finalize(self) -> None:
         self.backend.finalize()
 
@@ -411,6 +518,101 @@ class Designer2d(Designer):
     def exit_entity(self, entity: DXFGraphic) -> None:
         self.backend.exit_entity(entity)
 
+    def draw_cached(
+        self, key: Hashable, m: Matrix44, draw: Callable[[], None]
+    ) -> bool:
+        """Draws the primitives created by the `draw` function transformed by
+        the matrix `m`. The primitives are recorded at the first call for a `key`
+        and replayed for all subsequent calls with the same `key`.
+
+        The primitives are recorded without clipping, the clipping of the current
+        viewport is applied at replaying. The linetype rendering depends on the
+        viewport scale, therefore the recordings are stored separately for each
+        viewport scale.
+        """
+        key = (key, self.current_vp_scale)
+        recording = self._recordings.get(key)
+        if recording is None:
+            recording = self._record(draw)
+            self._recordings[key] = recording
+        self._replay(recording, m)
+        return True
+
+    def clear_cache(self) -> None:
+        """Clears the cache of recorded primitives."""
+        self._recordings.clear()
+
+    def _record(self, draw: Callable[[], None]) -> Recording:
+        backend = self.backend
+        clipper = self.clipper
+        recorder = Recorder()
+        self.backend = recorder
+        self.clipper = ClippingRect()
+        try:
+            draw()
+        finally:
+            self.backend = backend
+            self.clipper = clipper
+        return list(recorder.player().recordings())
+
+    def _replay(self, recording: Recording, m: Matrix44) -> None:
+        backend = self.backend
+        clipper = self.clipper
+        is_clipping = clipper.is_active
+        handle = self._current_entity_handle
+        for record_type, properties, data in recording:
+            properties = properties._replace(handle=handle)
+            if record_type == RecordType.FILLED_PATHS:
+                paths = [transformed_copy(p, m) for p in data]
+                if is_clipping:
+                    paths = list(
+                        clipper.clip_filled_paths(
+                            paths, self.config.max_flattening_distance
+                        )
+                    )
+                backend.draw_filled_paths(paths, properties)
+                continue
+            shape = transformed_copy(data, m)
+            if record_type == RecordType.PATH:
+                if is_clipping:
+                    for clipped_path in clipper.clip_paths(
+                        [shape], self.config.max_flattening_distance
+                    ):
+                        backend.draw_path(clipped_path, properties)
+                else:
+                    backend.draw_path(shape, properties)
+            elif record_type == RecordType.SOLID_LINES:
+                if is_clipping:
+                    shape = clipper.clip_lines(shape)
+                backend.draw_solid_lines_array(shape, properties)
+            elif record_type == RecordType.POINTS:
+                count = len(shape)
+                if count > 2:  # filled polygon
+                    if is_clipping:
+                        shape = clipper.clip_polygon(shape)
+                    backend.draw_filled_polygon(shape, properties)
+                elif count == 2:
+                    start, end = shape.vertices()
+                    if is_clipping:
+                        points = clipper.clip_line(start, end)
+                        if len(points) != 2:
+                            continue
+                        start, end = points
+                    backend.draw_line(start, end, properties)
+                elif count == 1:
+                    point: Optional[Vec2] = shape.vertices()[0]
+                    if is_clipping:
+                        point = clipper.clip_point(point)  # type: ignore
+                        if point is None:
+                            continue
+                    backend.draw_point(point, properties)  # type: ignore
+
+
+def transformed_copy(shape, m: Matrix44):
+    shape = copy.copy(shape)
+    shape.transform_inplace(m)
+    return shape
+
 
 def invert_color(color: Color) -> Color:
     r, g, b = RGB.from_hex(color)
@@ -521,6 +723,58 @@ def filter_vp_entities(
             yield entity
 
 
+class ModelspaceIndex:
+    """Spatial index of the modelspace entities to skip the entities outside of
+    viewports. The index is created for each frontend call which draws viewports
+    and is shared by all viewports of this call, therefore the rendering time of
+    a viewport depends on the visible content and not on the size of the
+    modelspace.
+
+    Entities without extents, like XLINE and RAY, are visible in all viewports.
+
+    Args:
+        msp: modelspace layout
+        bbox_cache: the bounding box cache of the modelspace entities
+
+    """
+
+    def __init__(self, msp: Layout, bbox_cache: Optional[ezdxf.bbox.Cache] = None):
+        entities = list(msp)
+        self._order: dict[int, int] = {id(e): i for i, e in enumerate(entities)}
+        self._index = SpatialIndex(entities, fast=True, cache=bbox_cache)
+        self._unbounded = self._index.unbounded()
+
+    def query(
+        self, window: BoundingBox2d, polygon: Optional[np.ndarray] = None
+    ) -> list[DXFGraphic]:
+        """Returns all entities which may be visible in the given modelspace
+        `window` in modelspace order. Entities outside the clipping `polygon`
+        are removed if given, the `polygon` is an ndarray of shape (n, 2) in
+        modelspace coordinates.
+        """
+        entities = self._index.query_window(window)
+        if polygon is not None and len(entities):
+            boxes = [self._index.bbox(e) for e in entities]
+            extmin = np.array([(b.extmin.x, b.extmin.y) for b in boxes])  # type: ignore
+            extmax = np.array([(b.extmax.x, b.extmax.y) for b in boxes])  # type: ignore
+            visible = boxes_intersecting_polygon(extmin, extmax, polygon)
+            entities = [e for e, is_visible in zip(entities, visible) if is_visible]
+        entities.extend(self._unbounded)
+        order = self._order
+        entities.sort(key=lambda e: order[id(e)])
+        return entities
+
+
+def viewport_clipping_polygon(vp: Viewport) -> np.ndarray:
+    """Returns the clipping polygon of the viewport `vp` in modelspace coordinates
+    as ndarray of shape (n, 2).
+    """
+    m = vp.get_transformation_matrix()
+    m.inverse()
+    path = make_path(vp).transform(m)
+    return BkPoints2d(path.flattening(0.01 * vp.dxf.view_height)).np_vertices()
+
+
 def prepare_string_for_rendering(text: str, dxftype: str) -> str:
     assert "\n" not in text, "not a single line of text"
     if dxftype in {"TEXT", "ATTRIB", "ATTDEF"}:
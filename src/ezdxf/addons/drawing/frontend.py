@@ -54,7 +54,7 @@ from ezdxf.entities.attrib import BaseAttrib
 from ezdxf.entities.polygon import DXFPolygon
 from ezdxf.entities.boundary_paths import AbstractBoundaryPath
 from ezdxf.layouts import Layout
-from ezdxf.math import Vec2, Vec3, OCS, NULLVEC
+from ezdxf.math import Vec2, Vec3, OCS, NULLVEC, Z_AXIS, Matrix44
 from ezdxf.path import (
     Path,
     make_path,
@@ -117,6 +117,8 @@ class UniversalFrontend:
         self.designer = designer
         designer.set_draw_entities_callback(self.draw_entities_callback)
         self.config = ctx.update_configuration(config)
+        if self.config.pixel_size > 0.0:
+            self.config = level_of_detail_configuration(self.config)
         designer.set_config(self.config)
 
         if self.config.pdsize is None or self.config.pdsize <= 0:
@@ -223,6 +225,8 @@ class UniversalFrontend:
             self.ctx.current_layout_properties = layout_properties
         else:
             self.ctx.set_current_layout(layout)
+        # recorded block primitives depend on the layout properties:
+        self.designer.clear_cache()
         # set background before drawing entities
         self.set_background(self.ctx.current_layout_properties.background_color)
         self.parent_stack = []
@@ -392,6 +396,13 @@ class UniversalFrontend:
         complex_mtext_renderer(self.ctx, self.designer, mtext, properties)
 
     def draw_curve_entity(self, entity: DXFGraphic, properties: Properties) -> None:
+        if entity.dxftype() in ("CIRCLE", "ARC"):
+            # level-of-detail rendering: circles and arcs smaller than a pixel
+            pixel_size = self.designer.lod_pixel_size
+            if pixel_size > 0.0 and 2.0 * abs(entity.dxf.radius) < pixel_size:
+                center = entity.ocs().to_wcs(entity.dxf.center)  # type: ignore
+                self.designer.draw_point(center, properties)
+                return
         try:
             path = make_path(entity)
         except AttributeError:  # API usage error
@@ -469,7 +480,7 @@ class UniversalFrontend:
         ocs = polygon.ocs()
         elevation = polygon.dxf.elevation.z
         properties.linetype_pattern = tuple()
-        lines: list[tuple[Vec3, Vec3]] = []
+        lines: list[tuple[Vec2, Vec2]] = []
 
         t0 = time.perf_counter()
         max_time = self.config.hatching_timeout
@@ -482,19 +493,32 @@ class UniversalFrontend:
                 return True
             return False
 
+        polygons = hatching.boundary_polygons(
+            paths, self.config.max_flattening_distance
+        )
         for baseline in hatching.pattern_baselines(
             polygon,
             min_hatch_line_distance=self.config.min_hatch_line_distance,
             jiggle_origin=True,
         ):
-            for line in hatching.hatch_paths(baseline, paths, timeout):
-                line_pattern = baseline.pattern_renderer(line.distance)
-                for s, e in line_pattern.render(line.start, line.end):
-                    if ocs.transform:
-                        s, e = ocs.to_wcs((s.x, s.y, elevation)), ocs.to_wcs(
-                            (e.x, e.y, elevation)
-                        )
-                    lines.append((s, e))
+            if timeout():
+                break
+            # pattern lines as ndarray of shape (n, 2, 2) in OCS coordinates
+            pattern_lines = hatching.hatch_pattern_lines(baseline, polygons)
+            if ocs.transform:
+                # the designer requires only the x- and y-axis of WCS coordinates
+                ux, uy, uz = ocs.ux, ocs.uy, ocs.uz
+                x = pattern_lines[..., 0:1]
+                y = pattern_lines[..., 1:2]
+                pattern_lines = (
+                    x * (ux.x, ux.y)
+                    + y * (uy.x, uy.y)
+                    + (uz.x * elevation, uz.y * elevation)
+                )
+            lines.extend(
+                (Vec2(x0, y0), Vec2(x1, y1))
+                for (x0, y0), (x1, y1) in pattern_lines.tolist()
+            )
         self.designer.draw_solid_lines(lines, properties)
 
     def draw_hatch_entity(
@@ -677,6 +701,8 @@ class UniversalFrontend:
     def draw_composite_entity(self, entity: DXFGraphic, properties: Properties) -> None:
         def draw_insert(insert: Insert):
             self.draw_entities(insert.attribs)
+            if self.config.block_cache and self.draw_cached_block(insert, properties):
+                return
             # draw_entities() includes the visibility check:
             self.draw_entities(
                 insert.virtual_entities(
@@ -703,6 +729,62 @@ class UniversalFrontend:
         else:
             raise TypeError(entity.dxftype())
 
+    def draw_cached_block(self, insert: Insert, properties: Properties) -> bool:
+        """Draw the block content of the `insert` entity by the cached
+        primitives of the block definition. Returns ``False`` if the block
+        reference is not supported by the block cache.
+
+        The primitives are cached in the scaled block coordinate system,
+        the rotation and the insert location are applied by the designer.
+        The cached primitives depend on the properties inherited from the
+        block reference, like the layer for entities on layer "0" or the
+        BYBLOCK color, linetype and lineweight.
+        """
+        block = insert.block()
+        if block is None:
+            return False
+        dxf = insert.dxf
+        if not Z_AXIS.isclose(dxf.extrusion):
+            return False
+        xscale = dxf.xscale
+        yscale = dxf.yscale
+        zscale = dxf.zscale
+        key = (
+            block.block_record_handle,
+            xscale,
+            yscale,
+            zscale,
+            properties.color,
+            properties.pen,
+            properties.layer,
+            properties.linetype_name,
+            tuple(properties.linetype_pattern),
+            properties.linetype_scale,
+            properties.lineweight,
+        )
+        m = Matrix44.chain(
+            Matrix44.z_rotate(math.radians(dxf.rotation)),
+            Matrix44.translate(*Vec3(dxf.insert).xyz),
+        )
+
+        def draw_block_content() -> None:
+            # A virtual block reference at the origin without rotation
+            # renders the content in the scaled block coordinate system:
+            local_insert = Insert.new(
+                dxfattribs={
+                    "name": dxf.name,
+                    "xscale": xscale,
+                    "yscale": yscale,
+                    "zscale": zscale,
+                },
+                doc=insert.doc,
+            )
+            self.draw_entities(
+                local_insert.virtual_entities(skipped_entity_callback=self.skip_entity)
+            )
+
+        return self.designer.draw_cached(key, m, draw_block_content)
+
     def draw_proxy_graphic(self, data: bytes, doc) -> None:
         if data:
             try:
@@ -743,6 +825,18 @@ class Frontend(UniversalFrontend):
         super().__init__(ctx, Designer2d(out), config, bbox_cache)
 
 
+def level_of_detail_configuration(config: Configuration) -> Configuration:
+    """Returns the configuration for the level-of-detail rendering, curves are
+    flattened with a tolerance of half a pixel and hatch patterns with a
+    line distance smaller than a pixel are rendered as solid fillings.
+    """
+    pixel_size = config.pixel_size
+    return config.with_changes(
+        max_flattening_distance=max(config.max_flattening_distance, pixel_size / 2),
+        min_hatch_line_distance=max(config.min_hatch_line_distance, pixel_size),
+    )
+
+
 def is_spatial_text(extrusion: Vec3) -> bool:
     # note: the magnitude of the extrusion vector has no effect on text scale
     return not math.isclose(extrusion.x, 0) or not math.isclose(extrusion.y, 0)
@@ -806,7 +900,11 @@ def _draw_entities(
             frontend.draw_entity(entity, properties)
         else:
             frontend.skip_entity(entity, "invisible")
-    _draw_viewports(frontend, viewports)
+    if viewports:
+        # The modelspace index is shared by all viewports of this draw call, the
+        # modelspace may have been modified since the last call:
+        ctx.modelspace_index = None
+        _draw_viewports(frontend, viewports)
 
 
 def _draw_viewports(frontend: UniversalFrontend, viewports: list[Viewport]) -> None:
@@ -6,6 +6,7 @@ import math
 import logging
 from os import PathLike
 
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
 from matplotlib.lines import Line2D
@@ -152,6 +153,33 @@ class MatplotlibBackend(Backend):
             )
         )
 
+    def draw_solid_lines_array(
+        self, lines: BkPoints2d, properties: BackendProperties
+    ) -> None:
+        """Draw a bunch of solid lines given as vertex pairs (n, n+1) without
+        creating Python objects for each line.
+        """
+        vertices = lines.np_vertices()
+        starts = vertices[0::2]
+        ends = vertices[1::2]
+        is_point = np.all(np.abs(ends - starts) <= 1e-12, axis=1)
+        points = starts[is_point]
+        is_line = ~is_point
+        color = properties.color
+        z = self._get_z()
+        self.ax.scatter(
+            points[:, 0], points[:, 1], s=SCATTER_POINT_SIZE, c=color, zorder=z
+        )
+        self.ax.add_collection(
+            LineCollection(
+                np.stack((starts[is_line], ends[is_line]), axis=1),
+                linewidths=self.get_lineweight(properties),
+                color=color,
+                zorder=z,
+                capstyle="butt",
+            )
+        )
+
     def draw_path(self, path: BkPath2d, properties: BackendProperties):
         """Draw a solid line path, line type rendering is done by the
         frontend since v0.18.1
@@ -0,0 +1,250 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+"""
+Parallel tiled rendering of a layout by the drawing add-on.
+
+The extents of the layout are split into a grid of tiles. The main process
+assigns the entities to the tiles by a window query of the spatial index of
+the layout, entities without extents are assigned to all tiles. Each tile is
+rendered by a :class:`~ezdxf.addons.drawing.frontend.Frontend` and a
+:class:`~ezdxf.addons.drawing.recorder.Recorder` in a pool of worker
+processes, which load the DXF document from the file system. The recordings
+are cropped to the tile rectangles and merged in tile order into a single
+:class:`~ezdxf.addons.drawing.recorder.Player` by the main process.
+
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple, List, Dict, Union
+from typing_extensions import TypeAlias
+import concurrent.futures
+import math
+import os
+from pathlib import Path
+
+import ezdxf
+import ezdxf.bbox
+from ezdxf.math import BoundingBox2d
+
+from .config import Configuration
+from .frontend import Frontend
+from .properties import RenderContext, BackendProperties
+from .recorder import Recorder, Player, DataRecord, crop_records_rect
+
+if TYPE_CHECKING:
+    from ezdxf.document import Drawing
+    from ezdxf.layouts import Layout
+
+__all__ = ["render_tiles", "render_tile", "tile_grid", "merge_tile_results"]
+
+CropRect: TypeAlias = Tuple[float, float, float, float]
+
+# Records, property table, resolved configuration and background color:
+TileResult: TypeAlias = Tuple[
+    List[DataRecord], Dict[int, BackendProperties], Configuration, str
+]
+
+# Entities are assigned to all tiles which are intersected by the bounding box
+# of the entity enlarged by this factor of the tile size, because the rendered
+# text and lineweights may exceed the calculated bounding boxes:
+TILE_MARGIN = 0.05
+
+# Document of the worker process, loaded by the initializer of the pool:
+_worker_doc: Optional[Drawing] = None
+
+
+def render_tiles(
+    filename: Union[str, Path],
+    layout_name: str = "Model",
+    *,
+    config: Configuration = Configuration(),
+    columns: int = 2,
+    rows: int = 2,
+    workers: int = 0,
+) -> Player:
+    """Renders the layout `layout_name` of the DXF file `filename` in tiles by
+    a pool of worker processes and returns the merged recordings as
+    :class:`~ezdxf.addons.drawing.recorder.Player`. The player can be
+    replayed on any backend::
+
+        player = render_tiles("huge.dxf", workers=8, columns=4, rows=4)
+        backend = svg.SVGBackend()
+        player.replay(backend)
+        svg_string = backend.get_string(layout.Page(0, 0))
+
+    Each worker process loads the DXF file, therefore the parallel rendering is
+    only beneficial for layouts where the rendering time exceeds the loading
+    time by far. Shapes which cross tile borders are split at the borders.
+
+    Args:
+        filename: DXF file name
+        layout_name: name of the layout to render, "Model" for the modelspace
+        config: configuration of the drawing add-on
+        columns: count of tile columns
+        rows: count of tile rows
+        workers: count of worker processes, 0 for the count of available
+            CPU cores, 1 renders all tiles in the main process
+
+    Raises:
+        KeyError: layout `layout_name` does not exist
+
+    """
+    if workers < 1:
+        workers = os.cpu_count() or 1
+    doc = ezdxf.readfile(filename)
+    layout = doc.layouts.get(layout_name)
+    box = ezdxf.bbox.extents(layout, fast=True)
+    extents = BoundingBox2d()
+    if box.has_data:
+        extents.extend([box.extmin, box.extmax])
+    tiles = tile_grid(extents, max(columns, 1), max(rows, 1))
+    jobs: list[tuple[Optional[set[str]], Optional[CropRect]]]
+    if len(tiles) < 2:
+        jobs = [(None, None)]  # render all entities without cropping
+    else:
+        jobs = [
+            (set(handles), crop_rect(tile, extents))
+            for tile, handles in zip(tiles, assign_entities(layout, tiles))
+        ]
+
+    if workers < 2 or len(jobs) < 2:
+        results = [
+            render_tile(doc, layout_name, handles, crop, config)
+            for handles, crop in jobs
+        ]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_load_worker_doc,
+            initargs=(str(filename),),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _render_worker_tile, layout_name, handles, crop, config
+                )
+                for handles, crop in jobs
+            ]
+            results = [future.result() for future in futures]
+    return merge_tile_results(results)
+
+
+def tile_grid(extents: BoundingBox2d, columns: int, rows: int) -> list[BoundingBox2d]:
+    """Returns the tiles of a grid of `columns` x `rows` tiles covering the
+    given `extents` in row-major order, starting at the lower left corner.
+    Returns an empty list for undefined `extents`.
+    """
+    if not extents.has_data:
+        return []
+    extmin = extents.extmin
+    size = extents.size
+    dx = size.x / columns
+    dy = size.y / rows
+    tiles: list[BoundingBox2d] = []
+    for row in range(rows):
+        y = extmin.y + row * dy
+        for column in range(columns):
+            x = extmin.x + column * dx
+            tiles.append(BoundingBox2d([(x, y), (x + dx, y + dy)]))
+    return tiles
+
+
+def assign_entities(layout: Layout, tiles: Sequence[BoundingBox2d]) -> list[list[str]]:
+    """Returns the handles of the entities of the `layout` for each tile.
+    Entities without extents are assigned to all tiles.
+    """
+    tile_handles: list[list[str]] = []
+    assigned: set[str] = set()
+    for tile in tiles:
+        window = BoundingBox2d([tile.extmin, tile.extmax])
+        size = tile.size
+        window.grow(max(size.x, size.y) * TILE_MARGIN)
+        handles = [entity.dxf.handle for entity in layout.query_window(window)]
+        assigned.update(handles)
+        tile_handles.append(handles)
+    unbounded = [e.dxf.handle for e in layout if e.dxf.handle not in assigned]
+    return [handles + unbounded for handles in tile_handles]
+
+
+def crop_rect(tile: BoundingBox2d, extents: BoundingBox2d) -> CropRect:
+    """Returns the crop rectangle of a `tile` as tuple (x0, y0, x1, y1). The
+    borders of tiles at the border of the `extents` are moved outwards by the
+    size of the `extents`, because the rendered shapes may exceed the
+    calculated extents.
+    """
+    size = extents.size
+    margin = max(size.x, size.y)
+    abs_tol = margin * 1e-9
+    x0, y0 = tile.extmin
+    x1, y1 = tile.extmax
+    if math.isclose(x0, extents.extmin.x, abs_tol=abs_tol):
+        x0 -= margin
+    if math.isclose(y0, extents.extmin.y, abs_tol=abs_tol):
+        y0 -= margin
+    if math.isclose(x1, extents.extmax.x, abs_tol=abs_tol):
+        x1 += margin
+    if math.isclose(y1, extents.extmax.y, abs_tol=abs_tol):
+        y1 += margin
+    return x0, y0, x1, y1
+
+
+def render_tile(
+    doc: Drawing,
+    layout_name: str,
+    handles: Optional[set[str]],
+    crop: Optional[CropRect],
+    config: Configuration,
+) -> TileResult:
+    """Renders the entities of the layout `layout_name` which handles are
+    included in `handles` or all entities if `handles` is ``None``, and crops
+    the recordings by the rectangle `crop` if not ``None``.
+    """
+    layout = doc.layouts.get(layout_name)
+    recorder = Recorder()
+    frontend = Frontend(RenderContext(doc), recorder, config=config)
+    filter_func = None
+    if handles is not None:
+        filter_func = lambda e: e.dxf.handle in handles  # noqa: E731
+    frontend.draw_layout(layout, filter_func=filter_func)
+    records = recorder.records
+    if crop is not None:
+        x0, y0, x1, y1 = crop
+        records = crop_records_rect(
+            records,
+            BoundingBox2d([(x0, y0), (x1, y1)]),
+            frontend.config.max_flattening_distance,
+        )
+    return records, recorder.properties, recorder.config, recorder.background
+
+
+def merge_tile_results(results: Sequence[TileResult]) -> Player:
+    """Merges the recordings of the tiles in the given order into a single
+    :class:`Player`.
+    """
+    player = Player()
+    properties_table = player.properties
+    for index, (records, properties, config, background) in enumerate(results):
+        if index == 0:
+            player.config = config
+            player.background = background
+        for record in records:
+            # The hash of strings is not stable across processes:
+            properties_ = properties[record.property_hash]
+            property_hash = hash(properties_[:4])
+            properties_table[property_hash] = properties_
+            record.property_hash = property_hash
+            player.records.append(record)
+    return player
+
+
+def _load_worker_doc(filename: str) -> None:
+    global _worker_doc
+    _worker_doc = ezdxf.readfile(filename)
+
+
+def _render_worker_tile(
+    layout_name: str,
+    handles: Optional[set[str]],
+    crop: Optional[CropRect],
+    config: Configuration,
+) -> TileResult:
+    assert _worker_doc is not None, "worker document not loaded"
+    return render_tile(_worker_doc, layout_name, handles, crop, config)
@@ -0,0 +1,453 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+"""
+Native single page PDF output of the drawing add-on.
+
+The page content stream is compressed incrementally and written to the output
+stream in chunks, the size of the content does not affect the memory
+consumption. The PDF objects which depend on the content, like the length of
+the content stream and the graphic states for transparency, are written after
+the content stream.
+
+"""
+from __future__ import annotations
+from typing import BinaryIO, Iterable, no_type_check
+import zlib
+
+import numpy as np
+
+from ezdxf.colors import RGB
+from ezdxf.math import Vec2, BoundingBox2d
+from ezdxf.path import Command
+from ezdxf.version import __version__
+
+from .type_hints import Color
+from .backend import BackendInterface, BkPath2d, BkPoints2d
+from .config import Configuration, LineweightPolicy
+from .properties import BackendProperties
+from .streaming import StreamingBackend
+from . import layout
+
+__all__ = ["PDFStreamBackend", "PDFStreamRenderBackend"]
+
+# PDF units are points (pt), 1 pt is 1/72 of an inch:
+MM_TO_POINTS = 72.0 / 25.4  # 25.4 mm = 1 inch / 72
+
+# size of the uncompressed content buffer in bytes:
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+# PDF object numbers:
+CATALOG = 1
+PAGES = 2
+PAGE = 3
+INFO = 4
+CONTENT = 5
+CONTENT_LENGTH = 6
+RESOURCES = 7
+FIRST_GRAPHIC_STATE = 8
+
+
+class PDFStreamBackend(StreamingBackend):
+    """This backend writes a single page PDF document to the binary `stream`
+    as the frontend produces the output and does not require any external
+    packages. The memory consumption does not depend on the size of the rendered
+    layout. The extents of the content have to be known in advance::
+
+        msp = doc.modelspace()
+        render_box = ezdxf.bbox.extents(msp, fast=True)
+        with open("huge.pdf", "wb") as fp:
+            backend = pdf.PDFStreamBackend(
+                fp, layout.Page(0, 0), BoundingBox2d(render_box)
+            )
+            Frontend(RenderContext(doc), backend).draw_layout(msp)
+
+    The output is finalized by the :meth:`finalize` method, which is called at the
+    end of :meth:`Frontend.draw_layout`.
+
+    Args:
+        stream: binary stream
+        page: page definition, see :class:`~ezdxf.addons.drawing.layout.Page`
+        render_box: the region to render in DXF coordinates
+        settings: layout settings, see :class:`~ezdxf.addons.drawing.layout.Settings`
+
+    Raises:
+        ValueError: undefined `render_box` or the final page has no area
+
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        page: layout.Page,
+        render_box: BoundingBox2d,
+        *,
+        settings: layout.Settings = layout.Settings(),
+    ) -> None:
+        self.stream = stream
+        super().__init__(page, render_box, settings=settings)
+
+    def get_output_coordinate_space(self, page: layout.Page) -> float:
+        return max(page.width_in_mm, page.height_in_mm) * MM_TO_POINTS
+
+    def make_backend(
+        self, page: layout.Page, settings: layout.Settings
+    ) -> PDFStreamRenderBackend:
+        """Override this method to use a customized render backend."""
+        return PDFStreamRenderBackend(page, settings, self.stream)
+
+
+class PDFStreamRenderBackend(BackendInterface):
+    """Writes a single page PDF document to a binary stream.
+
+    The input coordinates are floats in 1/72 inch, the page is defined by the
+    upper left corner in the origin (0, 0) and the lower right corner at
+    (page-width, page-height).
+
+    """
+
+    def __init__(
+        self,
+        page: layout.Page,
+        settings: layout.Settings,
+        stream: BinaryIO,
+        *,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        self.settings = settings
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._stroke_width_cache: dict[float, float] = dict()
+        self._color_cache: dict[str, str] = dict()
+        self.page_width_in_pt = page.width_in_mm * MM_TO_POINTS
+        self.page_height_in_pt = page.height_in_mm * MM_TO_POINTS
+        # LineweightPolicy.ABSOLUTE:
+        self.min_lineweight = 0.05  # in mm, set by configure()
+        self.lineweight_scaling = 1.0  # set by configure()
+        self.lineweight_policy = LineweightPolicy.ABSOLUTE  # set by configure()
+
+        # when the stroke width is too thin PDF viewers may get confused;
+        self.abs_min_stroke_width = 0.1  # pt == 0.03528mm (arbitrary choice)
+
+        # LineweightPolicy.RELATIVE:
+        # max_stroke_width is determined as a certain percentage of settings.output_coordinate_space
+        self.max_stroke_width: float = max(
+            self.abs_min_stroke_width,
+            int(settings.output_coordinate_space * settings.max_stroke_width),
+        )
+        # min_stroke_width is determined as a certain percentage of max_stroke_width
+        self.min_stroke_width: float = max(
+            self.abs_min_stroke_width,
+            int(self.max_stroke_width * settings.min_stroke_width),
+        )
+        # LineweightPolicy.RELATIVE_FIXED:
+        # all strokes have a fixed stroke-width as a certain percentage of max_stroke_width
+        self.fixed_stroke_width: float = max(
+            self.abs_min_stroke_width,
+            int(self.max_stroke_width * settings.fixed_stroke_width),
+        )
+
+        # output state:
+        self._offset = 0  # count of bytes written
+        self._object_offsets: dict[int, int] = dict()
+        self._compressor = zlib.compressobj()
+        self._buffer: list[str] = []
+        self._buffer_length = 0
+        self._content_length = 0  # count of compressed bytes
+        self._graphic_states: dict[float, str] = dict()  # opacity: name
+        self._is_finalized = False
+
+        # current graphic state of the content stream:
+        self._stroke_color = ""
+        self._fill_color = ""
+        self._stroke_width = -1.0
+        self._opacity = 1.0
+        self._write_header()
+
+    def _write(self, data: bytes) -> None:
+        self.stream.write(data)
+        self._offset += len(data)
+
+    def _write_object(self, number: int, content: str) -> None:
+        self._object_offsets[number] = self._offset
+        self._write(f"{number} 0 obj\n{content}\nendobj\n".encode("latin-1"))
+
+    def _write_header(self) -> None:
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object(CATALOG, f"<< /Type /Catalog /Pages {PAGES} 0 R >>")
+        self._write_object(PAGES, f"<< /Type /Pages /Kids [{PAGE} 0 R] /Count 1 >>")
+        self._write_object(
+            PAGE,
+            f"<< /Type /Page /Parent {PAGES} 0 R "
+            f"/MediaBox [0 0 {self.page_width_in_pt:.2f} {self.page_height_in_pt:.2f}] "
+            f"/Contents {CONTENT} 0 R /Resources {RESOURCES} 0 R >>",
+        )
+        self._write_object(INFO, f"<< /Creator (ezdxf {__version__}) >>")
+        self._object_offsets[CONTENT] = self._offset
+        self._write(
+            f"{CONTENT} 0 obj\n<< /Length {CONTENT_LENGTH} 0 R "
+            f"/Filter /FlateDecode >>\nstream\n".encode("latin-1")
+        )
+        # flip y-axis, origin in the top-left corner; round line caps and joins:
+        self.emit(f"1 0 0 -1 0 {self.page_height_in_pt:.2f} cm 1 J 1 j\n")
+
+    def emit(self, content: str) -> None:
+        """Adds `content` to the page content stream, the content is compressed
+        and written to the output stream when the internal buffer is full.
+        """
+        self._buffer.append(content)
+        self._buffer_length += len(content)
+        if self._buffer_length >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Compresses the buffered content and writes it to the output stream."""
+        if not self._buffer:
+            return
+        data = self._compressor.compress("".join(self._buffer).encode("latin-1"))
+        self._buffer.clear()
+        self._buffer_length = 0
+        self._content_length += len(data)
+        self._write(data)
+
+    def finalize(self) -> None:
+        if self._is_finalized:
+            return
+        self._is_finalized = True
+        self.flush()
+        data = self._compressor.flush()
+        self._content_length += len(data)
+        self._write(data)
+        self._write(b"\nendstream\nendobj\n")
+        self._write_object(CONTENT_LENGTH, str(self._content_length))
+        states = " ".join(
+            f"/{name} {number} 0 R"
+            for number, name in enumerate(
+                self._graphic_states.values(), start=FIRST_GRAPHIC_STATE
+            )
+        )
+        self._write_object(RESOURCES, f"<< /ExtGState << {states} >> >>")
+        for number, opacity in enumerate(
+            self._graphic_states.keys(), start=FIRST_GRAPHIC_STATE
+        ):
+            self._write_object(
+                number, f"<< /Type /ExtGState /CA {opacity:.3f} /ca {opacity:.3f} >>"
+            )
+        self._write_xref()
+        self.stream.flush()
+
+    def _write_xref(self) -> None:
+        xref_offset = self._offset
+        count = max(self._object_offsets) + 1
+        lines = [f"xref\n0 {count}\n", "0000000000 65535 f \n"]
+        for number in range(1, count):
+            lines.append(f"{self._object_offsets[number]:010d} 00000 n \n")
+        lines.append(
+            f"trailer\n<< /Size {count} /Root {CATALOG} 0 R /Info {INFO} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        )
+        self._write("".join(lines).encode("latin-1"))
+
+    def resolve_color(self, color: Color) -> str:
+        key = color[:7]
+        try:
+            return self._color_cache[key]
+        except KeyError:
+            pass
+        r, g, b = RGB.from_hex(color).to_floats()
+        color_str = f"{r:.3f} {g:.3f} {b:.3f}"
+        self._color_cache[key] = color_str
+        return color_str
+
+    def resolve_stroke_width(self, width: float) -> float:
+        try:
+            return self._stroke_width_cache[width]
+        except KeyError:
+            pass
+        stroke_width = self.fixed_stroke_width
+        if self.lineweight_policy == LineweightPolicy.ABSOLUTE:
+            stroke_width = (  # in points (pt) = 1/72 inch
+                max(self.min_lineweight, width) * MM_TO_POINTS * self.lineweight_scaling
+            )
+        elif self.lineweight_policy == LineweightPolicy.RELATIVE:
+            stroke_width = map_lineweight_to_stroke_width(
+                width, self.min_stroke_width, self.max_stroke_width
+            )
+        stroke_width = max(self.abs_min_stroke_width, stroke_width)
+        self._stroke_width_cache[width] = stroke_width
+        return stroke_width
+
+    def set_opacity(self, color: Color) -> None:
+        opacity = round(alpha_to_opacity(color[7:9]), 3)
+        if opacity == self._opacity:
+            return
+        self._opacity = opacity
+        name = self._graphic_states.get(opacity)
+        if name is None:
+            name = f"GS{len(self._graphic_states) + 1}"
+            self._graphic_states[opacity] = name
+        self.emit(f"/{name} gs\n")
+
+    def set_stroke_properties(self, properties: BackendProperties) -> None:
+        color = self.resolve_color(properties.color)
+        if color != self._stroke_color:
+            self._stroke_color = color
+            self.emit(f"{color} RG\n")
+        width = self.resolve_stroke_width(properties.lineweight)
+        if width != self._stroke_width:
+            self._stroke_width = width
+            self.emit(f"{width:.3f} w\n")
+        self.set_opacity(properties.color)
+
+    def set_fill_properties(self, properties: BackendProperties) -> None:
+        color = self.resolve_color(properties.color)
+        if color != self._fill_color:
+            self._fill_color = color
+            self.emit(f"{color} rg\n")
+        self.set_opacity(properties.color)
+
+    def set_background(self, color: Color) -> None:
+        if alpha_to_opacity(color[7:9]) == 0.0:
+            return
+        self.set_fill_properties(BackendProperties(color=color))
+        self.emit(
+            f"0 0 {self.page_width_in_pt:.2f} {self.page_height_in_pt:.2f} re f\n"
+        )
+
+    def draw_point(self, pos: Vec2, properties: BackendProperties) -> None:
+        # a line of zero length is rendered as dot by the round line cap
+        self.draw_line(pos, pos, properties)
+
+    def draw_line(self, start: Vec2, end: Vec2, properties: BackendProperties) -> None:
+        self.set_stroke_properties(properties)
+        self.emit(f"{start.x:.2f} {start.y:.2f} m {end.x:.2f} {end.y:.2f} l S\n")
+
+    def draw_solid_lines(
+        self, lines: Iterable[tuple[Vec2, Vec2]], properties: BackendProperties
+    ) -> None:
+        self.draw_solid_lines_array(
+            BkPoints2d([v for line in lines for v in line]), properties
+        )
+
+    def draw_solid_lines_array(
+        self, lines: BkPoints2d, properties: BackendProperties
+    ) -> None:
+        if len(lines) == 0:
+            return
+        self.set_stroke_properties(properties)
+        coordinates = lines.np_vertices().reshape(-1, 4)
+        self.emit(
+            "".join(
+                f"{x0:.2f} {y0:.2f} m {x1:.2f} {y1:.2f} l\n"
+                for x0, y0, x1, y1 in coordinates.tolist()
+            )
+        )
+        self.emit("S\n")
+
+    def draw_path(self, path: BkPath2d, properties: BackendProperties) -> None:
+        if len(path) == 0:
+            return
+        self.set_stroke_properties(properties)
+        self.emit(make_path_str(path, close=False))
+        self.emit("S\n")
+
+    def draw_filled_paths(
+        self, paths: Iterable[BkPath2d], properties: BackendProperties
+    ) -> None:
+        content = [make_path_str(path, close=True) for path in paths if len(path)]
+        if not content:
+            return
+        self.set_fill_properties(properties)
+        self.emit("".join(content))
+        self.emit("f*\n")
+
+    def draw_filled_polygon(
+        self, points: BkPoints2d, properties: BackendProperties
+    ) -> None:
+        vertices = points.np_vertices()
+        if len(vertices) < 3:
+            return
+        self.set_fill_properties(properties)
+        self.emit(make_polygon_str(vertices))
+        self.emit("f*\n")
+
+    def configure(self, config: Configuration) -> None:
+        self.lineweight_policy = config.lineweight_policy
+        if config.min_lineweight:
+            # config.min_lineweight in 1/300 inch!
+            min_lineweight_mm = config.min_lineweight * 25.4 / 300
+            self.min_lineweight = max(0.05, min_lineweight_mm)
+        self.lineweight_scaling = config.lineweight_scaling
+
+    def clear(self) -> None:
+        pass
+
+    def enter_entity(self, entity, properties) -> None:
+        pass
+
+    def exit_entity(self, entity) -> None:
+        pass
+
+
+def make_polygon_str(vertices: np.ndarray) -> str:
+    x, y = vertices[0]
+    content = [f"{x:.2f} {y:.2f} m\n"]
+    content.extend(f"{x:.2f} {y:.2f} l\n" for x, y in vertices[1:].tolist())
+    content.append("h\n")
+    return "".join(content)
+
+
+@no_type_check
+def make_path_str(path: BkPath2d, close: bool) -> str:
+    start = path.start
+    content = [f"{start.x:.2f} {start.y:.2f} m\n"]
+    for cmd in path.commands():
+        end = cmd.end
+        if cmd.type == Command.MOVE_TO:
+            if close:
+                content.append("h\n")
+            content.append(f"{end.x:.2f} {end.y:.2f} m\n")
+        elif cmd.type == Command.LINE_TO:
+            content.append(f"{end.x:.2f} {end.y:.2f} l\n")
+        elif cmd.type == Command.CURVE3_TO:
+            # PDF supports only cubic Bézier curves
+            ctrl1 = start.lerp(cmd.ctrl, 2.0 / 3.0)
+            ctrl2 = end.lerp(cmd.ctrl, 2.0 / 3.0)
+            content.append(
+                f"{ctrl1.x:.2f} {ctrl1.y:.2f} {ctrl2.x:.2f} {ctrl2.y:.2f} "
+                f"{end.x:.2f} {end.y:.2f} c\n"
+            )
+        elif cmd.type == Command.CURVE4_TO:
+            ctrl1 = cmd.ctrl1
+            ctrl2 = cmd.ctrl2
+            content.append(
+                f"{ctrl1.x:.2f} {ctrl1.y:.2f} {ctrl2.x:.2f} {ctrl2.y:.2f} "
+                f"{end.x:.2f} {end.y:.2f} c\n"
+            )
+        start = end
+    if close:
+        content.append("h\n")
+    return "".join(content)
+
+
+def map_lineweight_to_stroke_width(
+    lineweight: float,
+    min_stroke_width: float,
+    max_stroke_width: float,
+    min_lineweight=0.05,  # defined by DXF
+    max_lineweight=2.11,  # defined by DXF
+) -> float:
+    """Map the DXF lineweight in mm to stroke-width in points."""
+    lineweight = max(min(lineweight, max_lineweight), min_lineweight) - min_lineweight
+    factor = (max_stroke_width - min_stroke_width) / (max_lineweight - min_lineweight)
+    return min_stroke_width + round(lineweight * factor, 1)
+
+
+def alpha_to_opacity(alpha: str) -> float:
+    # stroke-opacity: 0.0 = transparent; 1.0 = opaque
+    # alpha: "00" = transparent; "ff" = opaque
+    if len(alpha):
+        try:
+            return int(alpha, 16) / 255
+        except ValueError:
+            pass
+    return 1.0
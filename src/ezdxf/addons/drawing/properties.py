@@ -47,6 +47,7 @@ if TYPE_CHECKING:
     from ezdxf.document import Drawing
     from ezdxf.sections.table import Table
     from ezdxf.layouts import Layout
+    from ezdxf.addons.drawing.designer import ModelspaceIndex
 
 __all__ = [
     "Properties",
@@ -337,6 +338,10 @@ class RenderContext:
         self.pdsize: float = 0
         self.pdmode: int = 0
         self._hatch_pattern_cache: dict[str, HatchPatternType] = dict()
+        # Spatial index of the modelspace entities shared by all viewports
+        # drawn by a single frontend call, created by the first rendered
+        # viewport of each call.
+        self.modelspace_index: Optional[ModelspaceIndex] = None
         self.current_layout_properties = LayoutProperties.modelspace()
         self.plot_styles = self._load_plot_style_table(self.override_ctb)
         # Order for resolving SHX fonts: 1. "t"=TrueType; 2. "s"=SHX; 3. "l"=LFF
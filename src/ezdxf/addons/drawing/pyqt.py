@@ -61,6 +61,8 @@ class _PyQtBackend(Backend):
         self._color_cache: dict[Color, qg.QColor] = {}
         self._no_line = qg.QPen(qc.Qt.NoPen)
         self._no_fill = qg.QBrush(qc.Qt.NoBrush)
+        # graphic items of the current scene stored by top level entity handle:
+        self._entity_items: dict[str, list[qw.QGraphicsItem]] = {}
 
     def configure(self, config: Configuration) -> None:
         if config.min_lineweight is None:
@@ -69,10 +71,27 @@ class _PyQtBackend(Backend):
 
     def set_scene(self, scene: qw.QGraphicsScene) -> None:
         self._scene = scene
+        self._entity_items = {}
 
     def _add_item(self, item: qw.QGraphicsItem, entity_handle: str) -> None:
         self.set_item_data(item, entity_handle)
         self._scene.addItem(item)
+        try:
+            self._entity_items[entity_handle].append(item)
+        except KeyError:
+            self._entity_items[entity_handle] = [item]
+
+    def entity_items(self, entity_handle: str) -> list[qw.QGraphicsItem]:
+        """Returns the graphic items of the top level entity `entity_handle`."""
+        return list(self._entity_items.get(entity_handle, []))
+
+    def remove_entity_items(self, entity_handle: str) -> None:
+        """Removes all graphic items of the top level entity `entity_handle` from
+        the scene.
+        """
+        items = self._entity_items.pop(entity_handle, [])
+        for item in items:
+            self._scene.removeItem(item)
 
     @abc.abstractmethod
     def set_item_data(self, item: qw.QGraphicsItem, entity_handle: str) -> None:
@@ -173,6 +192,7 @@ class _PyQtBackend(Backend):
 
     def clear(self) -> None:
         self._scene.clear()
+        self._entity_items = {}
 
     def finalize(self) -> None:
         super().finalize()
@@ -31,7 +31,7 @@ from ezdxf.addons.drawing.pyqt import (
 )
 from ezdxf.audit import Auditor
 from ezdxf.document import Drawing
-from ezdxf.entities import DXFGraphic, DXFEntity
+from ezdxf.entities import DXFGraphic, DXFEntity, BlockRecord
 from ezdxf.layouts import Layout
 from ezdxf.lldxf.const import DXFStructureError
 
@@ -304,6 +304,89 @@ class CADWidget(qw.QWidget):
         if reset_view:
             self._view.fit_to_scene()
 
+    def update_entities(self, handles: Iterable[str]) -> None:
+        """Re-renders the entities given by their `handles` in the current scene
+        without rebuilding the whole scene.
+
+        Modified entities of the current layout are re-rendered and deleted
+        entities are removed from the scene. Modified entities of block
+        definitions re-render all block references of the current layout which
+        show these blocks, including nested block references.
+        The whole layout is redrawn if the changes cannot be mapped to the graphic
+        items of the current scene, e.g. deleted block entities or modelspace
+        changes while showing a paperspace layout.
+
+        Re-rendered entities are placed on top of the existing graphic items.
+        Changes of resources like layers, linetypes or text styles require a
+        redraw of the whole layout by :meth:`draw_layout`.
+
+        """
+        if self._doc is None or self._current_layout is None:
+            return
+        layout = self._doc.layout(self._current_layout)
+        redraw = self._affected_entities(layout, handles)
+        if redraw is None:
+            self.draw_layout(self._current_layout, reset_view=False)
+            return
+        if not redraw:
+            return
+        entities = [entity for entity in layout if entity.dxf.handle in redraw]
+        self._bbox_cache.invalidate(entities)
+        for handle in redraw:
+            self._backend.remove_entity_items(handle)
+        self._update_render_context(layout)
+        frontend = self._create_frontend()
+        frontend.set_background(
+            self._render_context.current_layout_properties.background_color
+        )
+        try:
+            frontend.draw_entities(entities)
+        finally:
+            self._backend.finalize()
+        self._view.buffer_scene_rect()
+
+    def _affected_entities(
+        self, layout: Layout, handles: Iterable[str]
+    ) -> Optional[set[str]]:
+        # Returns the handles of the entities of the current layout which have
+        # to be re-rendered or None if the whole layout has to be redrawn.
+        entitydb = self._doc.entitydb
+        layout_key = layout.layout_key
+        redraw: set[str] = set()
+        modified_blocks: set[str] = set()
+        for handle in handles:
+            entity = entitydb.get(handle)
+            if entity is None or not entity.is_alive:
+                if not self._backend.entity_items(handle):
+                    # owner of the deleted entity is unknown
+                    return None
+                redraw.add(handle)
+                continue
+            owner = entitydb.get(entity.dxf.owner)
+            if isinstance(owner, DXFGraphic):  # ATTRIB, VERTEX, SEQEND
+                entity = owner
+                owner = entitydb.get(entity.dxf.owner)
+            if entity.dxf.owner == layout_key:
+                redraw.add(entity.dxf.handle)
+            elif isinstance(owner, BlockRecord):
+                if owner.is_block_layout:
+                    modified_blocks.add(owner.dxf.name)
+                elif owner.is_modelspace and not layout.is_modelspace:
+                    # modelspace content is shown by paperspace viewports
+                    return None
+        if not modified_blocks:
+            return redraw
+        if not layout.is_modelspace:
+            # block references in the modelspace may be shown by viewports
+            return None
+        _add_nesting_blocks(self._doc, modified_blocks)
+        redraw.update(
+            insert.dxf.handle
+            for insert in layout.query("INSERT")
+            if insert.dxf.name in modified_blocks
+        )
+        return redraw
+
     def _create_frontend(self) -> Frontend:
         return Frontend(
             ctx=self._render_context,
@@ -317,6 +400,22 @@ class CADWidget(qw.QWidget):
         self._render_context.set_current_layout(layout)
 
 
+def _add_nesting_blocks(doc: Drawing, block_names: set[str]) -> None:
+    # Adds the names of all block definitions which contain block references of
+    # the given blocks, nested at any depth.
+    blocks = [block for block in doc.blocks if block.is_block_layout]
+    count = -1
+    while count != len(block_names):
+        count = len(block_names)
+        for block in blocks:
+            if block.name in block_names:
+                continue
+            if any(
+                insert.dxf.name in block_names for insert in block.query("INSERT")
+            ):
+                block_names.add(block.name)
+
+
 class CADViewer(qw.QMainWindow):
     def __init__(self, cad: Optional[CADWidget] = None):
         super().__init__()
@@ -514,6 +613,12 @@ class CADViewer(qw.QMainWindow):
                 f'Abort rendering of layout "{layout_name}": {str(e)}',
             )
 
+    def update_entities(self, handles: Iterable[str]) -> None:
+        """Re-renders the changed entities given by their `handles`, see
+        :meth:`CADWidget.update_entities`.
+        """
+        self._cad.update_entities(handles)
+
     def resizeEvent(self, event: qg.QResizeEvent) -> None:
         self._view.fit_to_scene()
 
@@ -0,0 +1,584 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+from __future__ import annotations
+from typing import Iterable, Optional, Sequence, Tuple
+from typing_extensions import TypeAlias
+import copy
+import struct
+import zlib
+
+import numpy as np
+
+from ezdxf.math import Vec2, BoundingBox2d
+from ezdxf.colors import RGB
+from ezdxf import npshapes
+
+from .type_hints import Color
+from .backend import BackendInterface, BkPath2d, BkPoints2d
+from .config import Configuration, LineweightPolicy
+from .properties import BackendProperties
+from . import layout, recorder
+
+__all__ = ["RasterBackend", "RasterRenderBackend", "fill_polygons"]
+
+MM_PER_INCH = 25.4
+SUPPORTED_IMAGE_FORMATS = ("png", "ppm")
+
+# count of sub-scanlines per pixel row for the vertical anti-aliasing, the
+# horizontal coverage of the pixels is calculated exactly:
+SUBSAMPLES = 4
+
+# max. flattening distance of curves in pixels:
+MAX_FLATTENING_DISTANCE = 0.25
+
+# coverage mask: left, top, ndarray(rows, columns) of floats in range [0, 1]
+Coverage: TypeAlias = Tuple[int, int, np.ndarray]
+
+
+class RasterBackend(recorder.Recorder):
+    """This backend renders the DXF content into a NumPy pixel array and creates
+    PNG and PPM output. The backend has no dependencies beyond NumPy, the optional
+    `Pillow`_ package is only required by the :meth:`get_image` method.
+
+    The shapes are filled by an anti-aliased scanline algorithm, lines are drawn as
+    filled polygons with the resolved lineweight as width.
+
+    .. _Pillow: https://pypi.org/project/Pillow/
+
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._init_flip_y = True
+
+    def _get_replay(
+        self,
+        page: layout.Page,
+        *,
+        settings: layout.Settings = layout.Settings(),
+        dpi: float = 96,
+        render_box: BoundingBox2d | None = None,
+    ) -> RasterRenderBackend:
+        top_origin = True
+        # This player changes the original recordings!
+        player = self.player()
+        if render_box is None:
+            render_box = player.bbox()
+
+        # the page origin (0, 0) is in the top-left corner.
+        output_layout = layout.Layout(render_box, flip_y=self._init_flip_y)
+        page = output_layout.get_final_page(page, settings)
+        width, height = get_image_size(page, dpi)
+
+        # DXF coordinates are mapped to pixels
+        settings = copy.copy(settings)
+        settings.output_coordinate_space = max(width, height)
+
+        m = output_layout.get_placement_matrix(
+            page, settings=settings, top_origin=top_origin
+        )
+        # transform content to the output coordinates space:
+        player.transform(m)
+        if settings.crop_at_margins:
+            p1, p2 = page.get_margin_rect(top_origin=top_origin)  # in mm
+            # scale factor to map page coordinates to output space coordinates:
+            output_scale = settings.page_output_scale_factor(page)
+            # crop content inplace by the margin rect:
+            player.crop_rect(
+                p1 * output_scale, p2 * output_scale, MAX_FLATTENING_DISTANCE
+            )
+
+        self._init_flip_y = False
+        backend = self.make_backend(page, settings, width, height)
+        player.replay(backend)
+        return backend
+
+    def get_array(
+        self,
+        page: layout.Page,
+        *,
+        settings: layout.Settings = layout.Settings(),
+        dpi: float = 96,
+        render_box: BoundingBox2d | None = None,
+    ) -> np.ndarray:
+        """Returns the rendered image as ndarray of shape (height, width, 4) and
+        data type uint8, the color channels are RGBA.
+
+        Args:
+            page: page definition, see :class:`~ezdxf.addons.drawing.layout.Page`
+            settings: layout settings, see :class:`~ezdxf.addons.drawing.layout.Settings`
+            dpi: output resolution in dots per inch
+            render_box: set explicit region to render, default is content bounding box
+        """
+        backend = self._get_replay(
+            page, settings=settings, dpi=dpi, render_box=render_box
+        )
+        return backend.get_array()
+
+    def get_pixmap_bytes(
+        self,
+        page: layout.Page,
+        *,
+        fmt="png",
+        settings: layout.Settings = layout.Settings(),
+        dpi: float = 96,
+        alpha=False,
+        render_box: BoundingBox2d | None = None,
+    ) -> bytes:
+        """Returns a pixel image as bytes, supported image formats:
+
+        === =========================
+        png Portable Network Graphics
+        ppm Portable Pixmap (no alpha channel)
+        === =========================
+
+        Args:
+            page: page definition, see :class:`~ezdxf.addons.drawing.layout.Page`
+            fmt: image format
+            settings: layout settings, see :class:`~ezdxf.addons.drawing.layout.Settings`
+            dpi: output resolution in dots per inch
+            alpha: add alpha channel (transparency), otherwise the image is
+                placed on a white background
+            render_box: set explicit region to render, default is content bounding box
+        """
+        if fmt not in SUPPORTED_IMAGE_FORMATS:
+            raise ValueError(f"unsupported image format: '{fmt}'")
+        pixels = self.get_array(
+            page, settings=settings, dpi=dpi, render_box=render_box
+        )
+        if fmt == "ppm":
+            return ppm_bytes(remove_alpha_channel(pixels))
+        if not alpha:
+            pixels = remove_alpha_channel(pixels)
+        return png_bytes(pixels)
+
+    def get_image(
+        self,
+        page: layout.Page,
+        *,
+        settings: layout.Settings = layout.Settings(),
+        dpi: float = 96,
+        render_box: BoundingBox2d | None = None,
+    ):
+        """Returns the rendered image as :class:`PIL.Image.Image` in RGBA mode.
+
+        .. important::
+
+            Python module Pillow is required: https://pypi.org/project/Pillow/
+
+        """
+        from PIL import Image
+
+        pixels = self.get_array(
+            page, settings=settings, dpi=dpi, render_box=render_box
+        )
+        return Image.fromarray(pixels, mode="RGBA")
+
+    @staticmethod
+    def make_backend(
+        page: layout.Page, settings: layout.Settings, width: int, height: int
+    ) -> RasterRenderBackend:
+        """Override this method to use a customized render backend."""
+        return RasterRenderBackend(page, settings, width, height)
+
+
+def get_image_size(page: layout.Page, dpi: float) -> tuple[int, int]:
+    """Returns the image size in pixels as tuple (width, height)."""
+    scale = dpi / MM_PER_INCH
+    return (
+        max(int(round(page.width_in_mm * scale)), 1),
+        max(int(round(page.height_in_mm * scale)), 1),
+    )
+
+
+class RasterRenderBackend(BackendInterface):
+    """Renders the DXF content into a NumPy framebuffer.
+
+    This backend requires some preliminary work, record the frontend output via the
+    Recorder backend to accomplish the following requirements:
+
+    - Move content in the first quadrant of the coordinate system.
+    - The page is defined by the upper left corner in the origin (0, 0) and
+      the lower right corner at (image-width, image-height)
+    - The output coordinates are floats in pixels, scale the content appropriately
+    - Replay the recorded output on this backend.
+
+    The framebuffer stores premultiplied RGBA values as floats.
+
+    """
+
+    def __init__(
+        self, page: layout.Page, settings: layout.Settings, width: int, height: int
+    ) -> None:
+        self.settings = settings
+        self.width = int(width)
+        self.height = int(height)
+        self.pixels = np.zeros((self.height, self.width, 4), dtype=np.float32)
+        self._stroke_width_cache: dict[float, float] = dict()
+        self._color_cache: dict[str, np.ndarray] = dict()
+        self.pixels_per_mm = settings.page_output_scale_factor(page)
+        # LineweightPolicy.ABSOLUTE:
+        self.min_lineweight = 0.05  # in mm, set by configure()
+        self.lineweight_scaling = 1.0  # set by configure()
+        self.lineweight_policy = LineweightPolicy.ABSOLUTE  # set by configure()
+
+        # thinner lines are drawn with a width of 1 pixel
+        self.abs_min_stroke_width = 1.0
+
+        # LineweightPolicy.RELATIVE:
+        # max_stroke_width is determined as a certain percentage of settings.output_coordinate_space
+        self.max_stroke_width: float = max(
+            self.abs_min_stroke_width,
+            settings.output_coordinate_space * settings.max_stroke_width,
+        )
+        # min_stroke_width is determined as a certain percentage of max_stroke_width
+        self.min_stroke_width: float = max(
+            self.abs_min_stroke_width,
+            self.max_stroke_width * settings.min_stroke_width,
+        )
+        # LineweightPolicy.RELATIVE_FIXED:
+        # all strokes have a fixed stroke-width as a certain percentage of max_stroke_width
+        self.fixed_stroke_width: float = max(
+            self.abs_min_stroke_width,
+            self.max_stroke_width * settings.fixed_stroke_width,
+        )
+
+    def get_array(self) -> np.ndarray:
+        """Returns the framebuffer as ndarray of shape (height, width, 4) and data
+        type uint8, the color channels are RGBA without premultiplied alpha.
+        """
+        pixels = self.pixels
+        alpha = pixels[:, :, 3:4]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rgb = np.where(alpha > 0.0, pixels[:, :, :3] / alpha, 0.0)
+        image = np.empty(pixels.shape, dtype=np.uint8)
+        image[:, :, :3] = np.clip(rgb * 255.0 + 0.5, 0, 255)
+        image[:, :, 3] = np.clip(pixels[:, :, 3] * 255.0 + 0.5, 0, 255)
+        return image
+
+    def resolve_color(self, color: Color) -> np.ndarray:
+        """Returns the premultiplied RGBA color as ndarray of floats."""
+        try:
+            return self._color_cache[color]
+        except KeyError:
+            pass
+        opacity = alpha_to_opacity(color[7:9])
+        r, g, b = RGB.from_hex(color).to_floats()
+        rgba = np.array((r, g, b, 1.0), dtype=np.float32) * opacity
+        self._color_cache[color] = rgba
+        return rgba
+
+    def resolve_stroke_width(self, width: float) -> float:
+        try:
+            return self._stroke_width_cache[width]
+        except KeyError:
+            pass
+        stroke_width = self.fixed_stroke_width
+        if self.lineweight_policy == LineweightPolicy.ABSOLUTE:
+            stroke_width = (  # in pixels
+                max(self.min_lineweight, width)
+                * self.pixels_per_mm
+                * self.lineweight_scaling
+            )
+        elif self.lineweight_policy == LineweightPolicy.RELATIVE:
+            stroke_width = map_lineweight_to_stroke_width(
+                width, self.min_stroke_width, self.max_stroke_width
+            )
+        stroke_width = max(self.abs_min_stroke_width, stroke_width)
+        self._stroke_width_cache[width] = stroke_width
+        return stroke_width
+
+    def set_background(self, color: Color) -> None:
+        self.pixels[:, :] = self.resolve_color(color)
+
+    def blend(self, coverage: Optional[Coverage], color: Color) -> None:
+        """Blends the `color` into the framebuffer, weighted by the `coverage`."""
+        if coverage is None:
+            return
+        left, top, mask = coverage
+        rows, columns = mask.shape
+        rgba = self.resolve_color(color)
+        region = self.pixels[top : top + rows, left : left + columns]
+        region *= (1.0 - mask * rgba[3])[:, :, np.newaxis]
+        region += mask[:, :, np.newaxis] * rgba
+
+    def draw_lines(
+        self, starts: np.ndarray, ends: np.ndarray, properties: BackendProperties
+    ) -> None:
+        """Draws multiple lines at once, `starts` and `ends` are ndarrays of shape
+        (n, 2).
+        """
+        if len(starts) == 0:
+            return
+        width = self.resolve_stroke_width(properties.lineweight)
+        coverage = fill_polygons(
+            stroke_quads(starts, ends, width), self.width, self.height, nonzero=True
+        )
+        self.blend(coverage, properties.color)
+
+    def draw_point(self, pos: Vec2, properties: BackendProperties) -> None:
+        point = np.array([(pos.x, pos.y)], dtype=np.float64)
+        self.draw_lines(point, point, properties)
+
+    def draw_line(self, start: Vec2, end: Vec2, properties: BackendProperties) -> None:
+        self.draw_lines(
+            np.array([(start.x, start.y)], dtype=np.float64),
+            np.array([(end.x, end.y)], dtype=np.float64),
+            properties,
+        )
+
+    def draw_solid_lines(
+        self, lines: Iterable[tuple[Vec2, Vec2]], properties: BackendProperties
+    ) -> None:
+        vertices = np.array(
+            [(v.x, v.y) for line in lines for v in line], dtype=np.float64
+        )
+        if len(vertices):
+            self.draw_lines(vertices[0::2], vertices[1::2], properties)
+
+    def draw_solid_lines_array(
+        self, lines: BkPoints2d, properties: BackendProperties
+    ) -> None:
+        vertices = lines.np_vertices()
+        if len(vertices):
+            self.draw_lines(vertices[0::2], vertices[1::2], properties)
+
+    def draw_path(self, path: BkPath2d, properties: BackendProperties) -> None:
+        polylines = flatten_paths((path,))
+        if not polylines:
+            return
+        starts = np.concatenate([p[:-1] for p in polylines])
+        ends = np.concatenate([p[1:] for p in polylines])
+        self.draw_lines(starts, ends, properties)
+
+    def draw_filled_paths(
+        self, paths: Iterable[BkPath2d], properties: BackendProperties
+    ) -> None:
+        rings = flatten_paths(paths)
+        if rings:
+            self.blend(
+                fill_polygons(rings, self.width, self.height), properties.color
+            )
+
+    def draw_filled_polygon(
+        self, points: BkPoints2d, properties: BackendProperties
+    ) -> None:
+        vertices = points.np_vertices()
+        if len(vertices) < 3:
+            return
+        self.blend(
+            fill_polygons((vertices,), self.width, self.height), properties.color
+        )
+
+    def configure(self, config: Configuration) -> None:
+        self.lineweight_policy = config.lineweight_policy
+        if config.min_lineweight:
+            # config.min_lineweight in 1/300 inch!
+            min_lineweight_mm = config.min_lineweight * 25.4 / 300
+            self.min_lineweight = max(0.05, min_lineweight_mm)
+        self.lineweight_scaling = config.lineweight_scaling
+
+    def clear(self) -> None:
+        self.pixels[:, :] = 0.0
+
+    def finalize(self) -> None:
+        pass
+
+    def enter_entity(self, entity, properties) -> None:
+        pass
+
+    def exit_entity(self, entity) -> None:
+        pass
+
+
+def flatten_paths(paths: Iterable[BkPath2d]) -> list[np.ndarray]:
+    """Returns the flattened sub-paths of all `paths` as ndarrays."""
+    vertices, offsets = npshapes.flatten_paths(
+        npshapes.single_paths(paths), MAX_FLATTENING_DISTANCE, segments=4
+    )
+    return [
+        vertices[start:end]
+        for start, end in zip(offsets[:-1], offsets[1:])
+        if end - start > 1
+    ]
+
+
+def stroke_quads(starts: np.ndarray, ends: np.ndarray, width: float) -> np.ndarray:
+    """Returns the outlines of the lines from `starts` to `ends` with the given
+    `width` as ndarray of shape (n, 4, 2). The lines are extended by half the width
+    at both ends, zero-length lines become squares. All quads have the same
+    orientation.
+    """
+    half_width = width * 0.5
+    directions = ends - starts
+    lengths = np.linalg.norm(directions, axis=1)
+    is_point = lengths < 1e-12
+    directions[is_point] = (1.0, 0.0)
+    lengths[is_point] = 1.0
+    directions *= (half_width / lengths)[:, np.newaxis]
+    normals = np.column_stack((-directions[:, 1], directions[:, 0]))
+    s = starts - directions
+    e = ends + directions
+    return np.stack((s + normals, e + normals, e - normals, s - normals), axis=1)
+
+
+def fill_polygons(
+    polygons: Sequence[np.ndarray] | np.ndarray,
+    width: int,
+    height: int,
+    *,
+    nonzero: bool = False,
+    samples: int = SUBSAMPLES,
+) -> Optional[Coverage]:
+    """Returns the anti-aliased coverage of the filled `polygons` clipped to the
+    image size `width` x `height` as tuple (left, top, mask) or ``None`` if nothing
+    is covered. The polygons are implicit closed ndarrays of shape (n, 2) in pixel
+    coordinates. The fill rule is even-odd or nonzero winding if `nonzero` is
+    ``True``.
+
+    The coverage is sampled by `samples` scanlines per pixel row and the horizontal
+    coverage is calculated exactly for each scanline.
+    """
+    if isinstance(polygons, np.ndarray):  # shape (n, m, 2)
+        starts = polygons.reshape(-1, 2)
+        ends = np.roll(polygons, -1, axis=1).reshape(-1, 2)
+    else:
+        starts = np.concatenate(polygons)
+        ends = np.concatenate([np.roll(p, -1, axis=0) for p in polygons])
+    # horizontal edges do not cross scanlines:
+    not_horizontal = starts[:, 1] != ends[:, 1]
+    x0, y0 = starts[not_horizontal].T
+    x1, y1 = ends[not_horizontal].T
+    if len(x0) == 0:
+        return None
+
+    # scanline k is located at y = (k + 0.5) / samples, the scanlines of an edge
+    # are in range ymin <= y < ymax:
+    k0 = np.ceil(np.minimum(y0, y1) * samples - 0.5)
+    k1 = np.ceil(np.maximum(y0, y1) * samples - 0.5)
+    k0 = np.clip(k0, 0, height * samples).astype(np.int64)
+    k1 = np.clip(k1, 0, height * samples).astype(np.int64)
+    counts = np.maximum(k1 - k0, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return None
+    edge = np.repeat(np.arange(len(counts)), counts)
+    k = k0[edge] + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    ys = (k + 0.5) / samples
+    xs = x0[edge] + (ys - y0[edge]) * (x1[edge] - x0[edge]) / (y1[edge] - y0[edge])
+    order = np.lexsort((xs, k))
+    xs = xs[order]
+    k = k[order]
+
+    # spans between sequential crossings of the same scanline:
+    if nonzero:
+        winding = np.cumsum(np.where(y1 > y0, 1, -1)[edge[order]])
+        inside = winding[:-1] != 0
+    else:
+        inside = np.arange(total - 1) % 2 == 0
+    inside &= k[:-1] == k[1:]
+    x_start = np.clip(xs[:-1][inside], 0, width)
+    x_end = np.clip(xs[1:][inside], 0, width)
+    k = k[:-1][inside]
+    valid = x_end > x_start
+    x_start = x_start[valid]
+    x_end = x_end[valid]
+    k = k[valid]
+    if len(k) == 0:
+        return None
+
+    top = int(k.min()) // samples
+    rows = int(k.max()) // samples - top + 1
+    left = int(np.floor(x_start.min()))
+    columns = min(int(np.ceil(x_end.max())), width) - left
+    row = k // samples - top
+    x_start -= left
+    x_end -= left
+    i0 = np.floor(x_start).astype(np.int64)
+    i1 = np.floor(x_end).astype(np.int64)
+
+    # one extra column for spans ending at the right border:
+    stride = columns + 1
+    coverage = np.zeros(rows * stride, dtype=np.float64)
+    full = np.zeros(rows * stride, dtype=np.float64)
+    base = row * stride
+    single = i0 == i1
+    np.add.at(coverage, (base + i0)[single], (x_end - x_start)[single])
+    multi = ~single
+    base = base[multi]
+    i0 = i0[multi]
+    i1 = i1[multi]
+    np.add.at(coverage, base + i0, (i0 + 1 - x_start[multi]))
+    np.add.at(coverage, base + i1, x_end[multi] - i1)
+    # fully covered pixels i0+1 ... i1-1 as difference array:
+    np.add.at(full, base + i0 + 1, 1.0)
+    np.add.at(full, base + i1, -1.0)
+    mask = coverage.reshape(rows, stride) + np.cumsum(
+        full.reshape(rows, stride), axis=1
+    )
+    mask = np.clip(mask[:, :columns] / samples, 0.0, 1.0).astype(np.float32)
+    return left, top, mask
+
+
+def map_lineweight_to_stroke_width(
+    lineweight: float,
+    min_stroke_width: float,
+    max_stroke_width: float,
+    min_lineweight=0.05,  # defined by DXF
+    max_lineweight=2.11,  # defined by DXF
+) -> float:
+    """Map the DXF lineweight in mm to stroke-width in pixels."""
+    lineweight = max(min(lineweight, max_lineweight), min_lineweight) - min_lineweight
+    factor = (max_stroke_width - min_stroke_width) / (max_lineweight - min_lineweight)
+    return min_stroke_width + round(lineweight * factor, 1)
+
+
+def alpha_to_opacity(alpha: str) -> float:
+    # opacity: 0.0 = transparent; 1.0 = opaque
+    # alpha: "00" = transparent; "ff" = opaque
+    if len(alpha):
+        try:
+            return int(alpha, 16) / 255
+        except ValueError:
+            pass
+    return 1.0
+
+
+def remove_alpha_channel(pixels: np.ndarray) -> np.ndarray:
+    """Returns the RGB image of the RGBA `pixels` placed on a white background."""
+    alpha = pixels[:, :, 3:4].astype(np.float32) / 255.0
+    rgb = pixels[:, :, :3] * alpha + 255.0 * (1.0 - alpha)
+    return np.clip(rgb + 0.5, 0, 255).astype(np.uint8)
+
+
+def png_bytes(pixels: np.ndarray) -> bytes:
+    """Returns the RGB or RGBA `pixels` of data type uint8 as PNG image."""
+    height, width, channels = pixels.shape
+    color_type = 6 if channels == 4 else 2
+    # each row starts with the filter type 0:
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * channels)
+
+    def chunk(name: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + name
+            + data
+            + struct.pack(">I", zlib.crc32(name + data) & 0xFFFFFFFF)
+        )
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", header),
+            chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)),
+            chunk(b"IEND", b""),
+        )
+    )
+
+
+def ppm_bytes(pixels: np.ndarray) -> bytes:
+    """Returns the RGB `pixels` of data type uint8 as binary PPM image."""
+    height, width, _ = pixels.shape
+    return b"P6 %d %d 255\n" % (width, height) + pixels.tobytes()
@@ -9,15 +9,27 @@ from typing import (
     Callable,
     Optional,
     NamedTuple,
+    Union,
+    BinaryIO,
 )
 from typing_extensions import Self, TypeAlias
 import copy
 import enum
 import dataclasses
+import json
+import typing
+from pathlib import Path
+
+import numpy as np
 
 from ezdxf.math import BoundingBox2d, Matrix44, Vec2, UVec
-from ezdxf.npshapes import NumpyPath2d, NumpyPoints2d, EmptyShapeError
-from ezdxf.tools import take2
+from ezdxf.npshapes import (
+    NumpyPath2d,
+    NumpyPoints2d,
+    EmptyShapeError,
+    CommandNumpyType,
+    VertexNumpyType,
+)
 
 from .backend import BackendInterface
 from .config import Configuration
@@ -120,6 +132,12 @@ class Recorder(BackendInterface):
 
         self.store(RecordType.SOLID_LINES, properties, NumpyPoints2d(flatten()))
 
+    def draw_solid_lines_array(
+        self, lines: NumpyPoints2d, properties: BackendProperties
+    ) -> None:
+        assert isinstance(lines, NumpyPoints2d)
+        self.store(RecordType.SOLID_LINES, properties, lines)
+
     def draw_path(self, path: NumpyPath2d, properties: BackendProperties) -> None:
         assert isinstance(path, NumpyPath2d)
         self.store(RecordType.PATH, properties, path)
@@ -234,23 +252,7 @@ class Player:
                 if not state.is_visible:
                     continue
                 properties = state.properties
-            if record_type == RecordType.POINTS:
-                if len(data) == 0:
-                    continue
-                if len(data) > 2:
-                    backend.draw_filled_polygon(data, properties)
-                    continue
-                vertices = data.vertices()
-                if len(vertices) == 1:
-                    backend.draw_point(vertices[0], properties)
-                else:
-                    backend.draw_line(vertices[0], vertices[1], properties)
-            elif record_type == RecordType.SOLID_LINES:
-                backend.draw_solid_lines(take2(data.vertices()), properties)
-            elif record_type == RecordType.PATH:
-                backend.draw_path(data, properties)
-            elif record_type == RecordType.FILLED_PATHS:
-                backend.draw_filled_paths(data, properties)
+            replay_record(backend, record_type, properties, data)
         backend.finalize()
 
     def transform(self, m: Matrix44) -> None:
@@ -258,11 +260,7 @@ class Player:
         :class:`~ezdxf.math.Matrix44`.
         """
         for record in self.records:
-            if record.type == RecordType.FILLED_PATHS:
-                for p in record.data:
-                    p.transform_inplace(m)
-            else:
-                record.data.transform_inplace(m)
+            transform_record(record, m)
 
         if self._bbox.has_data:
             # works for 90-, 180- and 270-degree rotation
@@ -280,6 +278,28 @@ class Player:
             bbox.extend(record.bbox())
         self._bbox = bbox
 
+    def save(self, file: Union[str, Path, BinaryIO]) -> None:
+        """Save the recordings as compressed NumPy archive (.npz) into a `file`,
+        which can be a filename or a binary stream.
+
+        The vertices and the path commands of all records are stored as
+        contiguous NumPy arrays and the properties as property table, see
+        :meth:`load`.
+        """
+        np.savez_compressed(file, **pack_records(self))
+
+    @classmethod
+    def load(cls, file: Union[str, Path, BinaryIO]) -> Self:
+        """Load recordings saved by the :meth:`save` method from a `file`,
+        which can be a filename or a binary stream.
+
+        Raises:
+            ValueError: invalid or unsupported file format
+
+        """
+        with np.load(file, allow_pickle=False) as data:
+            return unpack_records(cls(), data)
+
     def crop_rect(self, p1: UVec, p2: UVec, distance: float) -> None:
         """Crop recorded shapes inplace by a rectangle defined by two points.
 
@@ -301,6 +321,226 @@ class Player:
         self._bbox = BoundingBox2d()  # determine new bounding box on demand
 
 
+# Version of the file format of Player.save():
+RECORDING_FORMAT_VERSION = 1
+
+
+def pack_records(player: Player) -> dict[str, np.ndarray]:
+    """Returns the recordings of the `player` as dict of NumPy arrays.
+
+    The shapes of all records are stored in the contiguous arrays "vertices"
+    and "commands", the arrays "vertex_counts" and "command_counts" store the
+    counts for each shape and the array "shape_counts" stores the count of
+    shapes for each record, only FILLED_PATHS records have more than one shape.
+    The properties and handles are stored as tables referenced by index.
+    """
+    properties_index: dict[int, int] = dict()
+    handles_index: dict[str, int] = dict()
+    record_types: list[int] = []
+    record_properties: list[int] = []
+    record_handles: list[int] = []
+    shape_counts: list[int] = []
+    vertex_counts: list[int] = []
+    command_counts: list[int] = []
+    vertices: list[np.ndarray] = []
+    commands: list[np.ndarray] = []
+
+    for record in player.records:
+        record_types.append(record.type.value)
+        record_properties.append(
+            properties_index.setdefault(record.property_hash, len(properties_index))
+        )
+        record_handles.append(
+            handles_index.setdefault(record.handle, len(handles_index))
+        )
+        if record.type == RecordType.FILLED_PATHS:
+            shapes = record.data
+        else:
+            shapes = (record.data,)
+        shape_counts.append(len(shapes))
+        for shape in shapes:
+            v = shape.np_vertices()
+            vertices.append(v.reshape(-1, 2))
+            vertex_counts.append(len(v))
+            if isinstance(shape, NumpyPath2d):
+                c = shape._commands
+                commands.append(c)
+                command_counts.append(len(c))
+            else:
+                command_counts.append(0)
+
+    table = [player.properties[h] for h in properties_index.keys()]
+    meta = {
+        "version": RECORDING_FORMAT_VERSION,
+        "background": player.background,
+        "config": _config_to_dict(player.config),
+    }
+    return {
+        "meta": np.array(json.dumps(meta)),
+        "record_types": np.array(record_types, dtype=np.int8),
+        "record_properties": np.array(record_properties, dtype=np.int32),
+        "record_handles": np.array(record_handles, dtype=np.int32),
+        "shape_counts": np.array(shape_counts, dtype=np.int32),
+        "vertex_counts": np.array(vertex_counts, dtype=np.int32),
+        "command_counts": np.array(command_counts, dtype=np.int32),
+        "vertices": (
+            np.concatenate(vertices)
+            if vertices
+            else np.empty((0, 2), dtype=VertexNumpyType)
+        ),
+        "commands": (
+            np.concatenate(commands)
+            if commands
+            else np.empty((0,), dtype=CommandNumpyType)
+        ),
+        "handles": np.array(list(handles_index.keys()), dtype=str),
+        "colors": np.array([p.color for p in table], dtype=str),
+        "lineweights": np.array([p.lineweight for p in table], dtype=np.float64),
+        "layers": np.array([p.layer for p in table], dtype=str),
+        "pens": np.array([p.pen for p in table], dtype=np.int32),
+    }
+
+
+def unpack_records(player: Player, data) -> Player:
+    """Restores the recordings packed by :func:`pack_records` into the given
+    `player`.
+
+    Raises:
+        ValueError: invalid or unsupported data
+
+    """
+    try:
+        meta = json.loads(str(data["meta"]))
+        version = meta["version"]
+    except (KeyError, ValueError, TypeError):
+        raise ValueError("invalid recording format")
+    if version != RECORDING_FORMAT_VERSION:
+        raise ValueError(f"unsupported recording format version: {version}")
+    player.background = meta["background"]
+    player.config = _config_from_dict(meta["config"])
+
+    property_hashes: list[int] = []
+    for color, lineweight, layer, pen in zip(
+        data["colors"].tolist(),
+        data["lineweights"].tolist(),
+        data["layers"].tolist(),
+        data["pens"].tolist(),
+    ):
+        properties = BackendProperties(color, lineweight, layer, pen)
+        property_hash = hash(properties[:4])
+        player.properties[property_hash] = properties
+        property_hashes.append(property_hash)
+
+    handles = data["handles"].tolist()
+    vertices = data["vertices"]
+    commands = data["commands"]
+    vertex_counts = data["vertex_counts"].tolist()
+    command_counts = data["command_counts"].tolist()
+    v_start = 0
+    c_start = 0
+    shape_index = 0
+    records: list[DataRecord] = []
+    for type_value, properties_index, handle_index, count in zip(
+        data["record_types"].tolist(),
+        data["record_properties"].tolist(),
+        data["record_handles"].tolist(),
+        data["shape_counts"].tolist(),
+    ):
+        record_type = RecordType(type_value)
+        shapes: list[Union[NumpyPath2d, NumpyPoints2d]] = []
+        for _ in range(count):
+            v_end = v_start + vertex_counts[shape_index]
+            if record_type in (RecordType.PATH, RecordType.FILLED_PATHS):
+                c_end = c_start + command_counts[shape_index]
+                path = NumpyPath2d(None)
+                path._vertices = vertices[v_start:v_end].copy()
+                path._commands = commands[c_start:c_end].copy()
+                shapes.append(path)
+                c_start = c_end
+            else:
+                points = NumpyPoints2d(tuple())
+                points._vertices = vertices[v_start:v_end].copy()
+                shapes.append(points)
+            v_start = v_end
+            shape_index += 1
+        records.append(
+            DataRecord(
+                type=record_type,
+                property_hash=property_hashes[properties_index],
+                handle=handles[handle_index],
+                data=(
+                    tuple(shapes)
+                    if record_type == RecordType.FILLED_PATHS
+                    else shapes[0]
+                ),
+            )
+        )
+    player.records = records
+    player.has_shared_recordings = False
+    return player
+
+
+def _config_to_dict(config: Configuration) -> dict[str, Any]:
+    result: dict[str, Any] = dict()
+    for field in dataclasses.fields(config):
+        value = getattr(config, field.name)
+        if isinstance(value, enum.Enum):
+            value = value.name
+        result[field.name] = value
+    return result
+
+
+def _config_from_dict(values: dict[str, Any]) -> Configuration:
+    hints = typing.get_type_hints(Configuration)
+    params: dict[str, Any] = dict()
+    for name, value in values.items():
+        hint = hints.get(name)
+        if hint is None:  # ignore unknown options of other versions
+            continue
+        if isinstance(value, str):
+            for enum_type in (hint, *typing.get_args(hint)):
+                if isinstance(enum_type, type) and issubclass(enum_type, enum.Enum):
+                    value = enum_type[value]
+                    break
+        params[name] = value
+    return Configuration(**params)
+
+
+def replay_record(
+    backend: BackendInterface,
+    record_type: RecordType,
+    properties: BackendProperties,
+    data: Any,
+) -> None:
+    """Replay a single data record on the given `backend`."""
+    if record_type == RecordType.POINTS:
+        if len(data) == 0:
+            return
+        if len(data) > 2:
+            backend.draw_filled_polygon(data, properties)
+            return
+        vertices = data.vertices()
+        if len(vertices) == 1:
+            backend.draw_point(vertices[0], properties)
+        else:
+            backend.draw_line(vertices[0], vertices[1], properties)
+    elif record_type == RecordType.SOLID_LINES:
+        backend.draw_solid_lines_array(data, properties)
+    elif record_type == RecordType.PATH:
+        backend.draw_path(data, properties)
+    elif record_type == RecordType.FILLED_PATHS:
+        backend.draw_filled_paths(data, properties)
+
+
+def transform_record(record: DataRecord, m: Matrix44) -> None:
+    """Transforms the data of a single data record inplace."""
+    if record.type == RecordType.FILLED_PATHS:
+        for p in record.data:
+            p.transform_inplace(m)
+    else:
+        record.data.transform_inplace(m)
+
+
 def crop_records_rect(
     records: list[DataRecord], crop_rect: BoundingBox2d, distance: float
 ) -> list[DataRecord]:
@@ -378,11 +618,9 @@ def crop_records_rect(
                 record.data = clipper.clip_polygon(record.data)
             cropped_records.append(record)
         elif record.type == RecordType.SOLID_LINES:
-            points: list[Vec2] = []  # type: ignore
-            for s, e in take2(record.data.vertices()):
-                points.append(clipper.clip_line(s, e))  # type: ignore
-            record.data = NumpyPoints2d(points)
-            cropped_records.append(record)
+            record.data = clipper.clip_lines(record.data)  # type: ignore
+            if len(record.data):
+                cropped_records.append(record)
         else:
             raise ValueError("invalid record type")
     return cropped_records
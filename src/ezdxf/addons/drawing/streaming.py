@@ -0,0 +1,117 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+"""
+Base class for streaming backends of the drawing add-on.
+
+The :class:`~ezdxf.addons.drawing.recorder.Recorder` based backends like the
+:class:`~ezdxf.addons.drawing.svg.SVGBackend` store the whole frontend output
+to determine the content extents before the output is created. The streaming
+backends require the extents of the content in advance, therefore each shape
+can be transformed into the output coordinates, cropped at the page margins
+and written to the output immediately. The memory consumption does not depend
+on the size of the rendered layout.
+
+"""
+from __future__ import annotations
+from typing import Any, Optional
+import abc
+import copy
+
+from ezdxf.math import BoundingBox2d
+
+from .backend import BackendInterface
+from .config import Configuration
+from .properties import BackendProperties
+from .type_hints import Color
+from . import layout, recorder
+
+__all__ = ["StreamingBackend"]
+
+
+class StreamingBackend(recorder.Recorder, abc.ABC):
+    """Abstract base class of streaming backends. The frontend output is
+    transformed into the output coordinates, cropped at the page margins and
+    forwarded immediately to the render backend created by
+    :meth:`make_backend`.
+
+    Args:
+        page: page definition, see :class:`~ezdxf.addons.drawing.layout.Page`
+        render_box: the region to render in DXF coordinates, e.g. the extents
+            of the layout by :func:`ezdxf.bbox.extents`
+        settings: layout settings, see :class:`~ezdxf.addons.drawing.layout.Settings`
+
+    Raises:
+        ValueError: undefined `render_box` or the final page has no area
+
+    """
+
+    def __init__(
+        self,
+        page: layout.Page,
+        render_box: BoundingBox2d,
+        *,
+        settings: layout.Settings = layout.Settings(),
+    ) -> None:
+        super().__init__()
+        if not render_box.has_data:
+            raise ValueError("undefined render box")
+        top_origin = True
+        # the page origin (0, 0) is in the top-left corner.
+        output_layout = layout.Layout(render_box, flip_y=True)
+        page = output_layout.get_final_page(page, settings)
+        if page.width == 0 or page.height == 0:
+            raise ValueError("empty page")
+        settings = copy.copy(settings)
+        settings.output_coordinate_space = self.get_output_coordinate_space(page)
+        self.page = page
+        self.settings = settings
+        self.m = output_layout.get_placement_matrix(
+            page, settings=settings, top_origin=top_origin
+        )
+        # scale factor to map page coordinates to output space coordinates:
+        output_scale = settings.page_output_scale_factor(page)
+        self.max_sagitta = 0.1 * output_scale  # curve approximation 0.1 mm
+        self.crop_box: Optional[BoundingBox2d] = None
+        if settings.crop_at_margins:
+            p1, p2 = page.get_margin_rect(top_origin=top_origin)  # in mm
+            self.crop_box = BoundingBox2d([p1 * output_scale, p2 * output_scale])
+        self.backend = self.make_backend(page, settings)
+
+    @abc.abstractmethod
+    def get_output_coordinate_space(self, page: layout.Page) -> float:
+        """Returns the output coordinate space for the final `page`."""
+        ...
+
+    @abc.abstractmethod
+    def make_backend(
+        self, page: layout.Page, settings: layout.Settings
+    ) -> BackendInterface:
+        """Returns the render backend for the final `page`."""
+        ...
+
+    def store(
+        self, type_: recorder.RecordType, properties: BackendProperties, data: Any
+    ) -> None:
+        record = recorder.DataRecord(
+            type=type_, property_hash=0, handle=properties.handle, data=data
+        )
+        recorder.transform_record(record, self.m)
+        records = [record]
+        if self.crop_box is not None:
+            records = recorder.crop_records_rect(
+                records, self.crop_box, self.max_sagitta
+            )
+        backend = self.backend
+        for record in records:
+            recorder.replay_record(backend, record.type, properties, record.data)
+
+    def configure(self, config: Configuration) -> None:
+        super().configure(config)
+        self.backend.configure(config)
+
+    def set_background(self, color: Color) -> None:
+        super().set_background(color)
+        self.backend.set_background(color)
+
+    def finalize(self) -> None:
+        self.backend.finalize()
@@ -1,10 +1,12 @@
 #  Copyright (c) 2023, Manfred Moitzi
 #  License: MIT License
 from __future__ import annotations
-from typing import Iterable, Sequence, no_type_check
+from typing import Callable, Iterable, Sequence, TextIO, no_type_check
 
 import copy
+import numpy as np
 from xml.etree import ElementTree as ET
+from xml.sax.saxutils import quoteattr
 
 from ezdxf.math import Vec2, BoundingBox2d
 from ezdxf.path import Command
@@ -15,8 +17,9 @@ from .backend import BackendInterface, BkPath2d, BkPoints2d
 from .config import Configuration, LineweightPolicy
 from .properties import BackendProperties
 from . import layout, recorder
+from .streaming import StreamingBackend
 
-__all__ = ["SVGBackend"]
+__all__ = ["SVGBackend", "SVGStreamBackend"]
 
 
 class SVGBackend(recorder.Recorder):
@@ -101,6 +104,63 @@ class SVGBackend(recorder.Recorder):
         return SVGRenderBackend(page, settings)
 
 
+class SVGStreamBackend(StreamingBackend):
+    """This backend writes the SVG elements immediately to the text `stream`
+    as the frontend produces them, therefore the memory consumption does not
+    depend on the size of the rendered layout. The extents of the content have
+    to be known in advance::
+
+        msp = doc.modelspace()
+        render_box = ezdxf.bbox.extents(msp, fast=True)
+        with open("huge.svg", "wt", encoding="utf-8") as fp:
+            backend = svg.SVGStreamBackend(
+                fp, layout.Page(0, 0), BoundingBox2d(render_box)
+            )
+            Frontend(RenderContext(doc), backend).draw_layout(msp)
+
+    The output is finalized by the :meth:`finalize` method, which is called at the
+    end of :meth:`Frontend.draw_layout`. The SVG elements are grouped by their
+    style classes.
+
+    Args:
+        stream: text stream
+        page: page definition, see :class:`~ezdxf.addons.drawing.layout.Page`
+        render_box: the region to render in DXF coordinates
+        settings: layout settings, see :class:`~ezdxf.addons.drawing.layout.Settings`
+        xml_declaration: writes the "<?xml version='1.0' encoding='utf-8'?>"
+            string in front of the <svg> element
+
+    Raises:
+        ValueError: undefined `render_box` or the final page has no area
+
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        page: layout.Page,
+        render_box: BoundingBox2d,
+        *,
+        settings: layout.Settings = layout.Settings(),
+        xml_declaration=True,
+    ) -> None:
+        self.stream = stream
+        self.xml_declaration = xml_declaration
+        super().__init__(page, render_box, settings=settings)
+
+    def get_output_coordinate_space(self, page: layout.Page) -> float:
+        # same coordinate space as the SVGBackend
+        return 1_000_000
+
+    def make_backend(
+        self, page: layout.Page, settings: layout.Settings
+    ) -> SVGStreamRenderBackend:
+        """Override this method to use a customized render backend."""
+        return SVGStreamRenderBackend(
+            page, settings, self.stream, xml_declaration=self.xml_declaration
+        )
+
+
 def make_view_box(page: layout.Page, output_coordinate_space: float) -> tuple[int, int]:
     size = round(output_coordinate_space)
     if page.width > page.height:
@@ -155,6 +215,19 @@ class Styles:
         self._xml.append(style)
 
 
+class StreamStyles(Styles):
+    """Writes the style definitions immediately by the `write` function."""
+
+    def __init__(self, write: Callable[[str], None]) -> None:
+        super().__init__(ET.Element("def"))
+        self._write = write
+
+    def _add_class(self, name, style_str: str) -> None:
+        style = ET.Element("style")
+        style.text = f".{name} {style_str}"
+        self._write(ET.tostring(style, encoding="unicode"))
+
+
 CMD_M_ABS = "M {0.x:.0f} {0.y:.0f}"
 CMD_M_REL = "m {0.x:.0f} {0.y:.0f}"
 CMD_L_ABS = "L {0.x:.0f} {0.y:.0f}"
@@ -239,7 +312,6 @@ class SVGRenderBackend(BackendInterface):
     def add_strokes(self, d: str, properties: BackendProperties):
         if not d:
             return
-        element = ET.SubElement(self.entities, "path", d=d)
         stroke_width = self.resolve_stroke_width(properties.lineweight)
         stroke_color, stroke_opacity = self.resolve_color(properties.color)
         cls = self.styles.get_class(
@@ -247,14 +319,17 @@ class SVGRenderBackend(BackendInterface):
             stroke_width=stroke_width,
             stroke_opacity=stroke_opacity,
         )
-        element.set("class", cls)
+        self.add_path(d, cls)
 
     def add_filling(self, d: str, properties: BackendProperties):
         if not d:
             return
-        element = ET.SubElement(self.entities, "path", d=d)
         fill_color, fill_opacity = self.resolve_color(properties.color)
         cls = self.styles.get_class(fill=fill_color, fill_opacity=fill_opacity)
+        self.add_path(d, cls)
+
+    def add_path(self, d: str, cls: str) -> None:
+        element = ET.SubElement(self.entities, "path", d=d)
         element.set("class", cls)
 
     def resolve_color(self, color: Color) -> tuple[Color, float]:
@@ -300,6 +375,15 @@ class SVGRenderBackend(BackendInterface):
             return
         self.add_strokes(self.make_multi_line_str(lines), properties)
 
+    def draw_solid_lines_array(
+        self, lines: BkPoints2d, properties: BackendProperties
+    ) -> None:
+        if len(lines) == 0:
+            return
+        self.add_strokes(
+            self.make_multi_line_array_str(lines.np_vertices()), properties
+        )
+
     def draw_path(self, path: BkPath2d, properties: BackendProperties) -> None:
         self.add_strokes(self.make_path_str(path), properties)
 
@@ -334,6 +418,17 @@ class SVGRenderBackend(BackendInterface):
             d.append("Z")
         return " ".join(d)
 
+    @staticmethod
+    def make_multi_line_array_str(vertices: np.ndarray) -> str:
+        # each pair of vertices (n, n+1) is the start- and end point of a line
+        assert len(vertices) > 0
+        x, y = vertices[0]
+        d: list[str] = [f"M {x:.0f} {y:.0f}"]
+        commands = ("l", "m")
+        for index, (x, y) in enumerate(np.diff(vertices, axis=0).tolist()):
+            d.append(f"{commands[index % 2]} {x:.0f} {y:.0f}")
+        return " ".join(d)
+
     @staticmethod
     def make_multi_line_str(lines: Sequence[tuple[Vec2, Vec2]]) -> str:
         assert len(lines) > 0
@@ -396,6 +491,76 @@ class SVGRenderBackend(BackendInterface):
         pass
 
 
+class SVGStreamRenderBackend(SVGRenderBackend):
+    """Writes the SVG output immediately to a text stream, consecutive paths of
+    the same style class are grouped by a <g> element.
+
+    The requirements for the input coordinates are the same as for the
+    :class:`SVGRenderBackend`.
+
+    """
+
+    def __init__(
+        self,
+        page: layout.Page,
+        settings: layout.Settings,
+        stream: TextIO,
+        *,
+        xml_declaration=True,
+    ) -> None:
+        super().__init__(page, settings)
+        self.stream = stream
+        self.styles = StreamStyles(self.write)
+        self.xml_declaration = xml_declaration
+        self._is_header_written = False
+        self._is_finalized = False
+        self._group_class = ""  # style class of the open <g> element
+
+    def write(self, s: str) -> None:
+        """Writes the string `s` to the stream, writes the SVG header in
+        front of the first content.
+        """
+        if not self._is_header_written:
+            self.write_header()
+        self.stream.write(s)
+
+    def write_header(self) -> None:
+        self._is_header_written = True
+        write = self.stream.write
+        if self.xml_declaration:
+            write("<?xml version='1.0' encoding='utf-8'?>\n")
+        write(f"<svg {_attributes(self.root)}>")
+        write(ET.tostring(self.background, encoding="unicode"))
+        write(f"<g {_attributes(self.entities)}>")
+
+    def set_background(self, color: Color) -> None:
+        if not self._is_header_written:
+            # the background can not be changed after writing the header
+            super().set_background(color)
+            self.write_header()
+
+    def add_path(self, d: str, cls: str) -> None:
+        if cls != self._group_class:
+            if self._group_class:
+                self.write("</g>")
+            self.write(f'<g class="{cls}">')
+            self._group_class = cls
+        self.write(f'<path d="{d}" />')
+
+    def finalize(self) -> None:
+        if self._is_finalized:
+            return
+        self._is_finalized = True
+        if self._group_class:
+            self.write("</g>")
+            self._group_class = ""
+        self.write("</g></svg>")
+
+
+def _attributes(element: ET.Element) -> str:
+    return " ".join(f"{name}={quoteattr(value)}" for name, value in element.items())
+
+
 def alpha_to_opacity(alpha: str) -> float:
     # stroke-opacity: 0.0 = transparent; 1.0 = opaque
     # alpha: "00" = transparent; "ff" = opaque
@@ -1,15 +1,100 @@
 # Copyright (c) 2023, Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Tuple
+from typing_extensions import TypeAlias
+
 from ezdxf.fonts import fonts
 from ezdxf.fonts.font_measurements import FontMeasurements
+from ezdxf.math import Matrix44
+from ezdxf.npshapes import transform_paths
 
 from .text_renderer import TextRenderer
 
 if TYPE_CHECKING:
     from ezdxf.npshapes import NumpyPath2d
 
+__all__ = ["UnifiedTextRenderer", "TextPathCache"]
+
+# font face, text string; the width factor is applied by the transformation
+# matrix of the text entity and is not part of the glyph paths:
+TextPathKey: TypeAlias = Tuple[fonts.FontFace, str]
+
+DEFAULT_TEXT_PATH_CACHE_SIZE = 4096
+
+
+class TextPathCache:
+    """LRU cache for the glyph paths of whole text strings.
+
+    The glyph paths are stored in unit space (cap height of 1.0), therefore the
+    same string rendered in different text heights uses the same cache entry.
+    The least recently used entries are removed if the count of cached strings
+    exceeds `maxsize`.
+
+    Args:
+        maxsize: max. count of cached strings, 0 disables the cache
+
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_TEXT_PATH_CACHE_SIZE) -> None:
+        self._paths: dict[TextPathKey, list[NumpyPath2d]] = dict()
+        self._maxsize = max(int(maxsize), 0)
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __str__(self):
+        return (
+            f"TextPathCache(n={len(self._paths)}, "
+            f"maxsize={self._maxsize}, "
+            f"hits={self.hits}, "
+            f"misses={self.misses})"
+        )
+
+    @property
+    def maxsize(self) -> int:
+        """Max. count of cached strings, reducing the size removes the least
+        recently used entries.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, size: int) -> None:
+        self._maxsize = max(int(size), 0)
+        self._shrink()
+
+    def get(self, key: TextPathKey) -> Optional[list[NumpyPath2d]]:
+        """Returns the cached glyph paths in unit space or ``None``. The returned
+        paths must not be modified!
+        """
+        paths = self._paths.pop(key, None)
+        if paths is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._paths[key] = paths  # move to the end: most recently used
+        return paths
+
+    def store(self, key: TextPathKey, paths: list[NumpyPath2d]) -> None:
+        """Stores the glyph paths in unit space."""
+        if self._maxsize == 0:
+            return
+        self._paths[key] = paths
+        self._shrink()
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        self._paths.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _shrink(self) -> None:
+        paths = self._paths
+        while len(paths) > self._maxsize:
+            del paths[next(iter(paths))]  # least recently used
+
 
 class UnifiedTextRenderer(TextRenderer):
     """This text renderer supports .ttf, .ttc, .otf, .shx, .shp and .lff fonts.
@@ -19,8 +104,9 @@ class UnifiedTextRenderer(TextRenderer):
 
     """
 
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = DEFAULT_TEXT_PATH_CACHE_SIZE) -> None:
         self._font_cache: dict[str, fonts.AbstractFont] = dict()
+        self.text_path_cache = TextPathCache(cache_size)
 
     def get_font(self, font_face: fonts.FontFace) -> fonts.AbstractFont:
         if not font_face.filename and font_face.family:
@@ -59,8 +145,19 @@ class UnifiedTextRenderer(TextRenderer):
     def get_text_glyph_paths(
         self, text: str, font_face: fonts.FontFace, cap_height: float = 1.0
     ) -> list[NumpyPath2d]:
-        abstract_font = self.get_font(font_face)
-        return abstract_font.text_glyph_paths(text, cap_height)
+        key: TextPathKey = (font_face, text)
+        cache = self.text_path_cache
+        glyph_paths = cache.get(key)
+        if glyph_paths is None:
+            abstract_font = self.get_font(font_face)
+            if cache.maxsize == 0:
+                return abstract_font.text_glyph_paths(text, cap_height)
+            glyph_paths = abstract_font.text_glyph_paths(text, 1.0)
+            cache.store(key, glyph_paths)
+        # returns copies, the caller may transform the paths inplace:
+        return transform_paths(
+            glyph_paths, Matrix44.scale(cap_height, cap_height, 1.0)
+        )
 
     def get_text_line_width(
         self,
@@ -0,0 +1,268 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+from __future__ import annotations
+from typing import Iterator, Optional, Union
+import json
+import mmap
+import os
+from pathlib import Path
+
+from ezdxf.lldxf.extendedtags import ExtendedTags
+from ezdxf.lldxf import fileindex
+from ezdxf.lldxf.validator import is_dxf_file, is_binary_dxf_file
+from ezdxf.entities import DXFEntity, factory
+from ezdxf.entities.subentity import entity_linker
+
+__all__ = ["opendxf", "IndexedDXF"]
+
+Filename = Union[Path, str]
+INDEX_FORMAT_VERSION = 1
+
+
+class IndexedDXF:
+    """Random access to single DXF entities of big ASCII DXF files by their
+    handle. The DXF file is memory-mapped and only the requested entities are
+    decoded and loaded.
+
+    The loaded entities are regular :class:`~ezdxf.entities.DXFEntity` objects
+    but without a valid document assigned, like the entities of the
+    :mod:`~ezdxf.addons.iterdxf` add-on.
+
+    Args:
+        name: filename of an ASCII DXF file
+        index_file: optional sidecar file to store the entity index, an
+            existing index file is used if the DXF file has not been modified
+            since the index file was written
+        errors: specify decoding error handler
+
+            - "surrogateescape" to preserve possible binary data (default)
+            - "ignore" to use the replacement char U+FFFD "\ufffd" for invalid data
+            - "strict" to raise an :class:`UnicodeDecodeError` exception for invalid data
+
+    Raises:
+        IOError: not an ASCII DXF file or file does not exist
+        DXFStructureError: invalid or incomplete DXF file
+        UnicodeDecodeError: if `errors` is "strict" and a decoding error occurs
+
+    """
+
+    def __init__(
+        self,
+        name: Filename,
+        index_file: Optional[Filename] = None,
+        errors: str = "surrogateescape",
+    ):
+        name = str(name)
+        if is_binary_dxf_file(name) or not is_dxf_file(name):
+            raise IOError(f"File '{name}' is not an ASCII DXF file.")
+        self.filename = name
+        self.errors = errors
+        self.file = open(name, mode="rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        index: Optional[fileindex.EntityIndex] = None
+        if index_file is not None:
+            index = load_index(name, index_file)
+        if index is None:
+            index = fileindex.entity_index(self.data)  # type: ignore
+            if index_file is not None:
+                save_index(name, index_file, index)
+        self.index: fileindex.EntityIndex = index
+        self._handles: dict[str, int] = index.handle_map()
+
+    def __enter__(self) -> IndexedDXF:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Safe closing source DXF file."""
+        self.data.close()
+        self.file.close()
+
+    @property
+    def encoding(self) -> str:
+        return self.index.encoding
+
+    @property
+    def dxfversion(self) -> str:
+        return self.index.version
+
+    def __contains__(self, handle: str) -> bool:
+        """Returns ``True`` if an entity with `handle` exist."""
+        return handle in self._handles
+
+    def __len__(self) -> int:
+        """Count of indexed entities with handle."""
+        return len(self._handles)
+
+    def handles(self) -> Iterator[str]:
+        """Returns all handles of the DXF file."""
+        return iter(self._handles.keys())
+
+    def dxftype(self, handle: str) -> str:
+        """Returns the DXF type of the entity `handle` without loading the
+        entity.
+
+        Raises:
+            KeyError: `handle` does not exist
+
+        """
+        return self.index.dxftypes[self._handles[handle]]
+
+    def owner(self, handle: str) -> Optional[str]:
+        """Returns the owner handle of the entity `handle` without loading
+        the entity or ``None`` if the entity has no owner handle.
+
+        Raises:
+            KeyError: `handle` does not exist
+
+        """
+        return self.index.owners[self._handles[handle]] or None
+
+    def block_names(self) -> list[str]:
+        """Returns the names of all block definitions."""
+        return list(self.index.blocks.keys())
+
+    def get_tags(self, handle: str) -> ExtendedTags:
+        """Returns the DXF tags of the entity `handle`.
+
+        Raises:
+            KeyError: `handle` does not exist
+
+        """
+        return self._load_tags(self._handles[handle])
+
+    def get(self, handle: str) -> DXFEntity:
+        """Returns the DXF entity `handle`, the sub-entities of INSERT
+        (ATTRIB) and POLYLINE (VERTEX) entities are linked to their parent
+        entity.
+
+        Raises:
+            KeyError: `handle` does not exist
+
+        """
+        index = self._handles[handle]
+        entities = [self._load_entity(index)]
+        dxftype = entities[0].dxftype()
+        if dxftype == "POLYLINE" or (
+            dxftype == "INSERT" and entities[0].dxf.get("attribs_follow", 0)
+        ):
+            entities.extend(self._load_sub_entities(index + 1))
+            linker = entity_linker()
+            for entity in entities:
+                linker(entity)
+        return entities[0]
+
+    def block(self, name: str) -> list[DXFEntity]:
+        """Returns the content of the block definition `name` as list of DXF
+        entities without the BLOCK and ENDBLK entity. The sub-entities of
+        INSERT and POLYLINE entities are linked to their parent entity.
+
+        Raises:
+            KeyError: block `name` does not exist
+
+        """
+        start, stop = self.index.block_range(name)
+        content: list[DXFEntity] = []
+        linker = entity_linker()
+        for index in range(start + 1, stop):
+            entity = self._load_entity(index)
+            if entity.dxftype() == "ENDBLK":
+                break
+            if not linker(entity):
+                content.append(entity)
+        return content
+
+    def _load_sub_entities(self, index: int) -> Iterator[DXFEntity]:
+        dxftypes = self.index.dxftypes
+        count = len(dxftypes)
+        while index < count:
+            dxftype = dxftypes[index]
+            if dxftype not in ("VERTEX", "ATTRIB", "SEQEND"):
+                return
+            yield self._load_entity(index)
+            if dxftype == "SEQEND":
+                return
+            index += 1
+
+    def _load_tags(self, index: int) -> ExtendedTags:
+        start, end = self.index.span(index)
+        text = self.data[start:end].decode(self.encoding, errors=self.errors)
+        return ExtendedTags.from_text(text.replace("\r\n", "\n"))
+
+    def _load_entity(self, index: int) -> DXFEntity:
+        return factory.load(self._load_tags(index))
+
+
+def opendxf(
+    filename: Filename,
+    index_file: Optional[Filename] = None,
+    errors: str = "surrogateescape",
+) -> IndexedDXF:
+    """Open an ASCII DXF file for random access to single DXF entities.
+
+    The entity index of the DXF file is build at opening, which requires to
+    scan the whole file. Use the argument `index_file` to store the index in
+    a sidecar file, which will be reused at the next opening if the DXF file
+    is unchanged.
+
+    Args:
+        filename: filename of an ASCII DXF file
+        index_file: filename of the sidecar file to store the entity index
+        errors: specify decoding error handler
+
+            - "surrogateescape" to preserve possible binary data (default)
+            - "ignore" to use the replacement char U+FFFD "\ufffd" for invalid data
+            - "strict" to raise an :class:`UnicodeDecodeError` exception for invalid data
+
+    Raises:
+        IOError: not an ASCII DXF file or file does not exist
+        DXFStructureError: invalid or incomplete DXF file
+        UnicodeDecodeError: if `errors` is "strict" and a decoding error occurs
+
+    """
+    return IndexedDXF(filename, index_file=index_file, errors=errors)
+
+
+def _file_signature(filename: str) -> list[int]:
+    stat = os.stat(filename)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def save_index(
+    filename: str, index_file: Filename, index: fileindex.EntityIndex
+) -> None:
+    """Save the entity `index` of the DXF file `filename` as JSON file
+    `index_file`.
+    """
+    data = {
+        "format": INDEX_FORMAT_VERSION,
+        "signature": _file_signature(filename),
+        "index": index.to_dict(),
+    }
+    with open(index_file, "wt", encoding="utf8") as fp:
+        json.dump(data, fp, separators=(",", ":"))
+
+
+def load_index(
+    filename: str, index_file: Filename
+) -> Optional[fileindex.EntityIndex]:
+    """Load the entity index of the DXF file `filename` from the JSON file
+    `index_file`. Returns ``None`` if the index file does not exist, is
+    invalid or the DXF file was modified after saving the index.
+    """
+    try:
+        with open(index_file, "rt", encoding="utf8") as fp:
+            data = json.load(fp)
+    except (IOError, ValueError):
+        return None
+    try:
+        if (
+            data["format"] != INDEX_FORMAT_VERSION
+            or data["signature"] != _file_signature(filename)
+        ):
+            return None
+        return fileindex.EntityIndex.from_dict(data["index"])
+    except (KeyError, TypeError):
+        return None
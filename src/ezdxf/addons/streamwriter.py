@@ -0,0 +1,272 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+# Purpose: stream writer for DXF R2000+ documents with a huge count of
+# modelspace entities, the entities are written directly to the output stream
+# and are not stored in the in-memory drawing.
+from __future__ import annotations
+from typing import (
+    BinaryIO,
+    Iterable,
+    Iterator,
+    Optional,
+    TextIO,
+    Union,
+    TYPE_CHECKING,
+)
+from contextlib import contextmanager
+from io import StringIO, BytesIO
+from pathlib import Path
+
+import ezdxf
+from ezdxf.entities import DXFGraphic, factory
+from ezdxf.graphicsfactory import CreatorInterface
+from ezdxf.lldxf import const
+from ezdxf.lldxf.tagwriter import TagWriter, BinaryTagWriter, AbstractTagWriter
+
+if TYPE_CHECKING:
+    from ezdxf.document import Drawing
+
+__all__ = ["streamwriter", "StreamWriter", "StreamLayout"]
+
+# The $HANDSEED header variable is written before the handles of the
+# streamed entities are known, a zero-padded placeholder of max. handle
+# length (64-bit) is written and replaced by the final value at closing:
+HANDSEED_WIDTH = 16
+HANDSEED_PLACEHOLDER = "F" * HANDSEED_WIDTH
+
+
+@contextmanager
+def streamwriter(
+    stream: Union[TextIO, BinaryIO, str, Path],
+    doc: Optional[Drawing] = None,
+    fmt: str = "asc",
+) -> Iterator[StreamWriter]:
+    """Context manager for writing a DXF R2000+ document with an unlimited
+    count of modelspace entities to a file or stream. The `stream` argument
+    can be a filename or a seekable file-like object.
+
+    The HEADER, CLASSES, TABLES and BLOCKS sections and the existing content
+    of the modelspace and the active paperspace of the resource document
+    `doc` are written at entering the context, the streamed modelspace
+    entities are written immediately and the OBJECTS section is written at
+    exiting the context. A new DXF R2013 document is used as resource
+    document if `doc` is ``None``.
+
+    Set argument `fmt` to "asc" to write ASCII DXF file (default) or "bin" to
+    write Binary DXF files. ASCII DXF require a :class:`TextIO` stream and
+    Binary DXF require a :class:`BinaryIO` stream.
+
+    """
+    if doc is None:
+        doc = ezdxf.new()
+    _stream: Union[TextIO, BinaryIO, None] = None
+    if isinstance(stream, (str, Path)):
+        if fmt.startswith("asc"):
+            _stream = open(
+                stream, "wt", encoding=doc.output_encoding, errors="dxfreplace"
+            )
+        elif fmt.startswith("bin"):
+            _stream = open(stream, "wb")
+        else:
+            raise ValueError(f"Unknown format '{fmt}'.")
+        stream = _stream
+    writer = StreamWriter(stream, doc, fmt)
+    try:
+        yield writer
+    finally:
+        writer.close()
+        if _stream:
+            _stream.close()
+
+
+class StreamWriter:
+    """Stream writer for DXF R2000+ documents.
+
+    The entities written by the :class:`StreamWriter` are not stored in the
+    resource document, the memory usage is independent of the count of
+    written entities.
+
+    All resources like layers, linetypes, text styles and block definitions
+    have to exist in the resource document `doc` before creating the
+    :class:`StreamWriter`, because the TABLES and BLOCKS sections are written
+    at the beginning.
+
+    Args:
+        stream: seekable text stream for ASCII DXF or seekable binary stream
+            for binary DXF
+        doc: resource document
+        fmt: "asc" for ASCII DXF (default) or "bin" for binary DXF
+
+    Raises:
+        DXFVersionError: DXF R12 is not supported
+        ValueError: invalid format or the stream is not seekable
+
+    """
+
+    def __init__(
+        self, stream: Union[TextIO, BinaryIO], doc: Drawing, fmt: str = "asc"
+    ):
+        if doc.dxfversion <= const.DXF12:
+            raise const.DXFVersionError("DXF R12 is not supported.")
+        if not stream.seekable():
+            raise ValueError("Requires a seekable stream.")
+        self.doc = doc
+        self.stream = stream
+        self._fmt = fmt
+        self._owner: str = doc.modelspace().block_record_handle
+        self._pending: Optional[DXFGraphic] = None
+        self._handseed_pos: int = 0
+        self._count = 0
+        self._closed = False
+        self._tagwriter = self._new_tagwriter(stream)
+        self._write_preface()
+
+    @property
+    def count(self) -> int:
+        """Count of streamed entities."""
+        return self._count
+
+    def _new_tagwriter(self, stream) -> AbstractTagWriter:
+        if self._fmt.startswith("asc"):
+            return TagWriter(stream, dxfversion=self.doc.dxfversion)
+        elif self._fmt.startswith("bin"):
+            return BinaryTagWriter(
+                stream,
+                dxfversion=self.doc.dxfversion,
+                encoding=self.doc.output_encoding,
+            )
+        raise ValueError(f"Unknown format '{self._fmt}'.")
+
+    def _write_preface(self) -> None:
+        doc = self.doc
+        tagwriter = self._tagwriter
+        doc.prepare_export()
+        if isinstance(tagwriter, BinaryTagWriter):
+            tagwriter.write_signature()
+        self._write_header()
+        doc.classes.export_dxf(tagwriter)
+        doc.tables.export_dxf(tagwriter)
+        doc.blocks.export_dxf(tagwriter)
+        tagwriter.write_str("  0\nSECTION\n  2\nENTITIES\n")
+        doc.modelspace().entity_space.export_dxf(tagwriter)
+        doc.active_layout().entity_space.export_dxf(tagwriter)
+
+    def _write_header(self) -> None:
+        # Export the HEADER section into a memory buffer to locate the
+        # $HANDSEED placeholder:
+        doc = self.doc
+        doc.header["$HANDSEED"] = HANDSEED_PLACEHOLDER
+        buffer: Union[StringIO, BytesIO]
+        placeholder: Union[str, bytes]
+        if isinstance(self._tagwriter, BinaryTagWriter):
+            buffer = BytesIO()
+            placeholder = HANDSEED_PLACEHOLDER.encode()
+        else:
+            buffer = StringIO()
+            placeholder = HANDSEED_PLACEHOLDER
+        doc.header.export_dxf(self._new_tagwriter(buffer))  # type: ignore
+        data = buffer.getvalue()
+        index = data.index(placeholder)  # type: ignore
+        stream = self.stream
+        stream.write(data[:index])  # type: ignore
+        self._handseed_pos = stream.tell()
+        stream.write(data[index:])  # type: ignore
+
+    def modelspace(self) -> StreamLayout:
+        """Returns a modelspace-like :class:`StreamLayout` to create new
+        entities by the usual factory methods like :meth:`add_line`.
+        """
+        return StreamLayout(self)
+
+    def write(self, entity: DXFGraphic) -> None:
+        """Write a graphical `entity` to the modelspace. The `entity` has to
+        be a virtual entity (not assigned to a document) or a new entity of
+        the resource document which is not assigned to a layout.
+
+        The last written entity is buffered until the next entity is written
+        or the writer is closed, which allows modifications of entities
+        created by the factory methods of the :class:`StreamLayout` after
+        their creation. The written entities are unbound from the resource
+        document.
+
+        Raises:
+            DXFValueError: entity is assigned to another document or a layout
+            DXFStructureError: writer is closed
+
+        """
+        if self._closed:
+            raise const.DXFStructureError("Stream writer is closed.")
+        if entity.doc is None:
+            factory.bind(entity, self.doc)
+        elif entity.doc is not self.doc:
+            raise const.DXFValueError("Entity is assigned to another document.")
+        if entity.dxf.owner is not None:
+            raise const.DXFValueError("Entity is assigned to a layout.")
+        entity.set_owner(self._owner, paperspace=0)
+        self.flush()
+        self._pending = entity
+
+    def write_entities(self, entities: Iterable[DXFGraphic]) -> None:
+        """Write all `entities` to the modelspace, see :meth:`write`."""
+        for entity in entities:
+            self.write(entity)
+
+    def flush(self) -> None:
+        """Write the buffered entity to the stream."""
+        entity = self._pending
+        if entity is None:
+            return
+        self._pending = None
+        if entity.is_alive:
+            entity.export_dxf(self._tagwriter)
+            self.doc.entitydb.discard(entity)
+            self._count += 1
+
+    def close(self) -> None:
+        """Writes the OBJECTS section and the DXF tail. Call is not necessary
+        when using the context manager :func:`streamwriter`.
+        """
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        doc = self.doc
+        tagwriter = self._tagwriter
+        tagwriter.write_tag2(0, "ENDSEC")
+        doc.objects.export_dxf(tagwriter)
+        if doc.acdsdata.is_valid:
+            doc.acdsdata.export_dxf(tagwriter)
+        for section in doc.stored_sections:
+            section.export_dxf(tagwriter)
+        tagwriter.write_tag2(0, "EOF")
+        self._update_handseed()
+
+    def _update_handseed(self) -> None:
+        handseed = str(self.doc.entitydb.handles).zfill(HANDSEED_WIDTH)
+        self.doc.header["$HANDSEED"] = handseed
+        stream = self.stream
+        end_pos = stream.tell()
+        stream.seek(self._handseed_pos)
+        if isinstance(self._tagwriter, BinaryTagWriter):
+            stream.write(handseed.encode())  # type: ignore
+        else:
+            stream.write(handseed)  # type: ignore
+        stream.seek(end_pos)
+
+
+class StreamLayout(CreatorInterface):
+    """Modelspace-like layout of the :class:`StreamWriter`, all entities
+    created by the factory methods are written to the stream.
+
+    Factory methods which create new block definitions, like the DIMENSION
+    entities or :meth:`add_auto_blockref`, are not supported.
+
+    """
+
+    def __init__(self, writer: StreamWriter):
+        super().__init__(writer.doc)
+        self.writer = writer
+
+    def add_entity(self, entity: DXFGraphic) -> None:
+        """Write `entity` to the stream."""
+        self.writer.write(entity)
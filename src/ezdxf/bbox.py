@@ -1,14 +1,20 @@
-#  Copyright (c) 2021-2022, Manfred Moitzi
+#  Copyright (c) 2021-2023, Manfred Moitzi
 #  License: MIT License
 from __future__ import annotations
 from typing import TYPE_CHECKING, Iterable, Optional
+from array import array
+import math
+
+import numpy as np
 
 import ezdxf
 from ezdxf import disassemble
-from ezdxf.math import BoundingBox
+from ezdxf.math import BoundingBox, Z_AXIS
+from ezdxf.protocols import SupportsVirtualEntities, virtual_entities
 
 if TYPE_CHECKING:
-    from ezdxf.entities import DXFEntity
+    from ezdxf.entities import DXFEntity, Insert
+    from ezdxf.layouts import BlockLayout
 
 MAX_FLATTENING_DISTANCE = disassemble.Primitive.max_flattening_distance
 
@@ -135,7 +141,12 @@ def extents(
     If argument `fast` is ``True`` the calculation of Bézier curves is based on
     their control points, this may return a slightly larger bounding box.
 
+    The bounding boxes of the entities are calculated in batches by NumPy if
+    no `cache` is given, see :ref:`batch calculation`.
+
     """
+    if cache is None:
+        return BatchExtents(fast=fast).extents(entities)
     _extends = BoundingBox()
     for box in multi_flat(entities, fast=fast, cache=cache):
         _extends.extend(box)
@@ -153,7 +164,13 @@ def multi_flat(
     If argument `fast` is ``True`` the calculation of Bézier curves is based on
     their control points, this may return a slightly larger bounding box.
 
+    The bounding boxes of the entities are calculated in batches by NumPy if
+    no `cache` is given, see :ref:`batch calculation`.
+
     """
+    if cache is None:
+        yield from BatchExtents(fast=fast).multi_flat(entities)
+        return
 
     def extends_(entities_: Iterable[DXFEntity]) -> BoundingBox:
         _extends = BoundingBox()
@@ -173,3 +190,346 @@ def multi_flat(
 
         if box.has_data:
             yield box
+
+
+# The batch calculation collects the data of entities of the same type in
+# lists and calculates the bounding boxes of each type at once by NumPy.
+# Each bounding box is stored by the index of the entity in the input
+# sequence, this way the bounding boxes of sub-entities like ATTRIB entities
+# can be assigned to their parent entities.
+
+
+class _Boxes:
+    """Container of bounding boxes stored by their entity index."""
+
+    def __init__(self) -> None:
+        self.indices: list[np.ndarray] = []
+        self.extmin: list[np.ndarray] = []
+        self.extmax: list[np.ndarray] = []
+        # single bounding boxes: (index, extmin, extmax)
+        self._single: list[tuple[int, tuple, tuple]] = []
+
+    def add(self, indices, extmin: np.ndarray, extmax: np.ndarray) -> None:
+        if len(extmin):
+            self.indices.append(np.asarray(indices, dtype=np.int64))
+            self.extmin.append(extmin)
+            self.extmax.append(extmax)
+
+    def add_box(self, index: int, box: BoundingBox) -> None:
+        if box.has_data:
+            self._single.append((index, box.extmin.xyz, box.extmax.xyz))
+
+    def _collect_single(self) -> None:
+        single = self._single
+        if single:
+            self.add(
+                [s[0] for s in single],
+                np.array([s[1] for s in single], dtype=np.float64),
+                np.array([s[2] for s in single], dtype=np.float64),
+            )
+            self._single = []
+
+    def extents(self) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """Returns the overall extents as (extmin, extmax) tuple or ``None``
+        for no data.
+        """
+        self._collect_single()
+        if not self.extmin:
+            return None
+        extmin = np.min([a.min(axis=0) for a in self.extmin], axis=0)
+        extmax = np.max([a.max(axis=0) for a in self.extmax], axis=0)
+        return extmin, extmax
+
+    def merged(self, count: int) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the merged bounding boxes of `count` entities as
+        (extmin, extmax) arrays, entities without bounding box have an extmin
+        of +inf.
+        """
+        self._collect_single()
+        extmin = np.full((count, 3), np.inf)
+        extmax = np.full((count, 3), -np.inf)
+        for indices, emin, emax in zip(self.indices, self.extmin, self.extmax):
+            np.minimum.at(extmin, indices, emin)
+            np.maximum.at(extmax, indices, emax)
+        return extmin, extmax
+
+
+class BatchExtents:
+    """Batch calculation of bounding boxes by NumPy.
+
+    LINE, POINT, CIRCLE, ARC and LWPOLYLINE entities without width and arc
+    segments are processed in batches. The extents of block definitions
+    are calculated once and transformed for all block references
+    which have an axis-aligned transformation. All other entities and block
+    references are processed by the :mod:`ezdxf.disassemble` module.
+
+    An instance caches the extents of block definitions, don't reuse
+    instances after modifying block definitions.
+
+    Args:
+        fast: calculate the bounding boxes of Bézier curves based on their
+            control points, this may return slightly larger bounding boxes
+
+    """
+
+    def __init__(self, fast=False) -> None:
+        self.fast = fast
+        # extents of block definitions as (extmin, extmax) stored by the
+        # id of the BlockLayout:
+        self._block_extents: dict[int, Optional[tuple[np.ndarray, np.ndarray]]] = {}
+        self._pending_blocks: set[int] = set()
+
+    def extents(self, entities: Iterable[DXFEntity]) -> BoundingBox:
+        """Returns a single bounding box for all given `entities`."""
+        result = self._process(entities)[0].extents()
+        if result is None:
+            return BoundingBox()
+        return BoundingBox(result)
+
+    def multi_flat(self, entities: Iterable[DXFEntity]) -> Iterable[BoundingBox]:
+        """Yields a bounding box for each of the given `entities`, entities
+        without a bounding box are skipped.
+        """
+        boxes, count = self._process(entities)
+        extmin, extmax = boxes.merged(count)
+        valid = extmin[:, 0] <= extmax[:, 0]
+        for emin, emax in zip(extmin[valid].tolist(), extmax[valid].tolist()):
+            yield BoundingBox((emin, emax))
+
+    def _sub_extents(
+        self, entities: Iterable[DXFEntity]
+    ) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        return self._process(entities)[0].extents()
+
+    def _process(self, entities: Iterable[DXFEntity]) -> tuple[_Boxes, int]:
+        boxes = _Boxes()
+        lines: list[float] = []
+        line_indices: list[int] = []
+        points: list[float] = []
+        point_indices: list[int] = []
+        arcs: list[float] = []  # center, radius, start- and end angle
+        arc_indices: list[int] = []
+        # LWPOLYLINE vertices as (x, y, start width, end width, bulge):
+        lwpolyline_values = array("d")
+        lwpolyline_counts: list[int] = []
+        lwpolyline_indices: list[int] = []
+        lwpolyline_elevations: list[float] = []
+        lwpolyline_entities: list[DXFEntity] = []
+        inserts: dict[int, list[tuple[int, Insert]]] = {}
+        blocks: dict[int, BlockLayout] = {}
+
+        index = -1
+        for index, entity in enumerate(entities):
+            dxftype = entity.dxftype()
+            dxf = entity.dxf
+            if dxftype == "LINE":
+                lines.extend(dxf.start.xyz)
+                lines.extend(dxf.end.xyz)
+                line_indices.append(index)
+            elif dxftype == "POINT":
+                points.extend(dxf.location.xyz)
+                point_indices.append(index)
+            elif (
+                (dxftype == "CIRCLE" or dxftype == "ARC")
+                and dxf.radius > 0.0
+                and _is_wcs(dxf)
+            ):
+                if dxftype == "CIRCLE":
+                    start, end = 0.0, 360.0
+                else:
+                    start = dxf.start_angle
+                    end = dxf.end_angle
+                    if math.isclose(start, end):  # ARC has no extents
+                        continue
+                    start %= 360.0
+                    end %= 360.0
+                    if math.isclose(start, end):  # full circle
+                        end = start + 360.0
+                arcs.extend(dxf.center.xyz)
+                arcs.extend((dxf.radius, start, end))
+                arc_indices.append(index)
+            elif (
+                dxftype == "LWPOLYLINE"
+                and _is_wcs(dxf)
+                and len(entity) > 1  # type: ignore
+                and not dxf.get("const_width")
+            ):
+                values = entity.lwpoints.values  # type: ignore
+                lwpolyline_values.extend(values)
+                lwpolyline_counts.append(len(values) // 5)
+                lwpolyline_indices.append(index)
+                lwpolyline_elevations.append(dxf.elevation)
+                lwpolyline_entities.append(entity)
+            elif dxftype == "INSERT":
+                block = entity.block()  # type: ignore
+                if block is None or entity.mcount > 1:  # type: ignore
+                    self._add_entity(boxes, index, entity)
+                    continue
+                key = id(block)
+                blocks[key] = block
+                inserts.setdefault(key, []).append((index, entity))  # type: ignore
+            else:
+                self._add_entity(boxes, index, entity)
+
+        if lines:
+            data = np.array(lines, dtype=np.float64).reshape(-1, 6)
+            boxes.add(
+                line_indices,
+                np.minimum(data[:, :3], data[:, 3:]),
+                np.maximum(data[:, :3], data[:, 3:]),
+            )
+        if points:
+            data = np.array(points, dtype=np.float64).reshape(-1, 3)
+            boxes.add(point_indices, data, data)
+        if arcs:
+            boxes.add(arc_indices, *_arc_extents(np.array(arcs).reshape(-1, 6)))
+        if lwpolyline_counts:
+            values = np.frombuffer(lwpolyline_values, dtype=np.float64)
+            values = values.reshape(-1, 5)
+            starts = np.zeros(len(lwpolyline_counts), dtype=np.int64)
+            np.cumsum(lwpolyline_counts[:-1], out=starts[1:])
+            # LWPOLYLINE entities with width or arc segments are processed by
+            # the disassemble module:
+            curved = np.logical_or.reduceat(np.any(values[:, 2:], axis=1), starts)
+            for i in np.flatnonzero(curved):
+                self._add_entity(
+                    boxes, lwpolyline_indices[i], lwpolyline_entities[i]
+                )
+            linear = ~curved
+            z = np.array(lwpolyline_elevations, dtype=np.float64)[linear]
+            z = z.reshape(-1, 1)
+            vertices = values[:, :2]
+            extmin = np.minimum.reduceat(vertices, starts, axis=0)[linear]
+            extmax = np.maximum.reduceat(vertices, starts, axis=0)[linear]
+            boxes.add(
+                np.array(lwpolyline_indices)[linear],
+                np.hstack((extmin, z)),
+                np.hstack((extmax, z)),
+            )
+        for key, block_refs in inserts.items():
+            self._add_inserts(boxes, blocks[key], block_refs)
+        return boxes, index + 1
+
+    def _add_entity(self, boxes: _Boxes, index: int, entity: DXFEntity) -> None:
+        if isinstance(entity, SupportsVirtualEntities) and not (
+            entity.dxftype() == "INSERT" and entity.mcount > 1  # type: ignore
+        ):
+            # DIMENSION, LEADER, MLEADER, MLINE, ...
+            self._add_extents(boxes, index, virtual_entities(entity))
+            return
+        box = BoundingBox()
+        for _box in multi_recursive([entity], fast=self.fast):
+            box.extend(_box)
+        boxes.add_box(index, box)
+
+    def _add_extents(
+        self, boxes: _Boxes, index: int, entities: Iterable[DXFEntity]
+    ) -> None:
+        result = self._sub_extents(entities)
+        if result is not None:
+            boxes.add([index], result[0].reshape(1, 3), result[1].reshape(1, 3))
+
+    def _add_inserts(
+        self, boxes: _Boxes, block: BlockLayout, block_refs: list[tuple[int, Insert]]
+    ) -> None:
+        box = self._get_block_extents(block)
+        aligned_indices: list[int] = []
+        matrices: list[np.ndarray] = []
+        for index, insert in block_refs:
+            if insert.attribs:
+                self._add_extents(boxes, index, insert.attribs)
+            if box is None:
+                continue
+            m = np.array(list(insert.matrix44()), dtype=np.float64).reshape(4, 4)
+            if _is_axis_aligned(m):
+                aligned_indices.append(index)
+                matrices.append(m)
+            else:
+                self._add_extents(boxes, index, virtual_entities(insert))
+        if not matrices:
+            return
+        extmin, extmax = box  # type: ignore
+        corners = np.array(
+            [
+                (x, y, z, 1.0)
+                for x in (extmin[0], extmax[0])
+                for y in (extmin[1], extmax[1])
+                for z in (extmin[2], extmax[2])
+            ]
+        )
+        # transform the corner vertices of the block extents by all matrices:
+        vertices = np.einsum("vi,nij->nvj", corners, np.array(matrices))[:, :, :3]
+        boxes.add(aligned_indices, vertices.min(axis=1), vertices.max(axis=1))
+
+    def _get_block_extents(
+        self, block: BlockLayout
+    ) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        key = id(block)
+        try:
+            return self._block_extents[key]
+        except KeyError:
+            pass
+        if key in self._pending_blocks:  # circular block references
+            return None
+        self._pending_blocks.add(key)
+        try:
+            result = self._sub_extents(
+                e for e in block if e.dxftype() != "ATTDEF"  # type: ignore
+            )
+        finally:
+            self._pending_blocks.discard(key)
+        self._block_extents[key] = result
+        return result
+
+
+def _is_wcs(dxf) -> bool:
+    # OCS == WCS
+    extrusion = dxf.get("extrusion")
+    return extrusion is None or extrusion.isclose(Z_AXIS)
+
+
+def _arc_extents(data: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # data: center x, y, z, radius, start angle, end angle in degrees, the
+    # start angle is in the range [0, 360) and the end angle is the start
+    # angle + 360 for full circles
+    center = data[:, :3]
+    radius = data[:, 3]
+    start = data[:, 4]
+    end = data[:, 5]
+    span = np.where(end > start + 360.0 - 1e-12, 360.0, (end - start) % 360.0)
+    # angles of the start point, end point and the 4 quadrant points:
+    angles = np.column_stack(
+        (start, start + span, np.zeros_like(start), np.full_like(start, 90.0))
+    )
+    angles = np.column_stack((angles, angles[:, 2:] + 180.0))
+    # quadrant points are included if they are in the angle span of the arc:
+    included = np.ones(angles.shape, dtype=bool)
+    included[:, 2:] = ((angles[:, 2:] - start[:, None]) % 360.0) <= span[:, None]
+    rad = np.radians(angles)
+    x = center[:, 0:1] + radius[:, None] * np.cos(rad)
+    y = center[:, 1:2] + radius[:, None] * np.sin(rad)
+    extmin = np.column_stack(
+        (
+            np.where(included, x, np.inf).min(axis=1),
+            np.where(included, y, np.inf).min(axis=1),
+            center[:, 2],
+        )
+    )
+    extmax = np.column_stack(
+        (
+            np.where(included, x, -np.inf).max(axis=1),
+            np.where(included, y, -np.inf).max(axis=1),
+            center[:, 2],
+        )
+    )
+    return extmin, extmax
+
+
+def _is_axis_aligned(m: np.ndarray) -> bool:
+    # The bounding box of an axis-aligned box transformed by an axis-aligned
+    # transformation (scaling, mirroring and rotation by multiples of 90 deg)
+    # is the transformed box itself.
+    nonzero = np.abs(m[:3, :3]) > 1e-12
+    return bool(
+        np.all(nonzero.sum(axis=0) == 1) and np.all(nonzero.sum(axis=1) == 1)
+    )
@@ -44,7 +44,7 @@ from ezdxf.lldxf.const import (
 )
 from ezdxf.lldxf import loader
 from ezdxf.lldxf.tagwriter import TagWriter, BinaryTagWriter
-from ezdxf.query import EntityQuery
+from ezdxf.query import EntityQuery, indexed_query
 from ezdxf.render.dimension import DimensionRenderer
 from ezdxf.sections.acdsdata import AcDsDataSection, new_acds_data_section
 from ezdxf.sections.blocks import BlocksSection
@@ -321,7 +321,7 @@ class Drawing:
         return pathlib.Path(self.filename).resolve()
 
     @classmethod
-    def read(cls, stream: TextIO) -> Drawing:
+    def read(cls, stream: TextIO, *, lazy: bool = False) -> Drawing:
         """Open an existing drawing. Package users should use the factory
         function :func:`ezdxf.read`. To preserve possible binary data in
         XRECORD entities use :code:`errors='surrogateescape'` as error handler
@@ -329,27 +329,29 @@ class Drawing:
 
         Args:
              stream: text stream yielding text (unicode) strings by readline()
+             lazy: load graphical entities at the first access
 
         """
         from .lldxf.tagger import ascii_tags_loader
 
         tag_loader = ascii_tags_loader(stream)
-        return cls.load(tag_loader)
+        return cls.load(tag_loader, lazy=lazy)
 
     @classmethod
-    def load(cls, tag_loader: Iterable[DXFTag]) -> Drawing:
+    def load(cls, tag_loader: Iterable[DXFTag], *, lazy: bool = False) -> Drawing:
         """Load DXF document from a DXF tag loader, in general an external
         untrusted source.
 
         Args:
             tag_loader: DXF tag loader
+            lazy: load graphical entities at the first access
 
         """
         from .lldxf.tagger import tag_compiler
 
         tag_loader = tag_compiler(tag_loader)  # type: ignore
         doc = cls()
-        doc._load(tag_loader)
+        doc._load(tag_loader, lazy=lazy)
         return doc
 
     @classmethod
@@ -359,16 +361,37 @@ class Drawing:
         doc._load(tagger=compiled_tags)
         return doc
 
-    def _load(self, tagger: Iterable[DXFTag]) -> None:
+    @classmethod
+    def from_section_dict(
+        cls, sections: loader.SectionDict, *, lazy: bool = False
+    ) -> Drawing:
+        """Create new drawing from a section dict. (internal API)"""
+        doc = cls()
+        doc._load_sections(sections, lazy=lazy)
+        return doc
+
+    def _load(self, tagger: Iterable[DXFTag], *, lazy: bool = False) -> None:
         # 1st Loading stage: load complete DXF entity structure
         self.is_loading = True
         sections = loader.load_dxf_structure(tagger)
+        self._load_sections(sections, lazy=lazy)
+
+    def _load_sections(
+        self, sections: loader.SectionDict, *, lazy: bool = False
+    ) -> None:
         if "THUMBNAILIMAGE" in sections:
             del sections["THUMBNAILIMAGE"]
-        self._load_section_dict(sections)
+        self._load_section_dict(sections, lazy)
 
-    def _load_section_dict(self, sections: loader.SectionDict) -> None:
-        """Internal API to load a DXF document from a section dict."""
+    def _load_section_dict(
+        self, sections: loader.SectionDict, lazy: bool = False
+    ) -> None:
+        """Internal API to load a DXF document from a section dict.
+
+        In `lazy` mode the graphical entities of DXF R2000+ documents are
+        loaded at the first access, which speeds up opening large documents
+        when only some entities are required.
+        """
         self.is_loading = True
         # Create header section:
         header_entities: list[Tags] = sections.get("HEADER", [])  # type: ignore
@@ -390,8 +413,10 @@ class Drawing:
         seed: str = self.header.get("$HANDSEED", str(self.entitydb.handles))
         self.entitydb.handles.reset(_validate_handle_seed(seed))
 
-        # Store all necessary DXF entities in the entity database:
-        loader.load_and_bind_dxf_content(sections, self)
+        # Store all necessary DXF entities in the entity database,
+        # the DXF version upgrade of older DXF documents requires all entities:
+        lazy = lazy and self._dxfversion >= DXF2000
+        loader.load_and_bind_dxf_content(sections, self, lazy=lazy)
 
         # End of 1. loading stage, all entities of the DXF file are
         # stored in the entity database.
@@ -466,7 +491,8 @@ class Drawing:
 
         """
         db = self.entitydb
-        for entity in db.values():
+        # Lazy loaded entities execute the post_load_hook() at loading:
+        for entity in db.loaded_entities():
             # The post_load_hook() can return a callable, which should be
             # executed, when the DXF document is fully initialized.
             cmd = entity.post_load_hook(self)
@@ -579,14 +605,7 @@ class Drawing:
             handles = bool(self.header.get("$HANDLING", 0))
         else:
             handles = True
-        if dxfversion > DXF12:
-            self.classes.add_required_classes(dxfversion)
-
-        self._create_appids()
-        self._update_header_vars()
-        self.update_extents()
-        self.update_limits()
-        self._update_metadata()
+        self.prepare_export()
 
         if fmt.startswith("asc"):
             tagwriter = TagWriter(
@@ -607,6 +626,19 @@ class Drawing:
 
         self.export_sections(tagwriter)
 
+    def prepare_export(self) -> None:
+        """Update required classes, resources and header variables before
+        exporting the document. (internal API)
+        """
+        if self.dxfversion > DXF12:
+            self.classes.add_required_classes(self.dxfversion)
+
+        self._create_appids()
+        self._update_header_vars()
+        self.update_extents()
+        self.update_limits()
+        self._update_metadata()
+
     def encode_base64(self) -> bytes:
         """Returns DXF document as base64 encoded binary data."""
         stream = io.StringIO()
@@ -855,6 +887,10 @@ class Drawing:
         """Entity query over all layouts and blocks, excluding the OBJECTS section and
         the resource tables of the TABLES section.
 
+        Queries which select entities by their DXF type or by the DXF attributes
+        `layer`, `color`, `linetype` or `owner` are planned against the secondary
+        attribute indexes of the entity database.
+
         Args:
             query: query string
 
@@ -863,7 +899,12 @@ class Drawing:
             :ref:`entity query string` and :ref:`entity queries`
 
         """
-        return EntityQuery(self.chain_layouts_and_blocks(), query)
+        result = indexed_query(
+            self.entitydb, query, entities=self.chain_layouts_and_blocks()
+        )
+        if result is None:
+            result = EntityQuery(self.chain_layouts_and_blocks(), query)
+        return result
 
     def groupby(self, dxfattrib="", key=None) -> dict:
         """Groups DXF entities of all layouts and blocks (excluding the
@@ -28,6 +28,7 @@ if TYPE_CHECKING:
     from ezdxf.entities import DXFNamespace
     from ezdxf.entitydb import EntitySpace
     from ezdxf.layouts import BlockLayout
+    from ezdxf.spatialindex import SpatialIndex
     from ezdxf.lldxf.tagwriter import AbstractTagWriter
     from ezdxf import xref
 
@@ -101,6 +102,8 @@ class BlockRecord(DXFEntity):
         self.endblk: Optional[EndBlk] = None
         # stores also the block layout structure
         self.block_layout: Optional[BlockLayout] = None
+        # optional spatial index of the entity space, created on demand
+        self.spatial_index: Optional[SpatialIndex] = None
 
     def set_block(self, block: Block, endblk: EndBlk):
         self.block = block
@@ -215,6 +218,7 @@ class BlockRecord(DXFEntity):
             entity.destroy()
 
         # remove attributes to find invalid access after death
+        self.spatial_index = None
         del self.block
         del self.endblk
         del self.block_layout
@@ -269,6 +273,8 @@ class BlockRecord(DXFEntity):
         # Add unexpected entities also to the entity space - auditor should fix
         # errors!
         self.entity_space.add(entity)
+        if self.spatial_index is not None:
+            self.spatial_index.add(entity)
 
     def unlink_entity(self, entity: DXFGraphic) -> None:
         """Unlink `entity` from BLOCK_RECORD.
@@ -282,6 +288,8 @@ class BlockRecord(DXFEntity):
         """
         if entity.is_alive:
             self.entity_space.remove(entity)
+            if self.spatial_index is not None:
+                self.spatial_index.remove(entity)
             try:
                 entity.set_owner(None)
             except AttributeError:
@@ -297,6 +305,20 @@ class BlockRecord(DXFEntity):
         self.unlink_entity(entity)  # 1. unlink from entity space
         entity.destroy()
 
+    def get_spatial_index(self) -> SpatialIndex:
+        """Returns the spatial index of the entity space, creates the index if
+        it does not exist. (internal API)
+        """
+        if self.spatial_index is None:
+            from ezdxf.spatialindex import SpatialIndex
+
+            self.spatial_index = SpatialIndex(self.entity_space)
+        return self.spatial_index
+
+    def discard_spatial_index(self) -> None:
+        """Discard the spatial index of the entity space. (internal API)"""
+        self.spatial_index = None
+
     def audit(self, auditor: Auditor) -> None:
         """Validity check. (internal API)"""
         if not self.is_alive:
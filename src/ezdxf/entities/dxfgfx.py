@@ -1,4 +1,4 @@
-# Copyright (c) 2019-2022 Manfred Moitzi
+# Copyright (c) 2019-2023 Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
 from typing import TYPE_CHECKING, Optional, Iterable, Any
@@ -33,6 +33,7 @@ if TYPE_CHECKING:
     from ezdxf.entities import DXFNamespace
     from ezdxf.layouts import BaseLayout
     from ezdxf.lldxf.tagwriter import AbstractTagWriter
+    from ezdxf.spatialindex import SpatialIndex
     from ezdxf import xref
 
 __all__ = [
@@ -480,11 +481,22 @@ class DXFGraphic(DXFEntity):
         """Should be called if the main entity transformation was successful."""
         if self.xdata is not None:
             self.xdata.transform(m)
+        spatial_index = self._spatial_index()
+        if spatial_index is not None:
+            spatial_index.update(self)
+
+    def _spatial_index(self) -> Optional[SpatialIndex]:
+        # Returns the spatial index of the owner layout, if one exist:
+        doc = self.doc
+        if doc is None:
+            return None
+        block_record = doc.entitydb.get(self.dxf.owner)
+        return getattr(block_record, "spatial_index", None)
 
     @property
     def is_post_transform_required(self) -> bool:
         """Check if post transform call is required."""
-        return self.xdata is not None
+        return self.xdata is not None or self._spatial_index() is not None
 
     def translate(self, dx: float, dy: float, dz: float) -> DXFGraphic:
         """Translate entity inplace about `dx` in x-axis, `dy` in y-axis and
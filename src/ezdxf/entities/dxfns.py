@@ -1,4 +1,4 @@
-# Copyright (c) 2020-2022, Manfred Moitzi
+# Copyright (c) 2020-2023, Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
 from typing import Any, Optional, Union, Iterable, TYPE_CHECKING, Set
@@ -35,6 +35,10 @@ SETTER_EVENTS = {
 }
 EXCLUDE_FROM_UPDATE = frozenset(["_entity", "handle", "owner"])
 
+# DXF attributes stored in the secondary indexes of the entity database, see
+# EntityDB.get_attribute_index():
+INDEXED_ATTRIBUTES = frozenset(["owner", "layer", "color", "linetype"])
+
 
 class DXFNamespace:
     """:class:`DXFNamespace` manages all named DXF attributes of an entity.
@@ -86,6 +90,14 @@ class DXFNamespace:
     def __deepcopy__(self, memodict: Optional[dict] = None):
         return self.copy(self._entity)
 
+    def __getstate__(self) -> dict:
+        return self.__dict__
+
+    def __setstate__(self, state: dict) -> None:
+        # bypass __setattr__() and __getattr__(), the attribute _entity does
+        # not exist at unpickling
+        self.__dict__.update(state)
+
     def reset_handles(self):
         """Reset handle and owner to None."""
         self.__dict__["handle"] = None
@@ -179,6 +191,17 @@ class DXFNamespace:
             handler = getattr(self._entity, SETTER_EVENTS[key], None)
             if handler:
                 handler(value)
+        if key in INDEXED_ATTRIBUTES:
+            self._update_attribute_index(key)
+
+    def _update_attribute_index(self, key: str) -> None:
+        entity = self._entity
+        doc = getattr(entity, "doc", None)
+        if doc is None:
+            return
+        index = doc.entitydb.attribute_index
+        if index is not None:
+            index.update(entity, key)
 
     def __delattr__(self, key: str) -> None:
         """Delete DXF attribute `key`.
@@ -189,6 +212,8 @@ class DXFNamespace:
         """
         if self.hasattr(key):
             del self.__dict__[key]
+            if key in INDEXED_ATTRIBUTES:
+                self._update_attribute_index(key)
         else:
             raise const.DXFAttributeError(ERR_DXF_ATTRIB_NOT_EXITS.format(key))
 
@@ -271,7 +296,9 @@ class DXFNamespace:
         try:
             del self.__dict__[key]
         except KeyError:
-            pass
+            return
+        if key in INDEXED_ATTRIBUTES:
+            self._update_attribute_index(key)
 
     def is_supported(self, key: str) -> bool:
         """Returns True if DXF attribute `key` is supported else False.
@@ -2,22 +2,28 @@
 # License: MIT License
 from __future__ import annotations
 from typing import (
+    Any,
+    Callable,
     Optional,
     Iterable,
     TYPE_CHECKING,
     Iterator,
 )
 from contextlib import contextmanager
+import itertools
 from ezdxf.tools.handle import HandleGenerator
 from ezdxf.lldxf.types import is_valid_handle
 from ezdxf.entities.dxfentity import DXFEntity
 from ezdxf.entities.dxfobj import DXFObject
 from ezdxf.audit import AuditError, Auditor
-from ezdxf.lldxf.const import DXFInternalEzdxfError
-from ezdxf.entities import factory
-from ezdxf.query import EntityQuery
+from ezdxf.lldxf.const import DXFInternalEzdxfError, DXFValueError
+from ezdxf.entities import factory, entity_linker
+from ezdxf.lldxf.extendedtags import ExtendedTags
+from ezdxf.query import EntityQuery, indexed_query
 
 if TYPE_CHECKING:
+    from ezdxf.document import Drawing
+    from ezdxf.lldxf.tags import Tags
     from ezdxf.lldxf.tagwriter import AbstractTagWriter
 
 DATABASE_EXCLUDE = {
@@ -32,6 +38,148 @@ DATABASE_EXCLUDE = {
 }
 
 
+class LazyEntity:
+    """Placeholder for a graphical DXF entity loaded in lazy mode, stores
+    the DXF tags of the entity and of the linked sub-entities (VERTEX, ATTRIB
+    and SEQEND) until the DXF entity is requested from the entity database or
+    from the entity space of a layout. (internal API)
+
+    Args:
+        tags: DXF tags of the main entity followed by the DXF tags of the
+            linked sub-entities
+        doc: DXF document
+        link_first: link sub-entities before setting the owner of the main
+            entity, the BLOCKS section links entities before adding them to
+            the block layout, the ENTITIES section afterwards
+
+    """
+
+    __slots__ = (
+        "tags",
+        "doc",
+        "handles",
+        "owner",
+        "paperspace",
+        "entity",
+        "link_first",
+        "layout_owner",
+    )
+
+    def __init__(self, tags: list[Tags], doc: Drawing, link_first=False):
+        self.tags = tags
+        self.doc = doc
+        self.link_first = link_first
+        # Handles of the main entity and all linked sub-entities:
+        self.handles: list[str] = [h for h in map(_get_handle, tags) if h]
+        # Owner handle and paperspace flag stored in the DXF tags:
+        self.owner: Optional[str] = None
+        self.paperspace: int = 0
+        # Owner handle and paperspace flag set by the layout:
+        self.layout_owner: Optional[tuple[Optional[str], int]] = None
+        self.entity: Optional[DXFEntity] = None
+        self._scan_main_entity()
+
+    def _scan_main_entity(self) -> None:
+        appdata = False
+        # skip structure tag (0, DXFTYPE):
+        for code, value in self.tags[0][1:]:
+            if code == 102:
+                appdata = value.startswith("{")
+            elif code == 330:
+                if not appdata and self.owner is None:
+                    self.owner = value
+            elif code == 67:
+                try:
+                    self.paperspace = int(value)
+                except ValueError:
+                    pass
+            elif (code == 100 and value != "AcDbEntity") or code >= 1000:
+                # the owner handle and the paperspace flag are located in
+                # front of the entity specific subclasses and the XDATA
+                break
+
+    def __str__(self) -> str:
+        return f"{self.dxftype()}(#{self.dxf_handle()})"
+
+    @property
+    def is_alive(self) -> bool:
+        """``True`` if the entity is not loaded yet or the loaded entity is
+        alive.
+        """
+        if self.entity is None:
+            return True
+        return self.entity.is_alive
+
+    def dxftype(self) -> str:
+        return self.tags[0][0].value
+
+    def dxf_handle(self) -> Optional[str]:
+        return self.handles[0] if self.handles else None
+
+    def set_owner(self, owner: Optional[str], paperspace: int = 0) -> None:
+        """Set owner handle and paperspace flag of the entity."""
+        if self.entity is None:
+            self.layout_owner = owner, paperspace
+        else:
+            self.entity.set_owner(owner, paperspace)  # type: ignore
+
+    def load(self) -> DXFEntity:
+        """Returns the DXF entity, loads and binds the entity and the linked
+        sub-entities to the DXF document at the first call. Executes the 2nd
+        loading stage for all loaded entities.
+        """
+        if self.entity is not None:
+            return self.entity
+        doc = self.doc
+        doc.entitydb.remove_lazy_entity(self)
+        is_loading = doc.is_loading
+        # Bind entities like in the 1st loading stage:
+        doc.is_loading = True
+        try:
+            entities = [factory.load(ExtendedTags(tags), doc) for tags in self.tags]
+            for entity in entities:
+                factory.bind(entity, doc)
+            entity = entities[0]
+            # Same order as for eager loading, which matters for the owner
+            # handles of the sub-entities:
+            if self.link_first:
+                self._link_entities(entities)
+            if self.layout_owner is not None:
+                try:
+                    entity.set_owner(*self.layout_owner)  # type: ignore
+                except AttributeError:
+                    pass  # unexpected entities like DXFTagStorage
+            if not self.link_first:
+                self._link_entities(entities)
+            self.entity = entity
+        finally:
+            doc.is_loading = is_loading
+        self.tags = []  # free memory
+
+        # 2nd loading stage:
+        for entity in entities:
+            cmd = entity.post_load_hook(doc)
+            if cmd is not None:
+                if is_loading:
+                    doc._post_init_commands.append(cmd)
+                else:
+                    cmd()
+        return self.entity
+
+    @staticmethod
+    def _link_entities(entities: list[DXFEntity]) -> None:
+        linker = entity_linker()
+        for entity in entities:
+            linker(entity)
+
+
+def _get_handle(tags: Tags) -> Optional[str]:
+    try:
+        return tags.get_handle()
+    except DXFValueError:
+        return None
+
+
 class EntityDB:
     """A simple key/entity database.
 
@@ -45,6 +193,7 @@ class EntityDB:
         """Store handles to entities which should be deleted later."""
 
         def __init__(self, db: EntityDB):
+            self._db = db
             self._database = db._database
             self._handles: set[str] = set()
 
@@ -65,20 +214,34 @@ class EntityDB:
                     entity.destroy()
 
                 if handle in db:
+                    if self._db.attribute_index is not None:
+                        self._db.attribute_index.remove(db[handle])
                     del db[handle]
 
             self._handles.clear()
 
     def __init__(self) -> None:
         self._database: dict[str, DXFEntity] = {}
+        # Placeholders of entities loaded in lazy mode, stored by the handles
+        # of the main entity and the linked sub-entities:
+        self._lazy_entities: dict[str, LazyEntity] = {}
         # DXF handles of entities to delete later:
         self.handles = HandleGenerator()
         self.locked: bool = False  # used only for debugging
+        # Secondary indexes, created on demand by get_attribute_index():
+        self.attribute_index: Optional[AttributeIndex] = None
 
     def __getitem__(self, handle: str) -> DXFEntity:
         """Get entity by `handle`, does not filter destroyed entities nor
         entities in the trashcan.
         """
+        try:
+            return self._database[handle]
+        except KeyError:
+            lazy_entity = self._lazy_entities.get(handle)
+            if lazy_entity is None:
+                raise
+        lazy_entity.load()
         return self._database[handle]
 
     def __setitem__(self, handle: str, entity: DXFEntity) -> None:
@@ -92,6 +255,10 @@ class EntityDB:
         if handle == "0" or not is_valid_handle(handle):
             raise ValueError(f"Invalid handle {handle}.")
         self._database[handle] = entity
+        if self._lazy_entities:
+            self._lazy_entities.pop(handle, None)
+        if self.attribute_index is not None:
+            self.attribute_index.add(entity)
 
     def __delitem__(self, handle: str) -> None:
         """Delete entity by `handle`. Removes entity only from database, does
@@ -99,18 +266,22 @@ class EntityDB:
         """
         if self.locked:
             raise DXFInternalEzdxfError("Locked entity database.")
-        del self._database[handle]
+        if handle in self._lazy_entities:
+            self._lazy_entities[handle].load()
+        entity = self._database.pop(handle)
+        if self.attribute_index is not None:
+            self.attribute_index.remove(entity)
 
     def __contains__(self, handle: str) -> bool:
         """``True`` if database contains `handle`."""
         if handle is None:
             return False
         assert isinstance(handle, str), type(handle)
-        return handle in self._database
+        return handle in self._database or handle in self._lazy_entities
 
     def __len__(self) -> int:
         """Count of database items."""
-        return len(self._database)
+        return len(self._database) + len(self._lazy_entities)
 
     def __iter__(self) -> Iterator[str]:
         """Iterable of all handles, does filter destroyed entities but not
@@ -122,13 +293,19 @@ class EntityDB:
         """Returns entity for `handle` or ``None`` if no entry exist, does
         not filter destroyed entities.
         """
-        return self._database.get(handle)
+        entity = self._database.get(handle)
+        if entity is None and self._lazy_entities:
+            lazy_entity = self._lazy_entities.get(handle)
+            if lazy_entity is not None:
+                lazy_entity.load()
+                return self._database.get(handle)
+        return entity
 
     def next_handle(self) -> str:
         """Returns next unique handle."""
         while True:
             handle = self.handles.next()
-            if handle not in self._database:
+            if handle not in self._database and handle not in self._lazy_entities:
                 return handle
 
     def keys(self) -> Iterable[str]:
@@ -141,14 +318,46 @@ class EntityDB:
 
     def items(self) -> Iterable[tuple[str, DXFEntity]]:
         """Iterable of all (handle, entities) pairs, does filter destroyed
-        entities.
+        entities. Loads all entities of a lazy loaded document.
         """
+        if self._lazy_entities:
+            self.load_lazy_entities()
         return (
             (handle, entity)
             for handle, entity in self._database.items()
             if entity.is_alive
         )
 
+    def loaded_entities(self) -> list[DXFEntity]:
+        """Returns all loaded entities, does filter destroyed entities but
+        does not load the entities of a lazy loaded document. (internal API)
+        """
+        return [entity for entity in self._database.values() if entity.is_alive]
+
+    @property
+    def has_lazy_entities(self) -> bool:
+        """``True`` if the database has entities, which are not loaded yet."""
+        return bool(self._lazy_entities)
+
+    def add_lazy_entity(self, lazy_entity: LazyEntity) -> None:
+        """Add placeholder of a lazy loaded entity. (internal API)"""
+        for handle in lazy_entity.handles:
+            self._lazy_entities[handle] = lazy_entity
+
+    def remove_lazy_entity(self, lazy_entity: LazyEntity) -> None:
+        """Remove placeholder of a lazy loaded entity. (internal API)"""
+        lazy_entities = self._lazy_entities
+        for handle in lazy_entity.handles:
+            # do not remove placeholders of entities with duplicate handles
+            if lazy_entities.get(handle) is lazy_entity:
+                del lazy_entities[handle]
+
+    def load_lazy_entities(self) -> None:
+        """Load all entities of a lazy loaded document."""
+        lazy_entities = self._lazy_entities
+        while lazy_entities:
+            next(iter(lazy_entities.values())).load()
+
     def add(self, entity: DXFEntity) -> None:
         """Add `entity` to database, assigns a new handle to the `entity`
         if :attr:`entity.dxf.handle` is ``None``. Adding the same entity
@@ -190,6 +399,8 @@ class EntityDB:
                 entity.dxf.handle = None
             except KeyError:
                 pass
+            if self.attribute_index is not None:
+                self.attribute_index.remove(entity)
 
     def duplicate_entity(self, entity: DXFEntity) -> DXFEntity:
         """Duplicates `entity` and its sub entities (VERTEX, ATTRIB, SEQEND)
@@ -292,6 +503,8 @@ class EntityDB:
         dead_handles = [handle for handle, entity in db.items() if not entity.is_alive]
         for handle in dead_handles:
             del db[handle]
+        if self.attribute_index is not None:
+            self.attribute_index.purge()
 
     def dxf_types_in_use(self) -> set[str]:
         return set(entity.dxftype() for entity in self.values())
@@ -301,16 +514,37 @@ class EntityDB:
         Returns ``True`` if successful and ``False`` otherwise.
 
         """
-        if handle in self._database:
+        if handle in self:
             return False
         self.discard(entity)
         entity.dxf.handle = handle
         self.add(entity)
         return True
 
+    def get_attribute_index(self) -> AttributeIndex:
+        """Returns the secondary attribute indexes of the database, creates
+        the indexes if they do not exist. The indexes are maintained by the
+        database and the DXF attribute setters until they are discarded by
+        :meth:`discard_attribute_index`. Loads all entities of a lazy loaded
+        document.
+        """
+        if self.attribute_index is None:
+            self.attribute_index = AttributeIndex(self.values())
+        return self.attribute_index
+
+    def discard_attribute_index(self) -> None:
+        """Discard the secondary attribute indexes of the database."""
+        self.attribute_index = None
+
     def query(self, query: str = "*") -> EntityQuery:
         """Entity query over all entities in the DXF document.
 
+        Queries which select entities by their DXF type or by equality,
+        comparison or regular expression matching of the DXF attributes
+        `layer`, `color`, `linetype` or `owner` are planned against the
+        secondary attribute indexes of the database, see
+        :meth:`get_attribute_index`.
+
         Args:
             query: query string
 
@@ -319,7 +553,181 @@ class EntityDB:
             :ref:`entity query string` and :ref:`entity queries`
 
         """
-        return EntityQuery((e for e in self._database.values() if e.is_alive), query)
+        result = indexed_query(self, query)
+        if result is None:
+            result = EntityQuery(self.values(), query)
+        return result
+
+
+# The value for DXF attributes which are not supported by an entity,
+# these entities are not stored in the index of the DXF attribute:
+_NOT_SUPPORTED = object()
+
+
+class AttributeIndex:
+    """Secondary indexes of the entity database for the DXF type and the DXF
+    attributes `owner`, `layer`, `color` and `linetype` of the DXF entities.
+    Each index maps the attribute values to the entities with this value, the
+    value of unset attributes is the DXF default value.
+
+    The order of insertion is preserved, the results of the
+    :meth:`sort` method are in the order in which the entities were added to
+    the index. Destroyed entities are removed by :meth:`purge`.
+
+    (internal API)
+
+    """
+
+    ATTRIBUTES = ("owner", "layer", "color", "linetype")
+
+    def __init__(self, entities: Iterable[DXFEntity] = tuple()):
+        self._counter = itertools.count()
+        # Stores the insertion index and the indexed values of the entities,
+        # the values in the order of "dxftype" + ATTRIBUTES:
+        self._entries: dict[DXFEntity, list[Any]] = dict()
+        self._indexes: dict[str, dict[Any, set[DXFEntity]]] = {
+            name: dict() for name in ("dxftype",) + self.ATTRIBUTES
+        }
+        for entity in entities:
+            self.add(entity)
+
+    def __len__(self) -> int:
+        """Returns the count of indexed entities."""
+        return len(self._entries)
+
+    def __contains__(self, entity: DXFEntity) -> bool:
+        """Returns ``True`` if `entity` is indexed."""
+        return entity in self._entries
+
+    @staticmethod
+    def _get_value(entity: DXFEntity, name: str) -> Any:
+        try:
+            return entity.dxf.get_default(name)
+        except (AttributeError, ValueError):
+            return _NOT_SUPPORTED
+
+    def _link(self, name: str, value: Any, entity: DXFEntity) -> None:
+        if value is _NOT_SUPPORTED:
+            return
+        index = self._indexes[name]
+        try:
+            index[value].add(entity)
+        except KeyError:
+            index[value] = {entity}
+        except TypeError:  # unhashable value
+            pass
+
+    def _unlink(self, name: str, value: Any, entity: DXFEntity) -> None:
+        if value is _NOT_SUPPORTED:
+            return
+        index = self._indexes[name]
+        try:
+            entities = index[value]
+        except (KeyError, TypeError):
+            return
+        entities.discard(entity)
+        if not entities:
+            del index[value]
+
+    def add(self, entity: DXFEntity) -> None:
+        """Add `entity` to the indexes, updates the indexed values of already
+        indexed entities.
+        """
+        entry = self._entries.get(entity)
+        if entry is not None:
+            self.update(entity)
+            return
+        entry = [next(self._counter), entity.dxftype()]
+        self._link("dxftype", entry[1], entity)
+        for name in self.ATTRIBUTES:
+            value = self._get_value(entity, name)
+            entry.append(value)
+            self._link(name, value, entity)
+        self._entries[entity] = entry
+
+    def remove(self, entity: DXFEntity) -> None:
+        """Remove `entity` from the indexes, ignores not indexed entities."""
+        entry = self._entries.pop(entity, None)
+        if entry is None:
+            return
+        self._unlink("dxftype", entry[1], entity)
+        for name, value in zip(self.ATTRIBUTES, entry[2:]):
+            self._unlink(name, value, entity)
+
+    def update(self, entity: DXFEntity, name: Optional[str] = None) -> None:
+        """Update the indexed value of the DXF attribute `name` or of all
+        indexed DXF attributes if `name` is ``None``, ignores not indexed
+        entities.
+        """
+        entry = self._entries.get(entity)
+        if entry is None:
+            return
+        names = self.ATTRIBUTES if name is None else (name,)
+        for name in names:
+            position = self.ATTRIBUTES.index(name) + 2
+            value = self._get_value(entity, name)
+            if value != entry[position]:
+                self._unlink(name, entry[position], entity)
+                self._link(name, value, entity)
+                entry[position] = value
+
+    def purge(self) -> None:
+        """Remove all destroyed entities from the indexes."""
+        for entity in [e for e in self._entries if not e.is_alive]:
+            self.remove(entity)
+
+    def values(self, name: str) -> list[Any]:
+        """Returns all indexed values of the DXF attribute `name`, `name` can
+        be "dxftype" or one of the indexed DXF attributes.
+        """
+        return list(self._indexes[name].keys())
+
+    def get(self, name: str, value: Any) -> set[DXFEntity]:
+        """Returns all entities which have the given `value` for the DXF
+        attribute `name`, `name` can be "dxftype" or one of the indexed DXF
+        attributes.
+        """
+        try:
+            return set(self._indexes[name].get(value, tuple()))
+        except TypeError:  # unhashable value
+            return set()
+
+    def select(
+        self, name: str, predicate: Callable[[Any], bool]
+    ) -> set[DXFEntity]:
+        """Returns all entities which have a value for the DXF attribute
+        `name` that satisfies the `predicate` function, `name` can be
+        "dxftype" or one of the indexed DXF attributes.
+        """
+        result: set[DXFEntity] = set()
+        for value, entities in self._indexes[name].items():
+            if predicate(value):
+                result.update(entities)
+        return result
+
+    def indexed_value(self, entity: DXFEntity, name: str) -> Any:
+        """Returns the indexed value of the DXF attribute `name` of `entity`.
+
+        Raises:
+            KeyError: `entity` is not indexed
+
+        """
+        entry = self._entries[entity]
+        if name == "dxftype":
+            return entry[1]
+        return entry[self.ATTRIBUTES.index(name) + 2]
+
+    def sort(self, entities: Iterable[DXFEntity]) -> list[DXFEntity]:
+        """Returns the indexed and alive `entities` in insertion order."""
+        entries = self._entries
+        return [
+            e
+            for e in sorted(
+                (e for e in entities if e in entries),
+                key=lambda e: entries[e][0],
+            )
+            if e.is_alive
+        ]
 
 
 class EntitySpace:
@@ -337,9 +745,29 @@ class EntitySpace:
         self.entities: list[DXFEntity] = (
             list(e for e in entities if e.is_alive) if entities else []
         )
+        # True if the entity space contains placeholders of lazy loaded entities:
+        self._has_lazy_entities = False
+
+    def load_lazy_entities(self) -> None:
+        """Replace all placeholders of lazy loaded entities by the loaded
+        DXF entities. (internal API)
+        """
+        if not self._has_lazy_entities:
+            return
+        # Reset the flag in advance, because loading an entity can call
+        # methods of this entity space, e.g. MTEXT columns remove themselves
+        # from the layout:
+        self._has_lazy_entities = False
+        for entity in [e for e in self.entities if isinstance(e, LazyEntity)]:
+            entity.load()
+        self.entities = [
+            e.entity if isinstance(e, LazyEntity) else e  # type: ignore
+            for e in self.entities
+        ]
 
     def __iter__(self) -> Iterator[DXFEntity]:
         """Iterable of all entities, filters destroyed entities."""
+        self.load_lazy_entities()
         return (e for e in self.entities if e.is_alive)
 
     def __getitem__(self, index) -> DXFEntity:
@@ -352,6 +780,7 @@ class EntitySpace:
         ``list[DXFEntity]``. Does not filter destroyed entities.
 
         """
+        self.load_lazy_entities()
         return self.entities[index]
 
     def __len__(self) -> int:
@@ -369,7 +798,10 @@ class EntitySpace:
 
     def add(self, entity: DXFEntity) -> None:
         """Add `entity`."""
-        assert isinstance(entity, DXFEntity), type(entity)
+        if isinstance(entity, LazyEntity):
+            self._has_lazy_entities = True
+        else:
+            assert isinstance(entity, DXFEntity), type(entity)
         assert entity.is_alive, "Can not store destroyed entities"
         self.entities.append(entity)
 
@@ -388,17 +820,30 @@ class EntitySpace:
 
     def remove(self, entity: DXFEntity) -> None:
         """Remove `entity`."""
-        self.entities.remove(entity)
+        self.load_lazy_entities()
+        try:
+            self.entities.remove(entity)
+        except ValueError:
+            # entity is removed while loading the placeholders of lazy loaded
+            # entities:
+            for index, e in enumerate(self.entities):
+                if isinstance(e, LazyEntity) and e.entity is entity:
+                    del self.entities[index]
+                    return
+            raise
 
     def clear(self) -> None:
         """Remove all entities."""
         # Do not destroy entities!
         self.entities = list()
+        self._has_lazy_entities = False
 
     def pop(self, index: int = -1) -> DXFEntity:
+        self.load_lazy_entities()
         return self.entities.pop(index)
 
     def insert(self, index: int, entity: DXFEntity) -> None:
+        self.load_lazy_entities()
         self.entities.insert(index, entity)
 
     def audit(self, auditor: Auditor) -> None:
@@ -69,7 +69,7 @@ def new(
     return doc
 
 
-def read(stream: TextIO) -> Drawing:
+def read(stream: TextIO, *, lazy: bool = False) -> Drawing:
     """Read a DXF document from a text-stream. Open stream in text mode
     (``mode='rt'``) and set correct text encoding, the stream requires at least
     a :meth:`readline` method.
@@ -85,6 +85,8 @@ def read(stream: TextIO) -> Drawing:
 
     Args:
         stream: input text stream opened with correct encoding
+        lazy: load the graphical entities of DXF R2000+ documents at the first
+            access
 
     Raises:
         DXFStructureError: for invalid or corrupted DXF structures
@@ -92,13 +94,17 @@ def read(stream: TextIO) -> Drawing:
     """
     from ezdxf.document import Drawing
 
-    return Drawing.read(stream)
+    return Drawing.read(stream, lazy=lazy)
 
 
 def readfile(
     filename: str | os.PathLike,
     encoding: Optional[str] = None,
     errors: str = "surrogateescape",
+    *,
+    workers: int = 1,
+    lazy: bool = False,
+    cache_dir: Optional[str | os.PathLike] = None,
 ) -> Drawing:
     """Read the DXF document `filename` from the file-system.
 
@@ -124,22 +130,50 @@ def readfile(
             - "ignore" to use the replacement char U+FFFD "\ufffd" for invalid data
             - "strict" to raise an :class:`UnicodeDecodeError` exception for invalid data
 
+        workers: count of worker processes to load ASCII DXF files in parallel,
+            1 loads the document by the main process (default), 0 uses all
+            available CPU cores, this option is ignored for Binary DXF files
+        lazy: load the graphical entities of DXF R2000+ documents at the first
+            access, this speeds up loading large documents if only some
+            entities are required
+        cache_dir: directory to store snapshots of loaded DXF documents,
+            restoring an unchanged DXF document from its snapshot is much
+            faster than loading the DXF file, see module :mod:`ezdxf.snapshot`,
+            never use untrusted cache directories!
+
     Raises:
         IOError: not a DXF file or file does not exist
         DXFStructureError: for invalid or corrupted DXF structures
         UnicodeDecodeError: if `errors` is "strict" and a decoding error occurs
 
     """
+    filename = str(filename)
+    if cache_dir is None:
+        return _readfile(filename, encoding, errors, workers, lazy)
+
+    from ezdxf import snapshot
+
+    # the parameters which change the content of the loaded document:
+    params = {"encoding": encoding, "errors": errors, "lazy": lazy}
+    doc = snapshot.load(cache_dir, filename, **params)
+    if doc is None:
+        doc = _readfile(filename, encoding, errors, workers, lazy)
+        snapshot.save(doc, cache_dir, filename, **params)
+    return doc
+
+
+def _readfile(
+    filename: str, encoding: Optional[str], errors: str, workers: int, lazy: bool
+) -> Drawing:
     from ezdxf.lldxf.validator import is_dxf_file, is_binary_dxf_file
     from ezdxf.tools.codepage import is_supported_encoding
     from ezdxf.lldxf.tagger import binary_tags_loader
 
-    filename = str(filename)
     if is_binary_dxf_file(filename):
         with open(filename, "rb") as fp:
             data = fp.read()
             loader = binary_tags_loader(data, errors=errors)
-            doc = Drawing.load(loader)
+            doc = Drawing.load(loader, lazy=lazy)
             doc.filename = filename
             return doc
 
@@ -150,8 +184,18 @@ def readfile(
     if encoding is not None:
         # override default encodings if absolute necessary
         info.encoding = encoding
-    with open(filename, mode="rt", encoding=info.encoding, errors=errors) as fp:  # type: ignore
-        doc = read(fp)  # type: ignore
+    if workers < 1:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        with open(filename, mode="rt", encoding=info.encoding, errors=errors) as fp:  # type: ignore
+            doc = read(fp, lazy=lazy)  # type: ignore
+    else:
+        from ezdxf.lldxf import parallel
+
+        sections = parallel.load_dxf_structure(
+            filename, info.encoding, errors=errors, workers=workers
+        )
+        doc = Drawing.from_section_dict(sections, lazy=lazy)
 
     doc.filename = filename
     if encoding is not None and is_supported_encoding(encoding):
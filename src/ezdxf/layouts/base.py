@@ -1,4 +1,4 @@
-# Copyright (c) 2019-2022, Manfred Moitzi
+# Copyright (c) 2019-2023, Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
 from typing import TYPE_CHECKING, Iterator, Union, Iterable, Optional
@@ -20,6 +20,8 @@ from ezdxf.graphicsfactory import CreatorInterface
 if TYPE_CHECKING:
     from ezdxf.entities import DXFGraphic, BlockRecord, ExtensionDict
     from ezdxf.eztypes import KeyFunc
+    from ezdxf.math import AbstractBoundingBox, UVec
+    from ezdxf.spatialindex import SpatialIndex
 
 SUPPORTED_FOREIGN_ENTITY_TYPES = {
     "ARC",
@@ -402,6 +404,43 @@ class BaseLayout(_AbstractLayout):
             return reorder.descending(self.entity_space, redraw_order)  # type: ignore
         return reorder.ascending(self.entity_space, redraw_order)  # type: ignore
 
+    def spatial_index(self) -> SpatialIndex:
+        """Returns the :class:`~ezdxf.spatialindex.SpatialIndex` of the
+        layout, the index is created at the first call.
+
+        The spatial index is updated automatically by the methods
+        :meth:`add_entity`, :meth:`unlink_entity`, :meth:`delete_entity` and
+        the transformation of entities, but not by the modification of DXF
+        attributes, call :meth:`SpatialIndex.update` for modified entities.
+
+        """
+        return self.block_record.get_spatial_index()
+
+    def discard_spatial_index(self) -> None:
+        """Discard the spatial index of the layout."""
+        self.block_record.discard_spatial_index()
+
+    def query_window(self, window: AbstractBoundingBox) -> EntityQuery:
+        """Returns all entities which bounding box intersects the given
+        `window`, only the x- and y-axis of the `window` are used.
+        Creates the spatial index of the layout at the first call.
+        """
+        return EntityQuery(self.spatial_index().query_window(window))
+
+    def query_point(self, point: UVec, radius: float = 0.0) -> EntityQuery:
+        """Returns all entities which bounding box has a distance less or
+        equal `radius` to the given `point`. Creates the spatial index of the
+        layout at the first call.
+        """
+        return EntityQuery(self.spatial_index().query_point(point, radius))
+
+    def nearest(self, point: UVec, k: int = 1) -> EntityQuery:
+        """Returns the `k` entities nearest to the given `point` ordered by
+        the distance of their bounding boxes to the `point`. Creates the
+        spatial index of the layout at the first call.
+        """
+        return EntityQuery(self.spatial_index().nearest(point, k))
+
 
 class VirtualLayout(_AbstractLayout):
     """Helper class to disassemble complex entities into basic DXF
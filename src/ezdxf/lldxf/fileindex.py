@@ -1,7 +1,9 @@
-# Copyright (c) 2020-2022, Manfred Moitzi
+# Copyright (c) 2020-2023, Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
-from typing import Iterable, NamedTuple, BinaryIO
+from typing import Iterable, Iterator, NamedTuple, BinaryIO
+from array import array
+from itertools import accumulate, chain
 
 from .const import DXFStructureError
 from ezdxf.tools.codepage import toencoding
@@ -156,3 +158,248 @@ def load(filename: str) -> FileStructure:
         file_structure.encoding = "utf-8"
     file_structure.index = index
     return file_structure
+
+
+def structure_locations(filename: str, block_size: int = 1 << 24) -> list[int]:
+    """Returns the file locations of all structure tags (group code 0) of the
+    DXF file `filename` in ascending order.
+
+    This is a fast scanner for ASCII DXF files, which reads the file in blocks
+    of `block_size` bytes and does not decode or validate the file content.
+
+    Args:
+        filename: file system file name
+        block_size: count of bytes to read at once
+
+    """
+    with open(filename, mode="rb") as file:
+        return _scan_structure_locations(
+            iter(lambda: file.read(block_size), b"")
+        )
+
+
+def _scan_structure_locations(blocks: Iterable[bytes]) -> list[int]:
+    locations: list[int] = []
+    offset: int = 0  # file location of the first line of the current block
+    line_count: int = 0  # count of processed lines
+    tail: bytes = b""
+    for block in blocks:
+        lines = (tail + block).split(b"\n")
+        # the last line may be incomplete:
+        tail = lines.pop()
+        # relative start locations of all lines without line endings:
+        starts = list(accumulate(map(len, lines), initial=0))
+        # group code lines have an even line index:
+        first = line_count & 1
+        locations.extend(
+            offset + starts[index] + index
+            for index in range(first, len(lines), 2)
+            if lines[index].strip() == b"0"
+        )
+        offset += starts[-1] + len(lines)
+        line_count += len(lines)
+    return locations
+
+
+class EntityIndex:
+    """Index of all DXF structure entities of an ASCII DXF file, stores the
+    file location, the DXF type, the handle and the owner handle of each
+    structure entity, including SECTION, ENDSEC, TABLE, ENDTAB and EOF.
+
+    The size of an entity in bytes is the distance to the location of the
+    following structure entity.
+
+    Attributes:
+        version: DXF version if header variable $ACADVER is present, default
+            is DXF R12
+        encoding: Python encoding required to decode the DXF document
+        dxftypes: DXF type of each structure entity
+        handles: DXF handle of each structure entity or an empty string
+        owners: owner handle of each structure entity or an empty string
+        locations: file location of each structure entity, the last entry is
+            the file size
+        sections: section name -> index of the SECTION entity
+        blocks: block name -> index of the BLOCK entity
+
+    """
+
+    def __init__(self) -> None:
+        self.version: str = "AC1009"
+        self.encoding: str = "cp1252"
+        self.dxftypes: list[str] = []
+        self.handles: list[str] = []
+        self.owners: list[str] = []
+        self.locations: array = array("q")
+        self.sections: dict[str, int] = {}
+        self.blocks: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.dxftypes)
+
+    def handle_map(self) -> dict[str, int]:
+        """Returns a dict which maps handles to entity indices."""
+        return {handle: index for index, handle in enumerate(self.handles) if handle}
+
+    def span(self, index: int) -> tuple[int, int]:
+        """Returns the (start, end) file location of the entity at `index`."""
+        return self.locations[index], self.locations[index + 1]
+
+    def block_range(self, name: str) -> tuple[int, int]:
+        """Returns the index range [start, stop) of all entities of the block
+        definition `name`, including the BLOCK and the ENDBLK entity.
+
+        Raises:
+            KeyError: block `name` does not exist
+
+        """
+        start = self.blocks[name]
+        stop = start + 1
+        dxftypes = self.dxftypes
+        count = len(dxftypes)
+        while stop < count and dxftypes[stop] != "ENDBLK":
+            stop += 1
+        return start, min(stop + 1, count)
+
+    def to_dict(self) -> dict:
+        """Returns the index as JSON serializable dict."""
+        return {
+            "version": self.version,
+            "encoding": self.encoding,
+            "dxftypes": self.dxftypes,
+            "handles": self.handles,
+            "owners": self.owners,
+            "locations": self.locations.tolist(),
+            "sections": self.sections,
+            "blocks": self.blocks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> EntityIndex:
+        """Returns the index from a dict created by :meth:`to_dict`."""
+        entity_index = cls()
+        entity_index.version = data["version"]
+        entity_index.encoding = data["encoding"]
+        entity_index.dxftypes = data["dxftypes"]
+        entity_index.handles = data["handles"]
+        entity_index.owners = data["owners"]
+        entity_index.locations = array("q", data["locations"])
+        entity_index.sections = data["sections"]
+        entity_index.blocks = data["blocks"]
+        return entity_index
+
+
+def entity_index(data: bytes) -> EntityIndex:
+    """Returns the :class:`EntityIndex` of the ASCII DXF document `data`.
+    The argument `data` can be a :class:`bytes` object or a memory-mapped file.
+
+    Only the first tags of each entity are scanned for the handle and the
+    owner handle, the remaining content is not decoded nor validated.
+
+    Raises:
+        DXFStructureError: Invalid or incomplete DXF file.
+
+    """
+    index = EntityIndex()
+    size = len(data)
+    locations = _structure_locations(data)
+    if not locations:
+        raise DXFStructureError("No DXF structure tags found.")
+    locations.append(size)
+    dxftypes = index.dxftypes
+    handles = index.handles
+    owners = index.owners
+    section = ""
+    for n in range(len(locations) - 1):
+        dxftype, handle, owner, name = _scan_entity(
+            data, locations[n], locations[n + 1]
+        )
+        if dxftype == "SECTION":
+            section = name
+            index.sections[name] = n
+            if name == "HEADER":
+                _scan_header(index, data, locations[n], locations[n + 1])
+        elif dxftype == "BLOCK" and section == "BLOCKS":
+            index.blocks[name] = n
+        dxftypes.append(dxftype)
+        handles.append(handle)
+        owners.append(owner)
+    if not dxftypes or dxftypes[-1] != "EOF":
+        raise DXFStructureError("Unexpected end of file.")
+    index.locations = array("q", locations)
+    if index.version >= "AC1021":  # R2007 and later
+        index.encoding = "utf-8"
+    return index
+
+
+def _structure_locations(data: bytes, block_size: int = 1 << 24) -> list[int]:
+    # Add a line ending to process the last line:
+    blocks = chain(
+        (data[start : start + block_size] for start in range(0, len(data), block_size)),
+        (b"\n",),
+    )
+    return _scan_structure_locations(blocks)
+
+
+def _lines(data: bytes, start: int, end: int) -> Iterator[bytes]:
+    find = data.find
+    while start < end:
+        stop = find(b"\n", start, end)
+        if stop < 0:
+            stop = end
+        yield data[start:stop].strip()
+        start = stop + 1
+
+
+def _scan_entity(data: bytes, start: int, end: int) -> tuple[str, str, str, str]:
+    """Returns the DXF type, the handle, the owner handle and the name of the
+    entity located between `start` and `end`. The name is only scanned for
+    SECTION and BLOCK entities.
+    """
+    lines = _lines(data, start, end)
+    next(lines)  # structure tag (0, ...)
+    dxftype = next(lines, b"").decode(errors="replace")
+    handle = ""
+    owner = ""
+    name = ""
+    handle_code = 105 if dxftype == "DIMSTYLE" else 5
+    requires_name = dxftype in ("SECTION", "BLOCK")
+    appdata = False
+    for code_line in lines:
+        value = next(lines, b"")
+        try:
+            code = int(code_line)
+        except ValueError:
+            raise DXFStructureError(f"Invalid group code near file location {start}")
+        if code == handle_code:
+            handle = value.decode(errors="replace")
+        elif code == 330:
+            if not appdata and not owner:
+                owner = value.decode(errors="replace")
+        elif code == 102:
+            appdata = value.startswith(b"{")
+        elif code == 2 and requires_name:
+            name = value.decode(errors="replace")
+            break
+        elif code == 100 and value != b"AcDbEntity" and not requires_name:
+            # the handle and the owner handle are located in front of the
+            # entity specific subclasses
+            break
+        elif code >= 1000:
+            break
+        if handle and owner and not requires_name:
+            break
+    return dxftype, handle, owner, name
+
+
+def _scan_header(index: EntityIndex, data: bytes, start: int, end: int) -> None:
+    lines = _lines(data, start, end)
+    for code_line in lines:
+        value = next(lines, b"")
+        if code_line != b"9":
+            continue
+        if value == b"$ACADVER":
+            next(lines, None)
+            index.version = next(lines, b"").decode()
+        elif value == b"$DWGCODEPAGE":
+            next(lines, None)
+            index.encoding = toencoding(next(lines, b"").decode())
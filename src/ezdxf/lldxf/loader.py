@@ -1,11 +1,11 @@
-# Copyright (c) 2018-2022, Manfred Moitzi
+# Copyright (c) 2018-2023, Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
 import logging
-from typing import Iterable, TYPE_CHECKING, Optional
+from typing import Iterable, TYPE_CHECKING, Optional, Iterator
 from collections import OrderedDict
 
-from .const import DXFStructureError
+from .const import DXFStructureError, DXFValueError
 from .tags import group_tags, DXFTag, Tags
 from .extendedtags import ExtendedTags
 from ezdxf.entities import factory
@@ -69,6 +69,27 @@ def load_dxf_structure(
         dict of sections, each section is a list of DXF structure entities
         as Tags() objects
 
+    """
+    return load_dxf_structure_entities(group_tags(tagger), ignore_missing_eof)
+
+
+def load_dxf_structure_entities(
+    entities: Iterable[Tags], ignore_missing_eof: bool = False
+) -> SectionDict:
+    """Divide input stream of DXF structure entities into sections.
+    Each DXF structure entity is a :class:`Tags` object starting with a DXF
+    structure (0, ...) tag, see :func:`load_dxf_structure`.
+
+    Args:
+        entities: DXF structure entities as Tags() objects, e.g. created by
+            :func:`group_tags`
+        ignore_missing_eof: raises DXFStructureError() if False and EOF tag is
+            not present, set to True only in tests
+
+    Returns:
+        dict of sections, each section is a list of DXF structure entities
+        as Tags() objects
+
     """
 
     def inside_section() -> bool:
@@ -88,7 +109,7 @@ def load_dxf_structure(
     # DXF file, to load messy DXF files exist an (future) add-on
     # called 'recover'.
 
-    for entity in group_tags(tagger):
+    for entity in entities:
         tag = entity[0]
         if tag == (0, "SECTION"):
             if inside_section():
@@ -138,12 +159,27 @@ def load_dxf_entities(
         yield factory.load(ExtendedTags(entity), doc)
 
 
-def load_and_bind_dxf_content(sections: dict, doc: Drawing) -> None:
+def load_and_bind_dxf_content(
+    sections: dict, doc: Drawing, lazy: bool = False
+) -> None:
+    """Load and bind the DXF entities of the DXF structure `sections` to the
+    DXF document `doc`.
+
+    In `lazy` mode the graphical entities of the ENTITIES and the BLOCKS
+    section are bound as placeholders (:class:`~ezdxf.entitydb.LazyEntity`),
+    which store the raw DXF tags and load the DXF entity at the first access.
+
+    """
     # HEADER has no database entries.
     db = doc.entitydb
     for name in ["TABLES", "CLASSES", "ENTITIES", "BLOCKS", "OBJECTS"]:
         if name in sections:
             section = sections[name]
+            if lazy and name in LAZY_SECTIONS:
+                sections[name] = _bind_lazy_dxf_entities(
+                    section, doc, link_first=(name == "BLOCKS")
+                )
+                continue
             for index, entity in enumerate(load_dxf_entities(section, doc)):
                 handle = entity.dxf.get("handle")
                 if handle and handle in db:
@@ -154,3 +190,77 @@ def load_and_bind_dxf_content(sections: dict, doc: Drawing) -> None:
                 section[index] = entity
                 # Bind entities to the DXF document:
                 factory.bind(entity, doc)
+
+
+LAZY_SECTIONS = {"ENTITIES", "BLOCKS"}
+
+# These entities are always loaded at once:
+EAGER_ENTITIES = {
+    "SECTION",
+    "BLOCK",
+    "ENDBLK",
+    "VIEWPORT",  # required to set up the paperspace layouts
+    "VERTEX",  # orphaned sub-entities
+    "ATTRIB",
+    "SEQEND",
+}
+
+
+def _bundle_linked_entities(section: list[Tags]) -> Iterator[list[Tags]]:
+    """Yields the DXF structure entities of `section` as lists of tags,
+    the main entities POLYLINE and INSERT (with following ATTRIB entities) are
+    bundled with their sub-entities VERTEX, ATTRIB and the final SEQEND.
+    """
+    index = 0
+    count = len(section)
+    while index < count:
+        tags = section[index]
+        index += 1
+        bundle = [tags]
+        dxftype = tags[0].value
+        if dxftype == "POLYLINE" or (
+            dxftype == "INSERT" and tags.get_first_value(66, 0)
+        ):
+            # The entity linker checks the structure of the sub-entities at
+            # loading:
+            while index < count:
+                tags = section[index]
+                index += 1
+                bundle.append(tags)
+                if tags[0].value == "SEQEND":
+                    break
+        yield bundle
+
+
+def _has_handle(tags: Tags) -> bool:
+    try:
+        tags.get_handle()
+    except DXFValueError:
+        return False
+    return True
+
+
+def _bind_lazy_dxf_entities(
+    section: list[Tags], doc: Drawing, link_first: bool
+) -> list:
+    from ezdxf.entitydb import LazyEntity
+
+    db = doc.entitydb
+    content: list = []
+    for bundle in _bundle_linked_entities(section):
+        main_entity = bundle[0]
+        # DXF entities without handles are loaded at once:
+        if main_entity[0].value in EAGER_ENTITIES or not _has_handle(main_entity):
+            for entity in load_dxf_entities(bundle, doc):
+                factory.bind(entity, doc)
+                content.append(entity)
+            continue
+        lazy_entity = LazyEntity(bundle, doc, link_first)
+        for handle in lazy_entity.handles:
+            if handle in db:
+                logger.warning(
+                    f"Found non-unique entity handle #{handle}, data validation is required."
+                )
+        db.add_lazy_entity(lazy_entity)
+        content.append(lazy_entity)
+    return content
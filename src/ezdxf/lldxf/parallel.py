@@ -0,0 +1,198 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+"""
+Parallel loading of the DXF structure of ASCII DXF files.
+
+The file is scanned by the function :func:`ezdxf.lldxf.fileindex.structure_locations`
+to get the file locations of all structure tags (group code 0). The file is split
+at these locations into chunks of similar size, the chunks are decoded and compiled
+into DXF structure entities by a pool of worker processes and the results are
+merged in file order into a single section dict by the main process.
+
+The creation of the DXF entities and binding them to the document is done by
+the main process, therefore the entity handles and owner handles are the same
+as for the sequential loading process. The creation of the DXF entities is
+not parallelized and limits the achievable speedup.
+
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Sequence, Iterable, Iterator, Any, Tuple, List
+from array import array
+import bisect
+import concurrent.futures
+import io
+import os
+from itertools import chain
+
+from .tags import group_tags, Tags
+from .types import DXFTag, DXFVertex, DXFBinaryTag, POINT_CODES, BINARY_DATA
+from .tagger import ascii_tags_loader, tag_compiler
+from . import fileindex
+from . import loader
+
+if TYPE_CHECKING:
+    from ezdxf.eztypes import SectionDict
+
+__all__ = ["load_dxf_structure", "split_locations"]
+
+# Split the file into more chunks than workers for a better load balancing:
+CHUNKS_PER_WORKER = 4
+# Do not start worker processes for small files:
+MIN_CHUNK_SIZE = 1 << 20  # 1MB
+SPECIAL_CODES = POINT_CODES | BINARY_DATA
+# Structure tag appended to each chunk, the tag compiler requires a tag after
+# the last point tag of a chunk to detect the end of the point:
+CHUNK_END = DXFTag(0, "EOC")
+
+
+def split_locations(
+    locations: Sequence[int], size: int, count: int
+) -> list[tuple[int, int]]:
+    """Returns the (start, end) file locations of max. `count` chunks of
+    similar size for a file of `size` bytes.
+
+    The chunks are split only at the given `locations`, which have to be
+    the file locations of structure tags (group code 0) in ascending order.
+    The first chunk starts always at location 0 and the last chunk ends always
+    at location `size`, so the chunks cover the whole file.
+
+    Args:
+        locations: ascending file locations of structure tags
+        size: file size in bytes
+        count: max. count of chunks
+
+    """
+    if count < 2 or len(locations) < 2:
+        return [(0, size)]
+    step = size / count
+    split_points: list[int] = []
+    for n in range(1, count):
+        index = bisect.bisect_left(locations, step * n)
+        if index >= len(locations):
+            break
+        location = locations[index]
+        if location == 0:
+            continue
+        if not split_points or split_points[-1] < location:
+            split_points.append(location)
+    starts = [0] + split_points
+    ends = split_points + [size]
+    return list(zip(starts, ends))
+
+
+def load_chunk(
+    filename: str, start: int, end: int, encoding: str, errors: str
+) -> list[Tags]:
+    """Load the DXF structure entities located in the file `filename` between
+    the file locations `start` and `end`.
+    """
+    with open(filename, mode="rb") as fp:
+        fp.seek(start)
+        data = fp.read(end - start)
+    stream = io.StringIO(data.decode(encoding, errors=errors), newline=None)
+    tags = chain(ascii_tags_loader(stream), (CHUNK_END,))
+    entities = list(group_tags(tag_compiler(tags)))
+    entities.pop()  # remove CHUNK_END structure
+    return entities
+
+
+PackedEntities = Tuple["array[int]", List[Any], "array[int]"]
+
+
+def pack_entities(entities: Iterable[Tags]) -> PackedEntities:
+    """Returns the DXF structure entities as flat group code and value
+    containers and the tag count of each entity. Transferring these
+    containers between processes is much faster than pickling DXFTag
+    objects.
+    """
+    codes = array("i")
+    values: list[Any] = []
+    lengths = array("i")
+    for entity in entities:
+        lengths.append(len(entity))
+        for tag in entity:
+            codes.append(tag.code)
+            values.append(tag.value)
+    return codes, values, lengths
+
+
+def unpack_entities(packed: PackedEntities) -> Iterator[Tags]:
+    """Yields the DXF structure entities packed by :func:`pack_entities`."""
+    codes, values, lengths = packed
+    start = 0
+    for length in lengths:
+        end = start + length
+        yield Tags(
+            [
+                (
+                    DXFTag(code, value)
+                    if code not in SPECIAL_CODES
+                    else (
+                        DXFVertex(code, value)
+                        if code in POINT_CODES
+                        else DXFBinaryTag(code, value)
+                    )
+                )
+                for code, value in zip(codes[start:end], values[start:end])
+            ]
+        )
+        start = end
+
+
+def load_packed_chunk(
+    filename: str, start: int, end: int, encoding: str, errors: str
+) -> PackedEntities:
+    """Load and pack the DXF structure entities located in the file
+    `filename` between the file locations `start` and `end`.
+    This function is executed by the worker processes.
+    """
+    return pack_entities(load_chunk(filename, start, end, encoding, errors))
+
+
+def load_dxf_structure(
+    filename: str,
+    encoding: str,
+    errors: str = "surrogateescape",
+    workers: int = 0,
+) -> SectionDict:
+    """Load the DXF structure of the ASCII DXF file `filename` by a pool of
+    `workers` processes. Returns the same section dict as the function
+    :func:`ezdxf.lldxf.loader.load_dxf_structure`.
+
+    Args:
+        filename: file system name of an ASCII DXF file
+        encoding: text encoding of the DXF file
+        errors: specify decoding error handler
+        workers: count of worker processes, 0 for the count of available
+            CPU cores
+
+    Raises:
+        DXFStructureError: invalid or corrupted DXF structures
+
+    """
+    if workers < 1:
+        workers = os.cpu_count() or 1
+    size = os.path.getsize(filename)
+    count = min(workers * CHUNKS_PER_WORKER, size // MIN_CHUNK_SIZE)
+    if count > 1:
+        chunks = split_locations(
+            fileindex.structure_locations(filename), size, count
+        )
+    else:
+        chunks = [(0, size)]
+
+    if workers < 2 or len(chunks) < 2:
+        entities = chain.from_iterable(
+            load_chunk(filename, start, end, encoding, errors)
+            for start, end in chunks
+        )
+        return loader.load_dxf_structure_entities(entities)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(load_packed_chunk, filename, start, end, encoding, errors)
+            for start, end in chunks
+        ]
+        results = [future.result() for future in futures]
+    entities = chain.from_iterable(unpack_entities(packed) for packed in results)
+    return loader.load_dxf_structure_entities(entities)
@@ -1,4 +1,4 @@
-# Copyright (c) 2016-2022, Manfred Moitzi
+# Copyright (c) 2016-2023, Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
 from typing import Iterable, TextIO, Iterator, Any, Optional
@@ -18,6 +18,7 @@ from .types import (
 )
 from .const import DXFStructureError
 from ezdxf.tools.codepage import toencoding
+from ezdxf.acc import USE_C_EXT
 
 
 def internal_tag_compiler(s: str) -> Iterable[DXFTag]:
@@ -134,6 +135,44 @@ def ascii_tags_loader(
             return
 
 
+def scan_binary_dxf_params(data: bytes) -> tuple[str, str]:
+    """Returns the text encoding and the DXF version of binary DXF `data`.
+    (internal API)
+    """
+    dxfversion = "AC1009"
+    encoding = "cp1252"
+    try:
+        # Limit search to first 1024 bytes - an arbitrary number
+        # start index for 1-byte group code
+        start = data.index(b"$ACADVER", 22, 1024) + 10
+    except ValueError:
+        pass  # HEADER var $ACADVER not present
+    else:
+        if data[start] != 65:  # not 'A' = 2-byte group code
+            start += 1
+        dxfversion = data[start: start + 6].decode()
+
+    if dxfversion >= "AC1021":
+        encoding = "utf8"
+    else:
+        try:
+            # Limit search to first 1024 bytes - an arbitrary number
+            # start index for 1-byte group code
+            start = data.index(b"$DWGCODEPAGE", 22, 1024) + 14
+        except ValueError:
+            pass  # HEADER var $DWGCODEPAGE not present
+        else:  # name schema is 'ANSI_xxxx'
+            if data[start] != 65:  # not 'A' = 2-byte group code
+                start += 1
+            end = start + 5
+            while data[end] != 0:
+                end += 1
+            codepage = data[start:end].decode()
+            encoding = toencoding(codepage)
+
+    return encoding, dxfversion
+
+
 def binary_tags_loader(
     data: bytes, errors: str = "surrogateescape"
 ) -> Iterator[DXFTag]:
@@ -159,41 +198,7 @@ def binary_tags_loader(
     if data[:22] != b"AutoCAD Binary DXF\r\n\x1a\x00":
         raise DXFStructureError("Not a binary DXF data structure.")
 
-    def scan_params():
-        dxfversion = "AC1009"
-        encoding = "cp1252"
-        try:
-            # Limit search to first 1024 bytes - an arbitrary number
-            # start index for 1-byte group code
-            start = data.index(b"$ACADVER", 22, 1024) + 10
-        except ValueError:
-            pass  # HEADER var $ACADVER not present
-        else:
-            if data[start] != 65:  # not 'A' = 2-byte group code
-                start += 1
-            dxfversion = data[start: start + 6].decode()
-
-        if dxfversion >= "AC1021":
-            encoding = "utf8"
-        else:
-            try:
-                # Limit search to first 1024 bytes - an arbitrary number
-                # start index for 1-byte group code
-                start = data.index(b"$DWGCODEPAGE", 22, 1024) + 14
-            except ValueError:
-                pass  # HEADER var $DWGCODEPAGE not present
-            else:  # name schema is 'ANSI_xxxx'
-                if data[start] != 65:  # not 'A' = 2-byte group code
-                    start += 1
-                end = start + 5
-                while data[end] != 0:
-                    end += 1
-                codepage = data[start:end].decode()
-                encoding = toencoding(codepage)
-
-        return encoding, dxfversion
-
-    encoding, dxfversion = scan_params()
+    encoding, dxfversion = scan_binary_dxf_params(data)
     r12 = dxfversion <= "AC1009"
     index: int = 22
     data_length: int = len(data)
@@ -348,3 +353,19 @@ def tag_compiler(tags: Iterator[DXFTag]) -> Iterator[DXFTag]:
                         raise DXFStructureError(error_msg(x))
         except StopIteration:
             return
+
+
+# The Python implementations are always available by these names:
+py_ascii_tags_loader = ascii_tags_loader
+py_tag_compiler = tag_compiler
+py_binary_tags_loader = binary_tags_loader
+
+if USE_C_EXT:
+    try:
+        from ezdxf.acc.tagger import (  # type: ignore
+            ascii_tags_loader,
+            tag_compiler,
+            binary_tags_loader,
+        )
+    except ImportError:
+        pass
@@ -1,4 +1,4 @@
-# Copyright (c) 2012-2022, Manfred Moitzi
+# Copyright (c) 2012-2023, Manfred Moitzi
 # License: MIT License
 """
 B-Splines
@@ -26,6 +26,9 @@ from typing import (
     Optional,
 )
 import math
+
+import numpy as np
+
 from ezdxf.math import (
     Vec3,
     UVec,
@@ -56,6 +59,9 @@ if TYPE_CHECKING:
 USE_BANDED_MATRIX_SOLVER_CPYTHON_LIMIT = 15
 USE_BANDED_MATRIX_SOLVER_PYPY_LIMIT = 60
 
+# Max. subdivision level of the adaptive flattening for each initial segment:
+MAX_FLATTENING_LEVEL = 16
+
 __all__ = [
     # High level functions:
     "fit_points_to_cad_cv",
@@ -1055,10 +1061,13 @@ class BSpline:
         return linspace(lower_bound, upper_bound, segments + 1)
 
     def flattening(self, distance: float, segments: int = 4) -> Iterator[Vec3]:
-        """Adaptive recursive flattening. The argument `segments` is the
-        minimum count of approximation segments between two knots, if the
-        distance from the center of the approximation segment to the curve is
-        bigger than `distance` the segment will be subdivided.
+        """Adaptive flattening. The argument `segments` is the minimum count of
+        approximation segments between two knots, if the distance from the
+        center of the approximation segment to the curve is bigger than
+        `distance` the segment will be subdivided.
+
+        All segments of a subdivision level are evaluated at once by
+        :meth:`np_points`.
 
         Args:
             distance: maximum distance from the projected curve point onto the
@@ -1066,21 +1075,39 @@ class BSpline:
             segments: minimum segment count between two knots
 
         """
-
-        def subdiv(s: Vec3, e: Vec3, start_t: float, end_t: float):
+        params = np.array(self._flattening_params(segments), dtype=np.float64)
+        points = self.np_points(params)
+        result_params = [params[:1]]
+        result_points = [points[:1]]
+        start_t = params[:-1]
+        end_t = params[1:]
+        start_points = points[:-1]
+        end_points = points[1:]
+        for _ in range(MAX_FLATTENING_LEVEL):
+            if len(start_t) == 0:
+                break
             mid_t = (start_t + end_t) * 0.5
-            m = evaluator.point(mid_t)
-            try:
-                _dist = distance_point_line_3d(m, s, e)
-            except ZeroDivisionError:  # s == e
-                _dist = 0
-            if _dist < distance:
-                yield e
-            else:
-                yield from subdiv(s, m, start_t, mid_t)
-                yield from subdiv(m, e, mid_t, end_t)
-
-        evaluator = self.evaluator
+            mid_points = self.np_points(mid_t)
+            distances = _np_distance_point_line(mid_points, start_points, end_points)
+            done = distances < distance
+            result_params.append(end_t[done])
+            result_points.append(end_points[done])
+            split = ~done
+            mid_t = mid_t[split]
+            mid_points = mid_points[split]
+            start_t = np.concatenate((start_t[split], mid_t))
+            end_t = np.concatenate((mid_t, end_t[split]))
+            start_points = np.concatenate((start_points[split], mid_points))
+            end_points = np.concatenate((mid_points, end_points[split]))
+        result_params.append(end_t)
+        result_points.append(end_points)
+
+        # The curve parameters are ascending along the curve:
+        order = np.argsort(np.concatenate(result_params), kind="stable")
+        for x, y, z in np.concatenate(result_points)[order].tolist():
+            yield Vec3(x, y, z)
+
+    def _flattening_params(self, segments: int) -> list[float]:
         knots: list[float] = self.knots()  # type: ignore
         if self.is_clamped:
             lower_bound = 0.0
@@ -1091,18 +1118,16 @@ class BSpline:
         knots = list(set(knots))
         knots.sort()
         t = lower_bound
-        start_point = evaluator.point(t)
-        yield start_point
+        params = [t]
         for t1 in knots[1:]:
             delta = (t1 - t) / segments
             while t < t1:
                 next_t = t + delta
                 if math.isclose(next_t, t1):
                     next_t = t1
-                end_point = evaluator.point(next_t)
-                yield from subdiv(start_point, end_point, t, next_t)
+                params.append(next_t)
                 t = next_t
-                start_point = end_point
+        return params
 
     def point(self, t: float) -> Vec3:
         """Returns point  for parameter `t`.
@@ -1153,6 +1178,101 @@ class BSpline:
         """
         return self.evaluator.derivatives(t, n)
 
+    def np_points(self, t: Iterable[float] | np.ndarray) -> np.ndarray:
+        """Returns the points for parameter vector `t` as ndarray of shape (n, 3).
+        The basis functions are evaluated for all parameters at once by
+        vectorized numpy operations.
+
+        Args:
+            t: parameters in range [0, max_t]
+
+        .. versionadded:: 1.1
+
+        """
+        u = self._np_params(t)
+        if len(u) == 0:
+            return np.empty((0, 3), dtype=np.float64)
+        basis = self._basis
+        knots = np.array(basis.knots, dtype=np.float64)
+        order = basis.order
+        spans = _np_find_spans(knots, order, self.count, u)
+        nbasis = _np_basis_funcs(knots, order, spans, u)
+        indices = self._np_indices(spans)
+        if basis.is_rational:
+            products = nbasis * np.array(basis.weights, dtype=np.float64)[indices]
+            total = products.sum(axis=1)
+            nbasis = np.zeros_like(products)
+            valid = total != 0.0
+            nbasis[valid] = products[valid] / total[valid, np.newaxis]
+        control_points = self._np_control_points()[indices]
+        return np.einsum("mi,mic->mc", nbasis, control_points)
+
+    def np_derivatives(
+        self, t: Iterable[float] | np.ndarray, n: int = 2
+    ) -> np.ndarray:
+        """Returns the points and derivatives up to `n` <= degree for parameter
+        vector `t` as ndarray of shape (count of parameters, n + 1, 3).
+        The basis functions and their derivatives are evaluated for all
+        parameters at once by vectorized numpy operations.
+
+        e.g. n=1 returns point and 1st derivative.
+
+        Args:
+            t: parameters in range [0, max_t]
+            n: compute all derivatives up to n <= degree
+
+        .. versionadded:: 1.1
+
+        """
+        basis = self._basis
+        n = max(min(int(n), basis.degree), 0)
+        u = self._np_params(t)
+        if len(u) == 0:
+            return np.empty((0, n + 1, 3), dtype=np.float64)
+        knots = np.array(basis.knots, dtype=np.float64)
+        order = basis.order
+        spans = _np_find_spans(knots, order, self.count, u)
+        derivatives = _np_basis_funcs_derivatives(knots, order, spans, u, n)
+        indices = self._np_indices(spans)
+        control_points = self._np_control_points()[indices]
+        if not basis.is_rational:
+            return np.einsum("mki,mic->mkc", derivatives, control_points)
+
+        # Source: The NURBS Book: Algorithm A3.2 and A4.2
+        # Homogeneous point representation required: (x*w, y*w, z*w, w)
+        weighted = derivatives * np.array(basis.weights, dtype=np.float64)[
+            indices
+        ][:, np.newaxis, :]
+        ckw = np.einsum("mki,mic->mkc", weighted, control_points)
+        wders = weighted.sum(axis=2)
+        ck = np.empty_like(ckw)
+        for k in range(n + 1):
+            v = ckw[:, k]
+            for i in range(1, k + 1):
+                v = v - linalg.binomial_coefficient(k, i) * wders[
+                    :, i, np.newaxis
+                ] * ck[:, k - i]
+            ck[:, k] = v / wders[:, 0, np.newaxis]
+        return ck
+
+    def _np_params(self, t: Iterable[float] | np.ndarray) -> np.ndarray:
+        if isinstance(t, np.ndarray):
+            u = t.astype(np.float64).ravel()
+        else:
+            u = np.fromiter(t, dtype=np.float64)
+        max_t = self.max_t
+        return np.where(np.isclose(u, max_t, rtol=1e-9, atol=0.0), max_t, u)
+
+    def _np_indices(self, spans: np.ndarray) -> np.ndarray:
+        # Indices of the control points of each span, negative indices of
+        # parameters below the lower bound of unclamped splines wrap around
+        # like the indices of the scalar evaluator:
+        p = self.degree
+        return (spans[:, np.newaxis] - p + np.arange(p + 1)) % self.count
+
+    def _np_control_points(self) -> np.ndarray:
+        return np.array([v.xyz for v in self._control_points], dtype=np.float64)
+
     def insert_knot(self, t: float) -> BSpline:
         """Insert an additional knot, without altering the shape of the curve.
         Returns a new :class:`BSpline` object.
@@ -1295,9 +1415,10 @@ class BSpline:
 
         """
         if segments is None:
-            points = list(self.points(self.approximation_params(level)))
+            params = self.approximation_params(level)
         else:
-            points = list(self.approximate(segments))
+            params = list(self.params(segments))
+        points = Vec3.list(self.np_points(params).tolist())
         from .bezier_interpolation import cubic_bezier_interpolation
 
         return cubic_bezier_interpolation(points)
@@ -1323,6 +1444,117 @@ class BSpline:
         return params
 
 
+def _np_find_spans(
+    knots: np.ndarray, order: int, count: int, u: np.ndarray
+) -> np.ndarray:
+    # Vectorized Basis.find_span()
+    p = order - 1
+    if knots[p] == 0.0:  # common clamped spline
+        spans = np.searchsorted(knots[p:count], u, side="right") + (p - 1)
+    else:  # same result as the linear search
+        spans = np.searchsorted(knots[:count], u, side="right") - 1
+    spans[u >= knots[count]] = count - 1
+    return spans
+
+
+def _np_basis_funcs(
+    knots: np.ndarray, order: int, spans: np.ndarray, u: np.ndarray
+) -> np.ndarray:
+    # Vectorized Basis.basis_funcs() without weighting.
+    # Source: The NURBS Book: Algorithm A2.2
+    size = len(u)
+    nbasis = np.zeros((size, order))
+    left = np.zeros((size, order))
+    right = np.zeros((size, order))
+    nbasis[:, 0] = 1.0
+    for j in range(1, order):
+        left[:, j] = u - knots[np.maximum(0, spans + 1 - j)]
+        right[:, j] = knots[spans + j] - u
+        saved = np.zeros(size)
+        for r in range(j):
+            temp = nbasis[:, r] / (right[:, r + 1] + left[:, j - r])
+            nbasis[:, r] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        nbasis[:, j] = saved
+    return nbasis
+
+
+def _np_basis_funcs_derivatives(
+    knots: np.ndarray, order: int, spans: np.ndarray, u: np.ndarray, n: int
+) -> np.ndarray:
+    # Vectorized Basis.basis_funcs_derivatives(), returns an array of
+    # shape (count of parameters, n + 1, order).
+    # Source: The NURBS Book: Algorithm A2.3
+    size = len(u)
+    p = order - 1
+    left = np.ones((size, order))
+    right = np.ones((size, order))
+    ndu = np.ones((size, order, order))
+    for j in range(1, order):
+        left[:, j] = u - knots[np.maximum(0, spans + 1 - j)]
+        right[:, j] = knots[spans + j] - u
+        saved = np.zeros(size)
+        for r in range(j):
+            # lower triangle
+            ndu[:, j, r] = right[:, r + 1] + left[:, j - r]
+            temp = ndu[:, r, j - 1] / ndu[:, j, r]
+            # upper triangle
+            ndu[:, r, j] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        ndu[:, j, j] = saved
+
+    derivatives = np.zeros((size, n + 1, order))
+    derivatives[:, 0, :] = ndu[:, :, p]
+    a = np.ones((2, size, order))
+    for r in range(order):
+        s1 = 0
+        s2 = 1
+        a[0, :, 0] = 1.0
+        for k in range(1, n + 1):
+            d = np.zeros(size)
+            rk = r - k
+            pk = p - k
+            if r >= k:
+                a[s2, :, 0] = a[s1, :, 0] / ndu[:, pk + 1, rk]
+                d = a[s2, :, 0] * ndu[:, rk, pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k - 1 if (r - 1) <= pk else p - r
+            for j in range(j1, j2 + 1):
+                a[s2, :, j] = (a[s1, :, j] - a[s1, :, j - 1]) / ndu[:, pk + 1, rk + j]
+                d = d + a[s2, :, j] * ndu[:, rk + j, pk]
+            if r <= pk:
+                a[s2, :, k] = -a[s1, :, k - 1] / ndu[:, pk + 1, r]
+                d = d + a[s2, :, k] * ndu[:, r, pk]
+            derivatives[:, k, r] = d
+            s1, s2 = s2, s1
+
+    factor = float(p)
+    for k in range(1, n + 1):
+        derivatives[:, k, :] *= factor
+        factor *= p - k
+    return derivatives
+
+
+def _np_distance_point_line(
+    points: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    # Vectorized distance_point_line_3d(), returns 0 for degenerated lines.
+    chords = ends - starts
+    v1 = points - starts
+    chord_length2 = np.einsum("ij,ij->i", chords, chords)
+    degenerated = np.all(
+        np.abs(chords)
+        <= np.maximum(1e-9 * np.maximum(np.abs(starts), np.abs(ends)), 1e-12),
+        axis=1,
+    )
+    chord_length2[degenerated] = 1.0
+    projection = np.einsum("ij,ij->i", v1, chords)
+    diff = np.einsum("ij,ij->i", v1, v1) - projection * projection / chord_length2
+    distances = np.sqrt(np.maximum(diff, 0.0))
+    distances[degenerated] = 0.0
+    return distances
+
+
 def subdivide_params(p: list[float]) -> Iterable[float]:
     for i in range(len(p) - 1):
         yield p[i]
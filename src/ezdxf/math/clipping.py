@@ -1,8 +1,18 @@
-#  Copyright (c) 2021-2022, Manfred Moitzi
+#  Copyright (c) 2021-2023, Manfred Moitzi
 #  License: MIT License
 from __future__ import annotations
-from typing import Iterable, Sequence, Optional, Iterator, Union, Callable
-from typing_extensions import Protocol
+from typing import (
+    Iterable,
+    Sequence,
+    Optional,
+    Iterator,
+    Union,
+    Callable,
+    Tuple,
+    Dict,
+    List,
+)
+from typing_extensions import Protocol, TypeAlias
 from ezdxf.math import (
     Vec2,
     UVec,
@@ -12,12 +22,24 @@ from ezdxf.math import (
     TOLERANCE,
     BoundingBox2d,
 )
+from ezdxf.math.rtree import intersecting_pairs
+import collections
 import enum
+import functools
+import math
+
+import numpy as np
 
 __all__ = [
     "greiner_hormann_union",
     "greiner_hormann_difference",
     "greiner_hormann_intersection",
+    "polygon_union",
+    "polygon_difference",
+    "polygon_intersection",
+    "polygon_xor",
+    "polygon_boolean",
+    "BooleanOperation",
     "cohen_sutherland_line_clipping_2d",
     "Clipping",
     "ClippingPolygon2d",
@@ -190,6 +212,11 @@ class ClippingRect2d:
             ccw_check=False,
         )
 
+    @property
+    def bbox(self) -> BoundingBox2d:
+        """Returns the clipping rectangle as :class:`BoundingBox2d`."""
+        return BoundingBox2d((self._bbox.extmin, self._bbox.extmax))
+
     def clip_polygon(self, polygon: Iterable[Vec2]) -> Sequence[Vec2]:
         """Returns the clipped polygon."""
         return self._clipping_polygon.clip_polygon(polygon)
@@ -558,6 +585,7 @@ class BooleanOperation(enum.Enum):
     UNION = "union"
     DIFFERENCE = "difference"
     INTERSECTION = "intersection"
+    XOR = "xor"
 
 
 def greiner_hormann_intersection(
@@ -708,3 +736,524 @@ def cohen_sutherland_line_clipping_2d(
             x1 = x
             y1 = y
             code1 = encode(x1, y1)
+
+
+# Sweep-line polygon boolean engine:
+# All vertices are snapped to an integer grid of size `abs_tol` and all
+# geometric predicates are evaluated by exact integer arithmetic.
+# 1. split all edges by snap rounding at intersection points, touching vertices
+#    and collinear overlaps, coincident edges are merged and their winding
+#    contributions added
+# 2. sweep from left to right over the non-crossing edges and determine the
+#    winding numbers of both operands on each side of each edge
+# 3. edges with different results of the boolean operation on both sides are
+#    boundary edges, oriented with the result area on the left side
+# 4. link boundary edges to closed rings
+
+_IntPoint: TypeAlias = Tuple[int, int]
+# canonical edge: (left, right) or (bottom, top) for vertical edges
+_Edge: TypeAlias = Tuple[_IntPoint, _IntPoint]
+# winding number contributions of the subject and the clipping polygons
+_Winding: TypeAlias = Tuple[int, int]
+
+_NO_WINDING: _Winding = (0, 0)
+_OPERATIONS: Dict[BooleanOperation, Callable[[bool, bool], bool]] = {
+    BooleanOperation.UNION: lambda a, b: a or b,
+    BooleanOperation.DIFFERENCE: lambda a, b: a and not b,
+    BooleanOperation.INTERSECTION: lambda a, b: a and b,
+    BooleanOperation.XOR: lambda a, b: a != b,
+}
+
+
+def polygon_union(
+    subject: Iterable[Iterable[UVec]],
+    clip: Iterable[Iterable[UVec]] = tuple(),
+    *,
+    nonzero=False,
+    abs_tol: float = TOLERANCE,
+) -> list[list[Vec2]]:
+    """Returns the UNION of the polygons `subject` | `clip`. Resolves the
+    overlapping and self-intersecting parts of `subject` if `clip` is empty.
+
+    See :func:`polygon_boolean` for more information.
+
+    .. versionadded:: 1.1
+
+    """
+    return polygon_boolean(
+        subject, clip, BooleanOperation.UNION, nonzero=nonzero, abs_tol=abs_tol
+    )
+
+
+def polygon_difference(
+    subject: Iterable[Iterable[UVec]],
+    clip: Iterable[Iterable[UVec]],
+    *,
+    nonzero=False,
+    abs_tol: float = TOLERANCE,
+) -> list[list[Vec2]]:
+    """Returns the DIFFERENCE of the polygons `subject` - `clip`.
+
+    See :func:`polygon_boolean` for more information.
+
+    .. versionadded:: 1.1
+
+    """
+    return polygon_boolean(
+        subject, clip, BooleanOperation.DIFFERENCE, nonzero=nonzero, abs_tol=abs_tol
+    )
+
+
+def polygon_intersection(
+    subject: Iterable[Iterable[UVec]],
+    clip: Iterable[Iterable[UVec]],
+    *,
+    nonzero=False,
+    abs_tol: float = TOLERANCE,
+) -> list[list[Vec2]]:
+    """Returns the INTERSECTION of the polygons `subject` & `clip`.
+
+    See :func:`polygon_boolean` for more information.
+
+    .. versionadded:: 1.1
+
+    """
+    return polygon_boolean(
+        subject, clip, BooleanOperation.INTERSECTION, nonzero=nonzero, abs_tol=abs_tol
+    )
+
+
+def polygon_xor(
+    subject: Iterable[Iterable[UVec]],
+    clip: Iterable[Iterable[UVec]],
+    *,
+    nonzero=False,
+    abs_tol: float = TOLERANCE,
+) -> list[list[Vec2]]:
+    """Returns the symmetric difference (XOR) of the polygons `subject` ^ `clip`.
+
+    See :func:`polygon_boolean` for more information.
+
+    .. versionadded:: 1.1
+
+    """
+    return polygon_boolean(
+        subject, clip, BooleanOperation.XOR, nonzero=nonzero, abs_tol=abs_tol
+    )
+
+
+def polygon_boolean(
+    subject: Iterable[Iterable[UVec]],
+    clip: Iterable[Iterable[UVec]],
+    op: BooleanOperation,
+    *,
+    nonzero=False,
+    abs_tol: float = TOLERANCE,
+) -> list[list[Vec2]]:
+    """Sweep-line based 2D boolean operation for polygons.
+
+    The operands `subject` and `clip` are iterables of closed polygons, each
+    polygon is an iterable of vertices. Each operand can contain multiple
+    polygons, holes, self-intersecting polygons and polygons which overlap or
+    share edges and vertices with other polygons. The filled area of an operand
+    is defined by the even-odd rule or by the nonzero winding rule if argument
+    `nonzero` is ``True``.
+
+    Returns a list of closed polygons without the closing vertex. The polygons
+    do not intersect each other, exterior boundaries have a counter-clockwise
+    orientation and holes have a clockwise orientation. The nested structure
+    of the result can be created by the :func:`ezdxf.path.make_polygon_structure`
+    function.
+
+    All vertices are snapped to a grid of size `abs_tol`, vertices closer than
+    `abs_tol` are merged and almost collinear overlapping edges are handled as
+    coincident edges.
+
+    Args:
+        subject: polygons of the first operand
+        clip: polygons of the second operand
+        op: boolean operation, see :class:`BooleanOperation`
+        nonzero: use the nonzero winding rule, default is the even-odd rule
+        abs_tol: grid size for vertex snapping
+
+    Raises:
+        ValueError: unknown boolean operation or invalid `abs_tol`
+
+    .. versionadded:: 1.1
+
+    """
+    try:
+        operation = _OPERATIONS[op]
+    except KeyError:
+        raise ValueError(f"unknown or unsupported boolean operation: {op}")
+    if abs_tol <= 0.0:
+        raise ValueError(f"invalid grid size: {abs_tol}")
+    scale = 1.0 / abs_tol
+
+    def is_filled(winding: _Winding) -> bool:
+        if nonzero:
+            return operation(winding[0] != 0, winding[1] != 0)
+        return operation(winding[0] % 2 == 1, winding[1] % 2 == 1)
+
+    edges = _split_edges(_collect_edges((subject, clip), scale))
+    boundary_edges = _boundary_edges(edges, is_filled)
+    return [
+        [Vec2(x / scale, y / scale) for x, y in ring]
+        for ring in _link_rings(boundary_edges)
+    ]
+
+
+def _orient(p: _IntPoint, q: _IntPoint, r: _IntPoint) -> int:
+    """Returns > 0 if `r` is left of the line `p` -> `q`, < 0 if `r` is right of
+    the line and 0 if `r` is on the line.
+    """
+    return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+
+
+def _add_edge(
+    edges: dict[_Edge, _Winding],
+    start: _IntPoint,
+    end: _IntPoint,
+    winding: _Winding,
+) -> None:
+    if start == end:
+        return
+    if end < start:
+        start, end = end, start
+        winding = (-winding[0], -winding[1])
+    key = (start, end)
+    existing = edges.get(key, _NO_WINDING)
+    edges[key] = (existing[0] + winding[0], existing[1] + winding[1])
+
+
+def _collect_edges(
+    operands: Iterable[Iterable[Iterable[UVec]]], scale: float
+) -> dict[_Edge, _Winding]:
+    edges: dict[_Edge, _Winding] = dict()
+    windings: list[_Winding] = [(1, 0), (0, 1)]
+    for winding, polygons in zip(windings, operands):
+        for polygon in polygons:
+            vertices = [
+                (round(v.x * scale), round(v.y * scale)) for v in Vec2.generate(polygon)
+            ]
+            if len(vertices) < 3:
+                continue
+            start = vertices[-1]
+            for end in vertices:
+                _add_edge(edges, start, end, winding)
+                start = end
+    return edges
+
+
+def _split_edges(edges: dict[_Edge, _Winding]) -> dict[_Edge, _Winding]:
+    """Split edges by iterated snap rounding: all vertices and the intersection
+    points rounded to the grid are hot pixels and each edge which passes through
+    the grid cell of a hot pixel is split at the hot pixel. The split edges can
+    pass through further hot pixels, therefore the process is repeated. The set
+    of hot pixels does not change, which guarantees the termination of the
+    process, and the resulting edges do not cross each other.
+    """
+    # remove edges without winding contribution, e.g. coincident edges with
+    # opposite directions:
+    edges = {edge: winding for edge, winding in edges.items() if any(winding)}
+    hot_pixels = _intersection_points(edges)
+    for start, end in edges:
+        hot_pixels.add(start)
+        hot_pixels.add(end)
+    while True:
+        split_points = _find_split_points(edges, hot_pixels)
+        if not split_points:
+            return edges
+        split_edges: dict[_Edge, _Winding] = dict()
+        for edge, winding in edges.items():
+            points = split_points.get(edge)
+            if points is None:
+                _add_edge(split_edges, edge[0], edge[1], winding)
+                continue
+            start, end = edge
+            dx = end[0] - start[0]
+            dy = end[1] - start[1]
+            # snapped points are not exactly on the edge, sort the points by
+            # their projection onto the edge:
+            for point in sorted(points, key=lambda p: (p[0] * dx + p[1] * dy, p)):
+                _add_edge(split_edges, start, point, winding)
+                start = point
+            _add_edge(split_edges, start, end, winding)
+        edges = {
+            edge: winding for edge, winding in split_edges.items() if any(winding)
+        }
+
+
+def _edge_boxes(edges: Sequence[_Edge]) -> np.ndarray:
+    # the float conversion of the integer coordinates preserves the order,
+    # the bounding box test of the broad phase is therefore conservative:
+    return np.array(
+        [(p[0], min(p[1], q[1]), 0, q[0], max(p[1], q[1]), 0) for p, q in edges],
+        dtype=np.float64,
+    ).reshape(-1, 6)
+
+
+def _intersection_points(edges: Iterable[_Edge]) -> set[_IntPoint]:
+    """Returns the intersection points of all crossing edges rounded to the
+    grid, only edges with intersecting bounding boxes are tested.
+    """
+    points: set[_IntPoint] = set()
+    edge_list = sorted(edges)
+    for i, j in intersecting_pairs(_edge_boxes(edge_list)).tolist():
+        p, q = edge_list[j]
+        r, s = edge_list[i]
+        d1 = _orient(p, q, r)
+        d2 = _orient(p, q, s)
+        if (d1 > 0 > d2) or (d1 < 0 < d2):
+            d3 = _orient(r, s, p)
+            d4 = _orient(r, s, q)
+            if (d3 > 0 > d4) or (d3 < 0 < d4):
+                # the intersection point is r + (s - r) * d1 / (d1 - d2), the
+                # hot pixel is the grid cell which contains this point:
+                den = d1 - d2
+                if den < 0:
+                    den = -den
+                    d1 = -d1
+                points.add(
+                    (
+                        r[0] + (2 * (s[0] - r[0]) * d1 + den) // (2 * den),
+                        r[1] + (2 * (s[1] - r[1]) * d1 + den) // (2 * den),
+                    )
+                )
+    return points
+
+
+def _is_passing_through(p: _IntPoint, q: _IntPoint, pixel: _IntPoint) -> bool:
+    """Returns ``True`` if the edge `p` -> `q` intersects the grid cell of the
+    hot `pixel`. The grid cell is the half-open square [x-0.5, x+0.5) x
+    [y-0.5, y+0.5), each point belongs to exactly one grid cell.
+    """
+    # doubled coordinates to get integer coordinates for the cell borders:
+    px, py = 2 * p[0], 2 * p[1]
+    qx, qy = 2 * q[0], 2 * q[1]
+    x0, x1 = 2 * pixel[0] - 1, 2 * pixel[0] + 1
+    y0, y1 = 2 * pixel[1] - 1, 2 * pixel[1] + 1
+    if not (min(px, qx) < x1 and max(px, qx) >= x0):
+        return False
+    if not (min(py, qy) < y1 and max(py, qy) >= y0):
+        return False
+    # The open borders x1 and y1 are replaced by the closed borders x1-e and
+    # y1-e for an infinitesimal small e, a corner is below or above the line
+    # p -> q by its orientation, at orientation 0 the direction of the
+    # displacement by e decides:
+    dx = qx - px
+    dy = qy - py
+    below = False
+    above = False
+    for x, ex in ((x0, 0), (x1, 1)):
+        for y, ey in ((y0, 0), (y1, 1)):
+            orientation = dx * (y - py) - dy * (x - px)
+            displacement = dy * ex - dx * ey
+            if orientation < 0 or (orientation == 0 and displacement <= 0):
+                below = True
+            if orientation > 0 or (orientation == 0 and displacement >= 0):
+                above = True
+    return below and above
+
+
+def _find_split_points(
+    edges: Iterable[_Edge], hot_pixels: set[_IntPoint]
+) -> dict[_Edge, set[_IntPoint]]:
+    """Returns the hot pixels inside the edges, only edges with bounding boxes
+    which contain the hot pixel are tested.
+    """
+    split_points: dict[_Edge, set[_IntPoint]] = collections.defaultdict(set)
+    edge_list = list(edges)
+    pixel_list = list(hot_pixels)
+    count = len(edge_list)
+    boxes = np.vstack(
+        (
+            _edge_boxes(edge_list),
+            np.array(
+                [(x, y, 0, x, y, 0) for x, y in pixel_list], dtype=np.float64
+            ).reshape(-1, 6),
+        )
+    )
+    pairs = intersecting_pairs(boxes)
+    pairs = pairs[(pairs[:, 0] < count) & (pairs[:, 1] >= count)]
+    for i, j in pairs.tolist():
+        edge = edge_list[i]
+        pixel = pixel_list[j - count]
+        p, q = edge
+        if pixel != p and pixel != q and _is_passing_through(p, q, pixel):
+            split_points[edge].add(pixel)
+    return split_points
+
+
+def _compare_starting_edges(a: _Edge, b: _Edge) -> int:
+    # edges start at the same x-coordinate
+    if a[0] != b[0]:
+        return -1 if a[0] < b[0] else 1
+    orientation = _orient(a[0], a[1], b[1])
+    if orientation > 0:  # b is above a
+        return -1
+    return 1 if orientation < 0 else 0
+
+
+def _insert_index(status: list[_Edge], edge: _Edge) -> int:
+    """Returns the insert location of an `edge` starting at the current sweep
+    position.
+    """
+    start, end = edge
+    lo = 0
+    hi = len(status)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        p, q = status[mid]
+        orientation = _orient(p, q, start)
+        if orientation == 0:  # edges start at the same vertex
+            orientation = _orient(p, q, end)
+        if orientation > 0:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _remove_index(status: list[_Edge], edge: _Edge) -> int:
+    """Returns the location of an `edge` ending at the current sweep position."""
+    start, end = edge
+    lo = 0
+    hi = len(status)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        other = status[mid]
+        if other == edge:
+            return mid
+        p, q = other
+        orientation = _orient(p, q, end)
+        if orientation == 0:  # edges end at the same vertex
+            orientation = _orient(p, q, start)
+        if orientation > 0:
+            lo = mid + 1
+        else:
+            hi = mid
+    # fallback for an inconsistent order of the edges in the sweep status
+    return status.index(edge)
+
+
+def _point_index(status: list[_Edge], point: _IntPoint) -> int:
+    """Returns the count of edges below `point` at the current sweep position,
+    edges starting at `point` are below `point`.
+    """
+    lo = 0
+    hi = len(status)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        p, q = status[mid]
+        if _orient(p, q, point) >= 0:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _boundary_edges(
+    edges: dict[_Edge, _Winding], is_filled: Callable[[_Winding], bool]
+) -> list[_Edge]:
+    """Returns the oriented boundary edges of the result, the result area is on
+    the left side of each edge.
+    """
+
+    def add(winding_a: _Winding, winding_b: _Winding) -> _Winding:
+        return winding_a[0] + winding_b[0], winding_a[1] + winding_b[1]
+
+    starting: dict[int, list[_Edge]] = collections.defaultdict(list)
+    ending: dict[int, list[_Edge]] = collections.defaultdict(list)
+    vertical: dict[int, list[_Edge]] = collections.defaultdict(list)
+    for edge in edges:
+        (x0, _), (x1, _) = edge
+        if x0 == x1:
+            vertical[x0].append(edge)
+        else:
+            starting[x0].append(edge)
+            ending[x1].append(edge)
+
+    # winding numbers of the area above the edges in the sweep status:
+    above: dict[_Edge, _Winding] = dict()
+    # non-vertical edges crossing the sweep line, ordered from bottom to top:
+    status: list[_Edge] = []
+    boundary_edges: list[_Edge] = []
+    for x in sorted(set(starting) | set(ending) | set(vertical)):
+        for edge in ending.get(x, tuple()):
+            del status[_remove_index(status, edge)]
+        for edge in sorted(
+            starting.get(x, tuple()), key=functools.cmp_to_key(_compare_starting_edges)
+        ):
+            index = _insert_index(status, edge)
+            below = above[status[index - 1]] if index else _NO_WINDING
+            status.insert(index, edge)
+            above[edge] = add(below, edges[edge])
+            filled_above = is_filled(above[edge])
+            if filled_above != is_filled(below):
+                boundary_edges.append(edge if filled_above else (edge[1], edge[0]))
+        for edge in vertical.get(x, tuple()):
+            index = _point_index(status, edge[0])
+            right = above[status[index - 1]] if index else _NO_WINDING
+            filled_left = is_filled(add(right, edges[edge]))
+            if filled_left != is_filled(right):
+                boundary_edges.append(edge if filled_left else (edge[1], edge[0]))
+    return boundary_edges
+
+
+def _link_rings(boundary_edges: list[_Edge]) -> list[list[_IntPoint]]:
+    """Link oriented boundary edges to closed rings. At vertices with multiple
+    outgoing edges the edge next in clockwise order is taken, which separates
+    rings touching at a single vertex.
+    """
+
+    def angle(start: _IntPoint, end: _IntPoint) -> float:
+        return math.atan2(end[1] - start[1], end[0] - start[0])
+
+    def next_edge(edge: _Edge) -> _Edge:
+        candidates = outgoing[edge[1]]
+        if len(candidates) == 1:
+            return candidates[0]
+        reverse = angle(edge[1], edge[0])
+        return min(
+            candidates,
+            key=lambda e: (reverse - angle(e[0], e[1])) % math.tau or math.tau,
+        )
+
+    outgoing: dict[_IntPoint, list[_Edge]] = collections.defaultdict(list)
+    for edge in boundary_edges:
+        outgoing[edge[0]].append(edge)
+
+    rings: list[list[_IntPoint]] = []
+    used: set[_Edge] = set()
+    for first in boundary_edges:
+        if first in used:
+            continue
+        ring: list[_IntPoint] = []
+        edge = first
+        while True:
+            used.add(edge)
+            ring.append(edge[0])
+            edge = next_edge(edge)
+            if edge == first:
+                break
+            if edge in used:  # invalid topology
+                ring.clear()
+                break
+        ring = _remove_collinear_vertices(ring)
+        if len(ring) > 2:
+            rings.append(ring)
+    return rings
+
+
+def _remove_collinear_vertices(ring: list[_IntPoint]) -> list[_IntPoint]:
+    result: list[_IntPoint] = []
+    for vertex in ring:
+        while len(result) > 1 and _orient(result[-2], result[-1], vertex) == 0:
+            result.pop()
+        result.append(vertex)
+    while len(result) > 2 and _orient(result[-2], result[-1], result[0]) == 0:
+        result.pop()
+    while len(result) > 2 and _orient(result[-1], result[0], result[1]) == 0:
+        result.pop(0)
+    return result
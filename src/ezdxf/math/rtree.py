@@ -1,4 +1,4 @@
-# Copyright (c) 2022, Manfred Moitzi
+# Copyright (c) 2022-2023, Manfred Moitzi
 # License: MIT License
 # Immutable spatial search tree based on the SsTree implementation of the book
 # "Advanced Algorithms and Data Structures"
@@ -9,13 +9,34 @@
 #   http://www-db.deis.unibo.it/courses/SI-LS/papers/Gut84.pdf
 from __future__ import annotations
 import statistics
-from typing import Iterator, Callable, Sequence, Iterable
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 import abc
+import heapq
+import itertools
 import math
 
-from ezdxf.math import BoundingBox, AnyVec, Vec3, spherical_envelope
+import numpy as np
 
-__all__ = ["RTree"]
+from ezdxf.math import (
+    AbstractBoundingBox,
+    AnyVec,
+    BoundingBox,
+    UVec,
+    Vec3,
+    spherical_envelope,
+)
+
+__all__ = ["RTree", "BoxRTree"]
 
 INF = float("inf")
 
@@ -339,3 +360,605 @@ def nearest_neighbor_distances(points: Sequence[AnyVec]) -> list[float]:
         min(point.distance(p) for p in points[index + 1 :])
         for index, point in enumerate(points[:-1])
     ]
+
+
+T = TypeVar("T")
+Box = Tuple[float, float, float, float, float, float]  # (x0, y0, z0, x1, y1, z1)
+
+# Min. count of dynamically inserted boxes before the tree is rebuild:
+MIN_REBUILD_SIZE = 256
+
+
+class BoxRTree(Generic[T]):
+    """Mutable spatial search tree of axis-aligned bounding boxes with
+    arbitrary payloads based on `R-trees`_.
+
+    The tree is bulk loaded by the sort-tile-recursive (STR) algorithm into a
+    packed node layout, where the bounding boxes of each tree level are stored
+    in a NumPy array. Inserted boxes are stored in a dynamic R-tree with
+    quadratic split as described by Antonin Guttman, removed boxes of the
+    packed tree are marked as deleted. The whole tree is rebuild automatically
+    if the dynamic part or the count of deleted boxes exceed a certain size.
+
+    This class uses internally only 3D bounding boxes, but also supports
+    :class:`~ezdxf.math.BoundingBox2d` as well as
+    :class:`~ezdxf.math.BoundingBox` objects as input data, but box types
+    should not be mixed in a single search tree. A 2D bounding box is stored
+    as a flat 3D bounding box at z=0.
+
+    The payloads keep their type and identity and are compared by the ``is``
+    operator or the ``==`` operator for removing.
+
+    Args:
+        items: iterable of (bounding box, payload) tuples
+        max_node_size: max. count of child nodes, at least 2
+
+    Raises:
+        ValueError: max. node size too small or empty bounding box given
+
+    .. _R-trees: https://en.wikipedia.org/wiki/R-tree
+
+    """
+
+    def __init__(
+        self,
+        items: Iterable[tuple[AbstractBoundingBox, T]] = tuple(),
+        max_node_size: int = 16,
+    ):
+        if max_node_size < 2:
+            raise ValueError("max node size must be > 1")
+        self._max_node_size = max_node_size
+        self._offsets = np.arange(max_node_size)
+        self._build([(_box_tuple(box), item) for box, item in items])
+
+    def _build(self, entries: list[tuple[Box, T]]) -> None:
+        size = self._max_node_size
+        self._dynamic = _DynamicRTree(size)
+        self._dead = 0
+        if len(entries) == 0:
+            self._items: list[T] = []
+            self._levels: list[np.ndarray] = [np.empty((0, 6))]
+            self._alive = np.empty(0, dtype=bool)
+            return
+        boxes = np.array([entry[0] for entry in entries], dtype=np.float64)
+        order = str_order(boxes, size)
+        self._items = [entries[index][1] for index in order]
+        levels = [boxes[order]]
+        while len(levels[-1]) > size:
+            levels.append(_group_boxes(levels[-1], size))
+        self._levels = levels
+        self._alive = np.ones(len(entries), dtype=bool)
+
+    def __len__(self) -> int:
+        """Returns the count of boxes in the search tree."""
+        return len(self._items) - self._dead + len(self._dynamic)
+
+    def __iter__(self) -> Iterator[T]:
+        """Yields the payloads of all boxes in the search tree."""
+        for entry in self._entries():
+            yield entry[1]
+
+    def _entries(self) -> Iterator[tuple[Box, T]]:
+        alive = self._alive
+        for index, box in enumerate(self._levels[0].tolist()):
+            if alive[index]:
+                yield tuple(box), self._items[index]  # type: ignore
+        yield from self._dynamic.entries()
+
+    def rebuild(self) -> None:
+        """Rebuild the packed search tree from all stored boxes."""
+        self._build(list(self._entries()))
+
+    def insert(self, box: AbstractBoundingBox, item: T) -> None:
+        """Insert the bounding `box` with the payload `item`.
+
+        Raises:
+            ValueError: empty bounding box
+
+        """
+        self._dynamic.insert(item, _box_tuple(box))
+        self._check_rebuild()
+
+    def extend(self, items: Iterable[tuple[AbstractBoundingBox, T]]) -> None:
+        """Insert multiple (bounding box, payload) tuples at once, rebuilds the
+        tree if the count of new items is big enough.
+
+        Raises:
+            ValueError: empty bounding box
+
+        """
+        entries = [(_box_tuple(box), item) for box, item in items]
+        if len(entries) + len(self._dynamic) > self._rebuild_size():
+            entries.extend(self._entries())
+            self._build(entries)
+            return
+        for box, item in entries:
+            self._dynamic.insert(item, box)
+
+    def _rebuild_size(self) -> int:
+        return max(MIN_REBUILD_SIZE, len(self._items) // 4)
+
+    def _check_rebuild(self) -> None:
+        if len(self._dynamic) > self._rebuild_size():
+            self.rebuild()
+        elif self._dead > max(MIN_REBUILD_SIZE, len(self._items) // 2):
+            self.rebuild()
+
+    def remove(self, box: AbstractBoundingBox, item: T) -> bool:
+        """Remove the bounding `box` with the payload `item`, the `box` has to
+        be the same bounding box as used for inserting the `item`. Returns
+        ``True`` if the `item` was found and removed.
+        """
+        _box = _box_tuple(box)
+        items = self._items
+        for index in self._search_packed(np.array(_box)):
+            other = items[index]
+            if other is item or other == item:
+                self._alive[index] = False
+                self._dead += 1
+                self._check_rebuild()
+                return True
+        return self._dynamic.remove(item, _box)
+
+    def _search_packed(self, box: np.ndarray) -> np.ndarray:
+        levels = self._levels
+        size = self._max_node_size
+        candidates = np.flatnonzero(_intersects(levels[-1], box))
+        for level in reversed(levels[:-1]):
+            if len(candidates) == 0:
+                break
+            children = (candidates[:, np.newaxis] * size + self._offsets).ravel()
+            children = children[children < len(level)]
+            candidates = children[_intersects(level[children], box)]
+        if self._dead:
+            candidates = candidates[self._alive[candidates]]
+        return candidates
+
+    def intersecting(self, box: AbstractBoundingBox) -> Iterator[T]:
+        """Yields the payloads of all boxes intersecting the given bounding
+        `box` including touching boxes.
+        """
+        if not box.has_data:
+            return
+        _box = _box_tuple(box)
+        items = self._items
+        for index in self._search_packed(np.array(_box)).tolist():
+            yield items[index]
+        yield from self._dynamic.search(_box)
+
+    def iter_nearest(self, point: UVec) -> Iterator[tuple[T, float]]:
+        """Yields all payloads and the distance of their boxes to the given
+        `point` in ascending order of the distance. The distance of a `point`
+        inside a box is 0.
+        """
+        p = Vec3(point)
+        target = np.array(p.xyz)
+        size = self._max_node_size
+        levels = self._levels
+        alive = self._alive
+        counter = itertools.count()
+        # heap entries: (distance², unique index, kind, reference)
+        heap: list[tuple[float, int, int, Any]] = []
+
+        def push_packed(level: int, indices: np.ndarray) -> None:
+            if len(indices) == 0:
+                return
+            distances = _distance2(levels[level][indices], target)
+            kind = _PACKED_NODE
+            if level == 0:
+                kind = _PACKED_ENTRY
+                mask = alive[indices]
+                indices = indices[mask]
+                distances = distances[mask]
+            for index, distance in zip(indices.tolist(), distances.tolist()):
+                heapq.heappush(heap, (distance, next(counter), kind, (level, index)))
+
+        push_packed(len(levels) - 1, np.arange(len(levels[-1])))
+        heapq.heappush(heap, (0.0, next(counter), _DYNAMIC_NODE, self._dynamic.root))
+        while heap:
+            distance, _, kind, ref = heapq.heappop(heap)
+            if kind == _PACKED_ENTRY:
+                yield self._items[ref[1]], math.sqrt(distance)
+            elif kind == _DYNAMIC_ITEM:
+                yield ref, math.sqrt(distance)
+            elif kind == _PACKED_NODE:
+                level, index = ref
+                start = index * size
+                stop = min(start + size, len(levels[level - 1]))
+                push_packed(level - 1, np.arange(start, stop))
+            else:  # dynamic node
+                node: _Node = ref
+                child_kind = _DYNAMIC_ITEM if node.leaf else _DYNAMIC_NODE
+                for child_box, child in zip(node.boxes, node.children):
+                    heapq.heappush(
+                        heap,
+                        (
+                            _box_distance2(child_box, p.x, p.y, p.z),
+                            next(counter),
+                            child_kind,
+                            child,
+                        ),
+                    )
+
+    def nearest(self, point: UVec, k: int = 1) -> list[tuple[T, float]]:
+        """Returns the `k` nearest payloads to the given `point` and the
+        distance of their boxes to the `point` in ascending order of the
+        distance.
+        """
+        if k < 1:
+            return []
+        return list(itertools.islice(self.iter_nearest(point), k))
+
+
+_PACKED_NODE = 0
+_PACKED_ENTRY = 1
+_DYNAMIC_NODE = 2
+_DYNAMIC_ITEM = 3
+
+
+def _box_tuple(box: AbstractBoundingBox) -> Box:
+    if not box.has_data:
+        raise ValueError("empty bounding box")
+    x0, y0, z0 = Vec3(box.extmin).xyz
+    x1, y1, z1 = Vec3(box.extmax).xyz
+    return x0, y0, z0, x1, y1, z1
+
+
+def _intersects(boxes: np.ndarray, box: np.ndarray) -> np.ndarray:
+    return np.all(boxes[:, :3] <= box[3:], axis=1) & np.all(
+        boxes[:, 3:] >= box[:3], axis=1
+    )
+
+
+def _distance2(boxes: np.ndarray, point: np.ndarray) -> np.ndarray:
+    d = np.maximum(np.maximum(boxes[:, :3] - point, 0.0), point - boxes[:, 3:])
+    return np.sum(d * d, axis=1)
+
+
+def _group_boxes(boxes: np.ndarray, size: int) -> np.ndarray:
+    starts = np.arange(0, len(boxes), size)
+    return np.hstack(
+        (
+            np.minimum.reduceat(boxes[:, :3], starts, axis=0),
+            np.maximum.reduceat(boxes[:, 3:], starts, axis=0),
+        )
+    )
+
+
+def str_order(boxes: np.ndarray, max_node_size: int) -> np.ndarray:
+    """Returns the sort-tile-recursive (STR) order of the given `boxes` as
+    array of indices. The `boxes` are stored as (n, 6) array of the min. and
+    max. coordinates.
+    """
+    centers = (boxes[:, :3] + boxes[:, 3:]) * 0.5
+    # ignore axis without extent, like the z-axis for 2D data:
+    axes = [axis for axis in range(3) if np.ptp(centers[:, axis]) > 0.0]
+    if not axes:
+        return np.arange(len(boxes))
+    return _str_sort(np.arange(len(boxes)), centers, axes, max_node_size)
+
+
+def _str_sort(
+    indices: np.ndarray, centers: np.ndarray, axes: list[int], size: int
+) -> np.ndarray:
+    indices = indices[np.argsort(centers[indices, axes[0]], kind="stable")]
+    if len(axes) == 1 or len(indices) <= size:
+        return indices
+    pages = math.ceil(len(indices) / size)
+    slabs = math.ceil(pages ** (1.0 / len(axes)))
+    slab_size = size * math.ceil(pages / slabs)
+    return np.concatenate(
+        [
+            _str_sort(indices[start : start + slab_size], centers, axes[1:], size)
+            for start in range(0, len(indices), slab_size)
+        ]
+    )
+
+
+def intersecting_pairs(boxes: np.ndarray, max_node_size: int = 8) -> np.ndarray:
+    """Returns the index pairs (i, j) with i < j of all intersecting `boxes`
+    including touching boxes as (k, 2) array. The `boxes` are stored as (n, 6)
+    array of the min. and max. coordinates.
+
+    The boxes are packed into a tree by the STR algorithm and the tree is
+    joined with itself level by level, therefore the running time depends on
+    the count of intersecting boxes and not on the square of the box count.
+
+    Raises:
+        ValueError: max. node size too small
+
+    """
+    if max_node_size < 2:
+        raise ValueError("max node size must be > 1")
+    size = max_node_size
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+    if len(boxes) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    order = str_order(boxes, size)
+    levels = [boxes[order]]
+    while len(levels[-1]) > size:
+        levels.append(_group_boxes(levels[-1], size))
+
+    depth = len(levels) - 1
+    # a node of an upper level has to be joined with itself:
+    a, b = np.triu_indices(len(levels[depth]), k=0 if depth else 1)
+    child_a = np.repeat(np.arange(size), size)
+    child_b = np.tile(np.arange(size), size)
+    while True:
+        level = levels[depth]
+        keep = np.all(level[a, :3] <= level[b, 3:], axis=1) & np.all(
+            level[b, :3] <= level[a, 3:], axis=1
+        )
+        a = a[keep]
+        b = b[keep]
+        if depth == 0:
+            break
+        depth -= 1
+        count = len(levels[depth])
+        a = (a[:, np.newaxis] * size + child_a).ravel()
+        b = (b[:, np.newaxis] * size + child_b).ravel()
+        valid = (a < count) & (b < count)
+        valid &= (a < b) if depth == 0 else (a <= b)
+        a = a[valid]
+        b = b[valid]
+    return np.sort(np.column_stack((order[a], order[b])), axis=1)
+
+
+def _measure(b: Box) -> float:
+    # half surface area, works also for flat boxes of 2D data
+    dx = b[3] - b[0]
+    dy = b[4] - b[1]
+    dz = b[5] - b[2]
+    return dx * dy + dy * dz + dz * dx
+
+
+def _union(a: Box, b: Box) -> Box:
+    return (
+        a[0] if a[0] < b[0] else b[0],
+        a[1] if a[1] < b[1] else b[1],
+        a[2] if a[2] < b[2] else b[2],
+        a[3] if a[3] > b[3] else b[3],
+        a[4] if a[4] > b[4] else b[4],
+        a[5] if a[5] > b[5] else b[5],
+    )
+
+
+def _cover(boxes: list[Box]) -> Box:
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        min(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+        max(b[4] for b in boxes),
+        max(b[5] for b in boxes),
+    )
+
+
+def _box_intersects(a: Box, b: Box) -> bool:
+    return (
+        a[0] <= b[3]
+        and b[0] <= a[3]
+        and a[1] <= b[4]
+        and b[1] <= a[4]
+        and a[2] <= b[5]
+        and b[2] <= a[5]
+    )
+
+
+def _box_contains(a: Box, b: Box) -> bool:
+    return (
+        a[0] <= b[0]
+        and a[1] <= b[1]
+        and a[2] <= b[2]
+        and b[3] <= a[3]
+        and b[4] <= a[4]
+        and b[5] <= a[5]
+    )
+
+
+def _box_distance2(b: Box, x: float, y: float, z: float) -> float:
+    dx = max(b[0] - x, 0.0, x - b[3])
+    dy = max(b[1] - y, 0.0, y - b[4])
+    dz = max(b[2] - z, 0.0, z - b[5])
+    return dx * dx + dy * dy + dz * dz
+
+
+class _Node:
+    __slots__ = ("leaf", "boxes", "children")
+
+    def __init__(self, leaf: bool):
+        self.leaf = leaf
+        self.boxes: list[Box] = []
+        self.children: list[Any] = []  # payloads or nodes
+
+
+class _DynamicRTree:
+    """Dynamic R-tree with quadratic split."""
+
+    def __init__(self, max_node_size: int):
+        self.max_node_size = max_node_size
+        self.min_node_size = max(1, int(max_node_size * 0.4))
+        self.root = _Node(leaf=True)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def entries(self) -> Iterator[tuple[Box, Any]]:
+        return _leaf_entries(self.root)
+
+    def insert(self, item: Any, box: Box) -> None:
+        path: list[tuple[_Node, int]] = []
+        node = self.root
+        while not node.leaf:
+            index = _choose_subtree(node, box)
+            path.append((node, index))
+            node = node.children[index]
+        node.boxes.append(box)
+        node.children.append(item)
+        self.count += 1
+        self._adjust(node, path)
+
+    def _adjust(self, node: _Node, path: list[tuple[_Node, int]]) -> None:
+        max_size = self.max_node_size
+        split: Optional[_Node] = None
+        if len(node.children) > max_size:
+            split = _split(node, self.min_node_size)
+        for parent, index in reversed(path):
+            parent.boxes[index] = _cover(parent.children[index].boxes)
+            if split is not None:
+                parent.boxes.append(_cover(split.boxes))
+                parent.children.append(split)
+                split = None
+                if len(parent.children) > max_size:
+                    split = _split(parent, self.min_node_size)
+        if split is not None:
+            root = _Node(leaf=False)
+            root.children = [self.root, split]
+            root.boxes = [_cover(self.root.boxes), _cover(split.boxes)]
+            self.root = root
+
+    def remove(self, item: Any, box: Box) -> bool:
+        path: list[tuple[_Node, int]] = []
+        found = self._find_leaf(self.root, item, box, path)
+        if found is None:
+            return False
+        leaf, index = found
+        del leaf.children[index]
+        del leaf.boxes[index]
+        self.count -= 1
+        self._condense(leaf, path)
+        return True
+
+    def _find_leaf(
+        self, node: _Node, item: Any, box: Box, path: list[tuple[_Node, int]]
+    ) -> Optional[tuple[_Node, int]]:
+        if node.leaf:
+            for index, (child_box, child) in enumerate(
+                zip(node.boxes, node.children)
+            ):
+                if child_box == box and (child is item or child == item):
+                    return node, index
+            return None
+        for index, child_box in enumerate(node.boxes):
+            if _box_contains(child_box, box):
+                path.append((node, index))
+                found = self._find_leaf(node.children[index], item, box, path)
+                if found is not None:
+                    return found
+                path.pop()
+        return None
+
+    def _condense(self, node: _Node, path: list[tuple[_Node, int]]) -> None:
+        orphans: list[tuple[Box, Any]] = []
+        for parent, index in reversed(path):
+            if len(node.children) < self.min_node_size:
+                del parent.children[index]
+                del parent.boxes[index]
+                orphans.extend(_leaf_entries(node))
+            else:
+                parent.boxes[index] = _cover(node.boxes)
+            node = parent
+        root = self.root
+        if not root.leaf and len(root.children) == 1:
+            self.root = root.children[0]
+        elif not root.children:
+            self.root = _Node(leaf=True)
+        self.count -= len(orphans)
+        for box, item in orphans:
+            self.insert(item, box)
+
+    def search(self, box: Box) -> Iterator[Any]:
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.leaf:
+                for child_box, child in zip(node.boxes, node.children):
+                    if _box_intersects(child_box, box):
+                        yield child
+            else:
+                for child_box, child in zip(node.boxes, node.children):
+                    if _box_intersects(child_box, box):
+                        stack.append(child)
+
+
+def _leaf_entries(node: _Node) -> Iterator[tuple[Box, Any]]:
+    if node.leaf:
+        yield from zip(node.boxes, node.children)
+    else:
+        for child in node.children:
+            yield from _leaf_entries(child)
+
+
+def _choose_subtree(node: _Node, box: Box) -> int:
+    best_index = 0
+    best_enlargement = INF
+    best_measure = INF
+    for index, child_box in enumerate(node.boxes):
+        measure = _measure(child_box)
+        enlargement = _measure(_union(child_box, box)) - measure
+        if enlargement < best_enlargement or (
+            enlargement == best_enlargement and measure < best_measure
+        ):
+            best_index = index
+            best_enlargement = enlargement
+            best_measure = measure
+    return best_index
+
+
+def _split(node: _Node, min_size: int) -> _Node:
+    """Quadratic split of `node`, returns the new sibling node."""
+    boxes = node.boxes
+    children = node.children
+    count = len(boxes)
+    seed1, seed2 = 0, 1
+    worst = -INF
+    for i in range(count):
+        for j in range(i + 1, count):
+            waste = (
+                _measure(_union(boxes[i], boxes[j]))
+                - _measure(boxes[i])
+                - _measure(boxes[j])
+            )
+            if waste > worst:
+                worst = waste
+                seed1, seed2 = i, j
+
+    group1 = [seed1]
+    group2 = [seed2]
+    box1 = boxes[seed1]
+    box2 = boxes[seed2]
+    remaining = [i for i in range(count) if i != seed1 and i != seed2]
+    while remaining:
+        if len(group1) + len(remaining) <= min_size:
+            group1.extend(remaining)
+            break
+        if len(group2) + len(remaining) <= min_size:
+            group2.extend(remaining)
+            break
+        # pick the entry with the greatest preference for one group:
+        best = 0
+        best_diff = -1.0
+        for n, i in enumerate(remaining):
+            d1 = _measure(_union(box1, boxes[i])) - _measure(box1)
+            d2 = _measure(_union(box2, boxes[i])) - _measure(box2)
+            diff = abs(d1 - d2)
+            if diff > best_diff:
+                best_diff = diff
+                best = n
+        i = remaining.pop(best)
+        d1 = _measure(_union(box1, boxes[i])) - _measure(box1)
+        d2 = _measure(_union(box2, boxes[i])) - _measure(box2)
+        if d1 < d2 or (d1 == d2 and len(group1) <= len(group2)):
+            group1.append(i)
+            box1 = _union(box1, boxes[i])
+        else:
+            group2.append(i)
+            box2 = _union(box2, boxes[i])
+
+    sibling = _Node(node.leaf)
+    sibling.boxes = [boxes[i] for i in group2]
+    sibling.children = [children[i] for i in group2]
+    node.boxes = [boxes[i] for i in group1]
+    node.children = [children[i] for i in group1]
+    return sibling
@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import Iterable, Optional, Iterator, Sequence
 from typing_extensions import Self, TypeAlias
 import abc
+import math
 
 import numpy as np
 from ezdxf.math import (
@@ -40,6 +41,8 @@ __all__ = [
     "to_matplotlib_path",
     "single_paths",
     "orient_paths",
+    "transform_paths",
+    "flatten_paths",
 ]
 
 # comparing Command.<attrib> to ints is very slow
@@ -49,6 +52,13 @@ CMD_CURVE3_TO = int(Command.CURVE3_TO)
 CMD_CURVE4_TO = int(Command.CURVE4_TO)
 
 
+# count of vertices consumed by each command, indexed by command code
+VERTEX_STEPS = np.array([0, 1, 2, 3, 1], dtype=np.int64)
+CMD_CURVE_DEGREES = ((CMD_CURVE3_TO, 2), (CMD_CURVE4_TO, 3))
+# max. count of subdivisions of the initial curve segments by flatten_paths()
+MAX_SUBDIVISION_LEVEL = 16
+
+
 class NumpyShapesException(Exception):
     pass
 
@@ -96,14 +106,28 @@ class NumpyShape2d(abc.ABC):
 
 
 class NumpyPoints2d(NumpyShape2d):
-    """Represents an array of 2D points stored as a ndarray."""
+    """Represents an array of 2D points stored as a ndarray.
+
+    The `points` can be given as an iterable of :class:`Vec2` or :class:`Vec3`
+    instances or as ndarray of shape (n, 2) or (n, 3), the ndarray is copied.
+    """
 
-    def __init__(self, points: Iterable[Vec2 | Vec3]) -> None:
-        self._vertices = np.array([(v.x, v.y) for v in points], dtype=VertexNumpyType)
+    def __init__(self, points: Iterable[Vec2 | Vec3] | np.ndarray) -> None:
+        if isinstance(points, np.ndarray):
+            self._vertices = np.array(points[:, :2], dtype=VertexNumpyType)
+        else:
+            self._vertices = np.array(
+                [(v.x, v.y) for v in points], dtype=VertexNumpyType
+            )
 
     def __len__(self) -> int:
         return len(self._vertices)
 
+    def __copy__(self) -> Self:
+        clone = self.__class__(tuple())
+        clone._vertices = self._vertices.copy()
+        return clone
+
 
 NO_VERTICES = np.array([], dtype=VertexNumpyType)
 NO_COMMANDS = np.array([], dtype=CommandNumpyType)
@@ -522,3 +546,222 @@ def orient_paths(paths: list[NumpyPath2d]) -> list[NumpyPath2d]:
     for path in holes:
         path.clockwise()
     return outer_paths + holes
+
+
+def transform_paths(paths: Sequence[NumpyPath2d], m: Matrix44) -> list[NumpyPath2d]:
+    """Returns transformed copies of the given `paths`. The vertices of all paths
+    are transformed at once, which is much faster for many small paths like glyphs
+    than transforming each path by :meth:`NumpyPath2d.transform_inplace`.
+    """
+    if len(paths) == 0:
+        return []
+    vertices = np.concatenate([p._vertices for p in paths], axis=0)
+    if len(vertices):
+        m.transform_array_inplace(vertices, 2)
+    transformed_paths: list[NumpyPath2d] = []
+    start = 0
+    for path in paths:
+        end = start + len(path._vertices)
+        clone = path.__class__(None)
+        clone._vertices = vertices[start:end]
+        clone._commands = path._commands.copy()
+        transformed_paths.append(clone)
+        start = end
+    return transformed_paths
+
+
+def flatten_paths(
+    paths: Iterable[NumpyPath2d | Path], distance: float, segments: int = 4
+) -> tuple[np.ndarray, np.ndarray]:
+    """Flattens all `paths` at once and returns the vertices in a compressed
+    sparse row layout as tuple (vertices, offsets). The vertices of all paths are
+    stored in a single ndarray of shape (n, 2), the `offsets` array has the length
+    of the input paths + 1 and the vertices of path `i` are
+    ``vertices[offsets[i]:offsets[i + 1]]``.
+
+    The vertices of each path are the same as the result of
+    :meth:`NumpyPath2d.flattening`, the Bèzier curves of all paths are subdivided
+    together by vectorized numpy operations. :class:`ezdxf.path.Path` objects are
+    projected onto the xy-plane. Empty paths do not have any vertices.
+
+    Flattening of :term:`Multi-Path` objects is possible, but gaps are
+    indistinguishable from line segments, use :func:`single_paths` to flatten each
+    sub-path separately.
+
+    Args:
+        paths: paths to flatten
+        distance: maximum distance from the center of the curve to the center of
+            the line segment between two approximation points to determine if a
+            segment should be subdivided
+        segments: minimum segment count per Bèzier curve
+
+    """
+    vertex_arrays: list[np.ndarray] = []
+    command_arrays: list[np.ndarray] = []
+    for path in paths:
+        if not isinstance(path, NumpyPath2d):
+            path = NumpyPath2d(path)
+        commands = path._commands
+        command_arrays.append(commands)
+        # empty paths do not contribute any vertex:
+        vertex_arrays.append(path._vertices if len(commands) else NO_VERTICES)
+    path_count = len(command_arrays)
+    if path_count == 0 or not any(len(c) for c in command_arrays):
+        return np.empty((0, 2), dtype=VertexNumpyType), np.zeros(
+            path_count + 1, dtype=np.int64
+        )
+
+    vertices = np.concatenate(
+        [v.reshape(-1, 2) for v in vertex_arrays], axis=0
+    ).astype(VertexNumpyType, copy=False)
+    commands = np.concatenate(command_arrays).astype(np.int64)
+    command_counts = np.array([len(c) for c in command_arrays], dtype=np.int64)
+    path_ids = np.repeat(np.arange(path_count), command_counts)
+
+    # index of the first vertex of each path:
+    vertex_counts = np.array([len(v) for v in vertex_arrays], dtype=np.int64)
+    path_start_vertex = np.cumsum(vertex_counts) - vertex_counts
+    # index of the end vertex of each command:
+    vertex_steps = VERTEX_STEPS[commands]
+    step_sum = np.cumsum(vertex_steps)
+    first_command = np.cumsum(command_counts) - command_counts
+    path_step_offset = np.zeros(path_count, dtype=np.int64)
+    has_commands = command_counts > 0
+    path_step_offset[has_commands] = (
+        step_sum[first_command[has_commands]]
+        - vertex_steps[first_command[has_commands]]
+    )
+    end_index = path_start_vertex[path_ids] + step_sum - path_step_offset[path_ids]
+
+    # Output items in order: path start vertex, command 1, command 2, ...
+    # The item index of command j is j + path_id + 1, the item index of the start
+    # vertex of path i is the index of the first command of path i + i.
+    item_counts = np.zeros(path_count + len(commands), dtype=np.int64)
+    start_items = first_command + np.arange(path_count)
+    command_items = np.arange(len(commands)) + path_ids + 1
+    item_counts[start_items] = has_commands
+    item_counts[command_items] = 1
+
+    curve_points: list[tuple[np.ndarray, np.ndarray, int]] = []
+    for command, degree in CMD_CURVE_DEGREES:
+        curves = np.flatnonzero(commands == command)
+        if len(curves) == 0:
+            continue
+        # control points of all curves as array of shape (n, degree + 1, 2)
+        indices = end_index[curves, np.newaxis] + np.arange(-degree, 1)
+        curve_ids, points = _flatten_curves(vertices[indices], distance, segments)
+        point_counts = np.bincount(curve_ids, minlength=len(curves))
+        item_counts[command_items[curves]] = point_counts
+        curve_points.append((command_items[curves], points, point_counts))
+
+    item_offsets = np.cumsum(item_counts) - item_counts
+    result = np.empty((int(item_counts.sum()), 2), dtype=VertexNumpyType)
+    result[item_offsets[start_items[has_commands]]] = vertices[
+        path_start_vertex[has_commands]
+    ]
+    lines = (commands == CMD_LINE_TO) | (commands == CMD_MOVE_TO)
+    result[item_offsets[command_items[lines]]] = vertices[end_index[lines]]
+    for items, points, point_counts in curve_points:
+        # rank of each point in its curve:
+        first_point = np.cumsum(point_counts) - point_counts
+        rank = np.arange(len(points)) - np.repeat(first_point, point_counts)
+        result[np.repeat(item_offsets[items], point_counts) + rank] = points
+
+    offsets = np.empty(path_count + 1, dtype=np.int64)
+    offsets[:-1] = item_offsets[start_items]
+    offsets[-1] = len(result)
+    return result, offsets
+
+
+def _initial_parameters(segments: int) -> np.ndarray:
+    # same parameters as the flattening() method of Bezier3P and Bezier4P
+    dt = 1.0 / segments
+    params = [0.0]
+    t0 = 0.0
+    while t0 < 1.0:
+        t1 = t0 + dt
+        if math.isclose(t1, 1.0):
+            t1 = 1.0
+        params.append(t1)
+        t0 = t1
+    return np.array(params, dtype=np.float64)
+
+
+def _curve_points(
+    control_points: np.ndarray, curve_ids: np.ndarray, t: np.ndarray
+) -> np.ndarray:
+    """Returns the curve points of the quadratic or cubic Bèzier curves
+    `control_points` of shape (n, 3, 2) or (n, 4, 2) for the parameters `t` of the
+    curves `curve_ids`.
+    """
+    cp = control_points[curve_ids]
+    origin = cp[:, 0]
+    t = t[:, np.newaxis]
+    _1_minus_t = 1.0 - t
+    if control_points.shape[1] == 3:
+        b = 2.0 * t * _1_minus_t
+        c = t * t
+        points = (cp[:, 1] - origin) * b + (cp[:, 2] - origin) * c
+    else:
+        b = 3.0 * _1_minus_t * _1_minus_t * t
+        c = 3.0 * _1_minus_t * t * t
+        d = t * t * t
+        points = (
+            (cp[:, 1] - origin) * b + (cp[:, 2] - origin) * c + (cp[:, 3] - origin) * d
+        )
+    # add offset at last - it is maybe very large
+    return points + origin
+
+
+def _flatten_curves(
+    control_points: np.ndarray, distance: float, segments: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Adaptive flattening of all Bèzier curves at once. Returns the curve ids and
+    the approximation points without the start points, sorted by curve and
+    parameter.
+    """
+    count = len(control_points)
+    params = _initial_parameters(segments)
+    n = len(params) - 1
+    curve_ids = np.repeat(np.arange(count), n)
+    t0 = np.tile(params[:-1], count)
+    t1 = np.tile(params[1:], count)
+    p1 = _curve_points(control_points, curve_ids, t1)
+    # the end point of the curve is the last control point:
+    p1[n - 1 :: n] = control_points[:, -1]
+    p0 = np.empty_like(p1)
+    p0[1:] = p1[:-1]
+    p0[::n] = control_points[:, 0]
+
+    result_ids: list[np.ndarray] = []
+    result_params: list[np.ndarray] = []
+    result_points: list[np.ndarray] = []
+    for _ in range(MAX_SUBDIVISION_LEVEL):
+        tm = (t0 + t1) * 0.5
+        pm = _curve_points(control_points, curve_ids, tm)
+        done = np.linalg.norm((p0 + p1) * 0.5 - pm, axis=1) < distance
+        result_ids.append(curve_ids[done])
+        result_params.append(t1[done])
+        result_points.append(p1[done])
+        todo = ~done
+        if not np.any(todo):
+            break
+        # split the remaining segments at the mid-point:
+        curve_ids = np.repeat(curve_ids[todo], 2)
+        t0, t1 = _interleave(t0[todo], tm[todo]), _interleave(tm[todo], t1[todo])
+        p0, p1 = _interleave(p0[todo], pm[todo]), _interleave(pm[todo], p1[todo])
+    else:  # accept segments at max. subdivision level
+        result_ids.append(curve_ids)
+        result_params.append(t1)
+        result_points.append(p1)
+
+    ids = np.concatenate(result_ids)
+    order = np.lexsort((np.concatenate(result_params), ids))
+    return ids[order], np.concatenate(result_points)[order]
+
+
+def _interleave(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    result = np.empty((len(a) * 2,) + a.shape[1:], dtype=a.dtype)
+    result[0::2] = a
+    result[1::2] = b
+    return result
@@ -60,6 +60,22 @@ Sort by Area
 
 It is not possible for a path to contain another path with a larger area.
 
+Spatial Search Tree
+-------------------
+
+The bounding boxes of all paths are stored in a :class:`~ezdxf.math.rtree.BoxRTree`,
+the possible containers of a path are the paths with larger bounding boxes which
+contain the bounding box center of the path.  Only these candidates have to be
+tested, which avoids the pairwise testing of all paths.
+
+Point-in-Polygon Test
+---------------------
+
+The bounding box test is refined by a point-in-polygon test for :class:`Path` and
+:class:`NumpyPath2d` objects, which are flattened all at once.  This resolves
+paths inside the bounding box of a concave exterior path, which are not located
+inside the exterior path itself.
+
 """
 from __future__ import annotations
 from typing import (
@@ -73,7 +89,12 @@ from typing import (
 )
 from typing_extensions import TypeAlias
 from collections import namedtuple
-from ezdxf.math import AbstractBoundingBox
+import math
+
+import numpy as np
+
+from ezdxf.math import TOLERANCE
+from ezdxf.math.rtree import BoxRTree
 from ezdxf.protocols import SupportsBoundingBox
 
 
@@ -91,57 +112,136 @@ Polygon: TypeAlias = Tuple[T, Optional[List["Polygon"]]]
 BoxStruct = namedtuple("BoxStruct", "bbox, path")
 
 
+# Fixed count of line segments for each Bèzier curve of flattened paths, the
+# point-in-polygon test does not require a precise approximation:
+CURVE_SEGMENTS = 8
+# Count of vertices tested at once by the point-in-polygon test:
+TEST_CHUNK_SIZE = 16
+
+
 def make_polygon_structure(paths: Iterable[T]) -> list[Polygon]:
     """Returns a recursive polygon structure from iterable `paths`, uses 2D
-    bounding boxes as fast detection objects.
+    bounding boxes as fast detection objects and refines the result by
+    point-in-polygon tests for :class:`~ezdxf.path.Path` and
+    :class:`~ezdxf.npshapes.NumpyPath2d` objects.
 
     """
 
-    # Implements fast bounding box construction and fast inside check.
     def area(item: BoxStruct) -> float:
         size = item.bbox.size
         return size.x * size.y
 
-    def separate(
-        exterior: AbstractBoundingBox, candidates: list[BoxStruct]
-    ) -> tuple[list[BoxStruct], list[BoxStruct]]:
-        holes: list[BoxStruct] = []
-        outside: list[BoxStruct] = []
-        for candidate in candidates:
-            # Fast inside check:
-            (holes if exterior.inside(candidate.bbox.center) else outside).append(
-                candidate
-            )
-        return holes, outside
-
-    def polygon_structure(outside: list[BoxStruct]) -> list[list]:
-        polygons = []
-        while outside:
-            exterior = outside.pop()  # path with the largest area
-            # Get holes inside of exterior and returns the remaining paths
-            # outside of exterior:
-            holes, outside = separate(exterior.bbox, outside)
-            if holes:
-                # build nested hole structure:
-                # the largest hole could contain the smaller holes,
-                # and so on ...
-                holes = polygon_structure(holes)  # type: ignore
-            polygons.append([exterior, *holes])
-        return polygons
+    def is_inside(index: int, container: int) -> bool:
+        polygon = polygons[container]
+        vertices = polygons[index]
+        if polygon is None or vertices is None:
+            return True  # bounding box test only
+        return _is_inside(vertices, polygon)
 
-    def as_nested_paths(polygons) -> list:
+    def as_nested_paths(index: int) -> list:
         return [
-            polygon.path if isinstance(polygon, BoxStruct) else as_nested_paths(polygon)
-            for polygon in polygons
+            boxed_paths[index].path,
+            *(as_nested_paths(child) for child in children[index]),
         ]
 
-    boxed_paths = []
+    boxed_paths: list[BoxStruct] = []
     for path in paths:
         bbox = path.bbox()
         if bbox.has_data:
             boxed_paths.append(BoxStruct(bbox, path))
+    # stable sorting: equal sized paths are processed in reversed input order
     boxed_paths.sort(key=area)
-    return as_nested_paths(polygon_structure(boxed_paths))
+    boxed_paths.reverse()  # path with the largest area first
+
+    polygons = _flatten_polygons([item.path for item in boxed_paths])
+    tree = BoxRTree((item.bbox, index) for index, item in enumerate(boxed_paths))
+    parents: list[int] = []
+    children: list[list[int]] = []
+    roots: list[int] = []
+    for index, item in enumerate(boxed_paths):
+        center = item.bbox.center
+        # The containers of a path are processed before the path itself:
+        candidates = sorted(
+            container
+            for container in tree.intersecting(item.bbox)
+            if container < index
+            and boxed_paths[container].bbox.inside(center)
+            and is_inside(index, container)
+        )
+        # Descend into the nested structure: each path is located inside the
+        # first processed container of each nesting level.
+        parent = -1
+        for container in candidates:
+            if parents[container] == parent:
+                parent = container
+        parents.append(parent)
+        children.append([])
+        (children[parent] if parent >= 0 else roots).append(index)
+    return [as_nested_paths(index) for index in roots]
+
+
+def _flatten_polygons(paths: list) -> list[Optional[np.ndarray]]:
+    from ezdxf.path import Path
+    from ezdxf.npshapes import NumpyPath2d, flatten_paths
+
+    polygons: list[Optional[np.ndarray]] = [None] * len(paths)
+    indices = [
+        index
+        for index, path in enumerate(paths)
+        if isinstance(path, (Path, NumpyPath2d))
+    ]
+    if not indices:
+        return polygons
+    vertices, offsets = flatten_paths(
+        (paths[index] for index in indices), math.inf, segments=CURVE_SEGMENTS
+    )
+    for index, start, end in zip(indices, offsets[:-1], offsets[1:]):
+        polygon = vertices[start:end]
+        if len(polygon) > 1 and np.array_equal(polygon[0], polygon[-1]):
+            polygon = polygon[:-1]  # open polygon is required
+        if len(polygon) > 2:
+            polygons[index] = polygon
+    return polygons
+
+
+def _is_inside(vertices: np.ndarray, polygon: np.ndarray) -> bool:
+    """Returns ``True`` if the first vertex of `vertices`, which is not located
+    on the boundary of `polygon`, is inside `polygon`.
+    """
+    for start in range(0, len(vertices), TEST_CHUNK_SIZE):
+        states = _point_states(vertices[start : start + TEST_CHUNK_SIZE], polygon)
+        decided = states[states != 0]
+        if len(decided):
+            return bool(decided[0] > 0)
+    return True  # all vertices on the boundary
+
+
+def _point_states(
+    points: np.ndarray, polygon: np.ndarray, abs_tol=TOLERANCE
+) -> np.ndarray:
+    """Vectorized point-in-polygon test of multiple `points`, returns ``+1`` for
+    inside, ``0`` for on boundary line and ``-1`` for outside for each point,
+    see also :func:`ezdxf.math.is_point_in_polygon_2d`.
+    """
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    x2 = polygon[:, 0]
+    y2 = polygon[:, 1]
+    x1 = np.roll(x2, 1)
+    y1 = np.roll(y2, 1)
+    on_boundary = (
+        (np.minimum(x1, x2) <= x)
+        & (x <= np.maximum(x1, x2))
+        & (np.minimum(y1, y2) <= y)
+        & (y <= np.maximum(y1, y2))
+        & (np.abs((y2 - y1) * x - (x2 - x1) * y + (x2 * y1 - y2 * x1)) <= abs_tol)
+    ).any(axis=1)
+    crossing = ((y1 <= y) & (y < y2)) | ((y2 <= y) & (y < y1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing &= x < (x2 - x1) * (y - y1) / (y2 - y1) + x1
+    states = np.where(np.count_nonzero(crossing, axis=1) % 2, 1, -1)
+    states[on_boundary] = 0
+    return states
 
 
 def winding_deconstruction(
@@ -8,6 +8,7 @@ from typing import (
     Optional,
     Sequence,
     TypeVar,
+    Union,
 )
 import math
 from ezdxf.math import (
@@ -34,6 +35,7 @@ from ezdxf.math import (
     quadratic_bezier_bbox,
 )
 from ezdxf.math.triangulation import mapbox_earcut_2d
+from ezdxf.math.clipping import BooleanOperation, polygon_boolean
 from ezdxf.query import EntityQuery
 
 from .path import Path
@@ -43,6 +45,7 @@ from . import converter, nesting
 if TYPE_CHECKING:
     from ezdxf.query import EntityQuery
     from ezdxf.eztypes import GenericLayoutType
+    from ezdxf.npshapes import NumpyPath2d
 
 
 __all__ = [
@@ -74,6 +77,10 @@ __all__ = [
     "chamfer2",
     "triangulate",
     "is_rectangular",
+    "boolean_union",
+    "boolean_difference",
+    "boolean_intersection",
+    "boolean_xor",
 ]
 
 MAX_DISTANCE = 0.01
@@ -980,6 +987,113 @@ def triangulate(
         yield from mapbox_earcut_2d(exterior, holes)
 
 
+def boolean_union(
+    subject: Iterable[Union[Path, NumpyPath2d]],
+    clip: Iterable[Union[Path, NumpyPath2d]] = tuple(),
+    *,
+    nonzero=False,
+    max_sagitta: float = 0.01,
+    min_segments: int = 16,
+) -> list[nesting.Polygon]:
+    """Returns the UNION of the 2D paths `subject` | `clip` as nested polygon
+    structure, see :func:`make_polygon_structure`. Resolves the overlapping and
+    self-intersecting parts of `subject` if `clip` is empty.
+
+    See :func:`ezdxf.math.clipping.polygon_boolean` for more information.
+
+    Args:
+        subject: paths of the first operand, all sub-paths are closed polygons
+        clip: paths of the second operand, all sub-paths are closed polygons
+        nonzero: use the nonzero winding rule, default is the even-odd rule
+        max_sagitta: maximum distance from the center of the curve to the
+            center of the line segment between two approximation points to determine if
+            a segment should be subdivided.
+        min_segments: minimum segment count per Bézier curve
+
+    .. versionadded:: 1.1
+
+    """
+    return _boolean_operation(
+        subject, clip, BooleanOperation.UNION, nonzero, max_sagitta, min_segments
+    )
+
+
+def boolean_difference(
+    subject: Iterable[Union[Path, NumpyPath2d]],
+    clip: Iterable[Union[Path, NumpyPath2d]],
+    *,
+    nonzero=False,
+    max_sagitta: float = 0.01,
+    min_segments: int = 16,
+) -> list[nesting.Polygon]:
+    """Returns the DIFFERENCE of the 2D paths `subject` - `clip` as nested
+    polygon structure, see :func:`boolean_union` for more information.
+
+    .. versionadded:: 1.1
+
+    """
+    return _boolean_operation(
+        subject, clip, BooleanOperation.DIFFERENCE, nonzero, max_sagitta, min_segments
+    )
+
+
+def boolean_intersection(
+    subject: Iterable[Union[Path, NumpyPath2d]],
+    clip: Iterable[Union[Path, NumpyPath2d]],
+    *,
+    nonzero=False,
+    max_sagitta: float = 0.01,
+    min_segments: int = 16,
+) -> list[nesting.Polygon]:
+    """Returns the INTERSECTION of the 2D paths `subject` & `clip` as nested
+    polygon structure, see :func:`boolean_union` for more information.
+
+    .. versionadded:: 1.1
+
+    """
+    return _boolean_operation(
+        subject, clip, BooleanOperation.INTERSECTION, nonzero, max_sagitta, min_segments
+    )
+
+
+def boolean_xor(
+    subject: Iterable[Union[Path, NumpyPath2d]],
+    clip: Iterable[Union[Path, NumpyPath2d]],
+    *,
+    nonzero=False,
+    max_sagitta: float = 0.01,
+    min_segments: int = 16,
+) -> list[nesting.Polygon]:
+    """Returns the symmetric difference (XOR) of the 2D paths `subject` ^ `clip`
+    as nested polygon structure, see :func:`boolean_union` for more information.
+
+    .. versionadded:: 1.1
+
+    """
+    return _boolean_operation(
+        subject, clip, BooleanOperation.XOR, nonzero, max_sagitta, min_segments
+    )
+
+
+def _boolean_operation(
+    subject: Iterable[Union[Path, NumpyPath2d]],
+    clip: Iterable[Union[Path, NumpyPath2d]],
+    op: BooleanOperation,
+    nonzero: bool,
+    max_sagitta: float,
+    min_segments: int,
+) -> list[nesting.Polygon]:
+    def flatten(paths: Iterable[Union[Path, NumpyPath2d]]) -> Iterator[list[Vec2]]:
+        for path in paths:
+            for sub_path in path.sub_paths():
+                yield Vec2.list(sub_path.flattening(max_sagitta, min_segments))
+
+    polygons = polygon_boolean(flatten(subject), flatten(clip), op, nonzero=nonzero)
+    return nesting.make_polygon_structure(
+        converter.from_vertices(polygon, close=True) for polygon in polygons
+    )
+
+
 def is_rectangular(path: Path, aligned=True) -> bool:
     """Returns ``True`` if `path` is a rectangular quadrilateral (square or
     rectangle). If the argument `aligned` is ``True`` all sides of the
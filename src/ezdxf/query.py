@@ -1,5 +1,5 @@
 # Purpose: Query language and manipulation object for DXF entities
-# Copyright (c) 2013-2022, Manfred Moitzi
+# Copyright (c) 2013-2023, Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
 from typing import (
@@ -10,16 +10,25 @@ from typing import (
     Sequence,
     Union,
     Optional,
+    Set,
+    TYPE_CHECKING,
 )
 import re
 import operator
+import functools
 from collections import abc
 
 from ezdxf.entities.dxfentity import DXFEntity
+from ezdxf.entities.dxfns import INDEXED_ATTRIBUTES
 from ezdxf.groupby import groupby
 from ezdxf.math import Vec3, Vec2
 from ezdxf.queryparser import EntityQueryParser
 
+if TYPE_CHECKING:
+    from ezdxf.entitydb import EntityDB, AttributeIndex
+
+QueryPlan = Callable[["AttributeIndex"], Set[DXFEntity]]
+
 
 class _AttributeDescriptor:
     def __init__(self, name: str):
@@ -441,6 +450,18 @@ class EntityQuery(abc.Sequence):
 
 
 def entity_matcher(query: str) -> Callable[[DXFEntity], bool]:
+    return compile_query(query)[0]
+
+
+@functools.lru_cache(maxsize=128)
+def compile_query(
+    query: str,
+) -> tuple[Callable[[DXFEntity], bool], Optional[QueryPlan]]:
+    """Returns the entity matcher function and the query plan for the
+    secondary attribute indexes of the entity database of the `query` string.
+    The query plan is ``None`` if the indexes can not be used for the query.
+    The compiled queries are cached. (internal API)
+    """
     query_args = EntityQueryParser.parseString(query, parseAll=True)
     entity_matcher_ = build_entity_name_matcher(query_args.EntityQuery)
     attrib_matcher = build_entity_attributes_matcher(
@@ -450,7 +471,51 @@ def entity_matcher(query: str) -> Callable[[DXFEntity], bool]:
     def matcher(entity: DXFEntity) -> bool:
         return entity_matcher_(entity) and attrib_matcher(entity)
 
-    return matcher
+    plans: list[QueryPlan] = []
+    names_plan = build_entity_names_plan(query_args.EntityQuery)
+    if names_plan is not None:
+        plans.append(names_plan)
+    attribs_plan = build_entity_attributes_plan(
+        query_args.AttribQuery, query_args.AttribQueryOptions
+    )
+    if attribs_plan is not None:
+        plans.append(attribs_plan)
+    return matcher, _intersection_plan(plans)
+
+
+def indexed_query(
+    entitydb: EntityDB,
+    query: str = "*",
+    entities: Optional[Iterable[DXFEntity]] = None,
+) -> Optional[EntityQuery]:
+    """Returns the result of the `query` over the entities of the `entitydb`,
+    planned against the secondary attribute indexes of the database.
+    Returns ``None`` if the indexes can not be used for the `query`.
+
+    If `entities` is not ``None``, the result contains only the entities of
+    this iterable in the same order, e.g. the entities of the entity spaces of
+    all layouts and blocks. The indexes select the candidates, but the
+    membership of the entities is determined by the given `entities`, which
+    excludes linked sub-entities like VERTEX, SEQEND and ATTRIB and entities
+    which are not located in an entity space. Otherwise the entities of the
+    result are in the order in which they were added to the indexes, which is
+    the database order.
+
+    (internal API)
+
+    """
+    matcher, plan = compile_query(query)
+    if plan is None:
+        return None
+    index = entitydb.get_attribute_index()
+    candidates = plan(index)
+    if entities is None:
+        entities = index.sort(candidates)
+    else:
+        entities = (e for e in entities if e in candidates)
+    result = EntityQuery()
+    result.entities = [e for e in entities if matcher(e)]
+    return result
 
 
 def build_entity_name_matcher(
@@ -480,6 +545,7 @@ class Relation:
         name, op, value = relation
         self.dxf_attrib = name
         self.compare = Relation.CMP_OPERATORS[op]
+        self.ignore_case = ignore_case
         self.convert_case = to_lower if ignore_case else lambda x: x
 
         re_flags = re.IGNORECASE if ignore_case else 0
@@ -571,6 +637,98 @@ def build_entity_attributes_matcher(
     return match_bool_expr
 
 
+def build_entity_names_plan(names: Sequence[str]) -> Optional[QueryPlan]:
+    dxftypes = [name.upper() for name in names]
+    if "*" in dxftypes:
+        return None
+
+    def plan(index: AttributeIndex) -> set[DXFEntity]:
+        result: set[DXFEntity] = set()
+        for dxftype in dxftypes:
+            result.update(index.get("dxftype", dxftype))
+        return result
+
+    return plan
+
+
+def build_entity_attributes_plan(
+    tokens: Sequence, options: str
+) -> Optional[QueryPlan]:
+    if not len(tokens):
+        return None
+    ignore_case = "i" == options
+    return _build_plan(_compile_tokens(tokens, ignore_case))
+
+
+def _build_plan(
+    expr: Union[str, Relation, BoolExpression, Sequence]
+) -> Optional[QueryPlan]:
+    # The query plan returns a superset of the entities matching the
+    # expression, the entities of the superset have to be tested by the
+    # entity matcher.
+    if isinstance(expr, BoolExpression):
+        return _build_plan(expr.tokens)
+    if isinstance(expr, Relation):
+        if expr.dxf_attrib not in INDEXED_ATTRIBUTES:
+            return None
+        return _relation_plan(expr)
+
+    operators = set(token for token in expr if isinstance(token, str))
+    if "!" in operators:
+        return None
+    plans = [_build_plan(token) for token in expr if not isinstance(token, str)]
+    if "|" in operators:
+        if any(plan is None for plan in plans):
+            return None
+        return _union_plan(plans)  # type: ignore
+    return _intersection_plan([plan for plan in plans if plan is not None])
+
+
+def _relation_plan(relation: Relation) -> QueryPlan:
+    name = relation.dxf_attrib
+    if relation.compare is operator.eq and not relation.ignore_case:
+        value = relation.value
+
+        def plan(index: AttributeIndex) -> set[DXFEntity]:
+            return index.get(name, value)
+
+        return plan
+
+    def predicate(value) -> bool:
+        try:
+            return relation.compare(relation.convert_case(value), relation.value)
+        except TypeError:  # incompatible types
+            return False
+
+    def select(index: AttributeIndex) -> set[DXFEntity]:
+        return index.select(name, predicate)
+
+    return select
+
+
+def _union_plan(plans: list[QueryPlan]) -> QueryPlan:
+    def plan(index: AttributeIndex) -> set[DXFEntity]:
+        result: set[DXFEntity] = set()
+        for p in plans:
+            result.update(p(index))
+        return result
+
+    return plan
+
+
+def _intersection_plan(plans: list[QueryPlan]) -> Optional[QueryPlan]:
+    if not plans:
+        return None
+    if len(plans) == 1:
+        return plans[0]
+
+    def plan(index: AttributeIndex) -> set[DXFEntity]:
+        results = sorted((p(index) for p in plans), key=len)
+        return results[0].intersection(*results[1:])
+
+    return plan
+
+
 def unique_entities(entities: Iterable[DXFEntity]) -> Iterator[DXFEntity]:
     """Yield all unique entities, order of all entities will be preserved."""
     done: set[DXFEntity] = set()
@@ -10,6 +10,7 @@ from typing import (
     Union,
     Optional,
     Tuple,
+    Iterable,
 )
 from typing_extensions import TypeAlias
 from collections import defaultdict
@@ -17,6 +18,9 @@ import enum
 import math
 import dataclasses
 import random
+
+import numpy as np
+
 from ezdxf.math import (
     Vec2,
     Vec3,
@@ -24,8 +28,9 @@ from ezdxf.math import (
     Bezier4P,
     intersection_ray_cubic_bezier_2d,
     quadratic_to_cubic_bezier,
+    UVec,
 )
-from ezdxf import const
+from ezdxf import const, npshapes
 from ezdxf.path import Path, LineTo, MoveTo, Curve3To, Curve4To
 
 if TYPE_CHECKING:
@@ -35,6 +40,9 @@ MIN_HATCH_LINE_DISTANCE = 1e-4  # ??? what's a good choice
 NONE_VEC2 = Vec2(math.nan, math.nan)
 KEY_NDIGITS = 4
 SORT_NDIGITS = 10
+# max. count of intersections or pattern elements of the vectorized hatching engine
+MAX_HATCH_ELEMENTS = 10_000_000
+MAX_SAGITTA = 0.01
 
 
 class IntersectionType(enum.IntEnum):
@@ -592,6 +600,197 @@ def _line_segments(vertices: list[Intersection], distance: float) -> Iterator[Li
         prev_point = point
 
 
+# Vectorized hatching engine:
+# The boundary polygons are transformed into the pattern space of a hatch baseline,
+# where the u-axis is the hatch line direction and the v-axis is the normal
+# direction of the hatch lines. In pattern space the hatch lines are horizontal
+# scanlines at v = k * normal_distance and the line pattern of scanline k starts at
+# u = k * (offset · direction). An edge intersects the scanlines k in the range
+# ceil(v0 / normal_distance) <= k < ceil(v1 / normal_distance), this half-open
+# range counts vertices located at a scanline only for edges crossing the scanline.
+
+
+def hatch_pattern_lines(
+    baseline: HatchBaseLine, polygons: Iterable[Union[np.ndarray, Iterable[UVec]]]
+) -> np.ndarray:
+    """Returns the rendered pattern lines of the hatch defined by the `baseline`
+    and the given 2D `polygons` as ndarray of shape (n, 2, 2), each line is a
+    (start, end) pair of 2D vertices. Points of the line pattern are lines of zero
+    length, where the start vertex is equal to the end vertex.
+
+    This is the vectorized replacement of :func:`hatch_polygons` and
+    :meth:`PatternRenderer.render`. All intersections of all hatch lines with all
+    polygon edges and the line pattern are calculated by numpy array operations.
+    The `polygons` of a single entity can be given as ndarrays of shape (n, 2) or
+    as iterables of vertices, they are treated as closed polygons even if the last
+    vertex is not equal to the first vertex.
+
+    Args:
+        baseline: :class:`HatchBaseLine`
+        polygons: the boundary polygons of a single entity, the order of exterior-
+            and hole polygons and their winding orientation is not important
+
+    Raises:
+        DenseHatchingLinesError: the count of intersections or pattern elements
+            exceeds :attr:`MAX_HATCH_ELEMENTS`
+
+    .. versionadded:: 1.1
+
+    """
+    k, start, end = _scanline_segments(baseline, polygons)
+    if len(baseline.line_pattern):
+        k, start, end = _apply_line_pattern(baseline, k, start, end)
+    direction = np.array(baseline.direction, dtype=np.float64)
+    normal = np.array((-direction[1], direction[0]))
+    line_origins = np.array(baseline.origin, dtype=np.float64) + np.outer(
+        k * baseline.normal_distance, normal
+    )
+    lines = np.empty((len(k), 2, 2), dtype=np.float64)
+    lines[:, 0] = line_origins + np.outer(start, direction)
+    lines[:, 1] = line_origins + np.outer(end, direction)
+    return lines
+
+
+def boundary_polygons(
+    paths: Iterable[Union[Path, npshapes.NumpyPath2d]], max_sagitta: float = MAX_SAGITTA
+) -> list[np.ndarray]:
+    """Returns the flattened sub-paths of the given boundary `paths` as ndarrays of
+    shape (n, 2) for the :func:`hatch_pattern_lines` function.
+
+    Args:
+        paths: boundary paths
+        max_sagitta: maximum distance from the center of the curve to the
+            center of the line segment between two approximation points to determine if
+            a segment should be subdivided.
+
+    .. versionadded:: 1.1
+
+    """
+    sub_paths = [sub_path for path in paths for sub_path in path.sub_paths()]
+    vertices, offsets = npshapes.flatten_paths(sub_paths, max_sagitta)
+    return [
+        vertices[start:end]
+        for start, end in zip(offsets[:-1], offsets[1:])
+        if end - start > 2
+    ]
+
+
+def _scanline_segments(
+    baseline: HatchBaseLine, polygons: Iterable[Union[np.ndarray, Iterable[UVec]]]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the hatch line segments inside the polygons in pattern space as
+    tuple of ndarrays (scanline index, start, end), the segments are sorted by
+    scanline index and start location.
+    """
+    u_list: list[np.ndarray] = []
+    f_list: list[np.ndarray] = []
+    direction = np.array(baseline.direction, dtype=np.float64)
+    normal = np.array((-direction[1], direction[0]))
+    origin = np.array(baseline.origin, dtype=np.float64)
+    for polygon in polygons:
+        if isinstance(polygon, np.ndarray):
+            vertices = polygon[:, :2].astype(np.float64, copy=False)
+        else:
+            vertices = np.array(
+                [(v.x, v.y) for v in Vec2.generate(polygon)], dtype=np.float64
+            ).reshape(-1, 2)
+        # a closing vertex creates a zero-length edge without intersections
+        if len(vertices) < 3:
+            continue
+        vertices = vertices - origin
+        u_list.append(vertices @ direction)
+        # normal distance as multiple of the hatch line distance:
+        f_list.append((vertices @ normal) / baseline.normal_distance)
+    if not u_list:
+        empty = np.empty(0, dtype=np.float64)
+        return empty.astype(np.int64), empty, empty
+
+    u0 = np.concatenate(u_list)
+    f0 = np.concatenate(f_list)
+    u1 = np.concatenate([np.roll(u, -1) for u in u_list])
+    f1 = np.concatenate([np.roll(f, -1) for f in f_list])
+    first_scanline = np.ceil(np.minimum(f0, f1))
+    counts = (np.ceil(np.maximum(f0, f1)) - first_scanline).astype(np.int64)
+    total = int(counts.sum())
+    if total > MAX_HATCH_ELEMENTS:
+        raise DenseHatchingLinesError(f"too many hatch line intersections: {total}")
+
+    # expand each edge for all intersected scanlines:
+    edges = np.repeat(np.arange(len(counts)), counts)
+    k = np.repeat(first_scanline, counts) + (
+        np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    factor = (k - f0[edges]) / (f1[edges] - f0[edges])
+    u = u0[edges] + (u1[edges] - u0[edges]) * factor
+    order = np.lexsort((u, k))
+    k = k[order]
+    u = u[order]
+    # each closed polygon intersects a scanline an even number of times, the
+    # intersections of a scanline are pairs of entering and leaving points
+    # (even-odd rule):
+    k = k[0::2]
+    start = u[0::2]
+    end = u[1::2]
+
+    # merge adjacent segments and remove zero-length segments:
+    if len(k) > 1:
+        is_first = np.ones(len(k), dtype=bool)
+        is_first[1:] = (k[1:] != k[:-1]) | (start[1:] - end[:-1] > 1e-12)
+        is_last = np.roll(is_first, -1)
+        k = k[is_first]
+        start = start[is_first]
+        end = end[is_last]
+    valid = end - start > 1e-12
+    return k[valid].astype(np.int64), start[valid], end[valid]
+
+
+def _apply_line_pattern(
+    baseline: HatchBaseLine, k: np.ndarray, start: np.ndarray, end: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the dashes and points of the line pattern in pattern space as tuple
+    of ndarrays (scanline index, start, end).
+    """
+    pattern = np.array(baseline.line_pattern, dtype=np.float64)
+    lengths = np.abs(pattern)
+    pattern_length = math.fsum(lengths)
+    if pattern_length < 1e-9:  # solid line
+        return k, start, end
+    visible = pattern >= 0.0  # dashes and points
+    element_start = (np.cumsum(lengths) - lengths)[visible]
+    element_length = pattern[visible]
+    is_point = element_length == 0.0
+
+    pattern_origin = k * Vec2(baseline.offset).dot(baseline.direction)
+    first_index = np.floor((start - pattern_origin) / pattern_length)
+    counts = (
+        np.floor((end - pattern_origin) / pattern_length) - first_index + 1
+    ).astype(np.int64)
+    total = int(counts.sum())
+    if total * len(element_start) > MAX_HATCH_ELEMENTS:
+        raise DenseHatchingLinesError(f"too many pattern elements: {total}")
+
+    # expand each segment for all pattern repetitions:
+    segments = np.repeat(np.arange(len(counts)), counts)
+    index = np.repeat(first_index, counts) + (
+        np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    element_starts = (pattern_origin[segments] + index * pattern_length)[
+        :, np.newaxis
+    ] + element_start
+    element_ends = element_starts + element_length
+    segment_starts = start[segments, np.newaxis]
+    segment_ends = end[segments, np.newaxis]
+    dash_starts = np.maximum(element_starts, segment_starts)
+    dash_ends = np.minimum(element_ends, segment_ends)
+    keep = np.where(
+        is_point,
+        (element_starts >= segment_starts) & (element_starts <= segment_ends),
+        dash_ends > dash_starts,
+    )
+    k = np.broadcast_to(k[segments, np.newaxis], keep.shape)
+    return k[keep], dash_starts[keep], dash_ends[keep]
+
+
 def hatch_entity(
     polygon: DXFPolygon,
     filter_text_boxes=True,
@@ -619,18 +818,16 @@ def hatch_entity(
         return
     ocs = polygon.ocs()
     elevation = polygon.dxf.elevation.z
-    paths = hatch_boundary_paths(polygon, filter_text_boxes)
     # todo: MPOLYGON offset
     # All paths in OCS!
+    polygons = boundary_polygons(hatch_boundary_paths(polygon, filter_text_boxes))
     for baseline in pattern_baselines(polygon, jiggle_origin=jiggle_origin):
-        for line in hatch_paths(baseline, paths):
-            line_pattern = baseline.pattern_renderer(line.distance)
-            for s, e in line_pattern.render(line.start, line.end):
-                if ocs.transform:
-                    yield ocs.to_wcs((s.x, s.y, elevation)), ocs.to_wcs(
-                        (e.x, e.y, elevation)
-                    )
-                yield Vec3(s), Vec3(e)
+        for (x0, y0), (x1, y1) in hatch_pattern_lines(baseline, polygons).tolist():
+            s = Vec3(x0, y0, elevation)
+            e = Vec3(x1, y1, elevation)
+            if ocs.transform:
+                s, e = ocs.to_wcs(s), ocs.to_wcs(e)
+            yield s, e
 
 
 def hatch_boundary_paths(polygon: DXFPolygon, filter_text_boxes=True) -> list[Path]:
@@ -1,6 +1,7 @@
-# Copyright (c) 2020-2022, Manfred Moitzi
+# Copyright (c) 2020-2023, Manfred Moitzi
 # License: MIT License
-from typing import Iterable, Iterator
+from typing import Iterable, Iterator, Sequence
+import numpy as np
 import ezdxf
 from ezdxf.math import UVec
 from ._linetypes import _LineTypeRenderer, LineSegment
@@ -19,3 +20,113 @@ class LineTypeRenderer(_LineTypeRenderer):
             if last is not None:
                 yield from self.line_segment(last, vertex)
             last = vertex
+
+
+def dashed_lines(vertices: np.ndarray, dashes: Sequence[float]) -> np.ndarray:
+    """Returns the line pattern `dashes` applied to the polyline `vertices` as
+    ndarray, where each pair of rows (n, n+1) represents the start- and end
+    point of a dash. The `vertices` are an ndarray of shape (n, 2) or (n, 3),
+    the pattern `dashes` is the simplified line pattern as for the
+    :class:`LineTypeRenderer`. The line pattern is continued across the
+    polyline vertices.
+    """
+    return multi_dashed_lines((vertices,), dashes)
+
+
+def multi_dashed_lines(
+    polylines: Iterable[np.ndarray], dashes: Sequence[float]
+) -> np.ndarray:
+    """Returns the line pattern `dashes` applied to multiple `polylines` as a
+    single ndarray, where each pair of rows (n, n+1) represents the start- and
+    end point of a dash. Each polyline starts at the beginning of the line
+    pattern. All polylines have to have the same vertex dimension.
+
+    This is the vectorized batch version of the :class:`LineTypeRenderer`,
+    the dashes of all polylines are calculated at once without creating
+    Python objects for each dash.
+    """
+    arrays = [np.asarray(p, dtype=np.float64) for p in polylines]
+    arrays = [a for a in arrays if len(a) > 1]
+    if len(arrays) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    vertices = np.concatenate(arrays)
+    counts = np.array([len(a) for a in arrays])
+    last = np.cumsum(counts) - 1  # index of the last vertex of each polyline
+    first = last - counts + 1  # index of the first vertex of each polyline
+    pattern = np.asarray(dashes, dtype=np.float64)
+    period = float(pattern.sum()) if len(pattern) > 1 else 0.0
+    if period <= 0.0:  # solid line
+        mask = np.ones(len(vertices) - 1, dtype=bool)
+        mask[last[:-1]] = False  # no lines between polylines
+        index = np.flatnonzero(mask)
+        return _interleave(vertices[index], vertices[index + 1])
+    if len(pattern) % 2:
+        # an odd count of dashes swaps dashes and gaps for each repetition
+        pattern = np.concatenate((pattern, pattern))
+        period *= 2.0
+
+    # distance of each vertex from the start of its polyline:
+    segment_lengths = np.linalg.norm(np.diff(vertices, axis=0), axis=1)
+    distances = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+    distances -= np.repeat(distances[first], counts)
+    lengths = distances[last]
+    # Each polyline starts at the beginning of a pattern period, polylines are
+    # separated by at least one pattern period:
+    periods = np.floor(lengths / period).astype(np.int64) + 1
+    starts = np.concatenate(([0], np.cumsum(periods)[:-1])) * period
+    ends = starts + lengths
+    distances += np.repeat(starts, counts)
+
+    # dashes of all pattern periods as distances:
+    bounds = np.cumsum(pattern)
+    period_starts = np.repeat(starts, periods) + period * (
+        np.arange(periods.sum()) - np.repeat(np.cumsum(periods) - periods, periods)
+    )
+    dash_starts = (period_starts[:, np.newaxis] + (bounds - pattern)[0::2]).ravel()
+    dash_ends = (period_starts[:, np.newaxis] + bounds[0::2]).ravel()
+    owner = np.repeat(np.arange(len(arrays)), periods * (len(pattern) // 2))
+    # the first dash of a polyline is kept for polylines of zero length:
+    keep = (dash_starts < ends[owner]) | (dash_starts == starts[owner])
+    dash_starts = dash_starts[keep]
+    dash_ends = np.minimum(dash_ends[keep], ends[owner[keep]])
+
+    # split dashes at polyline vertices:
+    i0 = np.searchsorted(distances, dash_starts, side="right")
+    inner = np.maximum(np.searchsorted(distances, dash_ends, side="left") - i0, 0)
+    pieces = inner + 1
+    dash_index = np.repeat(np.arange(len(dash_starts)), pieces)
+    k = np.arange(pieces.sum()) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    vertex_index = i0[dash_index] + k
+    max_index = len(distances) - 1
+    piece_starts = np.where(
+        k == 0,
+        dash_starts[dash_index],
+        distances[np.minimum(vertex_index - 1, max_index)],
+    )
+    piece_ends = np.where(
+        k == inner[dash_index],
+        dash_ends[dash_index],
+        distances[np.minimum(vertex_index, max_index)],
+    )
+    # remove zero-length pieces of split dashes, keep the dots of the pattern:
+    keep = (piece_ends > piece_starts) | (inner[dash_index] == 0)
+    return _interleave(
+        _interpolate(distances, vertices, piece_starts[keep]),
+        _interpolate(distances, vertices, piece_ends[keep]),
+    )
+
+
+def _interpolate(
+    distances: np.ndarray, vertices: np.ndarray, locations: np.ndarray
+) -> np.ndarray:
+    columns = vertices.shape[1]
+    return np.column_stack(
+        [np.interp(locations, distances, vertices[:, i]) for i in range(columns)]
+    )
+
+
+def _interleave(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    lines = np.empty((len(starts) * 2, starts.shape[1]), dtype=np.float64)
+    lines[0::2] = starts
+    lines[1::2] = ends
+    return lines
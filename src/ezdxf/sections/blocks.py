@@ -29,6 +29,7 @@ from ezdxf.entities import (
     factory,
     is_graphic_entity,
 )
+from ezdxf.entitydb import LazyEntity
 from ezdxf.math import UVec, NULLVEC, Vec3
 from ezdxf.render.arrows import ARROWS
 
@@ -144,8 +145,10 @@ class BlocksSection:
             for entity in entities:
                 # Do not store linked entities (VERTEX, ATTRIB, SEQEND) in
                 # the block layout, linked entities ares stored in their
-                # parent entity e.g. VERTEX -> POLYLINE:
-                if not linked(entity):
+                # parent entity e.g. VERTEX -> POLYLINE. Linked entities of
+                # lazy loaded entities are already bundled with the parent
+                # entity:
+                if isinstance(entity, LazyEntity) or not linked(entity):
                     yield entity
 
         block_records = self.block_records
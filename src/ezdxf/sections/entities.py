@@ -1,4 +1,4 @@
-# Copyright (c) 2011-2022, Manfred Moitzi
+# Copyright (c) 2011-2023, Manfred Moitzi
 # License: MIT License
 from __future__ import annotations
 from typing import TYPE_CHECKING, Iterable, Iterator, cast, Optional
@@ -7,6 +7,7 @@ import logging
 
 from ezdxf.lldxf import const
 from ezdxf.entities import entity_linker
+from ezdxf.entitydb import LazyEntity
 
 if TYPE_CHECKING:
     from ezdxf.document import Drawing
@@ -73,17 +74,20 @@ class EntitySection:
             )
 
         def add(entity: DXFGraphic):
-            handle = entity.dxf.owner
+            if isinstance(entity, LazyEntity):
+                handle = entity.owner
+                paperspace_flag = entity.paperspace
+            else:
+                handle = entity.dxf.owner
+                paperspace_flag = entity.dxf.get("paperspace", 0)
             # higher priority for owner handle
             paperspace = 0
             if handle == msp_layout_key:
                 paperspace = 0
             elif handle == psp_layout_key:
                 paperspace = 1
-            elif entity.dxf.hasattr(
-                "paperspace"
-            ):  # paperspace flag as fallback
-                paperspace = entity.dxf.paperspace
+            elif paperspace_flag:  # paperspace flag as fallback
+                paperspace = paperspace_flag
 
             if paperspace:
                 psp.add_entity(entity)
@@ -99,7 +103,10 @@ class EntitySection:
         for entity in entities:
             # No check for valid entities here:
             # Use the audit- or the recover module to fix invalid DXF files!
-            if not linked_entities(entity):
+            if isinstance(entity, LazyEntity):
+                # linked entities are already bundled with the main entity
+                add(entity)  # type: ignore
+            elif not linked_entities(entity):
                 add(entity)  # type: ignore
 
     def export_dxf(self, tagwriter: AbstractTagWriter) -> None:
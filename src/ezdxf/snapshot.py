@@ -0,0 +1,155 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+"""
+Persistent snapshots of loaded DXF documents.
+
+A snapshot is the pickled :class:`~ezdxf.document.Drawing` object of a loaded
+DXF document. Restoring a document from a snapshot is much faster than parsing
+the DXF file again, because neither the DXF tags nor the DXF entities have to
+be created from scratch.
+
+The snapshots are stored in a cache directory, the name of a snapshot file is
+derived from the absolute path of the DXF file. A snapshot is only valid if
+the size, the modification time and the hash of the DXF file, the loading
+parameters and the `ezdxf` version match the values stored in the snapshot.
+
+.. warning::
+
+    Snapshots are pickle files, never load snapshots from untrusted cache
+    directories!
+
+"""
+from __future__ import annotations
+from typing import Optional, Any, Iterator, TYPE_CHECKING
+import contextlib
+import gc
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+
+from ezdxf.version import __version__
+
+if TYPE_CHECKING:
+    from ezdxf.document import Drawing
+
+__all__ = ["load", "save", "snapshot_path"]
+
+logger = logging.getLogger("ezdxf")
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_EXT = ".snapshot"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def snapshot_path(
+    cache_dir: str | os.PathLike, filename: str | os.PathLike
+) -> pathlib.Path:
+    """Returns the path of the snapshot file for the DXF file `filename` in
+    the directory `cache_dir`.
+    """
+    path = str(pathlib.Path(filename).absolute())
+    name = hashlib.sha1(path.encode("utf8", errors="surrogateescape")).hexdigest()
+    return pathlib.Path(cache_dir) / (name + SNAPSHOT_EXT)
+
+
+def file_hash(filename: str | os.PathLike) -> str:
+    """Returns the hash of the content of the file `filename`."""
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(filename, "rb") as fp:
+        for block in iter(lambda: fp.read(HASH_BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _file_key(
+    filename: str | os.PathLike, params: dict[str, Any]
+) -> dict[str, Any]:
+    stat = os.stat(filename)
+    return {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "version": __version__,
+        "path": str(pathlib.Path(filename).absolute()),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "params": params,
+    }
+
+
+@contextlib.contextmanager
+def _gc_disabled() -> Iterator[None]:
+    # The cyclic garbage collector is triggered very often while (un)pickling
+    # the huge amount of objects of a DXF document, which slows down the
+    # process by an order of magnitude.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def save(
+    doc: Drawing,
+    cache_dir: str | os.PathLike,
+    filename: str | os.PathLike,
+    **params,
+) -> bool:
+    """Save a snapshot of the DXF document `doc` loaded from the DXF file
+    `filename` in the directory `cache_dir`. The keyword arguments `params`
+    are the parameters of the loading process, which have to match at
+    restoring the snapshot.
+
+    Returns ``True`` if the snapshot was saved successfully, the DXF document
+    is not modified and can be used after saving the snapshot.
+
+    """
+    path = snapshot_path(cache_dir, filename)
+    key = _file_key(filename, params)
+    key["hash"] = file_hash(filename)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "wb") as fp, _gc_disabled():
+            pickle.dump(key, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(doc, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        # replace existing snapshots atomically:
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError, RecursionError, TypeError) as e:
+        logger.warning(f"cannot save snapshot of '{filename}': {str(e)}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+def load(
+    cache_dir: str | os.PathLike, filename: str | os.PathLike, **params
+) -> Optional[Drawing]:
+    """Restore the DXF document loaded from the DXF file `filename` from a
+    snapshot in the directory `cache_dir`. Returns ``None`` if no snapshot
+    exist or the snapshot is outdated. The keyword arguments `params` have to
+    match the parameters used to save the snapshot.
+
+    """
+    path = snapshot_path(cache_dir, filename)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as fp:
+            key = pickle.load(fp)
+            expected = _file_key(filename, params)
+            if not isinstance(key, dict) or any(
+                key.get(name) != value for name, value in expected.items()
+            ):
+                return None
+            if key.get("hash") != file_hash(filename):
+                return None
+            with _gc_disabled():
+                doc = pickle.load(fp)
+    except Exception as e:  # any exception is possible for corrupt snapshots
+        logger.warning(f"cannot load snapshot of '{filename}': {str(e)}")
+        return None
+    return doc
@@ -0,0 +1,180 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+"""
+Spatial index for the entities of a layout.
+
+The spatial index is a :class:`~ezdxf.math.rtree.BoxRTree` of the 2D bounding
+boxes of the entities projected onto the xy-plane. The bounding boxes are
+calculated by the :mod:`ezdxf.bbox` module.
+
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from ezdxf import bbox
+from ezdxf.math import AbstractBoundingBox, BoundingBox2d, UVec, Vec2
+from ezdxf.math.rtree import BoxRTree
+
+if TYPE_CHECKING:
+    from ezdxf.entities import DXFGraphic
+
+__all__ = ["SpatialIndex"]
+
+
+class SpatialIndex:
+    """Spatial index of DXF entities.
+
+    The index stores the 2D bounding boxes of the entities projected onto the
+    xy-plane. The bounding boxes of added and updated entities are calculated
+    at the next query, therefore entities can be modified after adding them
+    to the index, like the entities created by the factory methods of
+    layouts. Entities without extents, like empty TEXT entities, can not be
+    found by queries.
+
+    Args:
+        entities: entities to index
+        fast: calculate the bounding boxes of Bézier curves based on their
+            control points, this may return slightly larger bounding boxes
+        cache: optional :class:`~ezdxf.bbox.Cache` for the calculation of the
+            bounding boxes
+
+    """
+
+    def __init__(
+        self,
+        entities: Iterable[DXFGraphic] = tuple(),
+        *,
+        fast=False,
+        cache: Optional[bbox.Cache] = None,
+    ):
+        self.fast = fast
+        self.cache = cache
+        self._boxes: dict[int, tuple[DXFGraphic, Optional[BoundingBox2d]]] = dict()
+        self._pending: dict[int, DXFGraphic] = dict()
+        self._tree: BoxRTree[DXFGraphic] = BoxRTree()
+        for entity in entities:
+            self.add(entity)
+
+    def __len__(self) -> int:
+        """Returns the count of indexed entities."""
+        return len(self._boxes) + len(self._pending)
+
+    def __contains__(self, entity: DXFGraphic) -> bool:
+        """Returns ``True`` if `entity` is indexed."""
+        key = id(entity)
+        return key in self._boxes or key in self._pending
+
+    def _extents(self, entity: DXFGraphic) -> Optional[BoundingBox2d]:
+        box = bbox.extents((entity,), fast=self.fast, cache=self.cache)
+        if not box.has_data:
+            return None
+        return BoundingBox2d((box.extmin, box.extmax))
+
+    def _update_tree(self) -> None:
+        if not self._pending:
+            return
+        boxes = self._boxes
+        new_items: list[tuple[BoundingBox2d, DXFGraphic]] = []
+        for key, entity in self._pending.items():
+            box = self._extents(entity) if entity.is_alive else None
+            boxes[key] = (entity, box)
+            if box is not None:
+                new_items.append((box, entity))
+        self._pending.clear()
+        self._tree.extend(new_items)
+
+    def _remove_from_tree(self, entity: DXFGraphic) -> None:
+        data = self._boxes.pop(id(entity), None)
+        if data is not None and data[1] is not None:
+            self._tree.remove(data[1], entity)
+
+    def add(self, entity: DXFGraphic) -> None:
+        """Add `entity` to the index."""
+        self._remove_from_tree(entity)
+        self._pending[id(entity)] = entity
+
+    def remove(self, entity: DXFGraphic) -> None:
+        """Remove `entity` from the index, ignores not indexed entities."""
+        self._pending.pop(id(entity), None)
+        self._remove_from_tree(entity)
+
+    def update(self, entity: DXFGraphic) -> None:
+        """Update the bounding box of the indexed `entity` after
+        modifications, ignores not indexed entities.
+        """
+        if entity in self:
+            self.add(entity)
+
+    def clear(self) -> None:
+        """Remove all entities from the index."""
+        self._boxes.clear()
+        self._pending.clear()
+        self._tree = BoxRTree()
+
+    def bbox(self, entity: DXFGraphic) -> Optional[BoundingBox2d]:
+        """Returns the indexed 2D bounding box of `entity` or ``None`` if the
+        `entity` is not indexed or has no extents.
+        """
+        self._update_tree()
+        data = self._boxes.get(id(entity))
+        if data is None:
+            return None
+        return data[1]
+
+    def unbounded(self) -> list[DXFGraphic]:
+        """Returns all indexed entities without extents, these entities can
+        not be found by queries.
+        """
+        self._update_tree()
+        return [e for e, box in self._boxes.values() if box is None and e.is_alive]
+
+    def query_window(self, window: AbstractBoundingBox) -> list[DXFGraphic]:
+        """Returns all entities which bounding box intersects the given
+        `window`, only the x- and y-axis of the `window` are used.
+        """
+        if not window.has_data:
+            return []
+        self._update_tree()
+        box = BoundingBox2d((window.extmin, window.extmax))
+        return [e for e in self._tree.intersecting(box) if e.is_alive]
+
+    def query_point(self, point: UVec, radius: float = 0.0) -> list[DXFGraphic]:
+        """Returns all entities which bounding box has a distance less or
+        equal `radius` to the given `point`.
+        """
+        self._update_tree()
+        p = Vec2(point)
+        r = float(radius)
+        window = BoundingBox2d([(p.x - r, p.y - r), (p.x + r, p.y + r)])
+        r2 = r * r
+        boxes = self._boxes
+        return [
+            e
+            for e in self._tree.intersecting(window)
+            if e.is_alive
+            and _distance2(p.x, p.y, boxes[id(e)][1]) <= r2  # type: ignore
+        ]
+
+    def nearest(self, point: UVec, k: int = 1) -> list[DXFGraphic]:
+        """Returns the `k` entities nearest to the given `point` ordered by
+        the distance of their bounding boxes to the `point`.
+        """
+        self._update_tree()
+        p = Vec2(point)
+        result: list[DXFGraphic] = []
+        if k < 1:
+            return result
+        for entity, _ in self._tree.iter_nearest(p):
+            if entity.is_alive:
+                result.append(entity)
+                if len(result) >= k:
+                    break
+        return result
+
+
+def _distance2(x: float, y: float, b: BoundingBox2d) -> float:
+    extmin = b.extmin
+    extmax = b.extmax
+    dx = max(extmin.x - x, 0.0, x - extmax.x)
+    dy = max(extmin.y - y, 0.0, y - extmax.y)
+    return dx * dx + dy * dy
@@ -0,0 +1,143 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+import os
+
+import ezdxf
+from ezdxf.lldxf import parallel, fileindex, loader
+from ezdxf.lldxf.tagger import ascii_tags_loader, tag_compiler
+
+
+class TestSplitLocations:
+    def test_single_chunk(self):
+        assert parallel.split_locations([0, 10, 20], 30, 1) == [(0, 30)]
+
+    def test_no_locations(self):
+        assert parallel.split_locations([], 30, 4) == [(0, 30)]
+
+    def test_chunks_cover_whole_file(self):
+        locations = list(range(0, 100, 10))
+        chunks = parallel.split_locations(locations, 100, 4)
+        assert chunks[0][0] == 0
+        assert chunks[-1][1] == 100
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            assert end == start
+
+    def test_split_only_at_given_locations(self):
+        locations = [0, 7, 33, 34, 80]
+        chunks = parallel.split_locations(locations, 100, 4)
+        for start, _ in chunks[1:]:
+            assert start in locations
+
+    def test_no_empty_chunks(self):
+        locations = [0, 90]
+        chunks = parallel.split_locations(locations, 100, 8)
+        assert chunks == [(0, 90), (90, 100)]
+
+
+@pytest.fixture(scope="module")
+def filename(tmp_path_factory):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for x in range(500):
+        msp.add_line((x, 0), (x, 10), dxfattribs={"layer": "LINES"})
+        msp.add_lwpolyline([(x, 0), (x + 1, 1), (x + 2, 0)])
+    blk = doc.blocks.new("BLOCK")
+    blk.add_circle((0, 0), 1)
+    msp.add_blockref("BLOCK", (0, 0))
+    name = tmp_path_factory.mktemp("parallel") / "parallel.dxf"
+    doc.saveas(name)
+    return str(name)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_CHUNK_SIZE", 1024)
+
+
+def entity_signature(doc):
+    return [
+        (e.dxf.handle, e.dxftype(), e.dxf.owner) for e in doc.entitydb.values()
+    ]
+
+
+@pytest.mark.parametrize("block_size", [7, 1000, 1 << 24])
+def test_structure_locations(filename, block_size):
+    expected = [
+        entry.location
+        for entry in fileindex.load(filename).index
+        if entry.code == 0
+    ]
+    assert fileindex.structure_locations(filename, block_size) == expected
+
+
+def test_load_structure_in_multiple_chunks(filename, small_chunks):
+    structure = fileindex.load(filename)
+    sections = parallel.load_dxf_structure(
+        filename, structure.encoding, workers=1
+    )
+    assert list(sections.keys()) == [
+        "HEADER",
+        "CLASSES",
+        "TABLES",
+        "BLOCKS",
+        "ENTITIES",
+        "OBJECTS",
+    ]
+    assert len(sections["ENTITIES"]) == 1002  # section header + 1001 entities
+
+
+def test_chunks_ending_after_lwpolyline_points(filename, monkeypatch):
+    # The chunks end after the last 2D point of LWPOLYLINE entities, the tag
+    # compiler has to detect the end of the last point without a following
+    # structure tag:
+    index = fileindex.load(filename).index
+    structures = [entry for entry in index if entry.code == 0]
+    split_points = [
+        entry.location
+        for prev, entry in zip(structures, structures[1:])
+        if prev.value == "LWPOLYLINE"
+    ]
+    size = os.path.getsize(filename)
+    chunks = list(zip([0] + split_points, split_points + [size]))
+    monkeypatch.setattr(parallel, "split_locations", lambda *args: chunks)
+    monkeypatch.setattr(parallel, "MIN_CHUNK_SIZE", 1)
+    sections = parallel.load_dxf_structure(filename, "cp1252", workers=1)
+
+    with open(filename, "rt", encoding="cp1252") as fp:
+        expected = loader.load_dxf_structure(tag_compiler(ascii_tags_loader(fp)))
+    assert len(chunks) > 500
+    assert list(sections.keys()) == list(expected.keys())
+    for name, entities in expected.items():
+        assert sections[name] == entities
+
+
+def test_pack_and_unpack_entities(filename):
+    entities = parallel.load_chunk(
+        filename, 0, os.path.getsize(filename), "cp1252", "strict"
+    )
+    packed = parallel.pack_entities(entities)
+    unpacked = list(parallel.unpack_entities(packed))
+    assert len(unpacked) == len(entities)
+    for e1, e2 in zip(entities, unpacked):
+        assert e1 == e2
+        assert [type(t) for t in e1] == [type(t) for t in e2]
+
+
+def test_parallel_loading_preserves_handles_and_owners(filename, small_chunks):
+    expected = ezdxf.readfile(filename)
+    doc = ezdxf.readfile(filename, workers=2)
+    assert entity_signature(doc) == entity_signature(expected)
+    assert len(doc.modelspace()) == 1001
+    assert len(doc.blocks.get("BLOCK")) == 1
+    assert doc.filename == filename
+
+
+def test_parallel_loading_of_small_files_without_worker_processes(filename):
+    expected = ezdxf.readfile(filename)
+    doc = ezdxf.readfile(filename, workers=0)
+    assert entity_signature(doc) == entity_signature(expected)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,123 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+
+import ezdxf
+from ezdxf.entitydb import LazyEntity
+
+
+@pytest.fixture(scope="module")
+def filename(tmp_path_factory):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for x in range(10):
+        msp.add_line((x, 0), (x, 10), dxfattribs={"layer": "LINES"})
+    msp.add_polyline3d([(0, 0, 0), (1, 1, 1), (2, 0, 1)])
+    blk = doc.blocks.new("BLOCK")
+    blk.add_circle((0, 0), 1)
+    blk.add_attdef("TAG", (0, 0))
+    insert = msp.add_blockref("BLOCK", (0, 0))
+    insert.add_auto_attribs({"TAG": "VALUE"})
+    doc.layout("Layout1").add_text("PAPERSPACE")
+    name = tmp_path_factory.mktemp("lazy") / "lazy.dxf"
+    doc.saveas(name)
+    return str(name)
+
+
+def signature(doc):
+    # lazy loaded entities are added to the entity database in access order
+    return sorted(
+        (e.dxf.handle, e.dxftype(), e.dxf.owner) for e in doc.entitydb.values()
+    )
+
+
+def test_graphical_entities_are_not_loaded(filename):
+    doc = ezdxf.readfile(filename, lazy=True)
+    assert doc.entitydb.has_lazy_entities is True
+    entities = doc.modelspace().entity_space.entities
+    assert all(isinstance(e, LazyEntity) for e in entities)
+
+
+def test_lookup_by_handle_loads_entity(filename):
+    expected = ezdxf.readfile(filename).modelspace()[0]
+    doc = ezdxf.readfile(filename, lazy=True)
+    handle = expected.dxf.handle
+    assert handle in doc.entitydb
+    line = doc.entitydb[handle]
+    assert line.dxftype() == "LINE"
+    assert line.dxf.layer == "LINES"
+    assert line.dxf.owner == doc.modelspace().block_record_handle
+    assert doc.entitydb.get(handle) is line
+
+
+def test_lookup_of_sub_entity_loads_main_entity(filename):
+    polyline = ezdxf.readfile(filename).modelspace().query("POLYLINE").first
+    doc = ezdxf.readfile(filename, lazy=True)
+    vertex = doc.entitydb[polyline.vertices[1].dxf.handle]
+    assert vertex.dxftype() == "VERTEX"
+    assert doc.entitydb[polyline.dxf.handle].vertices[1] is vertex
+
+
+def test_loaded_layouts_match_eager_loading(filename):
+    expected = ezdxf.readfile(filename)
+    doc = ezdxf.readfile(filename, lazy=True)
+    assert len(doc.modelspace()) == len(expected.modelspace())
+    assert [e.dxftype() for e in doc.modelspace()] == [
+        e.dxftype() for e in expected.modelspace()
+    ]
+    assert signature(doc) == signature(expected)
+    assert doc.entitydb.has_lazy_entities is False
+
+
+def test_linked_entities(filename):
+    doc = ezdxf.readfile(filename, lazy=True)
+    msp = doc.modelspace()
+    polyline = msp.query("POLYLINE").first
+    assert len(polyline.vertices) == 3
+    insert = msp.query("INSERT").first
+    assert insert.get_attrib_text("TAG") == "VALUE"
+    assert insert.seqend is not None
+
+
+def test_paperspace_entities(filename):
+    doc = ezdxf.readfile(filename, lazy=True)
+    text = doc.layout("Layout1").query("TEXT").first
+    assert text.dxf.text == "PAPERSPACE"
+    assert text.dxf.paperspace == 1
+
+
+def test_block_entities(filename):
+    doc = ezdxf.readfile(filename, lazy=True)
+    blk = doc.blocks.get("BLOCK")
+    assert len(blk) == 2
+    assert blk[0].dxftype() == "CIRCLE"
+    assert blk[0].dxf.owner == blk.block_record_handle
+
+
+def test_delete_lazy_entity(filename):
+    doc = ezdxf.readfile(filename, lazy=True)
+    msp = doc.modelspace()
+    count = len(msp)
+    line = msp[0]
+    msp.delete_entity(line)
+    assert line.is_alive is False
+    assert len(msp) == count - 1
+
+
+def test_write_lazy_loaded_document(filename, tmp_path):
+    doc = ezdxf.readfile(filename, lazy=True)
+    doc.saveas(tmp_path / "copy.dxf")
+    doc2 = ezdxf.readfile(tmp_path / "copy.dxf")
+    assert signature(doc2) == signature(ezdxf.readfile(filename))
+
+
+def test_dxf_r12_is_always_loaded_at_once(tmp_path):
+    doc = ezdxf.new("R12")
+    doc.modelspace().add_line((0, 0), (1, 0))
+    doc.saveas(tmp_path / "r12.dxf")
+    doc = ezdxf.readfile(tmp_path / "r12.dxf", lazy=True)
+    assert doc.entitydb.has_lazy_entities is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,113 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+import os
+
+import ezdxf
+from ezdxf import snapshot, filemanagement
+
+
+@pytest.fixture
+def filename(tmp_path):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (1, 0), dxfattribs={"layer": "LINES"})
+    msp.add_polyline3d([(0, 0, 0), (1, 1, 1), (2, 0, 1)])
+    msp.add_mtext("MTEXT")
+    blk = doc.blocks.new("BLOCK")
+    blk.add_circle((0, 0), 1)
+    msp.add_blockref("BLOCK", (0, 0))
+    name = tmp_path / "snapshot.dxf"
+    doc.saveas(name)
+    return str(name)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "cache"
+
+
+def test_readfile_creates_snapshot(filename, cache_dir):
+    ezdxf.readfile(filename, cache_dir=cache_dir)
+    assert snapshot.snapshot_path(cache_dir, filename).exists()
+
+
+def test_readfile_restores_snapshot(filename, cache_dir, monkeypatch):
+    expected = ezdxf.readfile(filename, cache_dir=cache_dir)
+
+    def do_not_load(*args):
+        raise AssertionError("DXF file should not be loaded")
+
+    monkeypatch.setattr(filemanagement, "_readfile", do_not_load)
+    doc = ezdxf.readfile(filename, cache_dir=cache_dir)
+    assert doc is not expected
+    assert doc.filename == filename
+    assert [e.dxftype() for e in doc.modelspace()] == [
+        e.dxftype() for e in expected.modelspace()
+    ]
+    assert len(doc.entitydb) == len(expected.entitydb)
+
+
+def test_restored_document_is_functional(filename, cache_dir, tmp_path):
+    ezdxf.readfile(filename, cache_dir=cache_dir)
+    doc = snapshot.load(
+        cache_dir, filename, encoding=None, errors="surrogateescape", lazy=False
+    )
+    assert doc is not None
+    msp = doc.modelspace()
+    line = msp.query("LINE").first
+    assert line.doc is doc
+    assert line.dxf.layer == "LINES"
+    assert doc.entitydb[line.dxf.handle] is line
+    assert len(doc.blocks.get("BLOCK")) == 1
+    msp.add_circle((0, 0), 1)
+    doc.saveas(tmp_path / "new.dxf")
+    assert len(ezdxf.readfile(tmp_path / "new.dxf").modelspace()) == 5
+
+
+def test_modified_dxf_file_invalidates_snapshot(filename, cache_dir):
+    ezdxf.readfile(filename, cache_dir=cache_dir)
+    doc = ezdxf.readfile(filename)
+    doc.modelspace().add_point((0, 0))
+    doc.saveas(filename)
+    doc = ezdxf.readfile(filename, cache_dir=cache_dir)
+    assert len(doc.modelspace().query("POINT")) == 1
+
+
+def test_changed_content_with_same_size_and_mtime(filename, cache_dir):
+    assert snapshot.save(ezdxf.readfile(filename), cache_dir, filename)
+    stat = os.stat(filename)
+    with open(filename, "rb") as fp:
+        data = fp.read()
+    with open(filename, "wb") as fp:
+        fp.write(data.replace(b"LINES", b"SENIL"))
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert snapshot.load(cache_dir, filename) is None
+
+
+def test_different_loading_parameters(filename, cache_dir):
+    assert snapshot.save(ezdxf.readfile(filename), cache_dir, filename, lazy=False)
+    assert snapshot.load(cache_dir, filename, lazy=True) is None
+    assert snapshot.load(cache_dir, filename, lazy=False) is not None
+
+
+def test_invalid_snapshot_is_ignored(filename, cache_dir):
+    os.makedirs(cache_dir)
+    snapshot.snapshot_path(cache_dir, filename).write_bytes(b"invalid")
+    assert snapshot.load(cache_dir, filename) is None
+    doc = ezdxf.readfile(filename, cache_dir=cache_dir)
+    assert len(doc.modelspace()) == 4
+    # invalid snapshot was replaced:
+    assert snapshot.load(
+        cache_dir, filename, encoding=None, errors="surrogateescape", lazy=False
+    )
+
+
+def test_lazy_loaded_document(filename, cache_dir):
+    ezdxf.readfile(filename, lazy=True, cache_dir=cache_dir)
+    doc = ezdxf.readfile(filename, lazy=True, cache_dir=cache_dir)
+    assert doc.modelspace().query("LINE").first.dxf.layer == "LINES"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,144 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+import random
+
+import ezdxf
+from ezdxf import bbox
+from ezdxf.math import BoundingBox2d
+from ezdxf.spatialindex import SpatialIndex
+
+
+@pytest.fixture
+def msp():
+    random.seed(7)
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for _ in range(200):
+        x = random.uniform(0, 100)
+        y = random.uniform(0, 100)
+        msp.add_line((x, y), (x + random.uniform(0, 5), y + random.uniform(0, 5)))
+        msp.add_circle((x, y), radius=random.uniform(0.1, 2))
+    return msp
+
+
+def extents(entity) -> BoundingBox2d:
+    return BoundingBox2d(bbox.extents([entity]))
+
+
+def brute_force_window(layout, window: BoundingBox2d) -> set:
+    return {e for e in layout if extents(e).has_intersection(window)}
+
+
+def random_windows(count: int, size: float = 10):
+    for _ in range(count):
+        x = random.uniform(-10, 110)
+        y = random.uniform(-10, 110)
+        yield BoundingBox2d([(x, y), (x + size, y + size)])
+
+
+def test_spatial_index_is_created_on_demand(msp):
+    assert msp.block_record.spatial_index is None
+    index = msp.spatial_index()
+    assert isinstance(index, SpatialIndex)
+    assert len(index) == 400
+    assert msp.spatial_index() is index
+    msp.discard_spatial_index()
+    assert msp.block_record.spatial_index is None
+
+
+def test_query_window(msp):
+    for window in random_windows(20):
+        assert set(msp.query_window(window)) == brute_force_window(msp, window)
+
+
+def test_query_window_returns_entity_query(msp):
+    window = BoundingBox2d([(0, 0), (50, 50)])
+    result = msp.query_window(window).query("CIRCLE")
+    assert len(result) > 0
+    assert all(e.dxftype() == "CIRCLE" for e in result)
+
+
+def test_query_point(msp):
+    circle = msp.add_circle((500, 500), radius=1)
+    assert list(msp.query_point((500, 500))) == [circle]
+    assert list(msp.query_point((502, 500), radius=0.5)) == []
+    assert list(msp.query_point((502, 500), radius=1)) == [circle]
+
+
+def test_nearest(msp):
+    line = msp.add_line((200, 200), (201, 200))
+    circle = msp.add_circle((210, 200), radius=1)
+    assert list(msp.nearest((202, 200), k=2)) == [line, circle]
+
+
+def test_index_is_updated_by_adding_and_deleting_entities(msp):
+    window = BoundingBox2d([(300, 300), (310, 310)])
+    assert len(msp.query_window(window)) == 0
+    line = msp.add_line((301, 301), (302, 302))
+    assert list(msp.query_window(window)) == [line]
+    msp.delete_entity(line)
+    assert len(msp.query_window(window)) == 0
+
+
+def test_index_is_updated_by_unlinking_entities(msp):
+    line = msp.add_line((301, 301), (302, 302))
+    msp.query_window(BoundingBox2d([(0, 0), (1, 1)]))
+    msp.unlink_entity(line)
+    assert line not in msp.spatial_index()
+
+
+def test_entities_created_by_factory_methods_are_indexed_completely(msp):
+    msp.spatial_index()
+    polyline = msp.add_lwpolyline([(300, 300), (400, 400)])
+    assert list(msp.nearest((400, 400))) == [polyline]
+
+
+def test_index_is_updated_by_transformation(msp):
+    for entity in list(msp)[::4]:
+        entity.translate(200, 0, 0)
+    for entity in list(msp)[1::4]:
+        entity.rotate_z(0.5)
+    for window in random_windows(20, size=50):
+        assert set(msp.query_window(window)) == brute_force_window(msp, window)
+
+
+def test_modified_entities_require_an_explicit_update(msp):
+    line = msp.add_line((300, 300), (301, 301))
+    index = msp.spatial_index()
+    msp.query_point((300, 300))
+    line.dxf.start = (400, 400)
+    line.dxf.end = (401, 401)
+    assert len(msp.query_point((400, 400))) == 0
+    index.update(line)
+    assert list(msp.query_point((400, 400))) == [line]
+
+
+def test_entities_without_extents_are_not_found():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    text = msp.add_text("")
+    assert len(msp.nearest((0, 0))) == 0
+    assert text in msp.spatial_index()
+    assert msp.spatial_index().unbounded() == [text]
+    assert msp.spatial_index().bbox(text) is None
+
+
+def test_indexed_bounding_box():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    circle = msp.add_circle((10, 10), radius=1)
+    box = msp.spatial_index().bbox(circle)
+    assert box.extmin.isclose((9, 9))
+    assert box.extmax.isclose((11, 11))
+
+
+def test_block_layout_supports_spatial_queries():
+    doc = ezdxf.new()
+    block = doc.blocks.new("TEST")
+    circle = block.add_circle((10, 10), radius=1)
+    assert list(block.query_point((10, 10))) == [circle]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,237 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+
+import ezdxf
+from ezdxf.entitydb import AttributeIndex
+from ezdxf.query import EntityQuery, compile_query
+
+
+@pytest.fixture
+def doc():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for i in range(100):
+        layer = f"Layer{i % 5}"
+        msp.add_line((0, 0), (i, 0), dxfattribs={"layer": layer, "color": i % 7})
+        msp.add_circle((0, 0), 1 + i, dxfattribs={"layer": layer})
+    blk = doc.blocks.new("BLK")
+    blk.add_line((0, 0), (1, 0), dxfattribs={"layer": "Layer1"})
+    blk.add_text("TEXT", dxfattribs={"layer": "Layer1", "linetype": "DASHED"})
+    return doc
+
+
+def scan(doc, query: str) -> EntityQuery:
+    return EntityQuery(doc.chain_layouts_and_blocks(), query)
+
+
+QUERIES = [
+    "LINE",
+    "LINE TEXT",
+    'LINE[layer=="Layer1"]',
+    '*[layer=="layer1"]',
+    '*[layer=="layer1"]i',
+    '*[layer!="Layer1"]',
+    '*[layer?"Layer[12]"]',
+    '*[layer=="Layer1" & color==3]',
+    '*[layer=="Layer1" & (color==1 | color==2)]',
+    '*[layer=="Layer1" | color<2]',
+    '*[!layer=="Layer1"]',
+    '*[color>=5 & lineweight==-1]',
+    '*[linetype=="DASHED"]',
+    "CIRCLE[radius>50]",
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_indexed_query_matches_linear_scan(doc, query):
+    expected = scan(doc, query)
+    result = doc.query(query)
+    assert len(result) == len(expected)
+    assert set(result) == set(expected)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_entitydb_query_matches_linear_scan(doc, query):
+    expected = EntityQuery(doc.entitydb.values(), query)
+    result = doc.entitydb.query(query)
+    assert set(result) == set(expected)
+
+
+def test_index_is_created_on_demand(doc):
+    assert doc.entitydb.attribute_index is None
+    doc.query("*")
+    assert doc.entitydb.attribute_index is None, "full scan does not use the index"
+    doc.query("LINE")
+    assert doc.entitydb.attribute_index is not None
+
+
+def test_query_plan_exists_only_for_indexed_attributes():
+    assert compile_query("*")[1] is None
+    assert compile_query("*[lineweight==-1]")[1] is None
+    assert compile_query("*[!layer=='0']")[1] is None
+    assert compile_query("*[layer=='0' | lineweight==-1]")[1] is None
+    assert compile_query("LINE")[1] is not None
+    assert compile_query("*[layer=='0' & lineweight==-1]")[1] is not None
+
+
+def test_result_is_in_linear_scan_order(doc):
+    query = 'LINE CIRCLE[layer=="Layer1"]'
+    assert list(doc.query(query)) == list(scan(doc, query))
+
+
+def test_entitydb_result_is_in_database_order(doc):
+    result = doc.entitydb.query('LINE CIRCLE[layer=="Layer1"]')
+    handles = [int(e.dxf.handle, 16) for e in result]
+    assert handles == sorted(handles)
+
+
+@pytest.fixture(scope="module")
+def linked_doc():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    blk = doc.blocks.new("BLK")
+    blk.add_attdef("TAG", (0, 0))
+    for i in range(10):
+        msp.add_polyline2d([(0, 0), (i, 0), (i, i)], dxfattribs={"color": 1})
+        msp.add_polyline3d([(0, 0, 0), (i, 0, i)], dxfattribs={"color": 2})
+        insert = msp.add_blockref("BLK", (i, 0), dxfattribs={"color": 3})
+        insert.add_auto_attribs({"TAG": str(i)})
+        blk.add_polyline2d([(0, 0), (1, i)])
+    # orphan: owned by the modelspace, but not located in the entity space
+    orphan = msp.add_line((0, 0), (1, 0))
+    msp.unlink_entity(orphan)
+    orphan.dxf.owner = msp.layout_key
+    return doc
+
+
+class TestLinkedSubEntities:
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "SEQEND",
+            "VERTEX",
+            "ATTRIB",
+            "LINE",
+            "POLYLINE INSERT",
+            "*[color!=1]",
+            "*[color==256]",
+            '*[layer=="0"]',
+        ],
+    )
+    def test_indexed_query_matches_linear_scan(self, linked_doc, query):
+        assert list(linked_doc.query(query)) == list(scan(linked_doc, query))
+
+    def test_sub_entities_are_not_included(self, linked_doc):
+        assert len(linked_doc.query("SEQEND VERTEX ATTRIB")) == 0
+        assert len(linked_doc.entitydb.query("SEQEND VERTEX ATTRIB")) > 0
+
+    def test_owner_query(self, linked_doc):
+        query = f'*[owner=="{linked_doc.modelspace().layout_key}"]'
+        expected = scan(linked_doc, query)
+        assert len(expected) == 30
+        assert list(linked_doc.query(query)) == list(expected)
+
+    def test_orphan_is_not_included(self, linked_doc):
+        assert len(linked_doc.query("LINE")) == 0
+        assert len(linked_doc.entitydb.query("LINE")) == 1
+
+
+def test_excludes_block_structure_entities(doc):
+    assert len(doc.query("BLOCK ENDBLK")) == 0
+    assert len(doc.entitydb.query("BLOCK ENDBLK")) > 0
+
+
+class TestIndexMaintenance:
+    def test_new_entities(self, doc):
+        assert len(doc.query('*[layer=="NEW"]')) == 0
+        doc.modelspace().add_point((0, 0), dxfattribs={"layer": "NEW"})
+        assert len(doc.query('*[layer=="NEW"]')) == 1
+        assert len(doc.query("POINT")) == 1
+
+    def test_attribute_setter(self, doc):
+        line = doc.query('LINE[layer=="Layer1"]')[0]
+        line.dxf.layer = "NEW"
+        line.dxf.color = 42
+        assert doc.query('*[layer=="NEW"]')[0] is line
+        assert doc.query("*[color==42]")[0] is line
+        assert line not in doc.query('*[layer=="Layer1"]')
+
+    def test_discard_attribute(self, doc):
+        line = doc.query("LINE[color==3]")[0]
+        line.dxf.discard("color")
+        assert line not in doc.query("LINE[color==3]")
+        assert line in doc.query("LINE[color==256]")
+
+    def test_delete_attribute(self, doc):
+        circle = doc.query('CIRCLE[layer=="Layer2"]')[0]
+        del circle.dxf.layer
+        assert circle not in doc.query('CIRCLE[layer=="Layer2"]')
+        assert circle in doc.query('CIRCLE[layer=="0"]')
+
+    def test_deleted_entities(self, doc):
+        msp = doc.modelspace()
+        lines = doc.query('LINE[layer=="Layer1"]')
+        count = len(lines)
+        msp.delete_entity(lines[0])
+        assert len(doc.query('LINE[layer=="Layer1"]')) == count - 1
+
+    def test_unlinked_entities(self, doc):
+        msp = doc.modelspace()
+        line = doc.query('LINE[layer=="Layer1"]')[0]
+        msp.unlink_entity(line)
+        assert line not in doc.query('LINE[layer=="Layer1"]')
+        assert line in doc.entitydb.query('LINE[layer=="Layer1"]')
+
+    def test_moved_entities(self, doc):
+        msp = doc.modelspace()
+        blk = doc.blocks.get("BLK")
+        line = doc.query('LINE[layer=="Layer3"]')[0]
+        msp.move_to_layout(line, blk)
+        result = doc.query(f'*[owner=="{blk.block_record_handle}"]')
+        assert line in result
+
+    def test_discarded_entities(self, doc):
+        line = doc.query('LINE[layer=="Layer1"]')[0]
+        doc.entitydb.discard(line)
+        assert line not in doc.entitydb.attribute_index
+
+    def test_purge(self, doc):
+        line = doc.query('LINE[layer=="Layer1"]')[0]
+        line.destroy()
+        index = doc.entitydb.attribute_index
+        assert line in index
+        doc.entitydb.purge()
+        assert line not in index
+
+
+class TestAttributeIndex:
+    def test_get_and_values(self, doc):
+        index = AttributeIndex(doc.modelspace())
+        assert len(index) == 200
+        assert len(index.get("dxftype", "LINE")) == 100
+        assert len(index.get("layer", "Layer1")) == 40
+        assert set(index.values("dxftype")) == {"LINE", "CIRCLE"}
+
+    def test_select(self, doc):
+        index = AttributeIndex(doc.modelspace())
+        result = index.select("color", lambda value: value < 2)
+        assert len(result) == 30  # 15x color 0 + 15x color 1
+
+    def test_unsupported_attributes_are_not_indexed(self):
+        doc = ezdxf.new()
+        layer = doc.layers.get("0")
+        index = AttributeIndex([layer])
+        assert layer in index
+        assert len(index.get("owner", layer.dxf.owner)) == 1
+        # the LAYER entity has no "layer" attribute:
+        assert index.values("layer") == []
+
+    def test_sort_returns_insertion_order(self, doc):
+        entities = list(doc.modelspace())
+        index = AttributeIndex(entities)
+        assert index.sort(reversed(entities)) == entities
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,150 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+import math
+import random
+
+import ezdxf
+from ezdxf import bbox
+from ezdxf.math import BoundingBox
+
+
+def disassembled_boxes(entities, fast=False) -> list[BoundingBox]:
+    # the cache forces the calculation by the disassemble module
+    return list(bbox.multi_flat(entities, fast=fast, cache=bbox.Cache()))
+
+
+# Bézier curves of the disassembled curves deviate slightly from the analytic
+# extents of circles and arcs:
+def assert_boxes_are_close(box1: BoundingBox, box2: BoundingBox, abs_tol=1e-3):
+    assert box1.extmin.isclose(box2.extmin, abs_tol=abs_tol)
+    assert box1.extmax.isclose(box2.extmax, abs_tol=abs_tol)
+
+
+@pytest.fixture(scope="module")
+def doc():
+    random.seed(17)
+
+    def r():
+        return random.uniform(-100, 100)
+
+    doc = ezdxf.new()
+    blk = doc.blocks.new("BLK", base_point=(1, 2))
+    blk.add_line((0, 0), (3, 4))
+    blk.add_circle((5, 5), 1)
+    blk.add_lwpolyline([(0, 0), (2, -3), (4, 0)])
+    blk.add_attdef("TAG", (100, 100))
+    nested = doc.blocks.new("NESTED")
+    nested.add_blockref("BLK", (10, 0), dxfattribs={"rotation": 90})
+    nested.add_point((-5, -5))
+
+    msp = doc.modelspace()
+    for _ in range(20):
+        msp.add_line((r(), r(), r()), (r(), r(), r()))
+        msp.add_point((r(), r(), r()))
+        msp.add_circle((r(), r(), r()), random.uniform(0.1, 5))
+        msp.add_lwpolyline(
+            [(r(), r()) for _ in range(5)], dxfattribs={"elevation": r()}
+        )
+        msp.add_lwpolyline([(r(), r(), 0, 0, 0.5) for _ in range(3)])
+        msp.add_circle((r(), r()), 2, dxfattribs={"extrusion": (0, 1, 1)})
+        msp.add_text("TEXT", dxfattribs={"insert": (r(), r())})
+        for rotation in (0, 90, 180, 270, 30):
+            msp.add_blockref(
+                "BLK",
+                (r(), r()),
+                dxfattribs={
+                    "rotation": rotation,
+                    "xscale": random.choice([1, -2, 3]),
+                },
+            )
+            msp.add_blockref("NESTED", (r(), r()), dxfattribs={"rotation": rotation})
+    insert = msp.add_blockref("BLK", (0, 0))
+    insert.add_attrib("TAG", "value", (200, 200))
+    msp.add_blockref("BLK", (0, 0), dxfattribs={"column_count": 2, "row_count": 2})
+    return doc
+
+
+def test_batch_calculation_matches_disassembled_entities(doc):
+    msp = doc.modelspace()
+    expected = disassembled_boxes(msp)
+    result = list(bbox.multi_flat(msp))
+    assert len(result) == len(expected)
+    for box1, box2 in zip(result, expected):
+        assert_boxes_are_close(box1, box2)
+
+
+def test_extents_matches_disassembled_entities(doc):
+    msp = doc.modelspace()
+    expected = bbox.extents(msp, cache=bbox.Cache())
+    assert_boxes_are_close(bbox.extents(msp), expected)
+
+
+def test_attribs_are_included():
+    doc = ezdxf.new()
+    blk = doc.blocks.new("BLK")
+    blk.add_line((0, 0), (1, 1))
+    insert = doc.modelspace().add_blockref("BLK", (0, 0))
+    insert.add_attrib("TAG", "value", (200, 200))
+    box = bbox.extents([insert])
+    assert box.extmin.isclose((0, 0))
+    assert box.extmax.x > 200
+    assert box.extmax.y > 200
+
+
+def test_unsupported_entities_are_ignored():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_ray((0, 0), (1, 0))
+    assert bbox.extents(msp).has_data is False
+    assert list(bbox.multi_flat(msp)) == []
+
+
+def test_empty_block_references():
+    doc = ezdxf.new()
+    doc.blocks.new("EMPTY")
+    msp = doc.modelspace()
+    msp.add_blockref("EMPTY", (0, 0))
+    msp.add_point((1, 2))
+    boxes = list(bbox.multi_flat(msp))
+    assert len(boxes) == 1
+
+
+def test_circular_block_references():
+    doc = ezdxf.new()
+    blk = doc.blocks.new("A")
+    blk.add_line((0, 0), (1, 0))
+    blk.add_blockref("A", (5, 5))
+    box = bbox.BatchExtents().extents([doc.modelspace().add_blockref("A", (0, 0))])
+    assert box.extmin.isclose((0, 0))
+    assert box.extmax.isclose((1, 0))
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [(0, 90), (10, 200), (350, 10), (200, 100), (-45, 45), (0, 360)],
+)
+def test_arc_extents(start, end):
+    doc = ezdxf.new()
+    arc = doc.modelspace().add_arc((1, 2), 3, start, end)
+    box = bbox.extents([arc])
+    expected = BoundingBox(arc.flattening(0.0001))
+    assert_boxes_are_close(box, expected)
+
+
+def test_arc_with_equal_start_and_end_angle_has_no_extents():
+    doc = ezdxf.new()
+    arc = doc.modelspace().add_arc((1, 2), 3, 30, 30)
+    assert bbox.extents([arc]).has_data is False
+
+
+def test_lwpolyline_with_bulges_is_processed_by_disassemble():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0, 0, 0, 1), (2, 0)])
+    box = bbox.extents(msp)
+    assert math.isclose(box.extmin.y, -1.0, abs_tol=1e-3)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
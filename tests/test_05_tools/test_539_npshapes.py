@@ -2,8 +2,9 @@
 #  License: MIT License
 
 import pytest
+import numpy as np
 
-from ezdxf.npshapes import NumpyPoints2d, NumpyPath2d
+from ezdxf.npshapes import NumpyPoints2d, NumpyPath2d, flatten_paths
 from ezdxf.math import Matrix44, BoundingBox2d, close_vectors, Vec2
 from ezdxf.path import Command, from_vertices, Path
 from ezdxf.render import forms
@@ -32,6 +33,12 @@ class TestNumpyPoints:
         pl.transform_inplace(m)
         assert all(v0.isclose(v1) for v0, v1 in zip(pl.vertices(), t_pts))
 
+    def test_from_ndarray(self, points):
+        array = np.array([(v.x, v.y, 9) for v in points])
+        pl = NumpyPoints2d(array)
+        array[0] = (0, 0, 0)  # the ndarray is copied
+        assert all(v0.isclose(v1) for v0, v1 in zip(pl.vertices(), points))
+
 
 class TestNumpyPath2d:
     @pytest.fixture
@@ -373,6 +380,47 @@ def test_flatten_path(p1):
     assert close_vectors(v1, v2)
 
 
+class TestFlattenPaths:
+    @pytest.fixture(scope="class")
+    def paths(self, p1):
+        multi_path = Path((0, 0))
+        multi_path.curve3_to((2, 0), (1, 1))
+        multi_path.move_to((5, 5))
+        multi_path.curve4_to((7, 5), (5, 7), (7, 7))
+        return [
+            NumpyPath2d(p1),
+            NumpyPath2d(None),
+            NumpyPath2d(from_vertices([(0, 0), (1, 0), (1, 1)])),
+            NumpyPath2d(multi_path),
+            NumpyPath2d(Path((3, 3))),
+        ]
+
+    @pytest.mark.parametrize("distance, segments", [(0.01, 4), (0.1, 16), (0.5, 1)])
+    def test_same_vertices_as_flattening_method(self, paths, distance, segments):
+        vertices, offsets = flatten_paths(paths, distance, segments)
+        assert len(offsets) == len(paths) + 1
+        for index, path in enumerate(paths):
+            expected = list(path.flattening(distance, segments))
+            result = vertices[offsets[index] : offsets[index + 1]]
+            assert len(result) == len(expected)
+            assert close_vectors(Vec2.generate(result), expected)
+
+    def test_empty_paths_have_no_vertices(self, paths):
+        _, offsets = flatten_paths(paths, 0.01)
+        assert offsets[1] == offsets[2]  # NumpyPath2d(None)
+        assert offsets[-1] == offsets[-2]  # path without commands
+
+    def test_accepts_path_objects(self, p1):
+        vertices, offsets = flatten_paths([p1], 0.01)
+        assert close_vectors(Vec2.generate(vertices), p1.flattening(0.01))
+        assert list(offsets) == [0, len(vertices)]
+
+    def test_no_paths(self):
+        vertices, offsets = flatten_paths([], 0.01)
+        assert vertices.shape == (0, 2)
+        assert list(offsets) == [0]
+
+
 class TestReversePath:
     def test_reversing_empty_path(self):
         p = NumpyPath2d(None)
@@ -0,0 +1,174 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+
+import pytest
+import math
+from ezdxf.math import Vec2, area, has_clockwise_orientation
+from ezdxf.math.clipping import (
+    BooleanOperation,
+    polygon_boolean,
+    polygon_union,
+    polygon_difference,
+    polygon_intersection,
+    polygon_xor,
+)
+from ezdxf.render.forms import circle
+
+
+def square(x0, y0, x1, y1):
+    return Vec2.list([(x0, y0), (x1, y0), (x1, y1), (x0, y1)])
+
+
+def as_tuples(polygons):
+    return [[(v.x, v.y) for v in polygon] for polygon in polygons]
+
+
+def signed_area(polygons):
+    # exterior boundaries are counter-clockwise oriented, holes clockwise
+    return sum(
+        -area(polygon) if has_clockwise_orientation(polygon) else area(polygon)
+        for polygon in polygons
+    )
+
+
+A = square(0, 0, 2, 2)
+B = square(1, 1, 3, 3)
+
+
+def test_union_of_overlapping_squares():
+    assert as_tuples(polygon_union([A], [B])) == [
+        [(0, 0), (2, 0), (2, 1), (3, 1), (3, 3), (1, 3), (1, 2), (0, 2)]
+    ]
+
+
+def test_intersection_of_overlapping_squares():
+    assert as_tuples(polygon_intersection([A], [B])) == [
+        [(1, 1), (2, 1), (2, 2), (1, 2)]
+    ]
+
+
+def test_difference_of_overlapping_squares():
+    assert as_tuples(polygon_difference([A], [B])) == [
+        [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+    ]
+
+
+def test_xor_of_overlapping_squares():
+    result = polygon_xor([A], [B])
+    assert len(result) == 2
+    assert signed_area(result) == pytest.approx(6.0)
+
+
+def test_unknown_operation():
+    with pytest.raises(ValueError):
+        polygon_boolean([A], [B], "unknown")  # type: ignore
+
+
+def test_invalid_grid_size():
+    with pytest.raises(ValueError):
+        polygon_union([A], [B], abs_tol=0.0)
+
+
+class TestDegeneratedCases:
+    def test_shared_edge(self):
+        assert as_tuples(polygon_union([square(0, 0, 1, 1)], [square(1, 0, 2, 1)])) == [
+            [(0, 0), (2, 0), (2, 1), (0, 1)]
+        ]
+
+    def test_squares_touching_at_a_vertex_are_separated(self):
+        result = polygon_union([square(0, 0, 1, 1)], [square(1, 1, 2, 2)])
+        assert as_tuples(result) == [
+            [(0, 0), (1, 0), (1, 1), (0, 1)],
+            [(1, 1), (2, 1), (2, 2), (1, 2)],
+        ]
+
+    def test_intersection_of_equal_polygons(self):
+        assert as_tuples(polygon_intersection([A], [A])) == as_tuples([A])
+
+    def test_difference_of_equal_polygons(self):
+        assert polygon_difference([A], [A]) == []
+
+    def test_collinear_overlapping_edges(self):
+        result = polygon_union([square(0, 0, 2, 1)], [square(1, 0, 3, 1)])
+        assert as_tuples(result) == [[(0, 0), (3, 0), (3, 1), (0, 1)]]
+
+    def test_vertices_closer_than_abs_tol_are_merged(self):
+        result = polygon_union([A], [square(2 + 1e-12, 0, 4, 2)])
+        assert as_tuples(result) == [[(0, 0), (4, 0), (4, 2), (0, 2)]]
+
+    def test_self_intersecting_polygon(self):
+        bowtie = Vec2.list([(0, 0), (2, 2), (2, 0), (0, 2)])
+        result = polygon_union([bowtie])
+        assert len(result) == 2
+        assert all(not has_clockwise_orientation(p) for p in result)
+        assert signed_area(result) == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("nonzero", [False, True])
+    def test_almost_coincident_edges(self, nonzero):
+        # A 143-gon traversed twice, the vertices of both rounds are not exactly
+        # equal. The rounded intersection points of the almost coincident edges
+        # created new intersections in each split pass.
+        count = 143
+        subject = [
+            Vec2.from_angle(math.tau * i * (count - 1) / count, 10)
+            for i in range(2 * count)
+        ]
+        clip = Vec2.list(circle(2 * count, radius=10))
+        result = polygon_union([subject], [clip], nonzero=nonzero)
+        assert signed_area(result) == pytest.approx(area(clip))
+
+
+class TestMultiplePolygons:
+    def test_even_odd_rule_creates_hole(self):
+        result = polygon_union([square(0, 0, 4, 4), square(1, 1, 2, 2)])
+        assert len(result) == 2
+        exterior, hole = result
+        assert has_clockwise_orientation(exterior) is False
+        assert has_clockwise_orientation(hole) is True
+        assert signed_area(result) == pytest.approx(15.0)
+
+    def test_nonzero_rule_fills_overlapping_polygons(self):
+        polygons = [square(0, 0, 2, 2), square(1, 0, 3, 2)]
+        assert len(polygon_union(polygons)) == 2  # even-odd
+        assert as_tuples(polygon_union(polygons, nonzero=True)) == [
+            [(0, 0), (3, 0), (3, 2), (0, 2)]
+        ]
+
+    def test_subtract_multiple_holes(self):
+        holes = [square(1, 1, 2, 2), square(3, 1, 4, 2), square(1.5, 1.5, 3.5, 3)]
+        result = polygon_difference([square(0, 0, 5, 4)], holes, nonzero=True)
+        assert signed_area(result) == pytest.approx(20.0 - 1.0 - 1.0 - 3.0 + 0.5)
+
+    def test_intersection_of_polygons_with_holes(self):
+        frame1 = [square(0, 0, 4, 4), square(1, 1, 3, 3)]
+        frame2 = [square(2, 2, 6, 6), square(3, 3, 5, 5)]
+        result = polygon_intersection(frame1, frame2)
+        assert len(result) == 2
+        assert signed_area(result) == pytest.approx(2.0)
+
+    def test_circles(self):
+        c1 = Vec2.list(circle(64, radius=2))
+        c2 = [v + Vec2(1, 0) for v in c1]
+        union = signed_area(polygon_union([c1], [c2]))
+        intersection = signed_area(polygon_intersection([c1], [c2]))
+        assert union + intersection == pytest.approx(2.0 * area(c1))
+        assert signed_area(polygon_xor([c1], [c2])) == pytest.approx(
+            union - intersection
+        )
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        BooleanOperation.UNION,
+        BooleanOperation.DIFFERENCE,
+        BooleanOperation.INTERSECTION,
+        BooleanOperation.XOR,
+    ],
+)
+def test_empty_operands(op):
+    assert polygon_boolean([], [], op) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,6 +1,7 @@
 # Copyright (c) 2012-2021 Manfred Moitzi
 # License: MIT License
 import pytest
+import numpy as np
 from ezdxf.math import Vec3, BSpline, close_vectors
 from ezdxf.math.bspline import normalize_knots, subdivide_params, linspace
 
@@ -545,3 +546,66 @@ def test_bspline_point_calculation_against_derivative_calculation():
     curve_points = [p[0] for p in spline.derivatives(PARAMS, n=1)]
     for p, expected in zip(curve_points, spline.points(PARAMS)):
         assert p.isclose(expected)
+
+
+class TestNumpyEvaluation:
+    @pytest.mark.parametrize(
+        "order,results",
+        [
+            [2, POINTS_ORDER_2],
+            [3, POINTS_ORDER_3],
+            [4, POINTS_ORDER_4],
+        ],
+        ids=["degree=1", "degree=2", "degree=3"],
+    )
+    def test_points_to_pre_calculated_results(self, order, results):
+        points = BSpline(DEFPOINTS, order=order).np_points(PARAMS)
+        assert points.shape == (len(PARAMS), 3)
+        assert close_vectors(Vec3.list(points), results)
+
+    def test_derivatives_to_pre_calculated_results(self):
+        derivatives = BSpline(DEFPOINTS, order=4).np_derivatives(PARAMS, n=2)
+        assert derivatives.shape == (len(PARAMS), 3, 3)
+        for values, expected in zip(derivatives, DERIVATIVES_ORDER_4):
+            assert close_vectors(Vec3.list(values), expected)
+
+    def test_derivatives_are_limited_by_degree(self):
+        spline = BSpline(DEFPOINTS, order=3)
+        assert spline.np_derivatives(PARAMS, n=5).shape == (len(PARAMS), 3, 3)
+
+    def test_accepts_ndarray_and_iterables(self):
+        spline = BSpline(DEFPOINTS, order=4)
+        expected = spline.np_points(PARAMS)
+        assert np.allclose(spline.np_points(np.array(PARAMS)), expected)
+        assert np.allclose(spline.np_points(iter(PARAMS)), expected)
+
+    def test_empty_parameters(self):
+        spline = BSpline(DEFPOINTS, order=4)
+        assert spline.np_points([]).shape == (0, 3)
+        assert spline.np_derivatives([], n=1).shape == (0, 2, 3)
+
+    def test_unclamped_spline(self, weired_spline1):
+        params = list(linspace(0, weired_spline1.max_t, 33))
+        points = weired_spline1.np_points(params)
+        assert close_vectors(Vec3.list(points), weired_spline1.points(params))
+        derivatives = weired_spline1.np_derivatives(params, n=3)
+        for values, expected in zip(
+            derivatives, weired_spline1.derivatives(params, n=3)
+        ):
+            assert close_vectors(Vec3.list(values), expected)
+
+    def test_flattening_of_unclamped_spline(self, weired_spline1):
+        points = list(weired_spline1.flattening(0.001))
+        assert len(points) > 32
+        lower_bound = weired_spline1.knots()[weired_spline1.order - 1]
+        assert close_vectors(points[:1], weired_spline1.points([lower_bound]))
+
+    def test_flattening_terminates_for_zero_distance(self):
+        spline = BSpline(DEFPOINTS, order=3)
+        points = list(spline.flattening(0.0, segments=1))
+        assert points[0].isclose(DEFPOINTS[0])
+        assert points[-1].isclose(DEFPOINTS[-1])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
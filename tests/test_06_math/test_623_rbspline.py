@@ -312,3 +312,16 @@ def test_flattening_issue():
     ]
     points = list(e.flattening(0.01))
     assert len(points) > 4
+
+
+def test_numpy_evaluation_of_rational_splines():
+    curve = BSpline(DEFPOINTS, order=3, weights=DEFWEIGHTS)
+    params = list(linspace(0, curve.max_t, 41))
+    points = curve.np_points(params)
+    for p, expected in zip(points.tolist(), curve.points(params)):
+        assert expected.isclose(p)
+
+    derivatives = curve.np_derivatives(params, n=2)
+    for values, expected in zip(derivatives.tolist(), curve.derivatives(params, 2)):
+        for v, e in zip(values, expected):
+            assert e.isclose(v)
@@ -0,0 +1,196 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+import random
+
+import numpy as np
+from ezdxf.math import BoundingBox, BoundingBox2d
+from ezdxf.math import rtree
+from ezdxf.math.rtree import BoxRTree
+
+
+def random_box2d(size: float = 5.0) -> BoundingBox2d:
+    x = random.uniform(0, 100)
+    y = random.uniform(0, 100)
+    return BoundingBox2d(
+        [(x, y), (x + random.uniform(0, size), y + random.uniform(0, size))]
+    )
+
+
+def brute_force_intersecting(items, box) -> set:
+    return {item for b, item in items if b.has_overlap(box)}
+
+
+def brute_force_distance(box: BoundingBox2d, point) -> float:
+    dx = max(box.extmin.x - point[0], 0.0, point[0] - box.extmax.x)
+    dy = max(box.extmin.y - point[1], 0.0, point[1] - box.extmax.y)
+    return (dx * dx + dy * dy) ** 0.5
+
+
+@pytest.fixture(scope="module")
+def items():
+    random.seed(42)
+    return [(random_box2d(), index) for index in range(1000)]
+
+
+def test_max_node_size_too_small():
+    with pytest.raises(ValueError):
+        BoxRTree(max_node_size=1)
+
+
+def test_empty_tree():
+    tree = BoxRTree()
+    assert len(tree) == 0
+    assert list(tree.intersecting(BoundingBox2d([(0, 0), (1, 1)]))) == []
+    assert tree.nearest((0, 0)) == []
+
+
+def test_empty_bounding_boxes_are_not_supported():
+    with pytest.raises(ValueError):
+        BoxRTree([(BoundingBox2d(), 1)])
+
+
+def test_bulk_loading(items):
+    tree = BoxRTree(items)
+    assert len(tree) == 1000
+    assert sorted(tree) == list(range(1000))
+
+
+def test_intersecting_includes_touching_boxes():
+    tree = BoxRTree([(BoundingBox2d([(0, 0), (1, 1)]), "A")])
+    assert list(tree.intersecting(BoundingBox2d([(1, 1), (2, 2)]))) == ["A"]
+
+
+@pytest.mark.parametrize("max_node_size", [2, 5, 16])
+def test_intersecting(items, max_node_size):
+    tree = BoxRTree(items, max_node_size=max_node_size)
+    random.seed(1)
+    for _ in range(20):
+        box = random_box2d(size=20)
+        assert set(tree.intersecting(box)) == brute_force_intersecting(items, box)
+
+
+def test_3d_boxes():
+    boxes = [
+        (BoundingBox([(0, 0, z), (1, 1, z + 1)]), z) for z in range(0, 100, 2)
+    ]
+    tree = BoxRTree(boxes)
+    result = tree.intersecting(BoundingBox([(0, 0, 10.5), (1, 1, 13.5)]))
+    assert set(result) == {10, 12}
+
+
+def test_insert_and_remove(items):
+    random.seed(2)
+    tree = BoxRTree(items[:500])
+    current = list(items[:500])
+    for item in items[500:]:
+        tree.insert(*item)
+        current.append(item)
+    random.shuffle(current)
+    for box, item in current[:600]:
+        assert tree.remove(box, item) is True
+    current = current[600:]
+    assert len(tree) == len(current)
+    for _ in range(20):
+        box = random_box2d(size=20)
+        assert set(tree.intersecting(box)) == brute_force_intersecting(current, box)
+
+
+def test_remove_not_existing_item(items):
+    tree = BoxRTree(items)
+    tree.insert(BoundingBox2d([(0, 0), (1, 1)]), "A")
+    assert tree.remove(BoundingBox2d([(0, 0), (1, 1)]), "B") is False
+    assert tree.remove(items[0][0], -1) is False
+    assert len(tree) == 1001
+
+
+def test_rebuild_after_many_inserts(items):
+    tree = BoxRTree(items[:10])
+    for item in items[10:]:
+        tree.insert(*item)
+    assert len(tree) == 1000
+    assert len(tree._dynamic) <= rtree.MIN_REBUILD_SIZE
+
+
+def test_extend(items):
+    tree = BoxRTree(items[:10])
+    tree.extend(items[10:])
+    assert len(tree) == 1000
+    assert len(tree._dynamic) == 0
+
+
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_nearest(items, k):
+    tree = BoxRTree(items[:700])
+    for item in items[700:]:
+        tree.insert(*item)
+    point = (50, 50)
+    expected = sorted(brute_force_distance(box, point) for box, _ in items)[:k]
+    result = tree.nearest(point, k)
+    assert len(result) == k
+    assert np.allclose([distance for _, distance in result], expected)
+
+
+def test_iter_nearest_yields_all_items(items):
+    tree = BoxRTree(items)
+    distances = [distance for _, distance in tree.iter_nearest((0, 0))]
+    assert len(distances) == 1000
+    assert distances == sorted(distances)
+
+
+def test_str_order_tiles_2d_data():
+    boxes = np.array(
+        [(x, y, 0, x, y, 0) for x in range(4) for y in range(4)], dtype=float
+    )
+    order = rtree.str_order(boxes, 4)
+    assert sorted(order.tolist()) == list(range(16))
+    # each leaf page of 4 boxes covers a 2x2 tile
+    for page in order.reshape(-1, 4):
+        assert len(set(boxes[page, 0])) == 2
+        assert len(set(boxes[page, 1])) == 2
+
+
+
+def box_array(items) -> np.ndarray:
+    return np.array(
+        [(*box.extmin, 0, *box.extmax, 0) for box, _ in items], dtype=float
+    )
+
+
+class TestIntersectingPairs:
+    @pytest.mark.parametrize("max_node_size", [2, 5, 16])
+    def test_random_boxes(self, items, max_node_size):
+        boxes = box_array(items)
+        pairs = rtree.intersecting_pairs(boxes, max_node_size)
+        expected = {
+            (i, j)
+            for i in range(len(items))
+            for j in range(i + 1, len(items))
+            if items[i][0].has_overlap(items[j][0])
+        }
+        assert len(pairs) == len(expected)
+        assert set(map(tuple, pairs.tolist())) == expected
+
+    def test_touching_boxes(self):
+        boxes = np.array(
+            [(0, 0, 0, 1, 1, 0), (1, 1, 0, 2, 2, 0), (3, 0, 0, 4, 1, 0)], dtype=float
+        )
+        assert rtree.intersecting_pairs(boxes).tolist() == [[0, 1]]
+
+    def test_coincident_boxes(self):
+        boxes = np.array([(0, 0, 0, 1, 1, 0)] * 20, dtype=float)
+        pairs = rtree.intersecting_pairs(boxes, 4)
+        assert len(pairs) == 20 * 19 // 2
+        assert bool(np.all(pairs[:, 0] < pairs[:, 1])) is True
+
+    @pytest.mark.parametrize("count", [0, 1])
+    def test_less_than_two_boxes(self, count):
+        boxes = np.array([(0, 0, 0, 1, 1, 0)] * count, dtype=float)
+        assert rtree.intersecting_pairs(boxes).shape == (0, 2)
+
+    def test_max_node_size_too_small(self):
+        with pytest.raises(ValueError):
+            rtree.intersecting_pairs(np.zeros((2, 6)), 1)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
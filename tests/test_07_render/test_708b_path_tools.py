@@ -25,8 +25,14 @@ from ezdxf.path import (
     lines_to_curve3,
     lines_to_curve4,
     is_rectangular,
+    boolean_union,
+    boolean_difference,
+    boolean_intersection,
+    unit_circle,
+    winding_deconstruction,
 )
 from ezdxf.path import make_path, Command
+from ezdxf.npshapes import NumpyPath2d
 from ezdxf.entities import BoundaryPathType, EdgeType
 from ezdxf.render import forms
 
@@ -796,3 +802,27 @@ def test_polyline_with_bulge_value_greater_one():
     p = make_path(pline, segments=12)
 
     assert len(p) == 4
+
+
+class TestBooleanOperations:
+    @pytest.fixture
+    def square(self):
+        return from_vertices([(-2, -2), (2, -2), (2, 2), (-2, 2)], close=True)
+
+    def test_difference_creates_nested_polygon_structure(self, square):
+        polygons = boolean_difference([square], [unit_circle()])
+        assert len(polygons) == 1
+        exterior, holes = winding_deconstruction(polygons)
+        assert len(exterior) == 1
+        assert len(holes) == 1
+        assert bbox(holes).size.isclose((2, 2))
+
+    def test_union_of_multi_path_resolves_holes(self, square):
+        polygons = boolean_union([to_multi_path([square, unit_circle()])])
+        assert len(polygons) == 1
+        assert len(polygons[0]) == 2  # exterior and hole
+
+    def test_intersection_accepts_numpy_paths(self, square):
+        polygons = boolean_intersection([NumpyPath2d(square)], [unit_circle()])
+        assert len(polygons) == 1
+        assert bbox(polygons[0]).size.isclose((2, 2))
@@ -4,6 +4,7 @@
 import pytest
 from ezdxf.render.forms import square, translate
 from ezdxf.path import Path, nesting, from_vertices
+from ezdxf.npshapes import NumpyPath2d
 
 EXTERIOR = list(translate(square(10), (-5, -5)))
 EXT1_PATH = from_vertices(EXTERIOR)
@@ -55,6 +56,76 @@ def test_fast_bbox_detection(paths, polygons):
     assert nesting.make_polygon_structure(paths) == polygons
 
 
+class TestPointInPolygonRefinement:
+    # L-shaped exterior path, the bounding box of the L-shape contains the
+    # square in the "notch" but the L-shape does not contain the square
+    L_SHAPE = [(0, 0), (10, 0), (10, 4), (4, 4), (4, 10), (0, 10)]
+    NOTCH_SQUARE = list(translate(square(3), (6, 6)))
+    INNER_SQUARE = list(translate(square(2), (1, 1)))
+
+    @pytest.fixture(params=[Path, NumpyPath2d])
+    def paths(self, request):
+        def make(vertices):
+            path = from_vertices(vertices, close=True)
+            return NumpyPath2d(path) if request.param is NumpyPath2d else path
+
+        return [
+            make(self.NOTCH_SQUARE),
+            make(self.L_SHAPE),
+            make(self.INNER_SQUARE),
+        ]
+
+    def test_square_in_notch_is_a_separated_polygon(self, paths):
+        notch, l_shape, inner = paths
+        assert nesting.make_polygon_structure(paths) == [
+            [l_shape, [inner]],
+            [notch],
+        ]
+
+    @pytest.mark.parametrize("path_type", [Path, NumpyPath2d])
+    def test_overlapping_paths_are_separated_polygons(self, path_type):
+        def make(vertices):
+            path = from_vertices(vertices, close=True)
+            return NumpyPath2d(path) if path_type is NumpyPath2d else path
+
+        # The bounding box center (8, 8) of the overlapping square is inside
+        # the exterior square, but the first vertex (11, 11) is outside:
+        exterior = make(square(10))
+        overlapping = make([(11, 11), (5, 11), (5, 5), (11, 5)])
+        assert nesting.make_polygon_structure([overlapping, exterior]) == [
+            [exterior],
+            [overlapping],
+        ]
+
+    def test_bounding_box_detection_for_other_types(self):
+        class BoxedObject:
+            def __init__(self, vertices):
+                self.path = from_vertices(vertices)
+
+            def bbox(self):
+                return self.path.bbox()
+
+        notch, l_shape = BoxedObject(self.NOTCH_SQUARE), BoxedObject(self.L_SHAPE)
+        assert nesting.make_polygon_structure([notch, l_shape]) == [
+            [l_shape, [notch]]
+        ]
+
+
+def test_many_nested_paths():
+    exteriors = []
+    holes = []
+    for x in range(20):
+        for y in range(20):
+            exteriors.append(from_vertices(translate(square(8), (x * 10, y * 10))))
+            holes.append(
+                from_vertices(translate(square(4), (x * 10 + 2, y * 10 + 2)))
+            )
+    polygons = nesting.make_polygon_structure(holes + exteriors)
+    assert len(polygons) == 400
+    for exterior, [hole] in polygons:
+        assert exterior.bbox().inside(hole.bbox().center)
+
+
 @pytest.mark.parametrize(
     "polygons,exp_ccw,exp_cw",
     [
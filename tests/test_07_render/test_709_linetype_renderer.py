@@ -2,7 +2,27 @@
 #  License: MIT License
 
 import pytest
-from ezdxf.render.linetypes import LineTypeRenderer
+import numpy as np
+from ezdxf.math import Vec2
+from ezdxf.render.linetypes import (
+    LineTypeRenderer,
+    dashed_lines,
+    multi_dashed_lines,
+)
+from ezdxf.render import _linetypes
+
+RENDERERS = [_linetypes._LineTypeRenderer]
+try:
+    from ezdxf.acc import linetypes
+
+    RENDERERS.append(linetypes._LineTypeRenderer)
+except ImportError:
+    pass
+
+
+@pytest.fixture(params=RENDERERS, ids=lambda cls: cls.__module__)
+def renderer(request):
+    return request.param
 
 
 def test_line_type_solid():
@@ -41,5 +61,59 @@ def test_dash_dot_2x_render_issue():
     assert last_segment[0].isclose(last_segment[1])
 
 
+def test_zero_length_dash_is_a_point(renderer):
+    ltr = renderer(dashes=(1.0, 0.5, 0.0, 0.5))
+    result = list(ltr.line_segment((0, 0), (4, 0)))
+    assert result == [
+        ((0, 0), (1, 0)),
+        ((1.5, 0), (1.5, 0)),
+        ((2, 0), (3, 0)),
+        ((3.5, 0), (3.5, 0)),
+    ]
+
+
+class TestDashedLines:
+    @pytest.mark.parametrize(
+        "dashes", [(1, 1), (2.0, 0.2, 0.1, 0.2), (1.0, 0.5, 0.0, 0.5), (0.7, 0.3, 0.2)]
+    )
+    def test_matches_line_type_renderer(self, renderer, dashes):
+        vertices = Vec2.list([(0, 0), (3.3, 0), (3.3, 4.1), (7, 9), (2, 1)])
+        ltr = renderer(dashes)
+        expected = [
+            segment
+            for start, end in zip(vertices, vertices[1:])
+            for segment in ltr.line_segment(start, end)
+        ]
+        lines = dashed_lines(np.array(vertices), dashes)
+        assert len(lines) == len(expected) * 2
+        for (start, end), s, e in zip(expected, lines[0::2], lines[1::2]):
+            assert start.isclose(Vec2(s))
+            assert end.isclose(Vec2(e))
+
+    def test_solid_line(self):
+        lines = dashed_lines(np.array([(0, 0), (1, 0), (1, 1)]), tuple())
+        assert lines.tolist() == [[0, 0], [1, 0], [1, 0], [1, 1]]
+
+    def test_zero_length_polyline_is_a_point(self):
+        lines = dashed_lines(np.array([(1, 1), (1, 1)]), (1, 1))
+        assert lines.tolist() == [[1, 1], [1, 1]]
+
+    def test_multiple_polylines_restart_the_pattern(self):
+        lines = multi_dashed_lines(
+            [np.array([(0, 0), (2.5, 0)]), np.array([(0, 1), (2.5, 1)])], (1, 1)
+        )
+        assert lines.tolist() == [
+            [0, 0], [1, 0], [2, 0], [2.5, 0],
+            [0, 1], [1, 1], [2, 1], [2.5, 1],
+        ]
+
+    def test_3d_vertices(self):
+        lines = dashed_lines(np.array([(0, 0, 0), (0, 0, 3)]), (1, 1))
+        assert lines.tolist() == [[0, 0, 0], [0, 0, 1], [0, 0, 2], [0, 0, 3]]
+
+    def test_polylines_without_lines(self):
+        assert len(multi_dashed_lines([np.array([(0, 0)])], (1, 1))) == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
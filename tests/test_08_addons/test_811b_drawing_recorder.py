@@ -1,13 +1,25 @@
 # Copyright (c) 2023, Manfred Moitzi
 # License: MIT License
 
+import io
 import pytest
+import numpy as np
 import ezdxf
 import ezdxf.path
-from ezdxf.npshapes import NumpyPath2d
+from ezdxf.npshapes import NumpyPath2d, NumpyPoints2d
 from ezdxf.math import Vec2
 from ezdxf.addons.drawing import RenderContext, Frontend
-from ezdxf.addons.drawing.recorder import Recorder, BackendProperties, Override
+from ezdxf.addons.drawing.config import Configuration, ColorPolicy
+from ezdxf.enums import Measurement
+from ezdxf.addons.drawing.recorder import (
+    Recorder,
+    Player,
+    RecordType,
+    BackendProperties,
+    Override,
+    pack_records,
+    unpack_records,
+)
 from ezdxf.addons.drawing.debug_backend import PathBackend
 
 
@@ -262,3 +274,122 @@ class TestCroppingRecords:
 
         paths = player.records[0].data
         assert len(paths) == 1, "hole should be removed"
+
+
+@pytest.fixture(scope="module")
+def recorded_player() -> Player:
+    recorder = Recorder()
+    recorder.configure(
+        Configuration(
+            pdsize=5,
+            measurement=Measurement.Metric,
+            color_policy=ColorPolicy.BLACK,
+            lineweight_scaling=2.0,
+        )
+    )
+    recorder.set_background("#ffffff")
+    red = BackendProperties("#ff0000", 0.5, "RED", 1, "A")
+    blue = BackendProperties("#0000ff", 0.25, "BLUE", 5, "B")
+    recorder.draw_point(Vec2(1, 2), red)
+    recorder.draw_line(Vec2(0, 0), Vec2(3, 4), blue)
+    recorder.draw_solid_lines(
+        [(Vec2(0, 0), Vec2(1, 0)), (Vec2(0, 1), Vec2(1, 1))], red
+    )
+    path = ezdxf.path.Path((0, 0))
+    path.line_to((10, 0))
+    path.curve4_to((0, 10), (10, 5), (5, 10))
+    path.curve3_to((0, 0), (0, 5))
+    recorder.draw_path(NumpyPath2d(path), blue)
+    recorder.draw_filled_polygon(
+        NumpyPoints2d(Vec2.list([(0, 0), (2, 0), (2, 2)])), red
+    )
+    exterior = ezdxf.path.from_vertices([(0, 0), (10, 0), (10, 10)], close=True)
+    hole = ezdxf.path.from_vertices([(5, 1), (9, 1), (9, 5)], close=True)
+    recorder.draw_filled_paths(
+        [NumpyPath2d(exterior), NumpyPath2d(hole)],
+        BackendProperties("#00ff00", 0.7, "GREEN", 3, "C"),
+    )
+    return recorder.player()
+
+
+class TestSaveAndLoad:
+    @staticmethod
+    def assert_equal_players(player, expected):
+        assert player.config == expected.config
+        assert player.background == expected.background
+        assert len(player.records) == len(expected.records)
+        for (type1, prop1, data1), (type2, prop2, data2) in zip(
+            player.recordings(), expected.recordings()
+        ):
+            assert type1 == type2
+            assert prop1 == prop2
+            if type1 == RecordType.FILLED_PATHS:
+                assert len(data1) == len(data2)
+                shapes = zip(data1, data2)
+            else:
+                shapes = [(data1, data2)]
+            for shape1, shape2 in shapes:
+                assert type(shape1) is type(shape2)
+                assert np.array_equal(shape1.np_vertices(), shape2.np_vertices())
+                if isinstance(shape1, NumpyPath2d):
+                    assert shape1.command_codes() == shape2.command_codes()
+
+    def test_all_record_types_are_recorded(self, recorded_player):
+        types = set(record.type for record in recorded_player.records)
+        assert types == set(RecordType)
+
+    def test_stream_round_trip(self, recorded_player):
+        stream = io.BytesIO()
+        recorded_player.save(stream)
+        stream.seek(0)
+        self.assert_equal_players(Player.load(stream), recorded_player)
+
+    def test_file_round_trip(self, recorded_player, tmp_path):
+        filename = tmp_path / "recording.npz"
+        recorded_player.save(filename)
+        self.assert_equal_players(Player.load(filename), recorded_player)
+        self.assert_equal_players(Player.load(str(filename)), recorded_player)
+
+    def test_filled_paths_with_holes(self, recorded_player):
+        loaded = unpack_records(Player(), pack_records(recorded_player))
+        exterior, hole = loaded.records[-1].data
+        assert len(exterior) == 3
+        assert hole.bbox().extmin.isclose((5, 1))
+
+    def test_loaded_player_is_replayable(self, recorded_player):
+        stream = io.BytesIO()
+        recorded_player.save(stream)
+        stream.seek(0)
+        loaded = Player.load(stream)
+        assert loaded.has_shared_recordings is False
+        assert loaded.bbox().extmin.isclose(recorded_player.bbox().extmin)
+        assert loaded.bbox().extmax.isclose(recorded_player.bbox().extmax)
+        backend = PathBackend()
+        loaded.replay(backend)
+        assert len(backend.collector) > 0
+
+    def test_empty_player(self):
+        stream = io.BytesIO()
+        Player().save(stream)
+        stream.seek(0)
+        loaded = Player.load(stream)
+        assert loaded.records == []
+        assert loaded.background == Player().background
+        assert loaded.config == Configuration()
+
+    def test_unknown_format_version(self, recorded_player):
+        data = pack_records(recorded_player)
+        data["meta"] = np.array('{"version": 999}')
+        with pytest.raises(ValueError):
+            unpack_records(Player(), data)
+
+    def test_invalid_format(self):
+        stream = io.BytesIO()
+        np.savez(stream, vertices=np.zeros((2, 2)))
+        stream.seek(0)
+        with pytest.raises(ValueError):
+            Player.load(stream)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,148 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+
+import pytest
+
+import ezdxf
+from ezdxf.math import BoundingBox2d
+from ezdxf.npshapes import NumpyPath2d
+from ezdxf.addons.drawing import RenderContext, Frontend
+from ezdxf.addons.drawing.config import Configuration
+from ezdxf.addons.drawing.recorder import Recorder
+
+
+@pytest.fixture(scope="module")
+def doc():
+    doc = ezdxf.new(setup=["linetypes"])
+    doc.layers.add("RED", color=1)
+    blk = doc.blocks.new("BLK", base_point=(1, 2))
+    blk.add_line((0, 0), (3, 4))
+    blk.add_line((0, 0), (5, 0), dxfattribs={"linetype": "DASHED"})
+    blk.add_circle((5, 5), 1, dxfattribs={"color": 0})  # BYBLOCK
+    blk.add_lwpolyline([(0, 0), (2, -3), (4, 0)], dxfattribs={"layer": "RED"})
+    blk.add_solid([(0, 0), (1, 0), (0, 1)])
+    blk.add_point((2, 2))
+    hatch = blk.add_hatch(color=3)
+    hatch.paths.add_polyline_path([(0, 0), (4, 0), (4, 4), (0, 4)])
+    blk.add_text("TEXT", height=0.5, dxfattribs={"insert": (1, 1)})
+    nested = doc.blocks.new("NESTED")
+    nested.add_blockref("BLK", (10, 0), dxfattribs={"rotation": 90})
+    nested.add_line((-5, -5), (5, 5))
+
+    msp = doc.modelspace()
+    for index, rotation in enumerate((0, 30, 90, 180, 270)):
+        x = index * 20
+        msp.add_blockref("BLK", (x, 0), dxfattribs={"rotation": rotation})
+        msp.add_blockref(
+            "BLK",
+            (x, 20),
+            dxfattribs={"rotation": rotation, "xscale": -2, "yscale": 2},
+        )
+        msp.add_blockref(
+            "NESTED",
+            (x, 40),
+            dxfattribs={"rotation": rotation, "color": 5, "layer": "RED"},
+        )
+    msp.add_blockref("BLK", (0, 60), dxfattribs={"column_count": 2, "row_count": 2})
+    return doc
+
+
+def render(doc, layout, block_cache: bool) -> Recorder:
+    recorder = Recorder()
+    frontend = Frontend(
+        RenderContext(doc),
+        recorder,
+        config=Configuration(block_cache=block_cache),
+    )
+    frontend.draw_layout(layout)
+    return recorder
+
+
+def extents(record) -> BoundingBox2d:
+    # The control vertices of rotated Bézier curves have different extents,
+    # therefore paths are compared by their flattened vertices:
+    shapes = record.data if isinstance(record.data, tuple) else [record.data]
+    box = BoundingBox2d()
+    for shape in shapes:
+        if isinstance(shape, NumpyPath2d):
+            box.extend(shape.flattening(0.001))
+        else:
+            box.extend(shape.vertices())
+    return box
+
+
+def assert_equal_recordings(recorder1: Recorder, recorder2: Recorder):
+    # Transformed circles may start at a different location, therefore the
+    # records are compared by their extents:
+    records1 = recorder1.records
+    records2 = recorder2.records
+    assert len(records1) == len(records2)
+    for record1, record2 in zip(records1, records2):
+        assert record1.type == record2.type
+        assert record1.handle == record2.handle
+        properties1 = recorder1.properties[record1.property_hash]
+        properties2 = recorder2.properties[record2.property_hash]
+        assert properties1[:4] == properties2[:4]
+        box1 = extents(record1)
+        box2 = extents(record2)
+        assert box1.extmin.isclose(box2.extmin, abs_tol=1e-3)
+        assert box1.extmax.isclose(box2.extmax, abs_tol=1e-3)
+
+
+def test_cached_blocks_match_uncached_rendering(doc):
+    msp = doc.modelspace()
+    assert_equal_recordings(render(doc, msp, True), render(doc, msp, False))
+
+
+def test_block_definitions_are_rendered_once_per_properties(doc):
+    recorder = Recorder()
+    frontend = Frontend(
+        RenderContext(doc), recorder, config=Configuration(block_cache=True)
+    )
+    frontend.draw_layout(doc.modelspace())
+    # BLK: unscaled and scaled block references, inside NESTED with inherited
+    # properties of the NESTED block references; NESTED: 1x
+    assert len(frontend.designer._recordings) == 4
+
+
+def test_block_references_with_extrusion_are_not_cached():
+    doc = ezdxf.new()
+    blk = doc.blocks.new("BLK")
+    blk.add_line((0, 0), (1, 0))
+    msp = doc.modelspace()
+    msp.add_blockref("BLK", (0, 0), dxfattribs={"extrusion": (0, 0, -1)})
+    recorder = Recorder()
+    frontend = Frontend(
+        RenderContext(doc), recorder, config=Configuration(block_cache=True)
+    )
+    frontend.draw_layout(msp)
+    assert len(frontend.designer._recordings) == 0
+    assert_equal_recordings(recorder, render(doc, msp, False))
+
+
+def test_cached_primitives_get_handle_of_block_reference(doc):
+    msp = doc.modelspace()
+    recorder = render(doc, msp, True)
+    handles = {record.handle for record in recorder.records}
+    assert handles == {insert.dxf.handle for insert in msp}
+
+
+def test_cached_blocks_are_clipped_by_viewports(doc):
+    psp = doc.paperspace("Layout1")
+    vp = psp.add_viewport(
+        center=(20, 20), size=(20, 20), view_center_point=(20, 20), view_height=20
+    )
+    vp.dxf.status = 2
+    try:
+        player1 = render(doc, psp, True).player()
+        player2 = render(doc, psp, False).player()
+    finally:
+        psp.delete_entity(vp)
+    box1 = player1.bbox()
+    box2 = player2.bbox()
+    assert box1.extmin.isclose(box2.extmin, abs_tol=1e-3)
+    assert box1.extmax.isclose(box2.extmax, abs_tol=1e-3)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,92 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+
+import pytest
+
+import ezdxf
+from ezdxf.math import BoundingBox2d
+from ezdxf.addons.drawing import RenderContext, Frontend
+from ezdxf.addons.drawing.recorder import Recorder
+from ezdxf.addons.drawing import parallel
+
+
+@pytest.fixture(scope="module")
+def filename(tmp_path_factory):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for x in range(10):
+        for y in range(10):
+            msp.add_line((x * 10, y * 10), (x * 10 + 15, y * 10 + 5))
+            msp.add_circle((x * 10, y * 10), 2)
+    msp.add_text("TEXT", height=2, dxfattribs={"insert": (48, 48)})
+    msp.add_xline((0, 0), (1, 1))
+    name = tmp_path_factory.mktemp("tiles") / "tiles.dxf"
+    doc.saveas(name)
+    return name
+
+
+def test_tile_grid():
+    tiles = parallel.tile_grid(BoundingBox2d([(0, 0), (4, 2)]), 2, 2)
+    assert len(tiles) == 4
+    assert tiles[0].extmin.isclose((0, 0))
+    assert tiles[0].extmax.isclose((2, 1))
+    assert tiles[1].extmin.isclose((2, 0))
+    assert tiles[3].extmax.isclose((4, 2))
+
+
+def test_tile_grid_of_undefined_extents():
+    assert parallel.tile_grid(BoundingBox2d(), 2, 2) == []
+
+
+def test_crop_rect_extends_outer_borders():
+    extents = BoundingBox2d([(0, 0), (4, 2)])
+    tiles = parallel.tile_grid(extents, 2, 1)
+    assert parallel.crop_rect(tiles[0], extents) == (-4, -4, 2, 6)
+    assert parallel.crop_rect(tiles[1], extents) == (2, -4, 8, 6)
+
+
+def test_assign_entities():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    left = msp.add_line((0, 0), (1, 1))
+    right = msp.add_line((9, 0), (10, 1))
+    both = msp.add_line((0, 0), (10, 0))
+    xline = msp.add_xline((0, 0), (1, 0))
+    tiles = parallel.tile_grid(BoundingBox2d([(0, 0), (10, 1)]), 2, 1)
+    h0, h1 = parallel.assign_entities(msp, tiles)
+    handle = lambda e: e.dxf.handle
+    assert set(h0) == set(map(handle, [left, both, xline]))
+    assert set(h1) == set(map(handle, [right, both, xline]))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_render_tiles_matches_extents_of_single_pass(filename, workers):
+    doc = ezdxf.readfile(filename)
+    recorder = Recorder()
+    Frontend(RenderContext(doc), recorder).draw_layout(doc.modelspace())
+    expected = recorder.player().bbox()
+
+    player = parallel.render_tiles(filename, workers=workers, columns=3, rows=2)
+    box = player.bbox()
+    assert box.extmin.isclose(expected.extmin)
+    assert box.extmax.isclose(expected.extmax)
+    assert player.background == recorder.background
+    # all property hashes have to be valid in the main process:
+    assert len(list(player.recordings())) == len(player.records)
+
+
+def test_render_single_tile_without_cropping(filename):
+    doc = ezdxf.readfile(filename)
+    recorder = Recorder()
+    Frontend(RenderContext(doc), recorder).draw_layout(doc.modelspace())
+    player = parallel.render_tiles(filename, workers=1, columns=1, rows=1)
+    assert len(player.records) == len(recorder.records)
+
+
+def test_invalid_layout_name(filename):
+    with pytest.raises(KeyError):
+        parallel.render_tiles(filename, "DoesNotExist", workers=1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,78 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+
+import pytest
+
+import ezdxf
+from ezdxf.addons.drawing import RenderContext, Frontend
+from ezdxf.addons.drawing.config import Configuration
+from ezdxf.addons.drawing.recorder import Recorder, RecordType
+
+
+@pytest.fixture
+def doc():
+    return ezdxf.new(setup=["linetypes"])
+
+
+def render(doc, pixel_size: float) -> list:
+    recorder = Recorder()
+    config = Configuration(pixel_size=pixel_size)
+    Frontend(RenderContext(doc), recorder, config=config).draw_layout(
+        doc.modelspace()
+    )
+    return recorder.records
+
+
+def test_level_of_detail_configuration(doc):
+    frontend = Frontend(
+        RenderContext(doc), Recorder(), config=Configuration(pixel_size=2.0)
+    )
+    assert frontend.config.max_flattening_distance == 1.0
+    assert frontend.config.min_hatch_line_distance == 2.0
+
+
+def test_small_text_as_filled_rectangle(doc):
+    doc.modelspace().add_text("TEXT", height=1.0)
+    assert render(doc, 0.0)[0].type == RecordType.FILLED_PATHS
+
+    record = render(doc, 1.0)[0]
+    assert record.type == RecordType.POINTS
+    assert len(record.data) == 4
+    extmin, extmax = record.data.extents()
+    assert extmin.isclose((0, 0))
+    assert extmax.y == pytest.approx(1.0)
+
+
+def test_short_linetype_pattern_as_continuous_line(doc):
+    doc.modelspace().add_line((0, 0), (100, 0), dxfattribs={"linetype": "DASHED"})
+    assert render(doc, 0.0)[0].type == RecordType.SOLID_LINES
+
+    record = render(doc, 1.0)[0]
+    assert record.type == RecordType.POINTS
+    assert len(record.data) == 2  # a single line
+
+
+def test_curves_smaller_than_a_pixel_as_points(doc):
+    msp = doc.modelspace()
+    msp.add_circle((1, 2), radius=0.1)
+    msp.add_ellipse((1, 2), major_axis=(0.1, 0), ratio=0.5)
+    assert render(doc, 0.0)[0].type == RecordType.PATH
+
+    records = render(doc, 1.0)
+    assert len(records) == 2
+    for record in records:
+        assert record.type == RecordType.POINTS
+        assert len(record.data) == 1
+        assert record.data.vertices()[0].isclose((1, 2), abs_tol=0.2)
+
+
+def test_dense_hatch_pattern_as_solid_filling(doc):
+    hatch = doc.modelspace().add_hatch()
+    hatch.set_pattern_fill("ANSI31", scale=0.5)
+    hatch.paths.add_polyline_path([(0, 0), (10, 0), (10, 10), (0, 10)])
+    assert render(doc, 0.0)[0].type == RecordType.SOLID_LINES
+    assert render(doc, 2.0)[0].type == RecordType.FILLED_PATHS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,87 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+
+import pytest
+
+from ezdxf.fonts import fonts
+from ezdxf.math import Matrix44
+from ezdxf.npshapes import NumpyPath2d, transform_paths
+from ezdxf.path import rect
+from ezdxf.addons.drawing.unified_text_renderer import (
+    UnifiedTextRenderer,
+    TextPathCache,
+)
+
+FONT_FACE = fonts.FontFace(filename="OpenSans-Regular.ttf")
+
+
+def test_lru_cache_removes_least_recently_used_entries():
+    cache = TextPathCache(maxsize=2)
+    cache.store((FONT_FACE, "A"), [])
+    cache.store((FONT_FACE, "B"), [])
+    assert cache.get((FONT_FACE, "A")) == []  # "A" is now most recently used
+    cache.store((FONT_FACE, "C"), [])
+    assert len(cache) == 2
+    assert cache.get((FONT_FACE, "B")) is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_reduce_cache_size():
+    cache = TextPathCache(maxsize=3)
+    for text in "ABC":
+        cache.store((FONT_FACE, text), [])
+    cache.maxsize = 1
+    assert len(cache) == 1
+    assert cache.get((FONT_FACE, "C")) == []
+
+
+def test_cache_size_zero_disables_the_cache():
+    cache = TextPathCache(maxsize=0)
+    cache.store((FONT_FACE, "A"), [])
+    assert len(cache) == 0
+
+
+def test_clear_resets_statistics():
+    cache = TextPathCache()
+    cache.store((FONT_FACE, "A"), [])
+    cache.get((FONT_FACE, "A"))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+
+
+class TestUnifiedTextRenderer:
+    def test_cached_paths_match_uncached_paths(self):
+        engine = UnifiedTextRenderer()
+        expected = engine.get_font(FONT_FACE).text_glyph_paths("Text", 2.5)
+        engine.get_text_glyph_paths("Text", FONT_FACE, 1.0)  # stored in unit space
+        paths = engine.get_text_glyph_paths("Text", FONT_FACE, 2.5)
+        assert engine.text_path_cache.hits == 1
+        assert len(paths) == len(expected)
+        for p0, p1 in zip(paths, expected):
+            assert p0.command_codes() == p1.command_codes()
+            assert all(
+                v0.isclose(v1)
+                for v0, v1 in zip(p0.control_vertices(), p1.control_vertices())
+            )
+
+    def test_returns_copies_of_cached_paths(self):
+        engine = UnifiedTextRenderer()
+        paths = engine.get_text_glyph_paths("X", FONT_FACE, 1.0)
+        extmin, extmax = paths[0].extents()
+        paths[0].transform_inplace(Matrix44.translate(100, 0, 0))
+        paths = engine.get_text_glyph_paths("X", FONT_FACE, 1.0)
+        assert paths[0].extents() == (extmin, extmax)
+
+
+def test_transform_paths():
+    paths = [NumpyPath2d(rect(1, 1)), NumpyPath2d(rect(2, 2))]
+    result = transform_paths(paths, Matrix44.translate(10, 0, 0))
+    assert result[0].start.isclose((10.5, 0.5))
+    assert result[1].start.isclose((11, 1))
+    assert paths[0].start.isclose((0.5, 0.5)), "source paths are not changed"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,108 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+
+import pytest
+
+import ezdxf
+from ezdxf.addons.drawing import RenderContext, Frontend, designer
+from ezdxf.addons.drawing.recorder import Recorder
+
+
+@pytest.fixture(scope="module")
+def doc():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for x in range(10):
+        msp.add_circle((x * 10, 0), radius=1)
+    msp.add_xline((0, 0), (1, 0))
+    psp = doc.paperspace("Layout1")
+    # shows the circles at x = 0, 10, 20
+    psp.add_viewport(
+        center=(20, 20), size=(30, 10), view_center_point=(10, 0), view_height=10
+    ).dxf.status = 2
+    # shows the circles at x = 60, 70, 80
+    psp.add_viewport(
+        center=(60, 20), size=(30, 10), view_center_point=(70, 0), view_height=10
+    ).dxf.status = 3
+    return doc
+
+
+def rendered_handles(doc, layout):
+    recorder = Recorder()
+    ctx = RenderContext(doc)
+    Frontend(ctx, recorder).draw_layout(layout)
+    handles: list[str] = []
+    for record in recorder.records:
+        # clipped shapes may be split into multiple records
+        if not handles or handles[-1] != record.handle:
+            handles.append(record.handle)
+    return ctx, handles
+
+
+def test_viewports_render_only_visible_entities(doc):
+    msp = doc.modelspace()
+    circles = [e.dxf.handle for e in msp.query("CIRCLE")]
+    xline = msp.query("XLINE").first.dxf.handle
+    _, handles = rendered_handles(doc, doc.paperspace("Layout1"))
+    # XLINE has no extents and is passed to all viewports, but it is rendered
+    # with a limited length and therefore not visible in the second viewport:
+    expected = circles[0:3] + [xline] + circles[6:9]
+    assert handles == expected, "expected modelspace order for each viewport"
+
+
+def test_modelspace_index_is_shared_by_all_viewports(doc, monkeypatch):
+    count = 0
+    modelspace_index = designer.ModelspaceIndex
+
+    def counter(*args, **kwargs):
+        nonlocal count
+        count += 1
+        return modelspace_index(*args, **kwargs)
+
+    monkeypatch.setattr(designer, "ModelspaceIndex", counter)
+    rendered_handles(doc, doc.paperspace("Layout1"))
+    assert count == 1
+
+
+def test_reused_render_context_renders_modified_modelspace():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_circle((0, 0), radius=1)
+    psp = doc.paperspace("Layout1")
+    psp.add_viewport(
+        center=(20, 20), size=(30, 10), view_center_point=(0, 0), view_height=10
+    ).dxf.status = 2
+    ctx = RenderContext(doc)
+    Frontend(ctx, Recorder()).draw_layout(psp)
+
+    circle = msp.add_circle((5, 0), radius=1)
+    recorder = Recorder()
+    Frontend(ctx, recorder).draw_layout(psp)
+    assert circle.dxf.handle in {record.handle for record in recorder.records}
+
+
+def test_non_rectangular_clipping_boundary():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    inside = msp.add_circle((0, 0), radius=1)
+    corner = msp.add_circle((9, 9), radius=0.5)
+    psp = doc.paperspace("Layout1")
+    # triangular clipping boundary in paperspace, scale 1:1
+    boundary = psp.add_lwpolyline([(-10, -10), (10, -10), (-10, 10)], close=True)
+    vp = psp.add_viewport(
+        center=(0, 0), size=(20, 20), view_center_point=(0, 0), view_height=20
+    )
+    vp.dxf.status = 2
+    vp.dxf.flags = vp.dxf.flags | 0x10000  # non-rectangular clipping
+    vp.dxf.clipping_boundary_handle = boundary.dxf.handle
+    assert vp.has_extended_clipping_path is True
+
+    recorder = Recorder()
+    Frontend(RenderContext(doc), recorder).draw_entities([vp])
+    handles = {record.handle for record in recorder.records}
+    assert inside.dxf.handle in handles
+    assert corner.dxf.handle not in handles
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
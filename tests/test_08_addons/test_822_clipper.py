@@ -2,9 +2,9 @@
 #  License: MIT License
 
 import pytest
+import numpy as np
 
-
-from ezdxf.addons.drawing.clipper import ClippingRect
+from ezdxf.addons.drawing.clipper import ClippingRect, boxes_intersecting_polygon
 from ezdxf.math import Vec2
 from ezdxf.path import rect
 from ezdxf import npshapes
@@ -35,5 +35,30 @@ def test_clip_polyline():
     assert len(result) == 4
 
 
+def test_clip_multiple_lines_at_once():
+    clipper = ClippingRect()
+    clipper.push(rect(2, 2), None)
+    lines = npshapes.NumpyPoints2d(
+        Vec2.list([(-3, 0), (3, 0), (0, 3), (0, -3), (2, 2), (3, 3), (0, 0), (0, 0)])
+    )
+    result = clipper.clip_lines(lines).vertices()
+    assert len(result) == 6
+    assert result[0].isclose((-1, 0))
+    assert result[1].isclose((1, 0))
+    assert result[2].isclose((0, 1))
+    assert result[3].isclose((0, -1))
+    assert result[4].isclose((0, 0)), "points are preserved"
+    assert result[5].isclose((0, 0))
+
+
+def test_boxes_intersecting_polygon():
+    triangle = np.array([(0, 0), (10, 0), (0, 10)], dtype=np.float64)
+    extmin = np.array([(1, 1), (8, 8), (-1, -1), (4, -1), (20, 0)], dtype=np.float64)
+    extmax = np.array([(2, 2), (9, 9), (11, 11), (6, 1), (21, 1)], dtype=np.float64)
+    result = boxes_intersecting_polygon(extmin, extmax, triangle)
+    # inside, outside, polygon inside box, crossing edge, outside
+    assert result.tolist() == [True, False, True, True, False]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
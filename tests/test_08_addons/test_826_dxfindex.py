@@ -0,0 +1,169 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+import os
+
+import ezdxf
+from ezdxf.addons import dxfindex
+from ezdxf.lldxf import fileindex
+from ezdxf.lldxf.const import DXFStructureError
+
+
+@pytest.fixture(scope="module")
+def filename(tmp_path_factory):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (1, 0), dxfattribs={"layer": "LINES"})
+    msp.add_polyline3d([(0, 0, 0), (1, 1, 1), (2, 0, 1)])
+    blk = doc.blocks.new("BLOCK")
+    blk.add_circle((0, 0), 1)
+    blk.add_polyline2d([(0, 0), (1, 0)])
+    blk.add_attdef("TAG", (0, 0))
+    insert = msp.add_blockref("BLOCK", (0, 0))
+    insert.add_auto_attribs({"TAG": "VALUE"})
+    doc.dimstyles.new("INDEX")
+    name = tmp_path_factory.mktemp("dxfindex") / "dxfindex.dxf"
+    doc.saveas(name)
+    return str(name)
+
+
+@pytest.fixture(scope="module")
+def expected(filename):
+    return ezdxf.readfile(filename)
+
+
+@pytest.fixture
+def doc(filename):
+    with dxfindex.opendxf(filename) as doc:
+        yield doc
+
+
+class TestEntityIndex:
+    def test_locations_of_structure_entities(self, filename):
+        with open(filename, "rb") as fp:
+            data = fp.read()
+        index = fileindex.entity_index(data)
+        expected = fileindex.load(filename)
+        assert list(index.locations[:-1]) == [
+            e.location for e in expected.index if e.code == 0
+        ]
+        assert index.locations[-1] == len(data)
+        assert index.version == expected.version
+        assert index.encoding == expected.encoding
+
+    def test_sections_and_blocks(self, filename):
+        with open(filename, "rb") as fp:
+            index = fileindex.entity_index(fp.read())
+        assert list(index.sections.keys()) == [
+            "HEADER",
+            "CLASSES",
+            "TABLES",
+            "BLOCKS",
+            "ENTITIES",
+            "OBJECTS",
+        ]
+        assert "BLOCK" in index.blocks
+        start, stop = index.block_range("BLOCK")
+        assert index.dxftypes[start] == "BLOCK"
+        assert index.dxftypes[stop - 1] == "ENDBLK"
+
+    def test_dict_conversion(self, filename):
+        with open(filename, "rb") as fp:
+            index = fileindex.entity_index(fp.read())
+        index2 = fileindex.EntityIndex.from_dict(index.to_dict())
+        assert index2.to_dict() == index.to_dict()
+
+    def test_missing_eof(self):
+        with pytest.raises(DXFStructureError):
+            fileindex.entity_index(b"  0\nSECTION\n  2\nENTITIES\n  0\nENDSEC\n")
+
+
+def test_all_handles_are_indexed(doc, expected):
+    assert set(doc.handles()) == set(expected.entitydb.keys())
+
+
+def test_dxftype_and_owner(doc, expected):
+    for entity in expected.entitydb.values():
+        handle = entity.dxf.handle
+        assert doc.dxftype(handle) == entity.dxftype()
+        # the loading process of a DXF document can change the owner of
+        # sub-entities, the index stores the owner handle of the DXF file
+        assert doc.owner(handle) == doc.get(handle).dxf.get("owner")
+
+
+def test_get_entity(doc, expected):
+    line = expected.modelspace().query("LINE").first
+    entity = doc.get(line.dxf.handle)
+    assert entity.dxftype() == "LINE"
+    assert entity.dxf.layer == "LINES"
+    assert entity.dxf.end.isclose((1, 0))
+    assert entity.doc is None
+
+
+def test_get_linked_entities(doc, expected):
+    insert = expected.modelspace().query("INSERT").first
+    entity = doc.get(insert.dxf.handle)
+    assert entity.get_attrib_text("TAG") == "VALUE"
+    polyline = expected.modelspace().query("POLYLINE").first
+    assert len(doc.get(polyline.dxf.handle).vertices) == 3
+
+
+def test_get_dimstyle_by_handle(doc, expected):
+    dimstyle = expected.dimstyles.get("INDEX")
+    assert doc.get(dimstyle.dxf.handle).dxf.name == "INDEX"
+
+
+def test_get_block_content(doc):
+    content = doc.block("BLOCK")
+    assert [e.dxftype() for e in content] == ["CIRCLE", "POLYLINE", "ATTDEF"]
+    assert len(content[1].vertices) == 2
+
+
+def test_invalid_handle(doc):
+    assert "FFFFFF" not in doc
+    with pytest.raises(KeyError):
+        doc.get("FFFFFF")
+
+
+def test_invalid_block_name(doc):
+    with pytest.raises(KeyError):
+        doc.block("DOES_NOT_EXIST")
+
+
+def test_index_file(filename, tmp_path):
+    index_file = tmp_path / "dxfindex.json"
+    with dxfindex.opendxf(filename, index_file=index_file) as doc:
+        handles = list(doc.handles())
+    assert index_file.exists()
+    index = dxfindex.load_index(filename, index_file)
+    assert index is not None
+    assert set(index.handle_map().keys()) == set(handles)
+
+
+def test_outdated_index_file_is_ignored(filename, tmp_path):
+    index_file = tmp_path / "dxfindex.json"
+    with dxfindex.opendxf(filename, index_file=index_file):
+        pass
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert dxfindex.load_index(filename, index_file) is None
+
+
+def test_invalid_index_file_is_ignored(filename, tmp_path):
+    index_file = tmp_path / "dxfindex.json"
+    index_file.write_text("invalid")
+    assert dxfindex.load_index(filename, index_file) is None
+    with dxfindex.opendxf(filename, index_file=index_file) as doc:
+        assert len(doc) > 0
+    assert dxfindex.load_index(filename, index_file) is not None
+
+
+def test_binary_dxf_is_not_supported(tmp_path, expected):
+    name = tmp_path / "binary.dxf"
+    expected.saveas(name, fmt="bin")
+    with pytest.raises(IOError):
+        dxfindex.opendxf(name)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
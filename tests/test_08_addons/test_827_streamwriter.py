@@ -0,0 +1,112 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+import io
+
+import ezdxf
+from ezdxf.addons.streamwriter import StreamWriter, streamwriter
+from ezdxf.entities import factory
+from ezdxf.lldxf import const
+
+
+@pytest.fixture
+def doc():
+    doc = ezdxf.new()
+    doc.layers.add("LINES")
+    blk = doc.blocks.new("BLOCK")
+    blk.add_circle((0, 0), 1)
+    return doc
+
+
+def stream_entities(doc, filename, fmt="asc"):
+    with streamwriter(filename, doc, fmt=fmt) as writer:
+        msp = writer.modelspace()
+        for x in range(100):
+            msp.add_line((x, 0), (x, 10), dxfattribs={"layer": "LINES"})
+        msp.add_lwpolyline([(0, 0), (1, 0), (1, 1)])
+        msp.add_polyline2d([(0, 0), (1, 0), (1, 1)])
+        insert = msp.add_blockref("BLOCK", (0, 0))
+        insert.add_attrib("TAG", "value")
+        hatch = msp.add_hatch()
+        hatch.paths.add_polyline_path([(0, 0), (1, 0), (1, 1)])
+        writer.write(factory.new("CIRCLE", dxfattribs={"radius": 2}))
+    return ezdxf.readfile(filename)
+
+
+@pytest.mark.parametrize("fmt", ["asc", "bin"])
+def test_read_streamed_document(doc, fmt, tmp_path):
+    result = stream_entities(doc, tmp_path / "stream.dxf", fmt)
+    msp = result.modelspace()
+    assert len(msp) == 105
+    assert len(msp.query("LINE[layer=='LINES']")) == 100
+    polyline = msp.query("POLYLINE").first
+    assert len(polyline.vertices) == 3
+    insert = msp.query("INSERT").first
+    assert insert.get_attrib_text("TAG") == "value"
+    assert len(msp.query("HATCH").first.paths) == 1
+    assert len(result.blocks.get("BLOCK")) == 1
+
+
+def test_handles_are_unique_and_below_handseed(doc, tmp_path):
+    result = stream_entities(doc, tmp_path / "stream.dxf")
+    handles = [int(e.dxf.handle, 16) for e in result.entitydb.values()]
+    assert len(handles) == len(set(handles))
+    assert max(handles) < int(result.header["$HANDSEED"], 16)
+
+
+def test_streamed_entities_are_not_stored_in_resource_document(doc, tmp_path):
+    count = len(doc.entitydb)
+    stream_entities(doc, tmp_path / "stream.dxf")
+    assert len(doc.modelspace()) == 0
+    # the written document may contain additional resources like APPIDs:
+    assert len(doc.entitydb) < count + 10
+
+
+def test_streamed_entities_have_modelspace_as_owner(doc, tmp_path):
+    result = stream_entities(doc, tmp_path / "stream.dxf")
+    owner = result.modelspace().block_record_handle
+    assert all(e.dxf.owner == owner for e in result.modelspace())
+
+
+def test_existing_layout_entities_are_written(doc, tmp_path):
+    doc.modelspace().add_point((1, 2))
+    doc.paperspace().add_point((3, 4))
+    result = stream_entities(doc, tmp_path / "stream.dxf")
+    assert len(result.modelspace()) == 106
+    assert len(result.paperspace()) == 1
+
+
+def test_entity_of_another_document_is_not_accepted(doc):
+    other = ezdxf.new()
+    line = other.modelspace().add_line((0, 0), (1, 0))
+    with streamwriter(io.StringIO(), doc) as writer:
+        with pytest.raises(const.DXFValueError):
+            writer.write(line)
+
+
+def test_entity_assigned_to_a_layout_is_not_accepted(doc):
+    line = doc.modelspace().add_line((0, 0), (1, 0))
+    with streamwriter(io.StringIO(), doc) as writer:
+        with pytest.raises(const.DXFValueError):
+            writer.write(line)
+
+
+def test_dxf_r12_is_not_supported():
+    with pytest.raises(const.DXFVersionError):
+        StreamWriter(io.StringIO(), ezdxf.new("R12"))
+
+
+def test_write_to_file(doc, tmp_path):
+    filename = tmp_path / "stream.dxf"
+    with streamwriter(filename, doc) as writer:
+        writer.write_entities(
+            factory.new("POINT", dxfattribs={"location": (x, 0)})
+            for x in range(10)
+        )
+        assert writer.count == 9  # last entity is still buffered
+    assert writer.count == 10
+    assert len(ezdxf.readfile(filename).modelspace()) == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
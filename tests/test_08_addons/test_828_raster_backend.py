@@ -0,0 +1,128 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+
+import struct
+import zlib
+
+import pytest
+import numpy as np
+
+import ezdxf
+from ezdxf.addons.drawing import Frontend, RenderContext, layout
+from ezdxf.addons.drawing import raster
+
+
+def square(x0, y0, x1, y1) -> np.ndarray:
+    return np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], dtype=np.float64)
+
+
+class TestFillPolygons:
+    def test_pixel_aligned_square(self):
+        left, top, mask = raster.fill_polygons([square(1, 1, 3, 3)], 5, 5)
+        assert (left, top) == (1, 1)
+        assert np.allclose(mask, 1.0)
+
+    def test_anti_aliased_borders(self):
+        left, top, mask = raster.fill_polygons([square(0.5, 0.5, 2.5, 2.5)], 5, 5)
+        assert (left, top) == (0, 0)
+        assert np.allclose(
+            mask, [[0.25, 0.5, 0.25], [0.5, 1.0, 0.5], [0.25, 0.5, 0.25]]
+        )
+
+    def test_clipped_to_image_size(self):
+        left, top, mask = raster.fill_polygons([square(-5, -5, 15, 15)], 4, 3)
+        assert (left, top) == (0, 0)
+        assert mask.shape == (3, 4)
+        assert np.allclose(mask, 1.0)
+
+    def test_outside_image(self):
+        assert raster.fill_polygons([square(10, 10, 20, 20)], 5, 5) is None
+
+    def test_even_odd_hole(self):
+        _, _, mask = raster.fill_polygons(
+            [square(0, 0, 5, 5), square(1, 1, 4, 4)], 5, 5
+        )
+        assert mask[2, 2] == 0.0
+        assert mask[0, 2] == 1.0
+
+    def test_nonzero_union_of_overlapping_squares(self):
+        quads = np.array([square(0, 0, 3, 3), square(1, 1, 4, 4)])
+        _, _, mask = raster.fill_polygons(quads, 5, 5, nonzero=True)
+        assert mask[2, 2] == 1.0  # even-odd would be 0
+        assert mask[0, 3] == 0.0
+
+
+def test_stroke_quads():
+    quads = raster.stroke_quads(
+        np.array([(0.0, 0.0), (1.0, 1.0)]), np.array([(4.0, 0.0), (1.0, 1.0)]), 2.0
+    )
+    assert quads.shape == (2, 4, 2)
+    assert np.allclose(quads[0], [(-1, 1), (5, 1), (5, -1), (-1, -1)])
+    # a zero-length line is a square:
+    assert np.allclose(quads[1], [(0, 2), (2, 2), (2, 0), (0, 0)])
+
+
+def test_png_bytes():
+    pixels = np.zeros((2, 3, 4), dtype=np.uint8)
+    pixels[0, 1] = (255, 0, 0, 255)
+    data = raster.png_bytes(pixels)
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height, depth, color_type = struct.unpack(">IIBB", data[16:26])
+    assert (width, height, depth, color_type) == (3, 2, 8, 6)
+    length = struct.unpack(">I", data[33:37])[0]
+    assert data[37:41] == b"IDAT"
+    rows = zlib.decompress(data[41 : 41 + length])
+    assert rows[:9] == bytes([0, 0, 0, 0, 0, 255, 0, 0, 255])
+
+
+def test_ppm_bytes():
+    pixels = np.full((2, 3, 3), 7, dtype=np.uint8)
+    data = raster.ppm_bytes(pixels)
+    assert data.startswith(b"P6 3 2 255\n")
+    assert len(data) == len(b"P6 3 2 255\n") + 18
+
+
+def test_remove_alpha_channel_composes_on_white_background():
+    pixels = np.array([[(0, 0, 0, 0), (0, 0, 0, 255)]], dtype=np.uint8)
+    rgb = raster.remove_alpha_channel(pixels)
+    assert rgb.tolist() == [[[255, 255, 255], [0, 0, 0]]]
+
+
+@pytest.fixture(scope="module")
+def backend():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    hatch = msp.add_hatch(color=1)  # red
+    hatch.paths.add_polyline_path(square(0, 0, 10, 10))
+    msp.add_line((0, 0), (20, 10))
+    backend = raster.RasterBackend()
+    Frontend(RenderContext(doc), backend).draw_layout(msp)
+    return backend
+
+
+def test_get_array(backend):
+    page = layout.Page(20, 10, layout.Units.mm)
+    pixels = backend.get_array(page, dpi=25.4)  # 1 pixel per mm
+    assert pixels.dtype == np.uint8
+    assert pixels.shape == (10, 20, 4)
+    # filled hatch in the left half, origin of the image is the top-left corner
+    assert pixels[5, 2].tolist() == [255, 0, 0, 255]
+    # opaque background
+    assert pixels[0, 15, 3] == 255
+
+
+def test_get_pixmap_bytes(backend):
+    page = layout.Page(20, 10, layout.Units.mm)
+    assert backend.get_pixmap_bytes(page, dpi=25.4)[:4] == b"\x89PNG"
+    assert backend.get_pixmap_bytes(page, fmt="ppm", dpi=25.4).startswith(
+        b"P6 20 10 255\n"
+    )
+
+
+def test_unsupported_image_format(backend):
+    with pytest.raises(ValueError):
+        backend.get_pixmap_bytes(layout.Page(20, 10), fmt="xyz")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
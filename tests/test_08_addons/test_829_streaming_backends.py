@@ -0,0 +1,128 @@
+# Copyright (c) 2023, Manfred Moitzi
+# License: MIT License
+
+import io
+import re
+import zlib
+from xml.etree import ElementTree as ET
+
+import pytest
+
+import ezdxf
+from ezdxf.math import BoundingBox2d
+from ezdxf.addons.drawing import Frontend, RenderContext, layout, svg, pdf
+from ezdxf.addons.drawing.recorder import Recorder
+
+
+@pytest.fixture(scope="module")
+def doc():
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for x in range(5):
+        msp.add_line((x, 0), (x + 3, 5), dxfattribs={"color": 1})
+    msp.add_circle((2, 2), radius=1.5, dxfattribs={"color": 2})
+    hatch = msp.add_hatch(color=3)
+    hatch.paths.add_polyline_path([(0, 0), (2, 0), (2, 2)])
+    hatch.transparency = 0.5
+    msp.add_point((4, 4))
+    return doc
+
+
+@pytest.fixture(scope="module")
+def render_box(doc):
+    recorder = Recorder()
+    Frontend(RenderContext(doc), recorder).draw_layout(doc.modelspace())
+    return recorder.player().bbox()
+
+
+PAGE = layout.Page(100, 80, margins=layout.Margins.all(5))
+
+
+def test_svg_stream_has_same_content_as_svg_backend(doc, render_box):
+    backend = svg.SVGBackend()
+    Frontend(RenderContext(doc), backend).draw_layout(doc.modelspace())
+    expected = backend.get_string(PAGE, render_box=render_box)
+
+    stream = io.StringIO()
+    backend = svg.SVGStreamBackend(stream, PAGE, render_box)
+    Frontend(RenderContext(doc), backend).draw_layout(doc.modelspace())
+    result = stream.getvalue()
+
+    root = ET.fromstring(result)  # well-formed XML
+    assert root.get("viewBox") == ET.fromstring(expected).get("viewBox")
+    pattern = r' d="([^"]*)"'
+    assert re.findall(pattern, result) == re.findall(pattern, expected)
+
+
+def test_svg_stream_groups_paths_by_style_class(doc, render_box):
+    stream = io.StringIO()
+    backend = svg.SVGStreamBackend(stream, PAGE, render_box, xml_declaration=False)
+    Frontend(RenderContext(doc), backend).draw_layout(doc.modelspace())
+    root = ET.fromstring(stream.getvalue())
+    namespace = "{http://www.w3.org/2000/svg}"
+    groups = root.findall(f"{namespace}g/{namespace}g")
+    # the 5 lines share the same style class
+    assert len(groups[0].findall(f"{namespace}path")) == 5
+    assert len(root.findall(f".//{namespace}style")) == len(
+        {g.get("class") for g in groups}
+    )
+
+
+def test_streaming_backend_requires_render_box():
+    with pytest.raises(ValueError):
+        svg.SVGStreamBackend(io.StringIO(), PAGE, BoundingBox2d())
+
+
+def render_pdf(doc, render_box, buffer_size=pdf.DEFAULT_BUFFER_SIZE) -> bytes:
+    class Backend(pdf.PDFStreamBackend):
+        def make_backend(self, page, settings):
+            return pdf.PDFStreamRenderBackend(
+                page, settings, self.stream, buffer_size=buffer_size
+            )
+
+    stream = io.BytesIO()
+    Frontend(RenderContext(doc), Backend(stream, PAGE, render_box)).draw_layout(
+        doc.modelspace()
+    )
+    return stream.getvalue()
+
+
+def content_stream(data: bytes) -> bytes:
+    start = data.index(b"stream\n") + 7
+    end = data.index(b"\nendstream")
+    return data[start:end]
+
+
+def test_pdf_structure(doc, render_box):
+    data = render_pdf(doc, render_box)
+    assert data.startswith(b"%PDF-1.4\n")
+    assert data.endswith(b"%%EOF\n")
+    xref_offset = int(data[data.rindex(b"startxref") + 10 :].split()[0])
+    table = data[xref_offset:].split(b"\n")
+    assert table[0] == b"xref"
+    count = int(table[1].split()[1])
+    for number in range(1, count):
+        offset = int(table[2 + number][:10])
+        assert data[offset:].startswith(b"%d 0 obj" % number)
+    # the length of the content stream is an indirect object:
+    length_offset = int(table[2 + pdf.CONTENT_LENGTH][:10])
+    length = int(data[length_offset:].split(b"\n")[1])
+    assert length == len(content_stream(data))
+
+
+def test_pdf_content(doc, render_box):
+    content = zlib.decompress(content_stream(render_pdf(doc, render_box)))
+    assert content.startswith(b"1 0 0 -1 0 226.77 cm")
+    assert content.count(b" S\n") == 6  # 5 lines and the point
+    assert b"f*\n" in content
+    assert b"/GS1 gs\n" in content  # transparency
+
+
+def test_pdf_content_is_flushed_incrementally(doc, render_box):
+    expected = zlib.decompress(content_stream(render_pdf(doc, render_box)))
+    data = render_pdf(doc, render_box, buffer_size=16)
+    assert zlib.decompress(content_stream(data)) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,131 @@
+#  Copyright (c) 2023, Manfred Moitzi
+#  License: MIT License
+import pytest
+from io import StringIO, BytesIO
+
+pytest.importorskip("ezdxf.acc.tagger")
+
+import ezdxf
+from ezdxf.lldxf.const import DXFStructureError
+from ezdxf.lldxf.tagger import (
+    py_ascii_tags_loader,
+    py_tag_compiler,
+    py_binary_tags_loader,
+)
+from ezdxf.acc.tagger import (
+    ascii_tags_loader as cy_ascii_tags_loader,
+    tag_compiler as cy_tag_compiler,
+    binary_tags_loader as cy_binary_tags_loader,
+)
+
+
+def compile_tags(compiler, s: str):
+    return list(compiler(py_ascii_tags_loader(StringIO(s))))
+
+
+def assert_equal_tags(tags1, tags2):
+    assert len(tags1) == len(tags2)
+    for t1, t2 in zip(tags1, tags2):
+        assert type(t1) is type(t2)
+        assert t1 == t2
+
+
+@pytest.mark.parametrize("skip_comments", [True, False])
+@pytest.mark.parametrize(
+    "s",
+    [
+        "0\nLINE\n999\ncomment\n8\n0\n",
+        "0\nSECTION\n0\nEOF\n0\nIGNORE\n",
+        "0\nLINE\n8\n",  # missing value
+        "",
+    ],
+)
+def test_ascii_tags_loader_is_compatible(s, skip_comments):
+    assert_equal_tags(
+        list(cy_ascii_tags_loader(StringIO(s), skip_comments)),
+        list(py_ascii_tags_loader(StringIO(s), skip_comments)),
+    )
+
+
+@pytest.mark.parametrize("s", ["X\nLINE\n", "0\nLINE\n 9 9\nX\n"])
+def test_ascii_tags_loader_invalid_group_code(s):
+    with pytest.raises(DXFStructureError):
+        list(cy_ascii_tags_loader(StringIO(s)))
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "0\nLINE\n5\nFF\n10\n1\n20\n2\n30\n3\n11\n4\n21\n5\n",
+        "0\nLWPOLYLINE\n90\n2\n10\n1\n20\n2\n10\n3\n20\n4\n0\nEOF\n",
+        "0\n  SECTION  \n70\n1.0\n40\n3.5\n290\n1\n",
+        "0\nXRECORD\n310\n0102FF\n1010\n1\n1020\n2\n1030\n3\n",
+        "0\nLINE\n1071\n123456\n160\n1234567890123\n",
+    ],
+)
+def test_tag_compiler_is_compatible(s):
+    assert_equal_tags(
+        compile_tags(cy_tag_compiler, s), compile_tags(py_tag_compiler, s)
+    )
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "10\n1\n30\n2\n",  # missing y-axis
+        "10\nx\n20\n2\n0\nEOF\n",  # invalid float
+        "70\nx\n",  # invalid int
+        "40\nx\n",  # invalid float
+        "310\nXYZ\n",  # invalid binary data
+    ],
+)
+def test_tag_compiler_errors(s):
+    with pytest.raises(DXFStructureError):
+        compile_tags(cy_tag_compiler, s)
+
+
+@pytest.fixture(scope="module", params=["R12", "R2000", "R2018"])
+def binary_dxf(request):
+    doc = ezdxf.new(request.param)
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (1, 2, 3), dxfattribs={"color": 1})
+    msp.add_text("Text äöü")
+    msp.add_circle((1, 2), radius=3.5)
+    if doc.dxfversion > "AC1009":
+        msp.add_lwpolyline([(0, 0), (1, 0), (1, 1)])
+        xrecord = doc.objects.add_xrecord(doc.rootdict.dxf.handle)
+        xrecord.extend([(310, b"\x00\x01\xFF"), (1071, -1234567)])
+    stream = BytesIO()
+    doc.write(stream, fmt="bin")
+    return stream.getvalue()
+
+
+def test_binary_tags_loader_is_compatible(binary_dxf):
+    assert_equal_tags(
+        list(cy_binary_tags_loader(binary_dxf)),
+        list(py_binary_tags_loader(binary_dxf)),
+    )
+
+
+def test_binary_tags_loader_requires_binary_dxf():
+    with pytest.raises(DXFStructureError):
+        list(cy_binary_tags_loader(b"0\nSECTION\n"))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3])
+def test_binary_tags_loader_missing_string_terminator(binary_dxf, size):
+    # same ValueError as the Python implementation
+    with pytest.raises(ValueError):
+        list(cy_binary_tags_loader(binary_dxf[:-size]))
+
+
+@pytest.mark.parametrize("value", [b"", b"\x00", b"\x00\x00\x00\x00"])
+def test_binary_tags_loader_truncated_double_value(value):
+    # DXF R12 without $ACADVER, 1-byte group code 40 and incomplete double:
+    data = b"AutoCAD Binary DXF\r\n\x1a\x00" + b"\x28" + value
+    with pytest.raises(DXFStructureError):
+        list(cy_binary_tags_loader(data))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])